@@ -0,0 +1,45 @@
+"""
+Import-time benchmark: the time to import grma in a fresh interpreter, and the heavy dependencies each import pulls in.
+Run it from the repository's root: python benchmark_import_time.py
+"""
+import subprocess
+import sys
+
+IMPORTS = [
+    "import grma",
+    "from grma.match import Graph",
+    "from grma.match import find_matches",
+    "from grma.match import matching",
+    "from grma.donorsgraph.build_donors_graph import BuildMatchingGraph",
+]
+HEAVY_MODULES = ["numpy", "pandas", "networkx", "tqdm", "grim"]
+REPEATS = 5
+
+MEASURE = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(elapsed, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(statement: str):
+    """return the best import time (in seconds) of REPEATS fresh interpreters, and the heavy modules imported"""
+    times = []
+    for _ in range(REPEATS):
+        output = subprocess.run([sys.executable, "-c", MEASURE.format(statement=statement, heavy=HEAVY_MODULES)],
+                                capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(output[0]))
+    return min(times), output[1] if len(output) > 1 else ""
+
+
+def main():
+    print(f"{'import':<70}{'time (ms)':>10}  heavy modules")
+    for statement in IMPORTS:
+        seconds, modules = measure(statement)
+        print(f"{statement:<70}{seconds * 1000:>10.1f}  {modules}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,21 @@
-from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
-from grma.match import matching, find_matches
+import importlib
+
+# BuildMatchingGraph and the matching functions import pandas, networkx and grim,
+# so they are imported on their first use and `from grma.match import Graph` stays cheap.
+_LAZY_ATTRIBUTES = {
+    "BuildMatchingGraph": "grma.donorsgraph.build_donors_graph",
+    "matching": "grma.match.match",
+    "find_matches": "grma.match.match",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -1,39 +1,167 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import pickle
-from typing import Union, List
+from typing import Dict, Iterable, Set, Tuple, Union, List
 
+import numpy as np
 from tqdm import tqdm
 
 from grma.donorsgraph import Edge
 from grma.donorsgraph.create_lol import LolBuilder
+from grma.match.graph_store import save_graph_directory
 from grma.match.graph_wrapper import Graph
 from grma.utilities.geno_representation import HashableArray
-from grma.utilities.utils import gl_string_to_integers, tuple_geno_to_int, print_time
+from grma.utilities.imputation_reader import read_imputation_file
+from grma.utilities.utils import tuple_geno_to_int, print_time
 
 CLASS_I_END = 6
 
 
+def genotype_keys(genotypes: np.ndarray) -> np.ndarray:
+    """return sortable keys (20 bytes) of (n, 10) genotypes"""
+    return np.ascontiguousarray(genotypes, dtype=">u2").view("V20").ravel()
+
+
+def class_i_keys(genotypes: np.ndarray) -> np.ndarray:
+    """return sortable keys (12 bytes) of the class I alleles of (n, 10) genotypes"""
+    return np.ascontiguousarray(np.asarray(genotypes)[:, :CLASS_I_END], dtype=">u2").view("V12").ravel()
+
+
+def donor_profile_key(genotypes: np.ndarray, weights: np.ndarray) -> bytes:
+    """
+    return the key of a donor's profile: its genotypes ((n, 10) alleles) and their weights, as they are stored
+    in the graph (float32). Donors with the same key have identical edges in the graph.
+    """
+    keys = genotype_keys(genotypes)
+    order = np.argsort(keys, kind="stable")
+    h = hashlib.blake2b(digest_size=16)
+    h.update(keys[order].tobytes())
+    h.update(np.asarray(weights, dtype=np.float32)[order].tobytes())
+    return h.digest()
+
+
+def class_subclasses(class_: Tuple[int, ...]) -> Set[int]:
+    """
+    subclasses are created by dropping an allele from a class.
+    each allele we drop, will be replaced with zero,
+    and will be shifted to the second place in the locus.
+    """
+    num_of_alleles = len(class_)
+
+    subclass_alleles = set()
+    # set the missing allele to always be the second allele in the locus
+    for i in range(num_of_alleles):
+        if i % 2 == 0:
+            subclass_alleles.add(tuple_geno_to_int(tuple(class_[0: i] + (0,) + class_[i + 1:])))
+        else:
+            subclass_alleles.add(tuple_geno_to_int(tuple(class_[0: i - 1] + (0, class_[i - 1]) + class_[i + 1:])))
+    return subclass_alleles
+
+
 class BuildMatchingGraph:
     """
     This class responsible for building the graph with the genotypes, classes and subclasses of the donors.
     It gets a path to directory with the donors' file, builds the graph and saved it as LOL graph using Cython.
+    Donors with identical genotypes distributions share a single donor node in the graph (a profile),
+    which is named after its smallest donor ID (see Graph.donors_of).
     """
 
-    __slots__ = '_verbose', "_graph", "_edges"
+    __slots__ = '_verbose', "_graph", "_edges", "_profiles"
 
-    def __init__(self, path_to_donors_directory: str, verbose: bool = False):
+    def __init__(self, path_to_donors_directory: str, verbose: bool = False,
+                 cache_directory: Union[str, os.PathLike, None] = None):
         """
         Build a donor's graph from the donor's genotypes.
         Args:
-            path_to_donors_directory: The path to the donors files directory
+            path_to_donors_directory: The path to the donors files directory.
+            The files can be grim's text output, or binary imputation files (.npz, see convert_imputation_file).
             verbose: A boolean flag for whether to print the documentation. default is False
+            cache_directory: A directory to keep the parsed donors files in, in the binary imputation format.
+            On a rebuild, the files that were not changed are loaded from it without parsing. default is None.
         """
         self._verbose = verbose
         self._graph = None  # LOL dict-representation
         self._edges: List[Edge] = []  # edge-list
-        self._save_graph_as_edges(path_to_donors_directory)
+        # {profile key: (the profile's donors, the profile's normalized probabilities)}
+        self._profiles: Dict[bytes, Tuple[List[int], Dict[HashableArray, float]]] = {}
+        self._save_graph_as_edges(path_to_donors_directory, cache_directory)
+
+    @classmethod
+    def from_donors(cls, donors: Iterable[Tuple[int, Dict[HashableArray, float]]],
+                    verbose: bool = False) -> BuildMatchingGraph:
+        """
+        Build a donor's graph from donors' genotypes distributions that were already parsed
+        (e.g. Graph.iter_donors, when the deltas applied to a graph are compacted).
+
+        :param donors: An iterable of (donor ID, {genotype: probability}), the probabilities of a donor sum to 1.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        self = cls.__new__(cls)
+        self._verbose = verbose
+        self._edges = []
+        self._profiles = {}
+        layers = self._empty_layers()
+        for donor_id, probability_dict in tqdm(donors, desc="Processing donors", disable=not verbose):
+            for geno in probability_dict:
+                self._add_genotype(geno, layers)
+            # the probabilities are already normalized
+            self._add_donor(donor_id, probability_dict, 1.)
+
+        self._graph = LolBuilder(directed=True, weighted=True, verbose=verbose).build(self._edges, layers,
+                                                                                      self._add_profiles(layers))
+        return self
+
+    @staticmethod
+    def _empty_layers() -> Dict[str, set]:
+        """dict of sets of nodes in each layer"""
+        return {
+            "ID": set(),
+            "GENOTYPE": set(),
+            "CLASS": set(),  # map classes to mp.uint32 objects
+            "SUBCLASS": set()
+        }
+
+    def _add_donor(self, donor_id: int, probability_dict: Dict[HashableArray, float], total_probability: float):
+        """add a donor to the profile of its genotypes distribution"""
+        if not probability_dict:
+            return
+        probability_dict = {HLA: probability / total_probability for HLA, probability in probability_dict.items()}
+        key = donor_profile_key(np.array([HLA.np() for HLA in probability_dict], dtype=np.uint16),
+                                np.fromiter(probability_dict.values(), dtype=np.float64))
+        profile = self._profiles.get(key)
+        if profile is None:
+            self._profiles[key] = ([donor_id], probability_dict)
+        else:
+            profile[0].append(donor_id)
+
+    def _add_profiles(self, layers: Dict[str, set]) -> Dict[int, List[int]]:
+        """
+        add the geno->id edges of each profile to edgelist. The profile's node is its smallest donor ID.
+        The id->geno direction is not stored, it is derived by LolBuilder from the same edges.
+
+        :return: {profile's donor ID: the other donors of the profile} of the profiles with more than one donor.
+        """
+        shared = {}
+        for donors, probability_dict in self._profiles.values():
+            donor_id = min(donors)
+            layers["ID"].add(donor_id)
+            for HLA, probability in probability_dict.items():
+                self._edges.append(Edge(HLA, donor_id, probability))
+            if len(donors) > 1:
+                shared[donor_id] = sorted(donor for donor in donors if donor != donor_id)
+        self._profiles = {}
+        return shared
+
+    def _add_genotype(self, geno: HashableArray, layers: Dict[str, set]):
+        """add a genotype to its classes and subclasses, if it is not in the graph yet"""
+        if geno not in layers["GENOTYPE"]:
+            layers["GENOTYPE"].add(geno)
+            geno_class1 = tuple(geno[:CLASS_I_END])
+            geno_class2 = tuple(geno[CLASS_I_END:])
+            self._create_classes_edges(geno, geno_class1, layers)
+            self._create_classes_edges(geno, geno_class2, layers)
 
     def _create_classes_edges(self, geno, class_, layers):
         int_class = tuple_geno_to_int(class_)
@@ -46,42 +174,24 @@ class BuildMatchingGraph:
             self._create_subclass_edges(class_, int_class, layers)
 
     def _create_subclass_edges(self, class_, int_class, layers):
-        """
-        subclasses edges are created by dropping an allele from a class.
-        each allele we drop, will be replaced with zero,
-        and will be shifted to the second place in the locus.
-        """
-        # create subclasses from class
-        num_of_alleles = len(class_)
-
-        subclass_alleles = set()
-        # set the missing allele to always be the second allele in the locus
-        for i in range(num_of_alleles):
-            if i % 2 == 0:
-                subclass_alleles.add(tuple_geno_to_int(tuple(class_[0: i] + (0,) + class_[i + 1:])))
-            else:
-                subclass_alleles.add(tuple_geno_to_int(tuple(class_[0: i - 1] + (0, class_[i - 1]) + class_[i + 1:])))
-
+        """subclasses edges are created by dropping an allele from a class (see class_subclasses)."""
         # add subclass->class edges
-        for sub in subclass_alleles:
+        for sub in class_subclasses(class_):
             self._edges.append(Edge(sub, int_class, 0))
             if sub not in layers["SUBCLASS"]:
                 layers["SUBCLASS"].add(sub)
 
-    def _save_graph_as_edges(self, path_to_donors_directory: str | os.PathLike):
+    def _save_graph_as_edges(self, path_to_donors_directory: str | os.PathLike,
+                             cache_directory: str | os.PathLike | None = None):
         """
         Process donors imputation files and save them to self._graph as an edgelist
         """
         print_time("(0/6) donorsgraph edgelist")
-        files = sorted(list(os.listdir(path_to_donors_directory)))
+        # sub-directories (e.g. a cache directory) are skipped
+        files = sorted(filename for filename in os.listdir(path_to_donors_directory)
+                       if os.path.isfile(os.path.join(path_to_donors_directory, filename)))
 
-        # dict of sets of nodes in each layer
-        layers = {
-            "ID": set(),
-            "GENOTYPE": set(),
-            "CLASS": set(),  # map classes to mp.uint32 objects
-            "SUBCLASS": set()
-        }
+        layers = self._empty_layers()
         count_donors = 0
 
         probability_dict = {}  # {genotype: probability} for each patient
@@ -89,63 +199,50 @@ class BuildMatchingGraph:
         last_id = 0
 
         for filename in files:
-            with open(os.path.join(path_to_donors_directory, filename)) as f:
-                for line in tqdm(f.readlines(), desc=f"Processing {filename}", disable=not self._verbose):
-                    # retrieve all line's parameters
-                    donor_id, geno, probability, index = line.strip().split(',')
-                    donor_id = int(donor_id)
-                    index = int(index)
-                    probability = float(probability)
-
-                    # convert geno to list of integers
-                    geno = gl_string_to_integers(geno)
-
-                    # sort alleles for each HLA-X
-                    for x in range(0, 10, 2):
-                        geno[x: x + 2] = sorted(geno[x: x + 2])
-                    geno = HashableArray(geno)
-
-                    # handle new donor appearance in file
-                    if index == 0:
-                        count_donors += 1
-
-                        # add id<->geno nodes to edgelist
-                        for HLA, geno_probability in probability_dict.items():
-                            self._edges.append(Edge(HLA, last_id, geno_probability / total_probability))
-                            self._edges.append(Edge(last_id, HLA, geno_probability / total_probability))
-
-                        # initialize parameters
-                        total_probability = 0
-                        last_id = donor_id
-                        probability_dict = {}
-                        layers["ID"].add(last_id)
-
-                    # continue creation of classes and subclasses
-                    if geno not in layers["GENOTYPE"]:
-                        layers["GENOTYPE"].add(geno)
-                        geno_class1 = tuple(geno[:CLASS_I_END])
-                        geno_class2 = tuple(geno[CLASS_I_END:])
-                        self._create_classes_edges(geno, geno_class1, layers)
-                        self._create_classes_edges(geno, geno_class2, layers)
-
-                    # add probabilities to probability dict
-                    total_probability += probability
-                    if geno in probability_dict:
-                        probability_dict[geno] += probability
-                    else:
-                        probability_dict[geno] = probability
-
-        # add the last donor to edgelist
-        for HLA, probability in probability_dict.items():
-            self._edges.append(Edge(HLA, last_id, probability / total_probability))
-            self._edges.append(Edge(last_id, HLA, probability / total_probability))
+            with tqdm(desc=f"Processing {filename}", unit=" lines", disable=not self._verbose) as progress:
+                # the lines are parsed in blocks: ids, genotypes (the alleles of each locus are sorted),
+                # probabilities and indices.
+                for block in read_imputation_file(os.path.join(path_to_donors_directory, filename),
+                                                  cache_directory):
+                    progress.update(len(block.ids))
+                    for donor_id, geno, probability, index in zip(block.ids.tolist(), block.genotypes,
+                                                                  block.probabilities.tolist(),
+                                                                  block.indices.tolist()):
+                        geno = HashableArray(geno)
+
+                        # handle new donor appearance in file
+                        if index == 0:
+                            count_donors += 1
+
+                            # add the donor to its profile
+                            self._add_donor(last_id, probability_dict, total_probability)
+
+                            # initialize parameters
+                            total_probability = 0
+                            last_id = donor_id
+                            probability_dict = {}
+
+                        # continue creation of classes and subclasses
+                        self._add_genotype(geno, layers)
+
+                        # add probabilities to probability dict
+                        total_probability += probability
+                        if geno in probability_dict:
+                            probability_dict[geno] += probability
+                        else:
+                            probability_dict[geno] = probability
+
+        # add the last donor to its profile
+        self._add_donor(last_id, probability_dict, total_probability)
 
         count_donors += 1
         if self._verbose:
-            print(f"Total number of donors:{count_donors}")
+            print(f"Total number of donors:{count_donors}, profiles: {len(self._profiles)}")
 
         # create graph's dict-representation of LOL
-        self._graph = LolBuilder(directed=True, weighted=True, verbose=self._verbose).build(self._edges, layers)
+        shared_profiles = self._add_profiles(layers)
+        lol_builder = LolBuilder(directed=True, weighted=True, verbose=self._verbose)
+        self._graph = lol_builder.build(self._edges, layers, shared_profiles)
 
     @property
     def graph(self):
@@ -162,3 +259,15 @@ class BuildMatchingGraph:
         :param path: A path to save the pickled object
         """
         pickle.dump(self._graph, open(path, "wb"))
+
+    def to_directory(self, path: Union[str, os.PathLike]):
+        """
+        Save the graph as a directory of raw arrays, which can be memory-mapped by several processes.
+        To get the graph from the directory use:
+
+        >>> from grma.match.graph_wrapper import Graph
+        >>> Graph.from_directory(path)
+
+        :param path: A path to the graph directory
+        """
+        save_graph_directory(self._graph, path)
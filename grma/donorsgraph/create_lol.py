@@ -1,4 +1,4 @@
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Tuple
 
 import numpy as np
 from tqdm import tqdm
@@ -6,6 +6,8 @@ import gc
 from collections import OrderedDict
 
 from grma.donorsgraph import Edge
+from grma.match.graph_store import graph_content_hash
+from grma.utilities.geno_representation import HashableArray
 from grma.utilities.utils import print_time, tuple_geno_to_int
 
 
@@ -22,9 +24,17 @@ class LolBuilder:
         }
         self._graph: List[Edge] = []
 
-    def build(self, edge_list: List[Edge], layers: Dict[str, Set]):
+    def build(self, edge_list: List[Edge], layers: Dict[str, Set], shared_profiles: Dict[int, List[int]] = None):
+        """
+        :param edge_list: The edges of the graph.
+        :param layers: a dictionary of the graph's layers. each layer is a set of all the nodes it contains.
+        :param shared_profiles: {donor: the other donors of its profile} of the donor nodes that are shared by
+        several donors (see BuildMatchingGraph).
+        """
         self._graph: List[Edge] = edge_list
         subclasses_start = self._convert(layers)
+        if shared_profiles:
+            self._add_profiles(shared_profiles, subclasses_start)
 
         neighbors_list, weights_list = self._sort_all(index_list=self._properties["index_list"],
                                                       neighbors_list=self._properties["neighbors_list"],
@@ -37,6 +47,9 @@ class LolBuilder:
 
         self._properties["neighbors_list"] = neighbors_list
         self._properties["weights_list"] = weights_list
+        self._properties["donor_index_list"], self._properties["donor_edges"] = \
+            self._transpose_donors(subclasses_start, neighbors_list)
+        self._properties["content_hash"] = graph_content_hash(self._properties)
 
         print_time("Finished creating the lol-matching graph")
         return self._properties
@@ -48,17 +61,18 @@ class LolBuilder:
         """
         free = 0
         print_time('(1/6) Convert edgelist to maps from nodes to internal numbers')
+        ids, subclasses, genotypes, classes = self._order_layers(layers)
 
         # maps nodes' original value to its lol id.
         # maps only ids and subclasses
         map_node_to_number = OrderedDict()
 
-        for idd in tqdm(layers["ID"], desc="(1.1) Map nodes to internal numbers", disable=not self._verbose):
+        for idd in tqdm(ids, desc="(1.1) Map nodes to internal numbers", disable=not self._verbose):
             map_node_to_number[idd] = free
             free += 1
 
         subclasses_start = free  # a flag for where the subclasses mapping starts.
-        for sub in tqdm(layers["SUBCLASS"], desc="(1.2) Map nodes to internal numbers", disable=not self._verbose):
+        for sub in tqdm(subclasses, desc="(1.2) Map nodes to internal numbers", disable=not self._verbose):
             map_node_to_number[sub] = free
             free += 1
 
@@ -66,15 +80,15 @@ class LolBuilder:
         arrays_start = free
         # map lol-ids to arrays
         # given an lol_id, the mapping will be map_number_to_arr_node[lol_id - arrays_start, :]
-        map_number_to_arr_node = np.zeros((len(layers["GENOTYPE"]), 10), dtype=np.uint16)
-        for i, geno in tqdm(enumerate(layers["GENOTYPE"]), desc="(1.3) Map nodes to internal numbers",
+        map_number_to_arr_node = np.zeros((len(genotypes), 10), dtype=np.uint16)
+        for i, geno in tqdm(enumerate(genotypes), desc="(1.3) Map nodes to internal numbers",
                             disable=not self._verbose):
             map_node_to_number[geno] = free
             map_number_to_arr_node[i, :] = geno.np()
             free += 1
 
         # map classes to lol-id.
-        for clss in tqdm(layers["CLASS"], desc="(1.4) Map nodes to internal numbers", disable=not self._verbose):
+        for clss in tqdm(classes, desc="(1.4) Map nodes to internal numbers", disable=not self._verbose):
             # Here also add dictionary {class: id_in_graph}
             map_node_to_number[clss] = free
             free += 1
@@ -152,6 +166,36 @@ class LolBuilder:
 
         return subclasses_start
 
+    def _order_layers(self, layers: Dict[str, Set]) -> Tuple[List, List, List[HashableArray], List]:
+        """
+        Order the nodes of each layer for their lol IDs, so the numbering doesn't depend on the order of the sets,
+        and nodes that are read together are close in memory:
+         - genotypes are ordered by their alleles, that is by class I and then by class II,
+           so the genotypes of a class are contiguous in map_number_to_arr_node.
+         - donors are ordered by their dominant genotype (the genotype with the highest probability), then by ID.
+         - subclasses and classes are ordered by their values.
+        """
+        genotypes = list(layers["GENOTYPE"])
+        if genotypes:
+            alleles = np.array([geno.np() for geno in genotypes], dtype=np.uint16)
+            genotypes = [genotypes[i] for i in np.lexsort(alleles.T[::-1])]
+        geno_order = {geno: i for i, geno in enumerate(genotypes)}
+
+        # {donor: (weight, genotype's order)} of the dominant genotype of each donor.
+        # The weights are compared as float32 - the weights stored in the graph.
+        dominant = {}
+        if self._weighted:
+            for edge in tqdm(self._graph, desc="(1.0) Find the donors' dominant genotypes", disable=not self._verbose):
+                # geno->id edges
+                if isinstance(edge.node1, HashableArray) and edge.node2 in layers["ID"]:
+                    weight, order = np.float32(edge.weight), geno_order[edge.node1]
+                    best = dominant.get(edge.node2)
+                    if best is None or weight > best[0] or (weight == best[0] and order < best[1]):
+                        dominant[edge.node2] = (weight, order)
+        ids = sorted(layers["ID"], key=lambda idd: (dominant.get(idd, (0, -1))[1], idd))
+
+        return ids, sorted(layers["SUBCLASS"]), genotypes, sorted(layers["CLASS"])
+
     def _add_weights_and_neighbors(self, node1, node2, space, neighbors_list, index_list,
                                    *, weight=None, weights_list=None):
         if space[node1] != -1:
@@ -183,6 +227,47 @@ class LolBuilder:
             weights_list[start] = neigh_2nd_total
         return weights_list
 
+    def _add_profiles(self, shared_profiles: Dict[int, List[int]], num_donors: int):
+        """
+        Map the donors of shared profiles to the lol ID of their profile's node, and list the donors of each profile:
+        the donors of the profile i are profile_members[profile_index_list[i]: profile_index_list[i + 1]],
+        sorted by their IDs.
+        """
+        map_node_to_number = self._properties["map_node_to_number"]
+        profile_sizes = np.ones(num_donors, dtype=np.int64)
+        for donor, others in shared_profiles.items():
+            profile_sizes[map_node_to_number[donor]] += len(others)
+
+        profile_index_list = np.zeros(num_donors + 1, dtype=np.uint32)
+        profile_index_list[1:] = np.cumsum(profile_sizes)
+        profile_members = np.zeros(int(profile_index_list[-1]), dtype=np.uint32)
+        for node_num, donor in enumerate(self._properties["map_number_to_num_node"].tolist()):
+            members = sorted([donor] + shared_profiles.get(donor, []))
+            profile_members[profile_index_list[node_num]: profile_index_list[node_num + 1]] = members
+            for member in members[1:]:
+                map_node_to_number[member] = node_num
+
+        self._properties["profile_index_list"] = profile_index_list
+        self._properties["profile_members"] = profile_members
+
+    @staticmethod
+    def _transpose_donors(num_donors: int, neighbors_list: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The donor<->genotype edges are stored once, in the genotypes' lists (the donors' lists in the LOL arrays
+        are empty). The donors' view is an index of the positions of each donor's edges in the genotypes' lists,
+        so the weight of an edge is stored once, in weights_list.
+
+        :return: donor_index_list (the donor's positions are donor_edges[donor_index_list[i]: donor_index_list[i + 1]])
+        and donor_edges. The positions of a donor are sorted, that is ordered by the genotypes' lol IDs.
+        """
+        positions = np.flatnonzero(neighbors_list < num_donors)
+        donors = neighbors_list[positions]
+        donor_edges = positions[np.argsort(donors, kind="stable")].astype(np.uint32)
+
+        donor_index_list = np.zeros(num_donors + 1, dtype=np.uint32)
+        donor_index_list[1:] = np.cumsum(np.bincount(donors, minlength=num_donors))
+        return donor_index_list, donor_edges
+
     def _sort_all(self, index_list=None, neighbors_list=None, weights_list=None):
         """sort the neighbors for each node"""
         print_time("(5/6) Sort")
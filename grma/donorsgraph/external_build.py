@@ -0,0 +1,481 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+from tqdm import tqdm
+
+from grma.donorsgraph.build_donors_graph import CLASS_I_END, class_subclasses, donor_profile_key, genotype_keys, \
+    class_i_keys
+from grma.match.graph_store import NodeIndex, META_FILE, NODE_KEYS_FILE, NODE_VALUES_FILE, \
+    graph_content_hash, save_graph_meta, list_directory_deltas
+from grma.utilities.imputation_reader import ImputationBlock, read_imputation_file
+from grma.utilities.utils import print_time, tuple_geno_to_int
+
+DEFAULT_MEMORY_BUDGET: int = 1 << 30  # 1GB
+
+# A donor<->genotype edge in a run file: the genotype (10 big-endian alleles, so the bytes sort as the alleles),
+# the donor ID and the normalized probability of the genotype.
+RUN_DTYPE = np.dtype([("genotype", "V20"), ("donor", np.int64), ("weight", np.float32)])
+# The memory a buffered edge takes, with the temporaries of sorting it.
+EDGE_MEMORY_BYTES: int = 4 * RUN_DTYPE.itemsize
+
+
+def _sequential_sums(values: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Sum the groups values[start: start + length], adding the values one by one in their order
+    (like a python loop, unlike np.add.reduceat), so the sums are identical to the in-memory build.
+    """
+    sums = np.zeros(len(starts), dtype=np.float64)
+    by_length = np.argsort(-lengths, kind="stable")
+    negative_lengths = -lengths[by_length]
+    for k in range(int(lengths.max()) if len(lengths) else 0):
+        active = by_length[:np.searchsorted(negative_lengths, -k, side="left")]
+        sums[active] += values[starts[active] + k]
+    return sums
+
+
+def _group_starts(sorted_values: np.ndarray) -> np.ndarray:
+    """return the positions where a new value starts in a sorted array"""
+    if not len(sorted_values):
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate([[True], sorted_values[1:] != sorted_values[:-1]]))
+
+
+class ExternalGraphBuilder:
+    """
+    Builds a donors' graph directory with a bounded memory, for registries larger than the memory.
+    The donor<->genotype edges (the bulk of the graph) are spilled to sorted run files on the local disk,
+    and then written from the runs into the LOL arrays of the graph directory, which are memory-mapped files.
+    Only the nodes (donors' IDs, genotypes, classes and subclasses) are kept in memory, as numpy arrays,
+    with a key of each distinct genotypes distribution: the edges of a donor whose genotypes distribution was seen
+    before are not spilled, the donor shares the donor node of the first donor (see BuildMatchingGraph).
+
+    The graph is identical to a graph built by BuildMatchingGraph (see LolBuilder._order_layers for the numbering).
+    """
+    __slots__ = "_memory_budget", "_runs_directory", "_verbose", "_runs", "_buffer", "_buffered", "_genotypes", \
+        "_donors", "_profiles", "_shared_donors", "_class_i_range"
+
+    def __init__(self, runs_directory: Union[str, os.PathLike], memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 verbose: bool = False,
+                 class_i_range: Tuple[Union[Sequence[int], None], Union[Sequence[int], None]] = (None, None)):
+        """
+        :param runs_directory: A directory for the run files.
+        :param memory_budget: Maximum memory (in bytes) of the edges that are held in memory at once.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        :param class_i_range: The class I alleles (low, high) of the genotypes to add to the graph - only genotypes
+        whose class I is in [low, high) are added, with their donors' edges (a shard of a sharded graph,
+        see grma.donorsgraph.sharded_build). None is unbounded. The donors' probabilities are still normalized
+        over all their genotypes. default is all the genotypes.
+        """
+        self._memory_budget = memory_budget
+        self._runs_directory = runs_directory
+        self._verbose = verbose
+        self._runs: List[str] = []
+        self._buffer: List[np.ndarray] = []
+        self._buffered = 0  # number of buffered edges
+        self._genotypes = np.zeros(0, dtype="V20")  # the sorted keys of all the genotypes
+        self._donors: List[np.ndarray] = []
+        self._profiles: Dict[bytes, int] = {}  # {profile key: the first donor with the profile}
+        self._shared_donors: List[Tuple[int, int]] = []  # (donor, the first donor with its profile)
+        self._class_i_range = [None if alleles is None else class_i_keys(np.array([alleles], dtype=np.uint16))
+                               for alleles in class_i_range]
+
+    @property
+    def _chunk_edges(self) -> int:
+        """number of edges that are processed at once"""
+        return max(self._memory_budget // EDGE_MEMORY_BYTES, 1)
+
+    def build(self, path_to_donors_directory: Union[str, os.PathLike], graph_directory: Union[str, os.PathLike],
+              cache_directory: Union[str, os.PathLike, None] = None):
+        """
+        Build the graph directory from the donors' imputation files.
+
+        :param path_to_donors_directory: The path to the donors files directory.
+        :param graph_directory: A path to the graph directory. It will be created if it does not exist.
+        :param cache_directory: A directory of parsed donors files (see BuildMatchingGraph). default is None.
+        """
+        os.makedirs(graph_directory, exist_ok=True)
+        # the directory is not a graph directory until the graph is complete
+        if os.path.isfile(os.path.join(graph_directory, META_FILE)):
+            os.remove(os.path.join(graph_directory, META_FILE))
+        for delta_path in list_directory_deltas(graph_directory):
+            os.remove(delta_path)
+
+        print_time("(1/5) Spill the donors' edges to sorted runs")
+        self._spill_runs(path_to_donors_directory, cache_directory)
+
+        print_time("(2/5) Map nodes to internal numbers")
+        # the donors with edges in the runs, one of each profile
+        donors = np.unique(np.concatenate(self._donors)) if self._donors else np.zeros(0, dtype=np.int64)
+        genotypes = self._genotypes.view(">u2").reshape(-1, 10).astype(np.uint16)
+        class_edges, sub_edges, class_values, sub_values = self._classes_and_subclasses(genotypes)
+
+        # a profile's node is named after its smallest donor ID
+        shared_donors = np.array(self._shared_donors, dtype=np.int64).reshape(-1, 2)
+        shared_profiles = np.searchsorted(donors, shared_donors[:, 1])
+        profile_values = donors.copy()
+        np.minimum.at(profile_values, shared_profiles, shared_donors[:, 0])
+
+        # donors are ordered by their dominant genotype, then by ID (as in LolBuilder._order_layers)
+        donors_order = np.lexsort((profile_values, self._dominant_genotypes(donors)))
+        donor_numbers = np.empty(len(donors), dtype=np.int64)  # the lol ID of each donor in donors
+        donor_numbers[donors_order] = np.arange(len(donors))
+
+        subclasses_start = len(donors)
+        arrays_start = subclasses_start + len(sub_values)
+        classes_start = arrays_start + len(genotypes)
+        num_nodes = classes_start + len(class_values)
+
+        print_time("(3/5) Create the index list")
+        # the donor<->genotype edges are stored in the genotypes' lists only (see LolBuilder._transpose_donors)
+        degrees = np.zeros(num_nodes, dtype=np.int64)
+        donor_degrees = np.zeros(len(donors), dtype=np.int64)
+        for donor_positions, geno_positions, _ in self._iter_run_edges(donors):
+            donor_degrees += np.bincount(donor_numbers[donor_positions], minlength=len(donors))
+            degrees += np.bincount(geno_positions + arrays_start, minlength=num_nodes)
+        class_nodes, class_neighbors = class_edges[0] + classes_start, class_edges[1] + arrays_start
+        sub_nodes, sub_neighbors = sub_edges[0] + subclasses_start, sub_edges[1] + classes_start
+        degrees += np.bincount(class_nodes, minlength=num_nodes)
+        degrees += np.bincount(sub_nodes, minlength=num_nodes)
+
+        index_list = np.zeros(num_nodes + 1, dtype=np.uint32)
+        index_list[1:] = np.cumsum(degrees)
+
+        print_time("(4/5) Create the neighbors list")
+        arrays = {
+            "index_list": index_list,
+            "map_number_to_num_node": profile_values[donors_order].astype(np.uint32),
+            "map_number_to_arr_node": genotypes
+        }
+        # all the donors, and the lol IDs of their donor nodes
+        all_donors = np.concatenate([donors, shared_donors[:, 0]])
+        all_donor_numbers = np.concatenate([donor_numbers, donor_numbers[shared_profiles]])
+        if len(shared_donors):
+            arrays["profile_index_list"], arrays["profile_members"] = self._profile_arrays(all_donors,
+                                                                                           all_donor_numbers)
+        for name, arr in arrays.items():
+            np.save(os.path.join(graph_directory, f"{name}.npy"), arr)
+        neighbors_list = np.lib.format.open_memmap(os.path.join(graph_directory, "neighbors_list.npy"), mode="w+",
+                                                   dtype=np.uint32, shape=(int(index_list[-1]),))
+        weights_list = np.lib.format.open_memmap(os.path.join(graph_directory, "weights_list.npy"), mode="w+",
+                                                 dtype=np.float32, shape=(int(index_list[-1]),))
+
+        cursor = index_list[:-1].astype(np.int64)  # the next free position of each node
+        for donor_positions, geno_positions, weights in self._iter_run_edges(donors):
+            self._scatter(cursor, geno_positions + arrays_start, donor_numbers[donor_positions], neighbors_list,
+                          weights, weights_list)
+        self._scatter(cursor, class_nodes, class_neighbors, neighbors_list)
+        self._scatter(cursor, sub_nodes, sub_neighbors, neighbors_list)
+
+        print_time("(5/5) Sort")
+        self._sort_segments(index_list, neighbors_list, weights_list)
+        self._dist_2nd_weights(subclasses_start, arrays_start, index_list, degrees, neighbors_list, weights_list)
+        neighbors_list.flush()
+        weights_list.flush()
+        arrays["donor_index_list"], arrays["donor_edges"] = self._transpose_donors(
+            donor_degrees, index_list, arrays_start, classes_start, neighbors_list, graph_directory)
+
+        node_index = self._node_index(all_donors, all_donor_numbers, sub_values, genotypes, class_values)
+        keys, values = node_index.arrays
+        np.save(os.path.join(graph_directory, NODE_KEYS_FILE), keys)
+        np.save(os.path.join(graph_directory, NODE_VALUES_FILE), values)
+
+        lol_properties = {"directed": True, "weighted": True, "arrays_start": arrays_start,
+                          "neighbors_list": neighbors_list, "weights_list": weights_list,
+                          "map_node_to_number": node_index, **arrays}
+        lol_properties["content_hash"] = graph_content_hash(lol_properties)
+        save_graph_meta(lol_properties, graph_directory)
+        print_time("Finished creating the lol-matching graph")
+
+    def _spill_runs(self, path_to_donors_directory: Union[str, os.PathLike],
+                    cache_directory: Union[str, os.PathLike, None]):
+        """Parse the donors files, and spill their edges to sorted runs whenever the memory budget is reached"""
+        files = sorted(filename for filename in os.listdir(path_to_donors_directory)
+                       if os.path.isfile(os.path.join(path_to_donors_directory, filename)))
+
+        carry = None  # the lines of the last donor, which might continue in the next block
+        for filename in files:
+            with tqdm(desc=f"Processing {filename}", unit=" lines", disable=not self._verbose) as progress:
+                for block in read_imputation_file(os.path.join(path_to_donors_directory, filename),
+                                                  cache_directory):
+                    progress.update(len(block.ids))
+                    if carry is not None:
+                        block = ImputationBlock(*(np.concatenate(arrays) for arrays in zip(carry, block)))
+                    last_start = np.flatnonzero(block.indices == 0)
+                    last_start = int(last_start[-1]) if len(last_start) else 0
+                    carry = ImputationBlock(*(arr[last_start:] for arr in block))
+                    self._add_edges(self._new_profiles_edges(self._in_class_i_range(
+                        self._donors_edges(ImputationBlock(*(arr[:last_start] for arr in block))))))
+
+        if carry is not None:
+            self._add_edges(self._new_profiles_edges(self._in_class_i_range(self._donors_edges(carry))))
+        self._flush()
+
+    @staticmethod
+    def _donors_edges(block: ImputationBlock) -> np.ndarray:
+        """
+        return the edges of complete donors (an array of RUN_DTYPE).
+        A genotype that appears more than once in a donor's imputation gets the sum of its probabilities.
+        """
+        edges = np.zeros(len(block.ids), dtype=RUN_DTYPE)
+        if not len(block.ids):
+            return edges
+
+        # a new donor starts at genotype index 0
+        starts = np.flatnonzero(block.indices == 0)
+        if not len(starts) or starts[0] != 0:
+            starts = np.concatenate([[0], starts])
+        lengths = np.diff(np.append(starts, len(block.ids)))
+        totals = _sequential_sums(block.probabilities, starts, lengths)
+
+        keys = genotype_keys(block.genotypes)
+        donor_of_line = np.repeat(np.arange(len(starts)), lengths)
+        order = np.lexsort((keys, donor_of_line))  # stable - the lines of a genotype stay in their order
+        edge_starts = np.flatnonzero(np.concatenate([[True], (donor_of_line[order][1:] != donor_of_line[order][:-1]) |
+                                                     (keys[order][1:] != keys[order][:-1])]))
+        edge_lengths = np.diff(np.append(edge_starts, len(order)))
+        probabilities = _sequential_sums(block.probabilities[order], edge_starts, edge_lengths)
+
+        edges = edges[:len(edge_starts)]
+        first_lines = order[edge_starts]
+        edges["genotype"] = keys[first_lines]
+        edges["donor"] = block.ids[first_lines]
+        edges["weight"] = probabilities / totals[donor_of_line[first_lines]]
+        return edges
+
+    def _in_class_i_range(self, edges: np.ndarray) -> np.ndarray:
+        """return the edges of the genotypes whose class I is in self._class_i_range"""
+        low, high = self._class_i_range
+        if low is None and high is None:
+            return edges
+        keys = class_i_keys(np.ascontiguousarray(edges["genotype"]).view(">u2").reshape(-1, 10))
+        keep = np.ones(len(edges), dtype=bool)
+        if low is not None:
+            keep &= np.searchsorted(low, keys, side="right") == 1
+        if high is not None:
+            keep &= np.searchsorted(high, keys, side="right") == 0
+        return edges[keep]
+
+    def _new_profiles_edges(self, edges: np.ndarray) -> np.ndarray:
+        """
+        return the edges of the donors with a profile that was not seen before.
+        The other donors are kept in self._shared_donors, with the first donor of their profile.
+        """
+        keep = np.ones(len(edges), dtype=bool)
+        starts = _group_starts(edges["donor"])  # the edges of a donor are consecutive
+        ends = np.append(starts[1:], len(edges))
+        genotypes = np.ascontiguousarray(edges["genotype"]).view(">u2").reshape(-1, 10)
+        weights = np.ascontiguousarray(edges["weight"])
+        for start, end, donor in zip(starts.tolist(), ends.tolist(), edges["donor"][starts].tolist()):
+            key = donor_profile_key(genotypes[start: end], weights[start: end])
+            first_donor = self._profiles.setdefault(key, donor)
+            if first_donor != donor:
+                keep[start: end] = False
+                self._shared_donors.append((donor, first_donor))
+        return edges[keep]
+
+    def _add_edges(self, edges: np.ndarray):
+        self._buffer.append(edges)
+        self._buffered += len(edges)
+        if self._buffered >= self._chunk_edges:
+            self._flush()
+
+    def _flush(self):
+        """sort the buffered edges by genotype and donor, and save them as a run"""
+        if not self._buffered:
+            return
+        edges = np.concatenate(self._buffer)
+        self._buffer, self._buffered = [], 0
+
+        edges = edges[np.lexsort((edges["donor"], edges["genotype"]))]
+        run_path = os.path.join(self._runs_directory, f"run_{len(self._runs):06d}.npy")
+        np.save(run_path, edges)
+        self._runs.append(run_path)
+
+        self._genotypes = np.union1d(self._genotypes, edges["genotype"])
+        self._donors.append(np.unique(edges["donor"]))
+        if self._verbose:
+            print_time(f"Saved a run of {len(edges)} edges")
+
+    def _iter_run_edges(self, donors: np.ndarray) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Yields (positions of the donors in donors, positions of the genotypes in self._genotypes, weights)
+        of the edges in the runs, in chunks
+        """
+        for run_path in self._runs:
+            run = np.load(run_path, mmap_mode="r")
+            for start in range(0, len(run), self._chunk_edges):
+                edges = np.asarray(run[start: start + self._chunk_edges])
+                yield np.searchsorted(donors, edges["donor"]), np.searchsorted(self._genotypes, edges["genotype"]), \
+                    edges["weight"]
+
+    def _dominant_genotypes(self, donors: np.ndarray) -> np.ndarray:
+        """
+        return the dominant genotype of each donor in donors: the position of its genotype with the highest
+        probability (the first of them on ties).
+        """
+        best_weights = np.full(len(donors), -1, dtype=np.float32)
+        best_genotypes = np.full(len(donors), -1, dtype=np.int64)
+        for donor_positions, geno_positions, weights in self._iter_run_edges(donors):
+            # the best edge of each donor in the chunk
+            order = np.lexsort((geno_positions, -weights, donor_positions))
+            firsts = order[_group_starts(donor_positions[order])]
+            donor, geno, weight = donor_positions[firsts], geno_positions[firsts], weights[firsts]
+
+            better = (weight > best_weights[donor]) | ((weight == best_weights[donor]) & (geno < best_genotypes[donor]))
+            best_weights[donor[better]] = weight[better]
+            best_genotypes[donor[better]] = geno[better]
+        return best_genotypes
+
+    @staticmethod
+    def _classes_and_subclasses(genotypes: np.ndarray) -> Tuple[Tuple[np.ndarray, np.ndarray],
+                                                                Tuple[np.ndarray, np.ndarray], List[int], List[int]]:
+        """
+        return the class->genotype edges and the subclass->class edges (as arrays of positions in the layers),
+        and the sorted values of the classes and the subclasses.
+        """
+        classes: Dict[int, Tuple[int, ...]] = {}
+        layers = []  # (the classes' values, the class of each genotype) for class I and class II
+        for class_start, class_end in ((0, CLASS_I_END), (CLASS_I_END, genotypes.shape[1])):
+            rows, inverse = np.unique(genotypes[:, class_start: class_end], axis=0, return_inverse=True)
+            values = [tuple_geno_to_int(row) for row in rows.tolist()]
+            classes.update(zip(values, map(tuple, rows.tolist())))
+            layers.append((values, inverse.ravel()))
+
+        class_values = sorted(classes)
+        class_numbers = {value: i for i, value in enumerate(class_values)}
+        class_edges = (np.concatenate([np.array([class_numbers[value] for value in values], dtype=np.int64)[inverse]
+                                       for values, inverse in layers]),
+                       np.tile(np.arange(len(genotypes), dtype=np.int64), len(layers)))
+
+        subclasses = [(sub, class_numbers[value]) for value, class_ in classes.items()
+                      for sub in class_subclasses(class_)]
+        sub_values = sorted({sub for sub, _ in subclasses})
+        sub_numbers = {value: i for i, value in enumerate(sub_values)}
+        sub_edges = (np.array([sub_numbers[sub] for sub, _ in subclasses], dtype=np.int64),
+                     np.array([clss for _, clss in subclasses], dtype=np.int64))
+        return class_edges, sub_edges, class_values, sub_values
+
+    @staticmethod
+    def _scatter(cursor: np.ndarray, nodes: np.ndarray, neighbors: np.ndarray, neighbors_list: np.ndarray,
+                 weights: Union[np.ndarray, None] = None, weights_list: Union[np.ndarray, None] = None):
+        """write edges to the next free positions of their nodes (the weights are 0 if they are not given)"""
+        order = np.argsort(nodes, kind="stable")
+        nodes = nodes[order]
+        starts = _group_starts(nodes)
+        counts = np.diff(np.append(starts, len(nodes)))
+        positions = cursor[nodes] + (np.arange(len(nodes)) - np.repeat(starts, counts))
+        neighbors_list[positions] = neighbors[order]
+        if weights is not None:
+            weights_list[positions] = weights[order]
+        cursor[nodes[starts]] += counts
+
+    def _transpose_donors(self, donor_degrees: np.ndarray, index_list: np.ndarray, arrays_start: int,
+                          classes_start: int, neighbors_list: np.ndarray,
+                          graph_directory: Union[str, os.PathLike]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        write the positions of the donors' edges in the genotypes' lists (see LolBuilder._transpose_donors)
+        :return: donor_index_list and donor_edges.
+        """
+        donor_index_list = np.zeros(len(donor_degrees) + 1, dtype=np.uint32)
+        donor_index_list[1:] = np.cumsum(donor_degrees)
+        np.save(os.path.join(graph_directory, "donor_index_list.npy"), donor_index_list)
+        donor_edges = np.lib.format.open_memmap(os.path.join(graph_directory, "donor_edges.npy"), mode="w+",
+                                                dtype=np.uint32, shape=(int(donor_index_list[-1]),))
+
+        # the genotypes' lists are read in order, so the positions of each donor are sorted
+        cursor = donor_index_list[:-1].astype(np.int64)
+        first, last = int(index_list[arrays_start]), int(index_list[classes_start])
+        for start in range(first, last, self._chunk_edges):
+            end = min(start + self._chunk_edges, last)
+            self._scatter(cursor, np.asarray(neighbors_list[start: end]), np.arange(start, end, dtype=np.uint32),
+                          donor_edges)
+        donor_edges.flush()
+        return donor_index_list, donor_edges
+
+    def _sort_segments(self, index_list: np.ndarray, neighbors_list: np.ndarray, weights_list: np.ndarray):
+        """sort the neighbors of each node, a chunk of nodes at a time"""
+        num_nodes = len(index_list) - 1
+        start = 0
+        with tqdm(total=num_nodes, desc="(5/5) Sort", disable=not self._verbose) as progress:
+            while start < num_nodes:
+                end = int(np.searchsorted(index_list, int(index_list[start]) + self._chunk_edges, side="right")) - 1
+                end = min(max(end, start + 1), num_nodes)
+                first, last = int(index_list[start]), int(index_list[end])
+                segments = np.repeat(np.arange(end - start), np.diff(index_list[start: end + 1]).astype(np.int64))
+                neighbors = np.asarray(neighbors_list[first: last])
+                order = np.lexsort((neighbors, segments))
+                neighbors_list[first: last] = neighbors[order]
+                weights_list[first: last] = np.asarray(weights_list[first: last])[order]
+                progress.update(end - start)
+                start = end
+
+    @staticmethod
+    def _dist_2nd_weights(subs_start: int, subs_end: int, index_list: np.ndarray, degrees: np.ndarray,
+                          neighbors_list: np.ndarray, weights_list: np.ndarray):
+        """
+        For each subclass node, add to its weights the number of genotypes connected to it
+        (in its first weight, as LolBuilder does).
+        """
+        if subs_start == subs_end:
+            return
+        first, last = int(index_list[subs_start]), int(index_list[subs_end])
+        starts = index_list[subs_start: subs_end].astype(np.int64)
+        totals = np.add.reduceat(degrees[neighbors_list[first: last]], starts - first)
+        weights_list[starts] = totals
+
+    @staticmethod
+    def _profile_arrays(all_donors: np.ndarray, all_donor_numbers: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        return the donors of each donor node (see LolBuilder._add_profiles): profile_index_list and profile_members.
+        """
+        order = np.lexsort((all_donors, all_donor_numbers))
+        profile_index_list = np.zeros(int(all_donor_numbers.max(initial=-1)) + 2, dtype=np.uint32)
+        profile_index_list[1:] = np.cumsum(np.bincount(all_donor_numbers, minlength=len(profile_index_list) - 1))
+        return profile_index_list, all_donors[order].astype(np.uint32)
+
+    @staticmethod
+    def _node_index(donors: np.ndarray, donor_numbers: np.ndarray, sub_values: List[int], genotypes: np.ndarray,
+                    class_values: List[int]) -> NodeIndex:
+        """
+        map the nodes to their lol IDs. The donors are given with the lol IDs of their donor nodes,
+        and the other nodes are given in the order of their lol IDs, after the donor nodes.
+        """
+        keys = np.concatenate([NodeIndex.encode_nodes(sub_values),
+                               NodeIndex.encode_nodes(tuple_geno_to_int(geno) for geno in genotypes.tolist()),
+                               NodeIndex.encode_nodes(class_values)])
+        num_donor_nodes = int(donor_numbers.max(initial=-1)) + 1
+        return NodeIndex.from_keys(np.concatenate([NodeIndex.encode_nodes(donors.tolist()), keys]),
+                                   np.concatenate([donor_numbers,
+                                                   np.arange(num_donor_nodes, num_donor_nodes + len(keys))]))
+
+
+def build_graph_directory(path_to_donors_directory: Union[str, os.PathLike],
+                          graph_directory: Union[str, os.PathLike],
+                          memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                          temp_directory: Union[str, os.PathLike, None] = None,
+                          cache_directory: Union[str, os.PathLike, None] = None, verbose: bool = False):
+    """
+    Build a donors' graph directory with a bounded memory (see ExternalGraphBuilder).
+    To get the graph from the directory use:
+
+    >>> from grma.match.graph_wrapper import Graph
+    >>> Graph.from_directory(graph_directory)
+
+    :param path_to_donors_directory: The path to the donors files directory.
+    :param graph_directory: A path to the graph directory. It will be created if it does not exist.
+    :param memory_budget: Maximum memory (in bytes) of the edges that are held in memory at once. default is 1GB.
+    :param temp_directory: A directory on a local disk for the run files. default is the system's temporary directory.
+    :param cache_directory: A directory of parsed donors files (see BuildMatchingGraph). default is None.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    """
+    runs_directory = tempfile.mkdtemp(prefix="grma_runs_", dir=temp_directory)
+    try:
+        builder = ExternalGraphBuilder(runs_directory, memory_budget, verbose)
+        builder.build(path_to_donors_directory, graph_directory, cache_directory)
+    finally:
+        shutil.rmtree(runs_directory, ignore_errors=True)
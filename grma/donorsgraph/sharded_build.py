@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from tqdm import tqdm
+
+from grma.donorsgraph.build_donors_graph import CLASS_I_END, class_i_keys
+from grma.donorsgraph.external_build import DEFAULT_MEMORY_BUDGET, ExternalGraphBuilder
+from grma.match.graph_store import NodeIndex, META_FILE, load_graph_directory
+from grma.utilities.imputation_reader import read_imputation_file
+from grma.utilities.utils import print_time
+
+SHARDS_FILE = "shards.json"
+SHARD_DIRECTORY_FORMAT = "shard_{:03d}"
+# The classes and subclasses of a shard (NodeIndex keys), which the search coordinator routes by.
+ROUTE_KEYS_FILE = "route_keys.npy"
+
+
+def class_i_bounds(path_to_donors_directory: Union[str, os.PathLike], num_shards: int,
+                   cache_directory: Union[str, os.PathLike, None] = None,
+                   verbose: bool = False) -> List[Tuple[int, ...]]:
+    """
+    Split the class I range of the donors into shards with about the same number of donor<->genotype lines.
+    All the genotypes of a class I are in the same shard.
+
+    :param path_to_donors_directory: The path to the donors files directory.
+    :param num_shards: Number of shards. There are fewer shards if the donors have fewer distinct class I.
+    :param cache_directory: A directory of parsed donors files (see BuildMatchingGraph). default is None.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    :return: The class I alleles where each shard but the first starts, sorted.
+    """
+    files = sorted(filename for filename in os.listdir(path_to_donors_directory)
+                   if os.path.isfile(os.path.join(path_to_donors_directory, filename)))
+
+    counts: Dict[bytes, int] = {}  # {class I key: number of lines}
+    for filename in files:
+        with tqdm(desc=f"Counting {filename}", unit=" lines", disable=not verbose) as progress:
+            for block in read_imputation_file(os.path.join(path_to_donors_directory, filename), cache_directory):
+                progress.update(len(block.ids))
+                keys, block_counts = np.unique(class_i_keys(block.genotypes), return_counts=True)
+                for key, count in zip(keys.tolist(), block_counts.tolist()):
+                    counts[key] = counts.get(key, 0) + count
+
+    keys = sorted(counts)
+    cumulative = np.cumsum([counts[key] for key in keys])
+    bounds = []
+    for k in range(1, num_shards):
+        i = int(np.searchsorted(cumulative, cumulative[-1] * k / num_shards, side="right")) if keys else 0
+        if i < len(keys) and (not bounds or keys[i] > bounds[-1]):
+            bounds.append(keys[i])
+    return [tuple(np.frombuffer(key, dtype=">u2").tolist()) for key in bounds]
+
+
+def shard_of_genotypes(bounds: np.ndarray, genotypes: np.ndarray) -> np.ndarray:
+    """
+    return the shard of each genotype.
+
+    :param bounds: The class I keys (see class_i_keys) where each shard but the first starts.
+    :param genotypes: (n, 10) genotypes.
+    """
+    return np.searchsorted(bounds, class_i_keys(genotypes), side="right")
+
+
+def _route_keys(graph_directory: Union[str, os.PathLike]) -> np.ndarray:
+    """return the NodeIndex keys of the classes and subclasses of a graph directory"""
+    lol_properties = load_graph_directory(graph_directory)
+    keys, values = lol_properties["map_node_to_number"].arrays
+    subclasses_start = len(lol_properties["map_number_to_num_node"])
+    arrays_start = int(lol_properties["arrays_start"])
+    classes_start = arrays_start + len(lol_properties["map_number_to_arr_node"])
+    routed = (values >= subclasses_start) & ((values < arrays_start) | (values >= classes_start))
+    return np.asarray(keys[routed])
+
+
+def _build_shard(path_to_donors_directory: Union[str, os.PathLike], shard_directory: Union[str, os.PathLike],
+                 class_i_range: Tuple[Union[Sequence[int], None], Union[Sequence[int], None]], memory_budget: int,
+                 temp_directory: Union[str, os.PathLike, None], cache_directory: Union[str, os.PathLike, None],
+                 verbose: bool) -> str:
+    """build the graph directory of a shard, and return its content hash"""
+    runs_directory = tempfile.mkdtemp(prefix="grma_runs_", dir=temp_directory)
+    try:
+        ExternalGraphBuilder(runs_directory, memory_budget, verbose, class_i_range).build(
+            path_to_donors_directory, shard_directory, cache_directory)
+    finally:
+        shutil.rmtree(runs_directory, ignore_errors=True)
+
+    np.save(os.path.join(shard_directory, ROUTE_KEYS_FILE), _route_keys(shard_directory))
+    with open(os.path.join(shard_directory, META_FILE)) as f:
+        return json.load(f)["content_hash"]
+
+
+def build_sharded_graph(path_to_donors_directory: Union[str, os.PathLike],
+                        sharded_directory: Union[str, os.PathLike], num_shards: int,
+                        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                        temp_directory: Union[str, os.PathLike, None] = None,
+                        cache_directory: Union[str, os.PathLike, None] = None,
+                        workers: int = 1, verbose: bool = False) -> List[str]:
+    """
+    Build a donors' graph that is split by class I into independent graph directories (shards),
+    so a registry can be searched by several machines (see grma.match.sharded_search.ShardCoordinator).
+    Each shard has the genotypes of a range of class I, their classes and subclasses, and the donors
+    that have them. A donor whose genotypes are in several shards is in all of them, with the edges of its
+    genotypes in each shard (the probabilities are of the whole donor, so the shards' scores add up).
+    The shards are built by ExternalGraphBuilder, with a bounded memory.
+
+    :param path_to_donors_directory: The path to the donors files directory.
+    :param sharded_directory: A path to the sharded graph's directory. It will be created if it does not exist.
+    :param num_shards: Number of shards (see class_i_bounds).
+    :param memory_budget: Maximum memory (in bytes) of the edges that are held in memory at once, in each shard's
+    build. default is 1GB.
+    :param temp_directory: A directory on a local disk for the run files. default is the system's temporary directory.
+    :param cache_directory: A directory of parsed donors files (see BuildMatchingGraph). Every shard reads all the
+    donors files, so it is recommended. default is None.
+    :param workers: Number of shards that are built at once, in worker processes. default is 1.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    :return: The paths to the shards' graph directories.
+    """
+    os.makedirs(sharded_directory, exist_ok=True)
+    # the directory is not a sharded graph until all the shards are complete
+    if os.path.isfile(os.path.join(sharded_directory, SHARDS_FILE)):
+        os.remove(os.path.join(sharded_directory, SHARDS_FILE))
+
+    print_time("Split the class I range into shards")
+    bounds = class_i_bounds(path_to_donors_directory, num_shards, cache_directory, verbose)
+    ranges = list(zip([None] + bounds, bounds + [None]))
+    shard_names = [SHARD_DIRECTORY_FORMAT.format(i) for i in range(len(ranges))]
+    shard_directories = [os.path.join(sharded_directory, name) for name in shard_names]
+
+    arguments = [(path_to_donors_directory, shard_directory, class_i_range, memory_budget, temp_directory,
+                  cache_directory, verbose) for shard_directory, class_i_range in zip(shard_directories, ranges)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(arguments))) as executor:
+            content_hashes = list(executor.map(_build_shard, *zip(*arguments)))
+    else:
+        content_hashes = []
+        for i, args in enumerate(arguments):
+            print_time(f"Build shard {i + 1}/{len(arguments)}")
+            content_hashes.append(_build_shard(*args))
+
+    with open(os.path.join(sharded_directory, SHARDS_FILE), "w") as f:
+        json.dump({"class_i_bounds": [list(alleles) for alleles in bounds], "shards": shard_names,
+                   "content_hashes": content_hashes}, f)
+    print_time(f"Finished creating {len(shard_names)} shards")
+    return shard_directories
+
+
+def load_shards_manifest(sharded_directory: Union[str, os.PathLike]) -> Tuple[np.ndarray, List[str], List[str]]:
+    """
+    Load the manifest of a sharded graph that was built by build_sharded_graph.
+
+    :return: The class I keys where each shard but the first starts, the paths to the shards' graph directories,
+    and the shards' content hashes.
+    """
+    if not os.path.isfile(os.path.join(sharded_directory, SHARDS_FILE)):
+        raise FileNotFoundError(f"Can't find a sharded graph in {sharded_directory}.")
+    with open(os.path.join(sharded_directory, SHARDS_FILE)) as f:
+        manifest = json.load(f)
+    bounds = class_i_keys(np.array(manifest["class_i_bounds"], dtype=np.uint16).reshape(-1, CLASS_I_END))
+    return bounds, [os.path.join(sharded_directory, name) for name in manifest["shards"]], manifest["content_hashes"]
+
+
+def load_route_keys(shard_directory: Union[str, os.PathLike]) -> NodeIndex:
+    """return the classes and subclasses of a shard, as a NodeIndex (the values are not used)"""
+    keys = np.load(os.path.join(shard_directory, ROUTE_KEYS_FILE))
+    return NodeIndex(keys, np.zeros(len(keys), dtype=np.uint32))
@@ -1,9 +1,9 @@
 import json
 from collections import defaultdict
+from itertools import chain
 import pickle
 from donorsgraph.build_donors_graph import BuildMatchingGraph
-from match import Graph, find_matches
-import csv
+from match import Graph, PatientsCSVWriter, find_matches
 import os
 from grim import grim
 from pathlib import Path
@@ -51,29 +51,6 @@ def preprocess_patient_data(lines):
 
     return patient_data, new_patient_ids
 
-def create_patient_files(patient_data):
-    """
-        Create patient files from grouped patient data.
-
-        Args:
-            patient_data (dict): Dictionary mapping patient IDs to their data.
-        """
-    base_directory = './patients_dir_temp'
-    os.makedirs(base_directory, exist_ok=True)
-
-    for patient_id, data in patient_data.items():
-        filename = f'patient_{patient_id}.txt'
-        filepath = os.path.join(base_directory, filename)
-
-        counter = 1
-        while os.path.exists(filepath):
-            filename = f'patient_{patient_id}_{counter}.txt'
-            filepath = os.path.join(base_directory, filename)
-            counter += 1
-
-        with open(filepath, 'w') as file:
-            file.writelines(data)
-
 def save_new_patient_ids(new_patient_ids):
     """
         Save the dictionary of new patient IDs to a pickle file.
@@ -84,32 +61,26 @@ def save_new_patient_ids(new_patient_ids):
     with open('new_patient_ids_for_D4.pkl', 'wb') as pickle_file:
         pickle.dump(new_patient_ids, pickle_file)
 
-def process_and_save_results(patients_dir, donors_graph, cutof=100, threshold=0.1, result_dir='./result_dir'):
+def match_patient_data(patient_data, donors_graph, cutof=100, threshold=0.1, result_dir='./result_dir'):
     """
-        Process patient files for matching and save results.
+        Match all the patients in one batched search, and save the results of each patient to its own CSV file
+        (<patient>.csv) in result_dir. The file of a patient is written as soon as its search is done.
 
         Args:
-            patients_dir (str): Path to the directory containing patient files.
+            patient_data (dict): Dictionary mapping patient IDs to their data (see preprocess_patient_data).
             donors_graph (Graph): Donors graph for matching.
             cutof (int, optional): Cutoff parameter for matching. Default is 100.
             threshold (float, optional): Threshold parameter for matching. Default is 0.1.
             result_dir (str, optional): Directory where result files will be saved. Default is './result_dir'.
         """
     os.makedirs(result_dir, exist_ok=True)
+    if not patient_data:
+        return
 
-    for filename in os.listdir(patients_dir):
-        if filename.endswith(".txt"):
-            patient_file_path = os.path.join(patients_dir, filename)
-
-            matching_results = find_matches(patient_file_path, donors_graph, cutof=cutof, threshold=threshold)
-
-            for patient, df in matching_results.items():
-                result_filename = os.path.join(result_dir, f"{patient}.csv")
-
-                with open(result_filename, 'w', newline='') as result_file:
-                    writer = csv.writer(result_file)
-                    writer.writerow(df.columns)
-                    writer.writerows(df.values)
+    lines = chain.from_iterable(patient_data.values())
+    with PatientsCSVWriter(result_dir, file_name="{patient}.csv", index=False, float_format=None,
+                           flush_rows=1) as writer:
+        find_matches(list(lines), donors_graph, cutof=cutof, threshold=threshold, save_results=writer)
 
 def GetResultPatients(config_grim_file, path_donors_graph, dir_result, cutof=100, threshold=0.1, build_grim_graph=True):
     """
@@ -132,9 +103,8 @@ def GetResultPatients(config_grim_file, path_donors_graph, dir_result, cutof=100
     # after_imputation_patients_file = imputation(patients_file) , and after that change the patients_file to after_imputation_patients_file
     lines = load_patients_data(patients_file)
     patient_data, new_patient_ids = preprocess_patient_data(lines)
-    create_patient_files(patient_data)
     save_new_patient_ids(new_patient_ids)
-    process_and_save_results('./patients_dir_temp', donors_graph, cutof=cutof, threshold=threshold, result_dir=dir_result)
+    match_patient_data(patient_data, donors_graph, cutof=cutof, threshold=threshold, result_dir=dir_result)
     # in the end return to the files result the name id or maybe its enough that the name of the file is the name of the id???
 
 
@@ -1,3 +1,28 @@
+import importlib
+
 from grma.match.graph_wrapper import Graph
-from grma.match.donors_matching import set_database
-from grma.match.match import matching, find_matches
+from grma.match.graph_handle import GraphHandle
+
+# The matching functions import pandas and networkx (and matching imports grim),
+# so they are imported on their first use.
+_LAZY_ATTRIBUTES = {
+    "set_database": "grma.match.donors_matching",
+    "DonorsDelta": "grma.match.graph_delta",
+    "matching": "grma.match.match",
+    "find_matches": "grma.match.match",
+    "rescore": "grma.match.match",
+    "MatchingError": "grma.match.match",
+    "PatientsCSVWriter": "grma.match.result_writer",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
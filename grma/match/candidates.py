@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from os import PathLike
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# (candidates' lol IDs, patient's genotype index, patient's genotype probability, similarity)
+CandidatesArrays = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+CANDIDATES_FIELDS = ("geno_ids", "geno_nums", "probs", "similarities")
+# (patient's first genotype, candidates arrays)
+PatientCandidates = Tuple[Sequence[int], CandidatesArrays]
+
+
+class CandidatesWriter(object):
+    """
+    Collects the genotype candidates of searched patients, and saves them in a single binary file (.npz).
+    Patients with identical genotypes distribution share the same candidates object, which is saved once.
+    """
+    __slots__ = "_graph_hash", "_patients", "_blocks", "_candidates", "_block_by_id"
+
+    def __init__(self, graph_hash: str):
+        self._graph_hash = graph_hash
+        self._patients: List[int] = []
+        self._blocks: List[int] = []  # the block of candidates of each patient
+        self._candidates: List[PatientCandidates] = []
+        self._block_by_id: Dict[int, int] = {}  # {id(candidates): block}
+
+    def add(self, patient: int, candidates: PatientCandidates):
+        """add the candidates of a patient"""
+        block = self._block_by_id.get(id(candidates))
+        if block is None:
+            block = self._block_by_id[id(candidates)] = len(self._candidates)
+            self._candidates.append(candidates)  # keeps the object (and its id) alive
+        self._patients.append(patient)
+        self._blocks.append(block)
+
+    def save(self, path: Union[str, PathLike]):
+        lengths = [len(arrays[0]) for _, arrays in self._candidates]
+        offsets = np.zeros(len(lengths) + 1, dtype=np.uint64)
+        offsets[1:] = np.cumsum(lengths)
+
+        fields = {}
+        for i, name in enumerate(CANDIDATES_FIELDS):
+            fields[name] = np.concatenate([arrays[i] for _, arrays in self._candidates]) if self._candidates \
+                else np.array([])
+
+        genotypes = np.array([genotype for genotype, _ in self._candidates], dtype=np.uint16).reshape(-1, 10)
+
+        with open(path, "wb") as f:
+            np.savez(f,
+                     graph_hash=np.array(self._graph_hash),
+                     patients=np.array(self._patients, dtype=np.int64),
+                     blocks=np.array(self._blocks, dtype=np.int64),
+                     genotypes=genotypes,
+                     offsets=offsets, **fields)
+
+
+def load_candidates(path: Union[str, PathLike]) -> Tuple[str, Iterator[Tuple[int, int, np.ndarray, CandidatesArrays]]]:
+    """
+    Load a candidates file saved by CandidatesWriter.
+
+    :return: The content hash of the graph the candidates were found in,
+    and a generator of (patient, block, patient's first genotype, candidates arrays) in the order of the search.
+    """
+    data = np.load(path)
+    graph_hash = str(data["graph_hash"])
+
+    def iter_candidates():
+        offsets = data["offsets"]
+        genotypes = data["genotypes"]
+        fields = [data[name] for name in CANDIDATES_FIELDS]
+        for patient, block in zip(data["patients"].tolist(), data["blocks"].tolist()):
+            start, end = int(offsets[block]), int(offsets[block + 1])
+            yield patient, block, genotypes[block], tuple(field[start:end] for field in fields)
+
+    return graph_hash, iter_candidates()
@@ -1,16 +1,19 @@
+import hashlib
+import os
+import time
 from collections.abc import Iterator
-from typing import List, Tuple, Set, Iterable, Dict
+from typing import List, Tuple, Set, Iterable, Dict, Union
 from typing import Sequence
 
-import networkx as nx
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
 from grma.match.graph_wrapper import Graph
+from grma.match.profiling import MatchingProfiler, profile_stage
 from grma.utilities.geno_representation import HashableArray, ClassMinusOne
+from grma.utilities.imputation_reader import ImputationBlock, parse_imputation_lines, read_imputation_blocks
 from grma.utilities.utils import donor_mismatch_format, \
-    drop_less_than_7_matches, check_similarity, gl_string_to_integers, tuple_geno_to_int, print_time
+    drop_less_than_7_matches, check_similarity, tuple_geno_to_int, print_time
 
 DONORS_DB: pd.DataFrame = pd.DataFrame()
 ZEROS: HashableArray = HashableArray([0])
@@ -53,6 +56,24 @@ def _init_results_df(donors_info):
     return pd.DataFrame(fields_in_results)
 
 
+def add_donors_info(results_df: pd.DataFrame, donors_info: Iterable[str]) -> pd.DataFrame:
+    """Add fields from the database to results that were found without them"""
+    donors_db_fields = DONORS_DB.columns.values.tolist()
+    for field in donors_info:
+        if field in donors_db_fields and field not in results_df.columns:
+            results_df[field] = [DONORS_DB.loc[int(donor), field] for donor in results_df["Donor_ID"]]
+    return results_df
+
+
+def copy_patient_results(results_df: Union[pd.DataFrame, None], patient: int) -> Union[pd.DataFrame, None]:
+    """Copy the results of a patient to another patient with the same genotypes"""
+    if results_df is None:
+        return None
+    results_df = results_df.copy()
+    results_df.loc[:, "Patient_ID"] = patient
+    return results_df
+
+
 def locuses_match_between_genos(geno1, geno2):
     matches = []
     for i in range(5):
@@ -66,28 +87,188 @@ def locuses_match_between_genos(geno1, geno2):
     return matches
 
 
+def iter_patients(imputation: Union[str, os.PathLike, Iterable[str], ImputationBlock]) \
+        -> Iterator[Tuple[int, List[Tuple[HashableArray, float, int]]]]:
+    """
+    Group the lines of an imputation file by patient.
+    A new patient starts at a line with index 0.
+    Yields (patient ID, [(genotype, probability, index), ...]) in the order of the file.
+
+    :param imputation: A path to the imputation file, an iterable of its lines, or its parsed lines
+    (an in-memory imputation).
+    """
+    if isinstance(imputation, (str, os.PathLike)):
+        blocks = read_imputation_blocks(imputation)
+    elif isinstance(imputation, ImputationBlock):
+        blocks = [imputation]
+    else:
+        blocks = [parse_imputation_lines(imputation)]
+
+    patient_id, genotypes = None, []
+    for block in blocks:
+        for line_patient_id, geno, prob, index in zip(block.ids.tolist(), map(HashableArray, block.genotypes),
+                                                      block.probabilities.tolist(), block.indices.tolist()):
+            if index == 0:
+                if genotypes:
+                    yield patient_id, genotypes
+                patient_id, genotypes = line_patient_id, []
+            genotypes.append((geno, prob, index))
+    if genotypes:
+        yield patient_id, genotypes
+
+
+def patient_fingerprint(genotypes: Iterable[Tuple[HashableArray, float, int]]) -> str:
+    """
+    A fingerprint of a patient's genotypes distribution. Patients with the same fingerprint get the same matches:
+    the same genotypes with the same normalized probabilities, and the same first genotype
+    (which is used for the results' most common genotype comparison).
+    """
+    genotypes = list(genotypes)
+    prob_dict: Dict[bytes, float] = {}
+    for geno, prob, _ in genotypes:
+        key = geno.np().tobytes()
+        prob_dict[key] = prob_dict.get(key, 0) + prob
+    total_prob = sum(prob_dict.values())
+
+    h = hashlib.blake2b(genotypes[0][0].np().tobytes(), digest_size=16)
+    for key in sorted(prob_dict):
+        h.update(key)
+        h.update(repr(prob_dict[key] / total_prob).encode())
+    return h.hexdigest()
+
+
+def most_common_genotype(donor_genotypes: Iterable[Tuple[Sequence[int], float]]) -> Sequence[int]:
+    """Takes the (genotype, probability) pairs of a donor. Returns the genotype with the highest probability
+    (the first of them on ties)."""
+    don_geno = []
+    geno_max_prob = 0
+    for geno, prob in donor_genotypes:
+        if prob > geno_max_prob:
+            geno_max_prob = prob
+            don_geno = geno
+
+    return don_geno
+
+
+def alleles_match_probabilities(donor_genotypes: Sequence[Tuple[Sequence[int], float]],
+                                pat_geno: Sequence[int]) -> List[int]:
+    """Takes the (genotype, probability) pairs of a donor and a patient's genotype.
+    Returns the probability of match for each allele of the patient (in percents)."""
+    probs = [0 for _ in range(10)]
+
+    for i, allele in enumerate(pat_geno):
+        p = 0
+        for don_geno, don_weight in donor_genotypes:
+            if allele in don_geno:
+                p += don_weight
+        probs[i] = int(round(p * 100))
+
+    return probs
+
+
+def append_matching_donor(add_donors: Dict, donors_info: Iterable[str], patient: int, donor: int,
+                          match_prob: float, mm_number: int, node_properties: Tuple[List[int], List[int]]) -> None:
+    """add a donor to the matches dictionary.
+    node_properties are the match between the most common genotypes and the probability of match for each allele."""
+
+    compare_commons, allele_prob = node_properties
+
+    add_donors["Patient_ID"].append(patient)
+    add_donors["Donor_ID"].append(donor)
+    add_donors["Match_Probability_A_1"].append(allele_prob[0])
+    add_donors["Match_Probability_A_2"].append(allele_prob[1])
+    add_donors["Match_Probability_B_1"].append(allele_prob[2])
+    add_donors["Match_Probability_B_2"].append(allele_prob[3])
+    add_donors["Match_Probability_C_1"].append(allele_prob[4])
+    add_donors["Match_Probability_C_2"].append(allele_prob[5])
+    add_donors["Match_Probability_DQB1_1"].append(allele_prob[6])
+    add_donors["Match_Probability_DQB1_2"].append(allele_prob[7])
+    add_donors["Match_Probability_DRB1_1"].append(allele_prob[8])
+    add_donors["Match_Probability_DRB1_2"].append(allele_prob[9])
+
+    add_donors["Match_Between_Most_Commons_A"].append(compare_commons[0])
+    add_donors["Match_Between_Most_Commons_B"].append(compare_commons[1])
+    add_donors["Match_Between_Most_Commons_C"].append(compare_commons[2])
+    add_donors["Match_Between_Most_Commons_DQB"].append(compare_commons[3])
+    add_donors["Match_Between_Most_Commons_DRB"].append(compare_commons[4])
+
+    add_donors["Matching_Probability"].append(match_prob)
+    add_donors["Number_Of_Mismatches"].append(mm_number)
+    add_donors["Permissive/Non-Permissive"].append("-")  # TODO: add permissiveness algorithm
+
+    # add the other given fields to the results
+    for field in donors_info:
+        add_donors[field].append(DONORS_DB.loc[donor, field])
+
+
+def classes_and_subclasses_from_genotype(genotype: HashableArray) -> Tuple[List[int], List[ClassMinusOne]]:
+    """Takes a sorted genotype.
+    Returns its two classes as integers, and its subclasses (each class without one of its alleles)."""
+    subclasses = []
+    classes = [genotype[:ALLELES_IN_CLASS_I], genotype[ALLELES_IN_CLASS_I:]]
+    num_of_alleles_in_class = [ALLELES_IN_CLASS_I, ALLELES_IN_CLASS_II]
+
+    int_classes = [tuple_geno_to_int(tuple(clss)) for clss in classes]
+
+    # class one is considered as 0.
+    # class two is considered as 1.
+    class_options = [0, 1]
+    for class_num in class_options:
+        for k in range(0, num_of_alleles_in_class[class_num]):
+            # set the missing allele to always be the second allele in the locus
+            if k % 2 == 0:
+                sub = tuple_geno_to_int(classes[class_num][0: k] + ZEROS + classes[class_num][k + 1:])
+            else:
+                sub = tuple_geno_to_int(classes[class_num][0: k - 1] + ZEROS +
+                                        classes[class_num][k - 1: k] + classes[class_num][k + 1:])
+
+            # missing allele number is the index of the first allele of the locus the missing allele belongs to.
+            # Could be [0, 2, 4, 6, 8]
+            missing_allele_num = ALLELES_IN_CLASS_I * class_num + 2 * (k // 2)
+            subclasses.append(ClassMinusOne(subclass=sub,
+                                            class_num=class_num,
+                                            allele_num=missing_allele_num))
+
+    return int_classes, subclasses
+
+
 class DonorsMatching(object):
     """DonorsMatching class is in charge of the matching process"""
-    __slots__ = "_graph", "_patients_graph", "_genotype_candidates", "patients", "verbose"
+    __slots__ = "_graph", "_patients_graph", "_genotype_candidates", "patients", "representatives", "verbose", \
+        "profiler"
+
+    def __init__(self, graph: Graph, verbose: bool = False, profiler: Union[MatchingProfiler, None] = None):
+        """
+        :param graph: The donors' graph.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        :param profiler: A MatchingProfiler to count the time of the stages of the matching in. default is None.
+        """
+        import networkx as nx  # imported here, so grma.match can be imported without networkx
 
-    def __init__(self, graph: Graph, verbose: bool = False):
         self._graph: Graph = graph
         self._patients_graph: nx.DiGraph = nx.DiGraph()
         self._genotype_candidates: Dict[int, Dict[int, List[Tuple[float, int]]]] = {}  # AMIT ADD
         self.patients: Dict[int, Sequence[int]] = {}
+        self.representatives: Dict[int, int] = {}  # {patient: the patient in the graph with the same genotypes}
         self.verbose = verbose
+        self.profiler = profiler
 
-    def get_most_common_genotype(self, donor_id):
-        """Takes a donor ID and return his/her most common genotype.
+    def with_graph(self, graph: Graph) -> "DonorsMatching":
         """
-        don_geno = []
-        geno_max_prob = 0
-        for geno in self._graph.neighbors(donor_id):
-            if geno[1] > geno_max_prob:
-                geno_max_prob = geno[1]
-                don_geno = geno[0]
-
-        return don_geno
+        Returns a DonorsMatching of the same patients in another donors' graph, without genotype candidates.
+        The patients graph is shared, not copied, so the patients are parsed only once for several graphs.
+        """
+        other = DonorsMatching(graph, verbose=self.verbose, profiler=self.profiler)
+        other._patients_graph = self._patients_graph
+        other._genotype_candidates = {patient: {} for patient in self._genotype_candidates}
+        other.patients = self.patients
+        other.representatives = self.representatives
+        return other
+
+    def get_most_common_genotype(self, donor_id, search_lol_id: bool = False):
+        """Takes a donor ID (or the lol ID of a donor node) and return his/her most common genotype.
+        """
+        return most_common_genotype(self._graph.neighbors(donor_id, search_lol_id=search_lol_id))
 
     def print_most_common_genotype(self, don_id: int, pat_geno: Sequence[int]) -> str:
         """Takes a donor ID and a genotype.
@@ -101,19 +282,10 @@ class DonorsMatching(object):
 
         return donor_mismatch_format(don_geno, pat_geno)
 
-    def probability_to_allele(self, don_id: int, pat_geno: Sequence[int]) -> List[float]:
-        """Takes a donor ID and a genotype.
+    def probability_to_allele(self, don_id: int, pat_geno: Sequence[int], search_lol_id: bool = False) -> List[float]:
+        """Takes a donor ID (or the lol ID of a donor node) and a genotype.
         Returns the probability of match for each allele"""
-        probs = [0 for _ in range(10)]
-
-        for i, allele in enumerate(pat_geno):
-            p = 0
-            for don_geno, don_weight in self._graph.neighbors(don_id):
-                if allele in don_geno:
-                    p += don_weight
-            probs[i] = int(round(p * 100))
-
-        return probs
+        return alleles_match_probabilities(list(self._graph.neighbors(don_id, search_lol_id=search_lol_id)), pat_geno)
 
     def __find_genotype_candidates_from_subclass(self, sub: int) -> np.ndarray:
         """Takes an integer subclass.
@@ -125,21 +297,28 @@ class DonorsMatching(object):
         Returns the genotypes (ids and values) which are connected to it in the graph"""
         return self._graph.class_neighbors(clss)
 
-    def __find_donor_from_geno(self, geno_id: int) -> Sequence[int]:
+    def __find_donor_from_geno(self, geno_id: int) -> Iterator[Tuple[int, float]]:
         """Gets the LOL ID of a genotype.
-        Return its neighbors - all the donors that has this genotype."""
-        ids, _ = zip(*self._graph.neighbors(geno_id, search_lol_id=True))
-        return list(ids)
+        Return its neighbors - the lol IDs of the donor nodes that has this genotype, and their probabilities.
+        A donor node might be shared by several donors (see Graph.donors_of)."""
+        donor_nodes, weights = self._graph.neighbors_ids(geno_id)
+        return zip(donor_nodes.tolist(), weights.tolist())
 
     def __add_matched_genos_to_graph(self, genos: Iterator, genotypes_ids: np.ndarray, genotypes_values: np.ndarray,
                                      allele_range_to_check: np.ndarray, matched_alleles: int):
+        profiler = self.profiler
         for geno in genos:
+            start = time.perf_counter() if profiler is not None else 0
             # check similarity between geno and all the candidates
             similarities = check_similarity(geno.np(),
                                             genotypes_values, allele_range_to_check,
                                             matched_alleles)
 
             candidates_to_iterate = drop_less_than_7_matches(genotypes_ids, similarities)
+            if profiler is not None:
+                profiler.add_time("similarity", time.perf_counter() - start)
+                profiler.count("candidates_examined", len(genotypes_ids))
+                profiler.count("pairs_7_plus", len(candidates_to_iterate))
 
             for geno_candidate_id, similarity in candidates_to_iterate:
                 # iterate over all the patients with the genotype
@@ -174,110 +353,82 @@ class DonorsMatching(object):
                     """
 
     def __classes_and_subclasses_from_genotype(self, genotype: HashableArray):
-        subclasses = []
-        classes = [genotype[:ALLELES_IN_CLASS_I], genotype[ALLELES_IN_CLASS_I:]]
-        num_of_alleles_in_class = [ALLELES_IN_CLASS_I, ALLELES_IN_CLASS_II]
+        int_classes, subclasses = classes_and_subclasses_from_genotype(genotype)
 
-        int_classes = [tuple_geno_to_int(tuple(clss)) for clss in classes]
+        # add class -> genotype and subclass -> genotype edges to patients graph
         for clss in int_classes:
             self._patients_graph.add_edge(clss, genotype)
-
-        # class one is considered as 0.
-        # class two is considered as 1.
-        class_options = [0, 1]
-        for class_num in class_options:
-            for k in range(0, num_of_alleles_in_class[class_num]):
-                # set the missing allele to always be the second allele in the locus
-                if k % 2 == 0:
-                    sub = tuple_geno_to_int(classes[class_num][0: k] + ZEROS + classes[class_num][k + 1:])
-                else:
-                    sub = tuple_geno_to_int(classes[class_num][0: k - 1] + ZEROS +
-                                            classes[class_num][k - 1: k] + classes[class_num][k + 1:])
-
-                # missing allele number is the index of the first allele of the locus the missing allele belongs to.
-                # Could be [0, 2, 4, 6, 8]
-                missing_allele_num = ALLELES_IN_CLASS_I * class_num + 2 * (k // 2)
-                subclass = ClassMinusOne(subclass=sub,
-                                         class_num=class_num,
-                                         allele_num=missing_allele_num)
-
-                # add subclass -> genotype edge to patients graph
-                subclasses.append(subclass)
-
-                self._patients_graph.add_edge(subclass, genotype)
+        for subclass in subclasses:
+            self._patients_graph.add_edge(subclass, genotype)
 
         return int_classes, subclasses
 
-    def create_patients_graph(self, f_patients: str):
+    def create_patients_graph(self, f_patients: Union[str, os.PathLike, Iterable[str], ImputationBlock],
+                              deduplicate: bool = False):
         """
         create patients graph. \n
         *takes in consideration that grimm outputs for each patient different genotypes*
+
+        :param f_patients: A path to the imputation file, an iterable of the imputation file's lines,
+        or an in-memory imputation (ImputationBlock).
+        :param deduplicate: A boolean flag for whether to add to the graph only one patient of each group of patients
+        with identical genotypes distribution. The other patients are mapped to it in self.representatives.
         """
+        import networkx as nx
+
         # AMIT - DELETE 'geno_num' from weights, was unnecessary
         self._patients_graph: nx.DiGraph = nx.DiGraph()
-        prob_dict: dict = {}  # {geno: [i, prob]}
-        total_prob: float = 0
-        last_patient: int = -1
         # subclasses: list[ClassMinusOne] = []
         subclasses_by_patient: Dict[int, Set] = {}
         classes_by_patient: Dict[int, Set] = {}
+        representative_by_fingerprint: Dict[str, int] = {}
+
+        patients = iter_patients(f_patients)
+        if self.profiler is not None:
+            patients = self.profiler.timed_patients(patients)
+        for patient_id, genotypes in patients:
+            if deduplicate:
+                fingerprint = patient_fingerprint(genotypes)
+                if fingerprint in representative_by_fingerprint:
+                    self.representatives[patient_id] = representative_by_fingerprint[fingerprint]
+                    continue
+                representative_by_fingerprint[fingerprint] = patient_id
+            self.representatives[patient_id] = patient_id
+
+            prob_dict: dict = {}  # {geno: prob}
+            total_prob: float = 0
+            self.patients[patient_id] = genotypes[0][0].np().tolist()
+            self._genotype_candidates[patient_id] = {}  # AMIT ADD - initialize _genotype_candidates
+            subclasses_by_patient[patient_id] = set()
+            classes_by_patient[patient_id] = set()
+
+            for geno, prob, index in genotypes:
+                # add probabilities to probability dict
+                total_prob += prob
+                if geno not in prob_dict:
+                    prob_dict[geno] = prob
+                else:
+                    prob_dict[geno] += prob
 
-        for line in open(f_patients).readlines():
-            # retrieve all line's parameters
-            line_values = line.strip().split(',')
-            patient_id, geno, prob, index = line_values
-
-            geno = gl_string_to_integers(geno)
-            patient_id = int(patient_id)
-            index = int(index)
-            prob = float(prob)
-
-            # handle new patient appearance in file
-            if index == 0:
-                # set normalized probabilities
-                for HLA, probability in prob_dict.items():
-                    self._patients_graph.edges[HLA, last_patient]['probability'] = probability / total_prob
-
-                # initialize parameters
-                prob_dict = {}
-                total_prob = 0
-                self.patients[patient_id] = geno
-                self._genotype_candidates[patient_id] = {}  # AMIT ADD - initialize _genotype_candidates
-                last_patient = patient_id
-
-                subclasses_by_patient[patient_id] = set()
-                classes_by_patient[patient_id] = set()
-
-            # sort alleles for each HLA-X
-            for x in range(0, 10, 2):
-                geno[x: x + 2] = sorted(geno[x: x + 2])
-
-            geno = HashableArray(geno)
-
-            # add probabilities to probability dict
-            total_prob += prob
-            if geno not in prob_dict:
-                prob_dict[geno] = prob
-            else:
-                prob_dict[geno] += prob
-
-            # add genotype->ID edge
-            self._patients_graph.add_edge(geno, patient_id, probability=0, geno_num=index)
+                # add genotype->ID edge
+                self._patients_graph.add_edge(geno, patient_id, probability=0, geno_num=index)
 
-            # add subclasses alleles
-            classes, subclasses = self.__classes_and_subclasses_from_genotype(geno)
+                # add subclasses alleles
+                classes, subclasses = self.__classes_and_subclasses_from_genotype(geno)
 
-            subclasses_by_patient[patient_id] = subclasses_by_patient[patient_id].union(subclasses)
-            classes_by_patient[patient_id] = classes_by_patient[patient_id].union(classes)
+                subclasses_by_patient[patient_id] = subclasses_by_patient[patient_id].union(subclasses)
+                classes_by_patient[patient_id] = classes_by_patient[patient_id].union(classes)
 
-        # set normalized probabilities to the last patient in the file
-        for HLA, probability in prob_dict.items():
-            self._patients_graph.edges[HLA, last_patient]['probability'] = probability / total_prob
+            # set normalized probabilities
+            for HLA, probability in prob_dict.items():
+                self._patients_graph.edges[HLA, patient_id]['probability'] = probability / total_prob
 
         # return subclasses_by_patient
         return subclasses_by_patient, classes_by_patient
 
     def find_geno_candidates_by_subclasses(self, subclasses):
+        from tqdm import tqdm
+
         for subclass in tqdm(subclasses, desc="finding subclasses matching candidates", disable=not self.verbose):
             if self._graph.in_nodes(subclass.subclass):
                 patient_genos = self._patients_graph.neighbors(subclass)  # The patient's genotypes which might be match
@@ -297,6 +448,8 @@ class DonorsMatching(object):
                                                   allele_range_to_check, matched_alleles)
 
     def find_geno_candidates_by_classes(self, classes):
+        from tqdm import tqdm
+
         for clss in tqdm(classes, desc="finding classes matching candidates", disable=not self.verbose):
             if self._graph.in_nodes(clss):
                 patient_genos = self._patients_graph.neighbors(clss)  # The patient's genotypes which might be match
@@ -371,6 +524,33 @@ class DonorsMatching(object):
 
         """
 
+    def donor_nodes_scores(self, patient: int, mismatch: int) -> Dict[int, float]:
+        """
+        Score the donor nodes of the genotype candidates of a patient with a given number of mismatches.
+        The score of a donor node is the sum of the probabilities multiplication of the patient's genotypes
+        and the donor's genotypes that match them.
+
+        :param patient: patient ID.
+        :param mismatch: number of mismatches. could be 0, 1, 2, 3.
+        :return: {lol ID of a donor node: its score}. The donors of a shared donor node are scored once.
+        """
+        patient_scores = {}
+        # for hla_id in self._patients_graph.neighbors(patient): # AMIT DELETE
+        for hla_id, genotype_matches in self._genotype_candidates[patient].items():  # AMIT ADD
+            for prob, matches in genotype_matches.values():  # AMIT CHANGE
+                # match_info = (probability of patient's genotype, number of matches to patient's genotype)
+                if matches != 10 - mismatch:
+                    continue
+
+                # add the probabilities multiplication of the patient and all the donors that has this genotype
+                # to their matching probabilities.
+                for donor, donor_prob in self.__find_donor_from_geno(hla_id):
+                    if donor in patient_scores:
+                        patient_scores[donor] += prob * donor_prob
+                    else:
+                        patient_scores[donor] = prob * donor_prob
+        return patient_scores
+
     def score_matches(self, mismatch: int, results_df: pd.DataFrame, donors_info: Iterable[str],
                       patient: int, threshold: float, cutof: int,
                       matched: Set[int]) -> Tuple[Set[int], int, pd.DataFrame]:
@@ -391,90 +571,81 @@ class DonorsMatching(object):
         if len(matched) >= cutof:
             return matched, 0, results_df
 
-        # a loop that set the scores for all the matching candidates.
-        patient_scores = {}
-        # for hla_id in self._patients_graph.neighbors(patient): # AMIT DELETE
-        for hla_id, genotype_matches in self._genotype_candidates[patient].items():  # AMIT ADD
-            for prob, matches in genotype_matches.values():  # AMIT CHANGE
-                # match_info = (probability of patient's genotype, number of matches to patient's genotype)
-                if matches != 10 - mismatch:
-                    continue
-
-                # add the probabilities multiplication of the patient and all the donors that has this genotype
-                # to their matching probabilities.
-                for donor in self.__find_donor_from_geno(hla_id):
-                    donor_prob = self._graph.get_edge_data(node1=hla_id, node2=donor, node1_id=True)
-                    if donor in patient_scores:
-                        patient_scores[donor][0] += prob * donor_prob
-                        if donor_prob > patient_scores[donor][2]:
-                            patient_scores[donor][1:] = [hla_id, donor_prob]
-
-                    else:
-                        patient_scores[donor] = [prob * donor_prob, hla_id, donor_prob]
-
-        ids_scores = []
-        count_matches = 0
+        with profile_stage(self.profiler, "scoring"):
+            patient_scores = self.donor_nodes_scores(patient, mismatch)
 
-        # sort matching according to their probability
-        for donor in patient_scores.keys():
-            # do not count or match to an already matched donors.
-            if donor in matched or patient_scores[donor][0] < threshold:
-                continue
+            ids_scores = []
+            count_matches = 0
 
-            count_matches += 1
-            ids_scores.append((donor, patient_scores[donor][0]))
+            # sort matching according to their probability
+            for donor_node, score in patient_scores.items():
+                if score < threshold:
+                    continue
+                for donor in self._graph.donors_of(donor_node):
+                    # do not count or match to an already matched donors.
+                    if donor in matched:
+                        continue
+                    count_matches += 1
+                    ids_scores.append((donor_node, donor, score))
 
-        ids_scores.sort(reverse=True, key=lambda x: x[1])
+            ids_scores.sort(reverse=True, key=lambda x: x[2])
 
         add_donors = {col: [] for col in results_df.columns.values.tolist()}
 
         # write matching donors to results.
-        for donor, score in ids_scores:
-            if len(matched) >= cutof:
-                break
-            matched.add(donor)
-            self.__append_matching_donor(add_donors, donors_info, patient, donor, score * 100, mismatch)
-
-        results_df = pd.concat([results_df, pd.DataFrame(add_donors)], ignore_index=True)
+        matched_before = len(matched)
+        with profile_stage(self.profiler, "enrichment"):
+            node_properties = {}  # the properties of each donor node, which are the same for all its donors
+            for donor_node, donor, score in ids_scores:
+                if len(matched) >= cutof:
+                    break
+                matched.add(donor)
+                if donor_node not in node_properties:
+                    node_properties[donor_node] = self.__donor_node_properties(donor_node, self.patients[patient])
+                append_matching_donor(add_donors, donors_info, patient, donor, score * 100, mismatch,
+                                      node_properties[donor_node])
+
+        with profile_stage(self.profiler, "output"):
+            results_df = pd.concat([results_df, pd.DataFrame(add_donors)], ignore_index=True)
+
+        if self.profiler is not None:
+            self.profiler.count("donor_nodes_scored", len(patient_scores))
+            self.profiler.count("donors_scored", count_matches)
+            self.profiler.count("matches", len(matched) - matched_before)
 
         if self.verbose:
             print_time(f"({mismatch} MMs) Found {count_matches} matches")
 
         return matched, count_matches, results_df # 3433825
 
-    def __append_matching_donor(self, add_donors: Dict, donors_info: Iterable[str],
-                                patient: int, donor: int, match_prob: float, mm_number: int) -> None:
-        """add a donor to the matches dictionary"""
-
-        compare_commons = locuses_match_between_genos(self.patients[patient], self.get_most_common_genotype(donor))
-
-        add_donors["Patient_ID"].append(patient)
-        add_donors["Donor_ID"].append(donor)
-        allele_prob = self.probability_to_allele(don_id=donor, pat_geno=self.patients[patient])
-        add_donors["Match_Probability_A_1"].append(allele_prob[0])
-        add_donors["Match_Probability_A_2"].append(allele_prob[1])
-        add_donors["Match_Probability_B_1"].append(allele_prob[2])
-        add_donors["Match_Probability_B_2"].append(allele_prob[3])
-        add_donors["Match_Probability_C_1"].append(allele_prob[4])
-        add_donors["Match_Probability_C_2"].append(allele_prob[5])
-        add_donors["Match_Probability_DQB1_1"].append(allele_prob[6])
-        add_donors["Match_Probability_DQB1_2"].append(allele_prob[7])
-        add_donors["Match_Probability_DRB1_1"].append(allele_prob[8])
-        add_donors["Match_Probability_DRB1_2"].append(allele_prob[9])
-
-        add_donors["Match_Between_Most_Commons_A"].append(compare_commons[0])
-        add_donors["Match_Between_Most_Commons_B"].append(compare_commons[1])
-        add_donors["Match_Between_Most_Commons_C"].append(compare_commons[2])
-        add_donors["Match_Between_Most_Commons_DQB"].append(compare_commons[3])
-        add_donors["Match_Between_Most_Commons_DRB"].append(compare_commons[4])
-
-        add_donors["Matching_Probability"].append(match_prob)
-        add_donors["Number_Of_Mismatches"].append(mm_number)
-        add_donors["Permissive/Non-Permissive"].append("-")  # TODO: add permissiveness algorithm
-
-        # add the other given fields to the results
-        for field in donors_info:
-            add_donors[field].append(DONORS_DB.loc[donor, field])
+    def __donor_node_properties(self, donor_node: int, pat_geno: Sequence[int]) -> Tuple[List[int], List[float]]:
+        """Takes the lol ID of a donor node and a genotype.
+        Returns the match between the most common genotypes, and the probability of match for each allele."""
+        compare_commons = locuses_match_between_genos(pat_geno,
+                                                      self.get_most_common_genotype(donor_node, search_lol_id=True))
+        return compare_commons, self.probability_to_allele(donor_node, pat_geno, search_lol_id=True)
+
+    def candidates_arrays(self, patient: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns the genotype candidates of a patient as arrays:
+        (candidates' lol IDs, patient's genotype index, patient's genotype probability, similarity)"""
+        rows = [(geno_id, geno_num, prob, similarity)
+                for geno_id, genotype_matches in self._genotype_candidates[patient].items()
+                for geno_num, (prob, similarity) in genotype_matches.items()]
+        geno_ids, geno_nums, probs, similarities = zip(*rows) if rows else ([], [], [], [])
+        return (np.array(geno_ids, dtype=np.uint32), np.array(geno_nums, dtype=np.uint32),
+                np.array(probs, dtype=np.float64), np.array(similarities, dtype=np.uint8))
+
+    def set_candidates_arrays(self, patient: int, genotype: Sequence[int], geno_ids: np.ndarray,
+                              geno_nums: np.ndarray, probs: np.ndarray, similarities: np.ndarray):
+        """Set a patient and its genotype candidates from arrays created by candidates_arrays,
+        so the patient can be scored without searching the graph."""
+        self.patients[patient] = list(genotype)
+        self.representatives[patient] = patient
+        candidates = {}
+        for geno_id, geno_num, prob, similarity in zip(geno_ids.tolist(), geno_nums.tolist(),
+                                                       probs.tolist(), similarities.tolist()):
+            candidates.setdefault(geno_id, {})[geno_num] = (prob, similarity)
+        self._genotype_candidates[patient] = candidates
 
     @property
     def patients_graph(self):
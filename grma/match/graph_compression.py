@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+from grma.match.graph_store import OPTIONAL_ARRAYS
+
+QUANTIZED_WEIGHT_SCALE: int = 65535  # must match lol_graph.pyx
+DEFAULT_CHUNK_EDGES: int = 1 << 22
+MAX_VARINT_BYTES: int = 5  # a uint32 takes at most 5 bytes of 7 bits
+
+
+def varint_lengths(values: np.ndarray) -> np.ndarray:
+    """return the number of bytes of each value in LEB128"""
+    lengths = np.ones(len(values), dtype=np.int64)
+    for k in range(1, MAX_VARINT_BYTES):
+        lengths += values >= (1 << (7 * k))
+    return lengths
+
+
+def varint_encode(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode unsigned values in LEB128 (7 bits in each byte, least significant first,
+    the high bit is set in all the bytes of a value but the last).
+
+    :return: The bytes (uint8), and the number of bytes of each value.
+    """
+    values = np.asarray(values, dtype=np.int64)
+    lengths = varint_lengths(values)
+    begins = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    for k in range(MAX_VARINT_BYTES):
+        has_byte = lengths > k
+        byte = (values[has_byte] >> (7 * k)) & 0x7F
+        byte |= np.where(lengths[has_byte] > k + 1, 0x80, 0)
+        out[begins[has_byte] + k] = byte
+    return out, lengths
+
+
+def _encode_neighbors(index_list: np.ndarray, neighbors_list: np.ndarray,
+                      chunk_edges: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode each neighbors' list as its first neighbor and the gaps between consecutive neighbors, in LEB128.
+    The edges are encoded in chunks of chunk_edges, so a memory-mapped graph is read part by part.
+
+    :return: The byte offset of each node's list (one more than the nodes; uint32, or uint64 when the bytes
+    don't fit in uint32 offsets), and the bytes (uint8).
+    """
+    num_edges = len(neighbors_list)
+    starts = index_list[:-1]
+    neighbors_offsets = np.zeros(len(index_list), dtype=np.uint64)
+    chunks = []
+    total_bytes = 0
+
+    for chunk_start in range(0, num_edges, chunk_edges):
+        chunk_end = min(chunk_start + chunk_edges, num_edges)
+        values = np.asarray(neighbors_list[chunk_start:chunk_end], dtype=np.int64)
+        gaps = values.copy()
+        gaps[1:] -= values[:-1]
+        if chunk_start > 0:
+            gaps[0] -= int(neighbors_list[chunk_start - 1])
+
+        # the first edge of each list is stored as is
+        chunk_nodes = np.arange(np.searchsorted(starts, chunk_start), np.searchsorted(starts, chunk_end))
+        gaps[starts[chunk_nodes] - chunk_start] = values[starts[chunk_nodes] - chunk_start]
+
+        data, lengths = varint_encode(gaps)
+        edge_offsets = np.cumsum(lengths) - lengths
+        neighbors_offsets[chunk_nodes] = total_bytes + edge_offsets[starts[chunk_nodes] - chunk_start]
+        chunks.append(data)
+        total_bytes += len(data)
+
+    # the empty lists at the end
+    neighbors_offsets[np.searchsorted(index_list, num_edges):] = total_bytes
+    if total_bytes <= np.iinfo(np.uint32).max:
+        neighbors_offsets = neighbors_offsets.astype(np.uint32)
+    neighbors_bytes = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.uint8)
+    return neighbors_offsets, neighbors_bytes
+
+
+def quantize_weights(weights: np.ndarray) -> np.ndarray:
+    """quantize weights in [0, 1] to uint16. 0 and 1 are kept exactly."""
+    weights = np.clip(np.asarray(weights, dtype=np.float64), 0., 1.)
+    return np.rint(weights * QUANTIZED_WEIGHT_SCALE).astype(np.uint16)
+
+
+def dequantize_weights(quantized: np.ndarray) -> np.ndarray:
+    """the weights of quantized weights, as float32 (the same values CompressedLolGraph returns)"""
+    return np.asarray(quantized).astype(np.float32) / np.float32(QUANTIZED_WEIGHT_SCALE)
+
+
+def compress_lol(lol_properties: dict, quantize: bool = False, chunk_edges: int = DEFAULT_CHUNK_EDGES) -> dict:
+    """
+    Create the compressed LOL dict-representation of a graph, which is queried by CompressedLolGraph.
+    - neighbors_list is replaced by the neighbors' lists in delta + varint encoding
+      (neighbors_offsets and neighbors_bytes). The edges keep their positions in index_list.
+    - weights_list is replaced by donor_weights, the weights of the genotypes' edges only
+      (the other edges have no weights), as float32 or quantized to uint16.
+    - The second degree count of each subclass (the first weight of the subclass) is kept in degrees_2nd.
+
+    :param lol_properties: The LOL dict-representation of the graph. Its donors' edges must be stored once
+    (see LolBuilder._transpose_donors). Graphs built before that should be rebuilt.
+    :param quantize: A boolean flag for whether to quantize the weights to 16 bits. default is False (lossless).
+    :param chunk_edges: Number of edges that are encoded at once.
+    """
+    if lol_properties.get("compressed"):
+        return lol_properties
+    if "donor_edges" not in lol_properties:
+        raise ValueError("Only a graph that stores each donor's edge once can be compressed. Rebuild the graph.")
+
+    index_list = np.asarray(lol_properties["index_list"], dtype=np.int64)
+    weights_list = lol_properties["weights_list"]
+    arrays_start = int(lol_properties["arrays_start"])
+    subclasses_start = len(lol_properties["map_number_to_num_node"])
+    classes_start = arrays_start + len(lol_properties["map_number_to_arr_node"])
+
+    neighbors_offsets, neighbors_bytes = _encode_neighbors(index_list, lol_properties["neighbors_list"],
+                                                           chunk_edges)
+    donor_weights = np.asarray(weights_list[index_list[arrays_start]: index_list[classes_start]], dtype=np.float32)
+    if quantize:
+        donor_weights = quantize_weights(donor_weights)
+
+    degrees_2nd = np.zeros(arrays_start - subclasses_start, dtype=np.uint32)
+    if lol_properties["weighted"]:
+        subclass_starts = index_list[subclasses_start:arrays_start]
+        non_empty = subclass_starts < index_list[subclasses_start + 1: arrays_start + 1]
+        degrees_2nd[non_empty] = np.asarray(weights_list[subclass_starts[non_empty]])
+
+    compressed = {name: lol_properties[name] for name in ("weighted", "directed", "arrays_start", "map_node_to_number",
+                                                          "map_number_to_num_node", "map_number_to_arr_node")
+                  + OPTIONAL_ARRAYS if name in lol_properties}
+    compressed.update(compressed=True,
+                      index_list=np.asarray(lol_properties["index_list"], dtype=np.uint32),
+                      neighbors_offsets=neighbors_offsets,
+                      neighbors_bytes=neighbors_bytes,
+                      donor_weights=donor_weights,
+                      degrees_2nd=degrees_2nd)
+    return compressed
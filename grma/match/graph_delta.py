@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import hashlib
+from os import PathLike
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+from grma.match.donors_matching import classes_and_subclasses_from_genotype
+from grma.utilities.geno_representation import HashableArray
+from grma.utilities.imputation_reader import ImputationBlock, parse_imputation_lines, read_imputation_file
+from grma.utilities.utils import tuple_geno_to_int
+
+
+class DonorsDelta(object):
+    """
+    A change to the donors of a graph: donors that were added or re-imputed (their new imputation),
+    and donors that were removed.
+    A re-imputed donor replaces all the genotypes the donor had in the graph.
+    """
+    __slots__ = "added", "removed"
+
+    def __init__(self, added: Union[ImputationBlock, None] = None, removed: Iterable[int] = ()):
+        """
+        :param added: The imputation lines of the added and re-imputed donors.
+        :param removed: The IDs of the removed donors.
+        """
+        self.added = added if added is not None else parse_imputation_lines(b"")
+        self.removed = np.unique(np.fromiter(removed, dtype=np.int64))
+
+    @classmethod
+    def from_files(cls, added_path: Union[str, PathLike, None] = None,
+                   removed_path: Union[str, PathLike, None] = None) -> DonorsDelta:
+        """
+        :param added_path: An imputation file (text, compressed or binary) of the added and re-imputed donors.
+        :param removed_path: A text file with the ID of a removed donor in each line.
+        """
+        added = None
+        if added_path is not None:
+            blocks = list(read_imputation_file(added_path))
+            added = ImputationBlock(*(np.concatenate(arrays) for arrays in zip(*blocks))) if blocks else None
+
+        removed = []
+        if removed_path is not None:
+            with open(removed_path) as f:
+                removed = [int(line) for line in f if line.strip()]
+        return cls(added, removed)
+
+    def iter_added_donors(self) -> Iterator[Tuple[int, Dict[HashableArray, float]]]:
+        """
+        Yields (donor ID, {genotype: probability}) for the added donors, with the probabilities normalized
+        the same way as in BuildMatchingGraph.
+        """
+        donor_id, probability_dict, total_probability = None, {}, 0.
+        for line_donor_id, geno, probability, index in zip(self.added.ids.tolist(), self.added.genotypes,
+                                                           self.added.probabilities.tolist(),
+                                                           self.added.indices.tolist()):
+            if index == 0:
+                if probability_dict:
+                    yield donor_id, {geno: prob / total_probability for geno, prob in probability_dict.items()}
+                donor_id, probability_dict, total_probability = line_donor_id, {}, 0.
+
+            geno = HashableArray(geno)
+            total_probability += probability
+            probability_dict[geno] = probability_dict.get(geno, 0) + probability
+        if probability_dict:
+            yield donor_id, {geno: prob / total_probability for geno, prob in probability_dict.items()}
+
+    @property
+    def content_hash(self) -> str:
+        h = hashlib.blake2b(digest_size=16)
+        for arr in (self.removed, *self.added):
+            h.update(np.ascontiguousarray(arr).data)
+        return h.hexdigest()
+
+    def save(self, path: Union[str, PathLike]):
+        with open(path, "wb") as f:
+            np.savez(f, removed=self.removed, **self.added._asdict())
+
+    @classmethod
+    def load(cls, path: Union[str, PathLike]) -> DonorsDelta:
+        with np.load(path) as data:
+            return cls(ImputationBlock(*(data[field] for field in ImputationBlock._fields)), data["removed"])
+
+
+class GraphOverlay(object):
+    """
+    The changes applied to a donors' graph since it was built, consulted by the Graph's lookups.
+     - Removed (and re-imputed) donors of the graph are tombstoned in a bitmap of their lol IDs.
+       A donor node that is shared by several donors (a profile) is tombstoned when all its donors are removed,
+       until then the removed donors are only dropped from it.
+     - New donors and new genotypes get lol IDs after the last node of the graph.
+     - The new edges (donor <-> genotype) are kept in adjacency dicts, and the new genotypes are listed
+       under their classes and subclasses.
+    """
+    __slots__ = "_num_nodes", "_base_num_nodes", "_removed", "_remaining", "_removed_donors", "_node_ids", \
+        "_values", "_adjacency", "_class_genotypes", "_subclass_genotypes"
+
+    def __init__(self, num_nodes: int, num_donors: int, profile_sizes: Union[np.ndarray, None] = None):
+        """
+        :param num_nodes: Number of nodes in the graph.
+        :param num_donors: Number of donor nodes in the graph (the donors' lol IDs are 0 to num_donors - 1).
+        :param profile_sizes: The number of donors of each donor node. default is None (a donor in each node).
+        """
+        self._base_num_nodes = num_nodes
+        self._num_nodes = num_nodes
+        self._removed = np.zeros(num_donors, dtype=bool)  # tombstones of the graph's donors
+        # the number of donors of each donor node that were not removed
+        self._remaining = np.ones(num_donors, dtype=np.int64) if profile_sizes is None \
+            else np.array(profile_sizes, dtype=np.int64)
+        self._removed_donors = set()  # the IDs of the graph's donors that were removed
+        self._node_ids: Dict[int, int] = {}  # {node value: lol ID} of the new donors and genotypes
+        self._values: Dict[int, Union[int, np.ndarray]] = {}  # {lol ID: node value} of the new nodes
+        self._adjacency: Dict[int, Dict[int, float]] = {}  # {lol ID: {neighbor lol ID: weight}} of the new edges
+        self._class_genotypes: Dict[int, List[int]] = {}  # {class: lol IDs of its new genotypes}
+        self._subclass_genotypes: Dict[int, List[int]] = {}  # {subclass: lol IDs of its classes' new genotypes}
+
+    def is_new(self, node_id: int) -> bool:
+        return node_id >= self._base_num_nodes
+
+    def node_id(self, node) -> Union[int, None]:
+        return self._node_ids.get(node)
+
+    def node_value(self, node_id: int):
+        return self._values[node_id]
+
+    def is_removed(self, node_id: int) -> bool:
+        return node_id < len(self._removed) and bool(self._removed[node_id])
+
+    def is_removed_donor(self, donor: int) -> bool:
+        """return True if the donor was removed from its donor node in the graph"""
+        return donor in self._removed_donors
+
+    def live_mask(self, node_ids: np.ndarray) -> np.ndarray:
+        """return a mask of the nodes that are not tombstoned"""
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        mask = np.ones(len(node_ids), dtype=bool)
+        donors = node_ids < len(self._removed)
+        mask[donors] = ~self._removed[node_ids[donors]]
+        return mask
+
+    def neighbors(self, node_id: int) -> Dict[int, float]:
+        return self._adjacency.get(node_id, {})
+
+    def has_class(self, node: int) -> bool:
+        return node in self._class_genotypes or node in self._subclass_genotypes
+
+    def class_genotypes(self, clss: int) -> List[int]:
+        return self._class_genotypes.get(clss, [])
+
+    def subclass_genotypes(self, sub: int) -> List[int]:
+        return self._subclass_genotypes.get(sub, [])
+
+    def new_donors(self) -> Iterator[int]:
+        """Yields the lol IDs of the new donors"""
+        for node_id, value in self._values.items():
+            if not isinstance(value, np.ndarray):
+                yield node_id
+
+    def _new_node(self, value) -> int:
+        node_id = self._num_nodes
+        self._num_nodes += 1
+        self._values[node_id] = value
+        return node_id
+
+    def _remove_donor(self, graph_donor_id: Union[int, None], donor: int):
+        if graph_donor_id is not None and graph_donor_id < len(self._removed) and donor not in self._removed_donors:
+            self._removed_donors.add(donor)
+            self._remaining[graph_donor_id] -= 1
+            if not self._remaining[graph_donor_id]:
+                self._removed[graph_donor_id] = True
+
+        # a donor that was added by an earlier delta
+        donor_id = self._node_ids.pop(donor, None)
+        if donor_id is not None:
+            for geno_id in self._adjacency.pop(donor_id, {}):
+                del self._adjacency[geno_id][donor_id]
+            del self._values[donor_id]
+
+    def apply(self, delta: DonorsDelta, graph_node_id):
+        """
+        Apply a delta.
+
+        :param delta: The delta.
+        :param graph_node_id: A function that returns the lol ID of a node value in the graph, or None.
+        """
+        added = list(delta.iter_added_donors())
+        for donor in delta.removed.tolist() + [donor for donor, _ in added]:
+            self._remove_donor(graph_node_id(donor), donor)
+
+        for donor, genotypes in added:
+            donor_id = self._node_ids[donor] = self._new_node(donor)
+            donor_edges = self._adjacency[donor_id] = {}
+            for geno, probability in genotypes.items():
+                int_geno = tuple_geno_to_int(geno)
+                geno_id = self._node_ids.get(int_geno)
+                if geno_id is None:
+                    geno_id = graph_node_id(int_geno)
+                if geno_id is None:
+                    geno_id = self._node_ids[int_geno] = self._new_node(geno.np().copy())
+                    self._add_genotype_to_classes(geno, geno_id)
+
+                # the weights are stored as float32, as in the LOL graph
+                weight = float(np.float32(probability))
+                donor_edges[geno_id] = weight
+                self._adjacency.setdefault(geno_id, {})[donor_id] = weight
+
+    def _add_genotype_to_classes(self, geno: HashableArray, geno_id: int):
+        int_classes, subclasses = classes_and_subclasses_from_genotype(geno)
+        for clss in int_classes:
+            self._class_genotypes.setdefault(clss, []).append(geno_id)
+        for sub in {subclass.subclass for subclass in subclasses}:
+            self._subclass_genotypes.setdefault(sub, []).append(geno_id)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from os import PathLike
+from typing import Iterator, Union
+
+from grma.match.graph_wrapper import Graph
+from grma.utilities.utils import print_time
+
+
+class GraphSnapshot(object):
+    """
+    A version of the donors' graph in a GraphHandle. The searches that acquired the snapshot keep it alive
+    after it is replaced, and the graph is released when the last of them is done.
+    """
+    __slots__ = "graph", "version", "generation", "_in_flight", "_retired", "_condition"
+
+    def __init__(self, graph: Graph, version: str, generation: int):
+        self.graph = graph
+        self.version = version
+        self.generation = generation
+        self._in_flight = 0
+        self._retired = False
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Number of searches that use the snapshot"""
+        return self._in_flight
+
+    @property
+    def retired(self) -> bool:
+        """Whether the snapshot was replaced by a newer version"""
+        return self._retired
+
+    def _enter(self):
+        with self._condition:
+            self._in_flight += 1
+
+    def _exit(self):
+        with self._condition:
+            self._in_flight -= 1
+            if self._retired and self._in_flight == 0:
+                self._release()
+
+    def _retire(self):
+        with self._condition:
+            self._retired = True
+            if self._in_flight == 0:
+                self._release()
+
+    def _release(self):
+        self.graph = None  # drop the arrays (and their memory maps) once nothing uses them
+        self._condition.notify_all()
+
+    def wait_drained(self, timeout: Union[float, None] = None) -> bool:
+        """
+        Wait until the snapshot is retired and its in-flight searches are done.
+
+        :param timeout: Maximum time (in seconds) to wait. default is None (no limit).
+        :return: Whether the snapshot was drained.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._retired and self._in_flight == 0, timeout)
+
+    def __repr__(self):
+        return f"GraphSnapshot(version={self.version!r}, generation={self.generation}, in_flight={self._in_flight})"
+
+
+class GraphHandle(object):
+    """
+    A versioned handle to the donors' graph, so a long-running process can move to a rebuilt graph without
+    restarting. A new graph is loaded in the background (see load_in_background) and swapped in atomically:
+    the searches that start after the swap use the new graph, the searches in flight finish with the old one,
+    and the old graph is released when they are done.
+    find_matches accepts a GraphHandle in place of a Graph, and adds a 'Graph_Version' column to the results.
+
+    >>> handle = GraphHandle.from_path("./data/donors_graph_1019")
+    >>> results = find_matches(PATH_TO_PATIENTS_FILE, handle)
+    >>> handle.load_in_background("./data/donors_graph_1020").result()
+    """
+    __slots__ = "_current", "_lock", "_generations", "_verbose"
+
+    def __init__(self, graph: Graph, version: Union[str, None] = None, verbose: bool = False):
+        """
+        :param graph: The donors' graph.
+        :param version: The version of the graph. default is the graph's content hash.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        self._lock = threading.Lock()
+        self._verbose = verbose
+        self._generations = 1
+        self._current = GraphSnapshot(graph, version if version is not None else graph.content_hash, 1)
+
+    @classmethod
+    def from_path(cls, path: Union[str, PathLike], version: Union[str, None] = None, mmap: bool = True,
+                  verbose: bool = False) -> GraphHandle:
+        """
+        :param path: A graph directory (see Graph.to_directory) or a graph pickle.
+        :param version: The version of the graph. default is the graph's content hash.
+        :param mmap: A boolean flag for whether to memory-map a graph directory's arrays. default is True.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        return cls(load_graph(path, mmap), version, verbose)
+
+    @property
+    def current(self) -> GraphSnapshot:
+        """The snapshot that new searches use"""
+        return self._current
+
+    @property
+    def version(self) -> str:
+        """The version of the graph that new searches use"""
+        return self._current.version
+
+    @contextmanager
+    def acquire(self) -> Iterator[GraphSnapshot]:
+        """
+        Pin the current snapshot for a search. The snapshot's graph is kept until the search is done,
+        even if a new graph is swapped in meanwhile.
+        """
+        with self._lock:
+            snapshot = self._current
+            snapshot._enter()
+        try:
+            yield snapshot
+        finally:
+            snapshot._exit()
+
+    def swap(self, graph: Graph, version: Union[str, None] = None) -> GraphSnapshot:
+        """
+        Switch the new searches to another graph. The searches in flight are not interrupted.
+
+        :param graph: The new donors' graph.
+        :param version: The version of the new graph. default is the graph's content hash.
+        :return: The replaced snapshot (see GraphSnapshot.wait_drained).
+        """
+        snapshot = GraphSnapshot(graph, version if version is not None else graph.content_hash, 0)
+        with self._lock:
+            self._generations += 1
+            snapshot.generation = self._generations
+            old, self._current = self._current, snapshot
+        old._retire()
+        if self._verbose:
+            print_time(f"Swapped graph version {old.version} ({old.in_flight} searches in flight) "
+                       f"for {snapshot.version}")
+        return old
+
+    def load_in_background(self, path: Union[str, PathLike], version: Union[str, None] = None,
+                           mmap: bool = True) -> Future:
+        """
+        Load a graph in a background thread and swap it in when it is loaded.
+        The current graph is searched as usual while the new one is loaded.
+
+        :param path: A graph directory (see Graph.to_directory) or a graph pickle.
+        :param version: The version of the new graph. default is the graph's content hash.
+        :param mmap: A boolean flag for whether to memory-map a graph directory's arrays. default is True.
+        :return: A future of the replaced snapshot.
+        """
+        def load_and_swap() -> GraphSnapshot:
+            if self._verbose:
+                print_time(f"Loading a new graph from {path}")
+            return self.swap(load_graph(path, mmap), version)
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grma-graph-load")
+        future = executor.submit(load_and_swap)
+        executor.shutdown(wait=False)
+        return future
+
+
+def load_graph(path: Union[str, PathLike], mmap: bool = True) -> Graph:
+    """Load a graph from a graph directory (see Graph.to_directory) or a graph pickle"""
+    if os.path.isdir(path):
+        return Graph.from_directory(path, mmap=mmap)
+    return Graph.from_pickle(path)
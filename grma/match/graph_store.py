@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import operator
+import os
+from os import PathLike
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import numpy as np
+
+LOL_ARRAYS = ("index_list", "neighbors_list", "weights_list", "map_number_to_num_node", "map_number_to_arr_node")
+# The donors' edges as positions in the genotypes' lists (see LolBuilder._transpose_donors).
+# Graphs that were built before store the donors' edges in the LOL arrays, and don't have them.
+DONOR_ARRAYS = ("donor_index_list", "donor_edges")
+# The donors of the donor nodes that are shared by several donors (see LolBuilder._add_profiles).
+# A graph without shared donor nodes doesn't have them.
+PROFILE_ARRAYS = ("profile_index_list", "profile_members")
+OPTIONAL_ARRAYS = DONOR_ARRAYS + PROFILE_ARRAYS
+# The arrays of a compressed graph (see grma.match.graph_compression), instead of LOL_ARRAYS.
+COMPRESSED_LOL_ARRAYS = ("index_list", "neighbors_offsets", "neighbors_bytes", "donor_weights", "degrees_2nd",
+                         "map_number_to_num_node", "map_number_to_arr_node")
+META_FILE = "meta.json"
+NODE_KEYS_FILE = "node_keys.npy"
+NODE_VALUES_FILE = "node_values.npy"
+DELTA_FILE_FORMAT = "delta_{:06d}.npz"  # the donors' deltas applied to the graph (see Graph.apply_delta)
+
+# The widest node value is a genotype: 10 alleles * 4 digits = 40 digits < 2 ** 136
+NODE_KEY_BYTES: int = 17
+
+
+class NodeIndex(object):
+    """
+    A read-only mapping from node value to its lol ID.
+    It is backed by two sorted arrays (fixed width big-endian keys and uint32 values),
+    so it can be memory-mapped from disk and shared between processes without unpickling.
+    """
+    __slots__ = "_keys", "_values"
+
+    def __init__(self, keys: np.ndarray, values: np.ndarray):
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, map_node_to_number: Dict[int, int]) -> NodeIndex:
+        items = sorted(map_node_to_number.items())
+        keys = np.frombuffer(b"".join(int(node).to_bytes(NODE_KEY_BYTES, "big") for node, _ in items),
+                             dtype=f"S{NODE_KEY_BYTES}")
+        values = np.fromiter((number for _, number in items), dtype=np.uint32, count=len(items))
+        return cls(keys, values)
+
+    @staticmethod
+    def encode_nodes(nodes: Iterable[int]) -> np.ndarray:
+        """return the keys of nodes (unsorted)"""
+        return np.frombuffer(b"".join(int(node).to_bytes(NODE_KEY_BYTES, "big") for node in nodes),
+                             dtype=f"S{NODE_KEY_BYTES}")
+
+    @classmethod
+    def from_keys(cls, keys: np.ndarray, values: np.ndarray) -> NodeIndex:
+        """create an index from the (unsorted) keys of the nodes (see encode_nodes) and their lol IDs"""
+        order = np.argsort(keys, kind="stable")
+        return cls(keys[order], np.asarray(values, dtype=np.uint32)[order])
+
+    @staticmethod
+    def _encode(node) -> Union[bytes, None]:
+        try:
+            return operator.index(node).to_bytes(NODE_KEY_BYTES, "big")
+        except (TypeError, OverflowError):
+            return None
+
+    def _position(self, node) -> int:
+        """return the position of the node in the keys array, -1 if it's not in the index"""
+        key = self._encode(node)
+        if key is None:
+            return -1
+        i = int(np.searchsorted(self._keys, key))
+        # numpy strips trailing null bytes when an element is read back.
+        if i < len(self._keys) and self._keys[i] == key.rstrip(b"\x00"):
+            return i
+        return -1
+
+    def __contains__(self, node) -> bool:
+        return self._position(node) != -1
+
+    def __getitem__(self, node) -> int:
+        i = self._position(node)
+        if i == -1:
+            raise KeyError(node)
+        return int(self._values[i])
+
+    def get(self, node, default=None):
+        i = self._position(node)
+        return default if i == -1 else int(self._values[i])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in self._keys:
+            yield int.from_bytes(key.ljust(NODE_KEY_BYTES, b"\x00"), "big")
+
+    def keys(self) -> Iterator[int]:
+        return iter(self)
+
+    def items(self) -> Iterator[Tuple[int, int]]:
+        return zip(iter(self), (int(v) for v in self._values))
+
+    @property
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self._keys, self._values
+
+
+def lol_array_names(lol_properties: dict) -> Tuple[str, ...]:
+    """return the names of the LOL arrays of a graph (compressed or not)"""
+    return COMPRESSED_LOL_ARRAYS if lol_properties.get("compressed") else LOL_ARRAYS
+
+
+def graph_content_hash(lol_properties: dict) -> str:
+    """
+    A hash of the graph's content (its arrays and its nodes' map).
+    It is stored with the graph by the builder, and it identifies the graph version, e.g. for cached results.
+    """
+    if lol_properties.get("content_hash"):
+        return lol_properties["content_hash"]
+
+    h = hashlib.blake2b(digest_size=16)
+    header = [int(lol_properties["arrays_start"]), bool(lol_properties["directed"]), bool(lol_properties["weighted"])]
+    if lol_properties.get("compressed"):
+        header.append("compressed")
+    h.update(json.dumps(header).encode())
+    node_index = lol_properties["map_node_to_number"]
+    if not isinstance(node_index, NodeIndex):
+        node_index = NodeIndex.from_dict(node_index)
+    arrays = [lol_properties[name] for name in lol_array_names(lol_properties) + OPTIONAL_ARRAYS
+              if name in lol_properties]
+    for arr in arrays + list(node_index.arrays):
+        arr = np.ascontiguousarray(arr)
+        h.update(str(arr.dtype).encode())
+        h.update(arr.data)
+    return h.hexdigest()
+
+
+def save_graph_directory(lol_properties: dict, path: Union[str, PathLike]):
+    """
+    Save the LOL dict-representation of a graph as a directory of .npy files.
+
+    :param lol_properties: The LOL dict-representation created by LolBuilder.
+    :param path: A path to the directory. It will be created if it does not exist.
+    """
+    os.makedirs(path, exist_ok=True)
+    for name in dict.fromkeys(LOL_ARRAYS + COMPRESSED_LOL_ARRAYS + OPTIONAL_ARRAYS):
+        if name in lol_properties:
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(lol_properties[name]))
+        elif os.path.isfile(os.path.join(path, f"{name}.npy")):
+            os.remove(os.path.join(path, f"{name}.npy"))
+
+    node_index = lol_properties["map_node_to_number"]
+    if not isinstance(node_index, NodeIndex):
+        node_index = NodeIndex.from_dict(node_index)
+    keys, values = node_index.arrays
+    np.save(os.path.join(path, NODE_KEYS_FILE), keys)
+    np.save(os.path.join(path, NODE_VALUES_FILE), values)
+    save_graph_meta(lol_properties, path)
+
+
+def save_graph_meta(lol_properties: dict, path: Union[str, PathLike]):
+    """
+    Save the meta file of a graph directory. It is written last, so a directory without it is not a graph directory.
+
+    :param lol_properties: The LOL dict-representation of the graph.
+    :param path: A path to the graph directory.
+    """
+    meta = {"arrays_start": int(lol_properties["arrays_start"]),
+            "directed": bool(lol_properties["directed"]),
+            "weighted": bool(lol_properties["weighted"]),
+            "compressed": bool(lol_properties.get("compressed", False)),
+            "content_hash": graph_content_hash(lol_properties)}
+    with open(os.path.join(path, META_FILE), "w") as f:
+        json.dump(meta, f)
+
+
+def load_graph_directory(path: Union[str, PathLike], mmap: bool = True) -> dict:
+    """
+    Load a graph directory that was saved by save_graph_directory.
+
+    :param path: A path to the graph directory.
+    :param mmap: A boolean flag for whether to memory-map the arrays instead of reading them into memory.
+    The arrays are mapped copy-on-write, so all the processes that map the same directory share its pages.
+    :return: The LOL dict-representation of the graph.
+    """
+    if not os.path.isfile(os.path.join(path, META_FILE)):
+        raise FileNotFoundError(f"Can't find a graph directory in {path}.")
+
+    mmap_mode = "c" if mmap else None
+    with open(os.path.join(path, META_FILE)) as f:
+        lol_properties = json.load(f)
+
+    for name in lol_array_names(lol_properties):
+        lol_properties[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+    for name in OPTIONAL_ARRAYS:
+        if os.path.isfile(os.path.join(path, f"{name}.npy")):
+            lol_properties[name] = np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+    lol_properties["map_node_to_number"] = NodeIndex(np.load(os.path.join(path, NODE_KEYS_FILE), mmap_mode=mmap_mode),
+                                                     np.load(os.path.join(path, NODE_VALUES_FILE), mmap_mode=mmap_mode))
+    return lol_properties
+
+
+def list_directory_deltas(path: Union[str, PathLike]) -> List[str]:
+    """return the paths of the deltas saved in a graph directory, in the order they were applied"""
+    paths = []
+    while os.path.isfile(os.path.join(path, DELTA_FILE_FORMAT.format(len(paths)))):
+        paths.append(os.path.join(path, DELTA_FILE_FORMAT.format(len(paths))))
+    return paths
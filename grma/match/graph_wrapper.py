@@ -1,24 +1,53 @@
 from __future__ import annotations
 
+import copy
+import hashlib
+import os
 import pickle
+from concurrent.futures import Future, ThreadPoolExecutor
 from os import PathLike
-from typing import Union
+from typing import Dict, Iterator, List, Tuple, Union
 
 import numpy as np
 
 from grma.utilities.geno_representation import HashableArray
-from grma.match.lol_graph import LolGraph
+from grma.match.graph_store import save_graph_directory, load_graph_directory, graph_content_hash, \
+    list_directory_deltas, DELTA_FILE_FORMAT
+from grma.match.graph_compression import compress_lol, dequantize_weights
+from grma.match.lol_graph import LolGraph, CompressedLolGraph
 
 NODES_TYPES = Union[int, HashableArray]
 
 
 class Graph(object):
-    """Graph wrapper class for LOLGraph"""
-    __slots__ = "_map_node_to_number", "_graph"
+    """
+    Graph wrapper class for LOLGraph (or CompressedLolGraph, for a compressed graph).
+    Donors' deltas applied to the graph (see apply_delta) are kept in an overlay that is consulted by the lookups.
+    """
+    __slots__ = "_map_node_to_number", "_graph", "_lol_properties", "_directory", "_overlay", "_deltas", \
+        "_saved_deltas"
 
     def __init__(self, lol_properties: dict):
+        self._lol_properties = lol_properties
+        self._directory = None  # set when the graph is memory-mapped from a graph directory
+        self._overlay = None  # GraphOverlay, set when a delta is applied
+        self._deltas = []  # the applied deltas
+        self._saved_deltas = 0  # number of applied deltas that are saved in the graph directory
         self._map_node_to_number = lol_properties["map_node_to_number"]
 
+        if lol_properties.get("compressed"):
+            self._graph = CompressedLolGraph(index_list=lol_properties["index_list"],
+                                             neighbors_offsets=lol_properties["neighbors_offsets"],
+                                             neighbors_bytes=lol_properties["neighbors_bytes"],
+                                             donor_weights=lol_properties["donor_weights"],
+                                             degrees_2nd=lol_properties["degrees_2nd"],
+                                             map_number_to_num_node=lol_properties["map_number_to_num_node"],
+                                             map_number_to_arr_node=lol_properties["map_number_to_arr_node"],
+                                             arrays_start=lol_properties["arrays_start"],
+                                             directed=lol_properties["directed"],
+                                             weighted=lol_properties["weighted"])
+            return
+
         self._graph = LolGraph(index_list=lol_properties["index_list"],
                                neighbors_list=lol_properties["neighbors_list"],
                                weights_list=lol_properties["weights_list"],
@@ -28,13 +57,78 @@ class Graph(object):
                                directed=lol_properties["directed"],
                                weighted=lol_properties["weighted"])
 
+    def _node_number(self, node: NODES_TYPES) -> Union[int, None]:
+        """return the lol ID of a node, None if it is not in the graph"""
+        if self._overlay is None:
+            return self._map_node_to_number.get(node, None)
+
+        node_num = self._overlay.node_id(node)
+        if node_num is None:
+            node_num = self._map_node_to_number.get(node, None)
+            if node_num is not None and (self._overlay.is_removed(node_num) or (
+                    self._is_donor_node(node_num) and self._overlay.is_removed_donor(node))):
+                return None
+        return node_num
+
+    def _is_donor_node(self, node_num: int) -> bool:
+        """return True if the lol ID is of a donor node of the graph (which might be shared by several donors)"""
+        return node_num < len(self._lol_properties["map_number_to_num_node"])
+
+    def _lol_id(self, node: NODES_TYPES | int, search_lol_id: bool) -> int:
+        """return the lol ID of a node, raise KeyError if it is not in the graph"""
+        if search_lol_id:
+            return node
+        if self._overlay is None:
+            return self._map_node_to_number[node]
+        node_num = self._node_number(node)
+        if node_num is None:
+            raise KeyError(node)
+        return node_num
+
+    def _is_transposed_donor(self, node_num: int) -> bool:
+        """
+        return True if the node is a donor whose edges are stored only in its genotypes' lists
+        (see LolBuilder._transpose_donors)
+        """
+        return "donor_edges" in self._lol_properties and node_num < len(self._lol_properties["donor_index_list"]) - 1
+
+    def _donor_neighbors(self, node_num: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        return the genotypes' lol IDs and weights of a donor, from the positions of the donor's edges
+        in the genotypes' lists.
+        """
+        donor_index_list = self._lol_properties["donor_index_list"]
+        positions = self._lol_properties["donor_edges"][donor_index_list[node_num]: donor_index_list[node_num + 1]]
+        geno_ids = np.searchsorted(self._lol_properties["index_list"], positions, side="right") - 1
+        return geno_ids.astype(np.uint32), self._edges_weights(positions)
+
+    def _edges_weights(self, positions: np.ndarray) -> np.ndarray:
+        """return the weights of the edges in the given positions of index_list"""
+        if not self._lol_properties.get("compressed"):
+            return np.asarray(self._lol_properties["weights_list"][positions])
+
+        # a compressed graph keeps the weights of the genotypes' edges only (the donors' edges are among them)
+        donor_weights = self._lol_properties["donor_weights"]
+        weights = donor_weights[positions - self._lol_properties["index_list"][self._graph.array_start]]
+        return dequantize_weights(weights) if donor_weights.dtype == np.uint16 else np.asarray(weights)
+
+    def _base_neighbors(self, node_num: int) -> Tuple[np.ndarray, Union[np.ndarray, None]]:
+        """return the lol IDs of the neighbors of a node in the LOL graph and their weights (None if unweighted)"""
+        if self._is_transposed_donor(node_num):
+            return self._donor_neighbors(node_num)
+        if self._graph.is_weighted():
+            return self._graph.neighbors_weighted(node_num)
+        return self._graph.neighbors_unweighted(node_num), None
+
     def in_nodes(self, node: NODES_TYPES) -> bool:
         """return True if the given node is in the graph and false otherwise"""
-        return node in self._map_node_to_number
+        if self._overlay is None:
+            return node in self._map_node_to_number
+        return self._node_number(node) is not None or self._overlay.has_class(node)
 
     def get_node_id(self, node: NODES_TYPES) -> bool:
         """return True if the given node is in the graph and false otherwise"""
-        return self._map_node_to_number.get(node, None)
+        return self._node_number(node)
 
     def get_edge_data(self, node1: NODES_TYPES, node2: NODES_TYPES,
                       node1_id: bool = False, node2_id: bool = False, default: object = None):
@@ -43,22 +137,69 @@ class Graph(object):
         """
 
         exception_val = -1
-        node1_num = self._map_node_to_number[node1] if not node1_id else node1
+        node1_num = self._lol_id(node1, node1_id)
 
-        node2_num = self._map_node_to_number[node2] if not node2_id else node2
+        node2_num = self._lol_id(node2, node2_id)
+        if self._overlay is not None:
+            if self._overlay.is_removed(node1_num) or self._overlay.is_removed(node2_num):
+                return default
+            weight = self._overlay.neighbors(node1_num).get(node2_num)
+            if weight is not None:
+                return weight
+            if self._overlay.is_new(node1_num) or self._overlay.is_new(node2_num):
+                return default
+
+        if self._is_transposed_donor(node1_num):
+            # the donor<->genotype edges are stored in the genotype's list
+            node1_num, node2_num = node2_num, node1_num
         ret = self._graph.get_edge_data(node1_num, node2_num)
         return default if ret == exception_val else ret
 
     def class_neighbors(self, node: NODES_TYPES | int, search_lol_id: bool = False):
-        node_num = self._map_node_to_number[node] if not search_lol_id else node
-        neighbors_list = self._graph.neighbors_unweighted(node_num)
+        if self._overlay is not None and not search_lol_id and node not in self._map_node_to_number:
+            neighbors_list = np.zeros(0, dtype=np.uint32)  # a class of new genotypes only
+        else:
+            node_num = self._map_node_to_number[node] if not search_lol_id else node
+            neighbors_list = self._graph.neighbors_unweighted(node_num)
 
         neighbors_list_values = np.ndarray([len(neighbors_list), 10], dtype=np.uint16)
         for i, neighbor in enumerate(neighbors_list):
             neighbors_list_values[i, :] = self._graph.arr_node_value_from_id(neighbor)
 
+        if self._overlay is not None and not search_lol_id:
+            return self._add_new_genotypes(neighbors_list, neighbors_list_values, self._overlay.class_genotypes(node))
         return neighbors_list, neighbors_list_values
 
+    def _add_new_genotypes(self, ids: np.ndarray, values: np.ndarray, new_genotypes) -> Tuple[np.ndarray, np.ndarray]:
+        """append genotypes from the overlay to genotypes of the graph (ids and values)"""
+        if not new_genotypes:
+            return ids, values
+        new_values = np.array([self._overlay.node_value(geno_id) for geno_id in new_genotypes], dtype=np.uint16)
+        return (np.concatenate([ids, np.array(new_genotypes, dtype=np.uint32)]),
+                np.concatenate([values, new_values]))
+
+    def _neighbors_ids(self, node_num: int) -> Tuple[np.ndarray, Union[np.ndarray, None]]:
+        """return the lol IDs of the neighbors of a node and their weights (None if the graph is unweighted)"""
+        if self._overlay is not None and (self._overlay.is_new(node_num) or self._overlay.is_removed(node_num)):
+            neighbors_list, weights_list = np.zeros(0, dtype=np.uint32), np.zeros(0, dtype=np.float32)
+        else:
+            neighbors_list, weights_list = self._base_neighbors(node_num)
+
+        if self._overlay is not None:
+            # drop the tombstoned donors, and add the new edges
+            live = self._overlay.live_mask(neighbors_list)
+            new_edges = self._overlay.neighbors(node_num)
+            neighbors_list = np.concatenate([neighbors_list[live], np.fromiter(new_edges.keys(), dtype=np.uint32)])
+            if weights_list is not None:
+                weights_list = np.concatenate([weights_list[live], np.fromiter(new_edges.values(), dtype=np.float32)])
+        return neighbors_list, weights_list
+
+    def neighbors_ids(self, node_id: int) -> Tuple[np.ndarray, Union[np.ndarray, None]]:
+        """return the lol IDs of the neighbors of a node (by its lol ID), and their weights (None if unweighted)"""
+        if self._overlay is None:
+            return self._base_neighbors(node_id)
+        return self._neighbors_ids(node_id)
+
     def neighbors_unweighted(self, node: NODES_TYPES | int, search_lol_id: bool = False):
         """
         Get node's neighbors. There are some options for what to get (see parameters).
@@ -66,12 +207,18 @@ class Graph(object):
          - Search node by its lol ID: search_lol_id=True
         :return: tuple of lists: (neighbor's IDs, neighbor's values, weights)
         """
-        node_num = self._map_node_to_number[node] if not search_lol_id else node
-        neighbors_list = self._graph.neighbors_unweighted(node_num)
+        node_num = self._lol_id(node, search_lol_id)
+        if self._overlay is None:
+            neighbors_list, _ = self._base_neighbors(node_num)
+        else:
+            neighbors_list, _ = self._neighbors_ids(node_num)
 
         neighbors_list_values = [0] * len(neighbors_list)
         for i, neighbor in enumerate(neighbors_list):
-            neighbors_list_values[i] = self._graph.arr_node_value_from_id(neighbor)
+            if self._overlay is not None and self._overlay.is_new(neighbor):
+                neighbors_list_values[i] = self._overlay.node_value(neighbor)
+            else:
+                neighbors_list_values[i] = self._graph.arr_node_value_from_id(neighbor)
 
         return neighbors_list, neighbors_list_values
 
@@ -82,11 +229,11 @@ class Graph(object):
          - Search node by its lol ID: search_lol_id=True
         :return: tuple of lists: (neighbor's IDs, neighbor's values, weights)
         """
-        node_num = self._map_node_to_number[node] if not search_lol_id else node
-        if self._graph.is_weighted():
-            neighbors_list, weights_list = self._graph.neighbors_weighted(node_num)
+        node_num = self._lol_id(node, search_lol_id)
+        if self._overlay is not None:
+            neighbors_list, weights_list = self._neighbors_ids(node_num)
         else:
-            neighbors_list = self._graph.neighbors_unweighted(node_num)
+            neighbors_list, weights_list = self._base_neighbors(node_num)
 
         neighbors_list_values = [0] * len(neighbors_list)
         for i, neighbor in enumerate(neighbors_list):
@@ -97,17 +244,220 @@ class Graph(object):
         return neighbors_list_values
 
     def neighbors_2nd(self, node):
-        node_num = self._map_node_to_number[node]
-        r0, r1 = self._graph.neighbors_2nd(node_num)
-        return r0[:-1], r1
+        if self._overlay is None:
+            node_num = self._map_node_to_number[node]
+            return self._graph.neighbors_2nd(node_num)
+
+        if node in self._map_node_to_number:
+            r0, r1 = self._graph.neighbors_2nd(self._map_node_to_number[node])
+        else:  # a subclass of new genotypes only
+            r0, r1 = np.zeros(0, dtype=np.uint32), np.zeros((0, 10), dtype=np.uint16)
+        return self._add_new_genotypes(r0, r1, self._overlay.subclass_genotypes(node))
+
+    def degree(self, node: NODES_TYPES | int, search_lol_id: bool = False) -> int:
+        """
+        return the number of neighbors of a node, 0 if the node is not in the graph.
+        With applied deltas, tombstoned donors are still counted (it is used as an estimation).
+        """
+        node_num = self._map_node_to_number.get(node) if not search_lol_id else node
+        degree = 0
+        if node_num is not None and (self._overlay is None or not self._overlay.is_new(node_num)):
+            index_list = self._lol_properties["donor_index_list"] if self._is_transposed_donor(node_num) \
+                else self._lol_properties["index_list"]
+            degree = int(index_list[node_num + 1] - index_list[node_num])
+
+        if self._overlay is not None:
+            if not search_lol_id:
+                node_num = self._node_number(node)
+                degree += len(self._overlay.class_genotypes(node))
+            if node_num is not None:
+                degree += len(self._overlay.neighbors(node_num))
+        return degree
+
+    def degree_2nd(self, node: NODES_TYPES) -> int:
+        """
+        return the number of second degree neighbors of a subclass (the genotypes of all its classes),
+        0 if the subclass is not in the graph. The count is stored by the builder in the subclass' first weight
+        (in degrees_2nd, in a compressed graph).
+        """
+        node_num = self._map_node_to_number.get(node)
+        degree = 0
+        if node_num is not None and self._lol_properties.get("compressed"):
+            subclasses_start = len(self._lol_properties["map_number_to_num_node"])
+            degree = int(self._lol_properties["degrees_2nd"][node_num - subclasses_start])
+        elif node_num is not None:
+            degree = int(self._lol_properties["weights_list"][self._lol_properties["index_list"][node_num]])
+        if self._overlay is not None:
+            degree += len(self._overlay.subclass_genotypes(node))
+        return degree
+
+    def donors_of(self, node_id: int) -> List[int]:
+        """
+        return the IDs of the donors of a donor node, by its lol ID.
+        Donors with identical genotypes distributions share a donor node (see BuildMatchingGraph),
+        whose value is the smallest of their IDs.
+        """
+        if self._overlay is not None and self._overlay.is_new(node_id):
+            return [self._overlay.node_value(node_id)]
+        if "profile_members" not in self._lol_properties:
+            donors = [int(self._graph.num_node_value_from_id(node_id))]
+        else:
+            profile_index_list = self._lol_properties["profile_index_list"]
+            donors = self._lol_properties["profile_members"][
+                profile_index_list[node_id]: profile_index_list[node_id + 1]].tolist()
+        if self._overlay is not None:
+            donors = [donor for donor in donors if not self._overlay.is_removed_donor(donor)]
+        return donors
 
     def node_value_from_id(self, node_id: int) -> NODES_TYPES:
         """convert lol ID to node value"""
+        if self._overlay is not None and self._overlay.is_new(node_id):
+            return self._overlay.node_value(node_id)
         if node_id < self._graph.array_start:
             return self._graph.num_node_value_from_id(node_id)
         return self._graph.arr_node_value_from_id(node_id)
 
+    @property
+    def content_hash(self) -> str:
+        """
+        A hash of the graph's content, which changes whenever the graph is rebuilt with different donors
+        or a delta is applied to it.
+        """
+        if not self._lol_properties.get("content_hash"):
+            self._lol_properties["content_hash"] = graph_content_hash(self._lol_properties)
+        if not self._deltas:
+            return self._lol_properties["content_hash"]
+
+        h = hashlib.blake2b(self._lol_properties["content_hash"].encode(), digest_size=16)
+        for delta in self._deltas:
+            h.update(delta.content_hash.encode())
+        return h.hexdigest()
+
+    @property
+    def directory(self) -> Union[str, PathLike, None]:
+        """
+        The graph directory the graph is mapped from, None if the graph was not loaded from a directory
+        or if deltas were applied to it since it was saved.
+        """
+        return self._directory if self._saved_deltas == len(self._deltas) else None
+
+    @property
+    def deltas(self) -> list:
+        """The donors' deltas that were applied to the graph"""
+        return list(self._deltas)
+
+    def apply_delta(self, delta):
+        """
+        Apply a donors' delta (grma.match.graph_delta.DonorsDelta) to the graph, without rebuilding it.
+        The added and re-imputed donors are kept in an overlay, and the removed donors are tombstoned.
+        The cost is proportional to the delta. Use compact to fold the deltas into a new graph.
+        """
+        from grma.match.graph_delta import GraphOverlay
+
+        if self._overlay is None:
+            profile_sizes = np.diff(self._lol_properties["profile_index_list"]) \
+                if "profile_index_list" in self._lol_properties else None
+            self._overlay = GraphOverlay(len(self._lol_properties["index_list"]) - 1,
+                                         len(self._lol_properties["map_number_to_num_node"]), profile_sizes)
+        self._overlay.apply(delta, self._map_node_to_number.get)
+        self._deltas.append(delta)
+
+    def iter_donors(self) -> Iterator[Tuple[int, Dict[HashableArray, float]]]:
+        """Yields (donor ID, {genotype: probability}) for every donor in the graph, including the applied deltas."""
+        num_donors = len(self._lol_properties["map_number_to_num_node"])
+        for node_num in range(num_donors):
+            if self._overlay is not None and self._overlay.is_removed(node_num):
+                continue
+            neighbors_list, weights_list = self._base_neighbors(node_num)
+            probability_dict = {HashableArray(self._graph.arr_node_value_from_id(geno_id)): float(weight)
+                                for geno_id, weight in zip(neighbors_list, weights_list)}
+            for donor in self.donors_of(node_num):
+                yield donor, dict(probability_dict)
+
+        if self._overlay is not None:
+            for node_num in self._overlay.new_donors():
+                yield self._overlay.node_value(node_num), \
+                    {HashableArray(self.node_value_from_id(geno_id)): weight
+                     for geno_id, weight in self._overlay.neighbors(node_num).items()}
+
+    def compact(self, verbose: bool = False) -> Graph:
+        """
+        Fold the applied deltas into new LOL arrays.
+
+        :return: A new graph with the current donors, without an overlay.
+        """
+        from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
+
+        return BuildMatchingGraph.from_donors(self.iter_donors(), verbose=verbose).graph
+
+    def compress(self, quantize: bool = False) -> Graph:
+        """
+        Compress the graph's neighbors' lists (delta + varint) and weights (see grma.match.graph_compression).
+        The compressed graph is queried directly, with the same results. The applied deltas are kept.
+
+        :param quantize: A boolean flag for whether to quantize the weights to 16 bits,
+        which changes the weights by up to 1/131070. default is False (lossless).
+        :return: A new, compressed graph.
+        """
+        graph = Graph(compress_lol(self._lol_properties, quantize=quantize))
+        graph._overlay = copy.deepcopy(self._overlay)
+        graph._deltas = list(self._deltas)
+        return graph
+
+    def compact_in_background(self, verbose: bool = False) -> Future:
+        """
+        Run compact in a background thread. The graph can still be searched while it runs,
+        but no deltas should be applied to it until it is done.
+
+        :return: A future of the new graph.
+        """
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grma-compact")
+        future = executor.submit(self.compact, verbose)
+        executor.shutdown(wait=False)
+        return future
+
+    def to_directory(self, path: Union[str, PathLike]):
+        """
+        Save the graph as a directory of raw arrays, and the applied deltas next to them.
+        Unlike a pickle, a graph directory can be memory-mapped and shared between processes.
+        If the graph was loaded from this directory, only the new deltas are saved.
+
+        :param path: A path to the directory.
+        """
+        if self._directory is not None and os.path.abspath(path) == os.path.abspath(self._directory):
+            start = self._saved_deltas
+        else:
+            save_graph_directory(self._lol_properties, path)
+            for delta_path in list_directory_deltas(path):
+                os.remove(delta_path)
+            start = 0
+
+        for i in range(start, len(self._deltas)):
+            self._deltas[i].save(os.path.join(path, DELTA_FILE_FORMAT.format(i)))
+        if self._directory is not None and os.path.abspath(path) == os.path.abspath(self._directory):
+            self._saved_deltas = len(self._deltas)
+
     @classmethod
     def from_pickle(cls, path: Union[str, PathLike]):
         graph_dict = pickle.load(open(path, "rb"))
         return cls(graph_dict)
+
+    @classmethod
+    def from_directory(cls, path: Union[str, PathLike], mmap: bool = True):
+        """
+        Load a graph saved by Graph.to_directory.
+
+        :param path: A path to the graph directory.
+        :param mmap: A boolean flag for whether to memory-map the graph's arrays. default is True.
+        """
+        graph = cls(load_graph_directory(path, mmap=mmap))
+        graph._directory = path
+
+        delta_paths = list_directory_deltas(path)
+        if delta_paths:
+            from grma.match.graph_delta import DonorsDelta
+
+            for delta_path in delta_paths:
+                graph.apply_delta(DonorsDelta.load(delta_path))
+            graph._saved_deltas = len(delta_paths)
+        return graph
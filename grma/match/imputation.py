@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from contextlib import ExitStack
+from os import PathLike
+from typing import Iterable, Iterator, List, TextIO, Tuple, Union
+
+import numpy as np
+
+from grma.utilities.imputation_reader import ImputationBlock
+from grma.utilities.utils import gl_string_to_integers, print_time
+
+# The configuration fields the frequency graph of grim depends on (see grim.graph_freqs)
+GRIM_GRAPH_FIELDS = ("populations", "freq_trim_threshold", "freq_file", "pops_count_file", "loci_map",
+                     "Plan_A_Matrix", "Plan_B_Matrix")
+GRIM_GRAPH_FILES_FIELDS = ("node_csv_file", "edges_csv_file", "top_links_csv_file", "info_node_csv_file")
+GRIM_GRAPH_FINGERPRINT_FILE = "grma_graph_fingerprint"
+GRIM_PLAN_B_MATRIX = [[[1, 2, 3, 4, 5]], [[1, 2, 3], [4, 5]], [[1], [2, 3], [4, 5]], [[1, 2, 3], [4], [5]],
+                      [[1], [2, 3], [4], [5]], [[1], [2], [3], [4], [5]]]
+GRIM_EPSILON_N = 1000  # the n grim's impute_file passes to impute_one
+# The versions of grim whose Imputation.impute_one (which has no public equivalent) GrimImputer calls
+GRIM_SUPPORTED_VERSIONS = ("1.0.0",)
+
+
+def grim_graph_fingerprint(conf: dict) -> str:
+    """
+    A fingerprint of the input of grim's frequency graph: the content of the frequency file (and the populations'
+    counts file), and the configuration fields the graph is built by. The paths are relative to the working directory,
+    as in grim.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps({field: conf.get(field) for field in GRIM_GRAPH_FIELDS + GRIM_GRAPH_FILES_FIELDS},
+                        sort_keys=True).encode())
+    for field in ("freq_file", "pops_count_file"):
+        if conf.get(field) and os.path.isfile(conf[field]):
+            with open(conf[field], "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+        else:
+            h.update(b"-")
+    return h.hexdigest()
+
+
+def _grim_graph_files(conf: dict) -> List[str]:
+    return [os.path.join(conf["graph_files_path"], conf[field]) for field in GRIM_GRAPH_FILES_FIELDS]
+
+
+def _grim_graph_is_current(conf: dict, fingerprint: str) -> bool:
+    """Whether the graph files in graph_files_path were built from the same input"""
+    fingerprint_path = os.path.join(conf["graph_files_path"], GRIM_GRAPH_FINGERPRINT_FILE)
+    if not os.path.isfile(fingerprint_path) or not all(os.path.isfile(path) for path in _grim_graph_files(conf)):
+        return False
+    with open(fingerprint_path) as f:
+        return f.read().strip() == fingerprint
+
+
+def build_grim_graph(config_file_path: Union[str, PathLike], conf: dict, reuse_graph: bool = True,
+                     verbose: bool = False):
+    """
+    Build grim's frequency graph files (grim.graph_freqs), unless the files in graph_files_path were built
+    from the same frequency file and configuration (see grim_graph_fingerprint) and reuse_graph is set.
+    """
+    from grim import grim
+
+    fingerprint = grim_graph_fingerprint(conf)
+    if reuse_graph and _grim_graph_is_current(conf, fingerprint):
+        if verbose:
+            print_time(f"Reusing grim's frequency graph in {conf['graph_files_path']}")
+        return
+
+    # the graph files are not valid until graph_freqs is done
+    fingerprint_path = os.path.join(conf["graph_files_path"], GRIM_GRAPH_FINGERPRINT_FILE)
+    if os.path.isfile(fingerprint_path):
+        os.remove(fingerprint_path)
+    grim.graph_freqs(config_file_path)
+    with open(fingerprint_path, "w") as f:
+        f.write(fingerprint)
+
+
+def check_grim_version():
+    """
+    Raise a RuntimeError if the installed grim is not one of GRIM_SUPPORTED_VERSIONS. GrimImputer calls grim's
+    internal Imputation.impute_one, whose arguments might change in another version.
+    """
+    import grim
+
+    version = getattr(grim, "__version__", None)
+    if version not in GRIM_SUPPORTED_VERSIONS:
+        raise RuntimeError(f"GrimImputer supports py-graph-imputation {', '.join(GRIM_SUPPORTED_VERSIONS)}, "
+                           f"but version {version} is installed. Install a supported version, or impute the patients "
+                           f"to a file with run_grim.")
+
+
+def _grim_imputation_config(conf: dict) -> dict:
+    """The configuration of grim's Imputation, with the defaults of grim's run_impute"""
+    graph_files_path = os.path.join(conf["graph_files_path"], "")
+    config = {
+        "planb": conf.get("planb", True),
+        "pops": conf.get("populations"),
+        "priority": conf.get("priority"),
+        "epsilon": conf.get("epsilon", 1e-3),
+        "number_of_results": conf.get("number_of_results", 1000),
+        "number_of_pop_results": conf.get("number_of_pop_results", 100),
+        "node_file": graph_files_path + conf.get("node_csv_file"),
+        "top_links_file": graph_files_path + conf.get("top_links_csv_file"),
+        "edges_file": graph_files_path + conf.get("edges_csv_file"),
+        "factor_missing_data": conf.get("factor_missing_data", 0.01),
+        "loci_map": conf.get("loci_map", {"A": 1, "B": 3, "C": 2, "DQB1": 4, "DRB1": 5}),
+        "matrix_planb": conf.get("Plan_B_Matrix", GRIM_PLAN_B_MATRIX),
+        "pops_count_file": conf.get("pops_count_file", ""),
+        "use_pops_count_file": conf.get("pops_count_file", False),
+        "number_of_options_threshold": conf.get("number_of_options_threshold", 100000),
+        "max_haplotypes_number_in_phase": conf.get("max_haplotypes_number_in_phase", 100),
+        "nodes_for_plan_A": conf.get("Plan_A_Matrix", []),
+        "save_mode": conf.get("save_space_mode", False),
+        "UNK_priors": conf.get("UNK_priors", "MR"),
+    }
+    config["full_loci"] = "".join(sorted({str(value) for value in config["loci_map"].values()}))
+    return config
+
+
+def iter_grim_input(patients: Union[str, PathLike, Iterable[str]]) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Yields (ID, GL string, race 1, race 2) for the lines of grim's input ('id,gl-string[,race1,race2]',
+    or separated by '%'). The races are None if they are not given.
+    """
+    if isinstance(patients, (str, PathLike)):
+        with open(patients) as f:
+            yield from iter_grim_input(f)
+        return
+
+    for line in patients:
+        line = line.rstrip()
+        if not line:
+            continue
+        fields = line.split(",") if "," in line else line.split("%")
+        yield fields[0], fields[1], (fields[2] if len(fields) > 2 else None), \
+            (fields[3] if len(fields) > 3 else None)
+
+
+class GrimImputer(object):
+    """
+    Impute patients with grim in memory. grim's imputation graph is loaded once, and the imputation of the patients
+    is returned as an ImputationBlock (typed arrays, like a parsed imputation file) that find_matches searches
+    directly, without writing the imputation to a file and reading it again.
+    Any object with an impute method of the same signature can be used in place of it (e.g. in matching).
+
+    >>> imputer = GrimImputer("./data/minimal-configuration.json")
+    >>> matching_results = find_matches(imputer.impute(), donors_graph)
+    """
+    __slots__ = "_conf", "_config", "_imputation", "verbose"
+
+    def __init__(self, config_file_path: Union[str, PathLike], reuse_graph: bool = True, verbose: bool = False):
+        """
+        :param config_file_path: A path to configuration file for grim imputation.
+        :param reuse_graph: A boolean flag for whether to reuse grim's frequency graph files (see run_grim).
+        default is True.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        check_grim_version()
+        from grim.imputation.impute import Imputation
+        from grim.imputation.networkx_graph import Graph as GrimGraph
+
+        if not os.path.isfile(config_file_path):
+            raise FileExistsError(f"Can't find configuration file in {config_file_path}.")
+        with open(config_file_path) as f:
+            self._conf = json.load(f)
+        self.verbose = verbose
+
+        build_grim_graph(config_file_path, self._conf, reuse_graph, verbose)
+        self._config = _grim_imputation_config(self._conf)
+        grim_graph = GrimGraph(self._config)
+        grim_graph.build_graph(self._config["node_file"], self._config["top_links_file"], self._config["edges_file"])
+        self._imputation = Imputation(grim_graph, self._config)
+        if verbose:
+            print_time("Loaded grim's imputation graph")
+
+    @property
+    def input_file(self) -> str:
+        """The patients' file in the configuration (imputation_in_file)"""
+        return self._conf["imputation_in_file"]
+
+    def _impute_subjects(self, patients: Union[str, PathLike, Iterable[str], None]
+                         ) -> Iterator[Tuple[str, List[Tuple[str, float]]]]:
+        """
+        Impute patients, and yield (ID, [(genotype, probability)]) for each of them - its best genotypes, as grim
+        writes them (see grim's write_best_prob_genotype). Patients that grim fails to impute are skipped.
+        """
+        config = self._config
+        num_loci = len(config["full_loci"]) - 1
+        for subject_id, gl, race1, race2 in iter_grim_input(patients if patients is not None else self.input_file):
+            imputation = self._imputation
+            imputation.plan, imputation.option_1, imputation.option_2 = "a", 0, 0
+            try:
+                _, res_muugs, _ = imputation.impute_one(subject_id, gl, [1] * num_loci, race1, race2,
+                                                        config["priority"], config["epsilon"], GRIM_EPSILON_N,
+                                                        True, False, config["planb"], False)
+            except Exception as e:
+                res_muugs = None
+                if self.verbose:
+                    print_time(f"Failed to impute {subject_id}: {e}")
+            if not res_muugs or not res_muugs["Haps"]:
+                if self.verbose:
+                    print_time(f"No imputation for {subject_id}")
+                continue
+
+            genotypes = sorted(res_muugs["Haps"].items(), key=lambda item: item[1], reverse=True)
+            yield subject_id, genotypes[:config["number_of_results"]]
+
+    def impute_lines(self, patients: Union[str, PathLike, Iterable[str], None] = None) -> Iterator[str]:
+        """
+        Impute patients, and yield the lines of grim's imputation output (the UMUG frequencies file) for them.
+        Patients that grim fails to impute are skipped.
+
+        :param patients: A path to grim's input file, or its lines. default is the configuration's input file.
+        """
+        for subject_id, genotypes in self._impute_subjects(patients):
+            yield from _imputation_lines(subject_id, genotypes)
+
+    def impute(self, patients: Union[str, PathLike, Iterable[str], None] = None,
+               save_to: Union[str, PathLike, TextIO, None] = None) -> ImputationBlock:
+        """
+        Impute patients in memory.
+
+        :param patients: A path to grim's input file, or its lines. default is the configuration's input file.
+        :param save_to: A path (or an open text file) to save the imputation to, in grim's output format.
+        default is None (not saved).
+        :return: The imputation of the patients, as an ImputationBlock.
+        """
+        with ExitStack() as stack:
+            save_file = save_to
+            if save_to is not None and not hasattr(save_to, "write"):
+                save_file = stack.enter_context(open(save_to, "w"))
+
+            subjects = []
+            for subject_id, genotypes in self._impute_subjects(patients):
+                if save_file is not None:
+                    save_file.writelines(_imputation_lines(subject_id, genotypes))
+                subjects.append((subject_id, genotypes))
+        return imputation_block(subjects)
+
+
+def _imputation_lines(subject_id: str, genotypes: List[Tuple[str, float]]) -> Iterator[str]:
+    """the lines of grim's imputation output for the genotypes of a subject"""
+    for k, (genotype, prob) in enumerate(genotypes):
+        yield f"{subject_id},{genotype},{prob},{k}\n"
+
+
+def imputation_block(subjects: Iterable[Tuple[Union[str, int], List[Tuple[str, float]]]]) -> ImputationBlock:
+    """
+    The ImputationBlock of imputed subjects, without formatting and parsing their imputation lines:
+    the same arrays as parse_imputation_lines of the lines of grim's output for them.
+
+    :param subjects: (ID, [(genotype GL string, probability)]) for each subject, its genotypes in their order.
+    """
+    ids, genotypes, probabilities, indices = [], [], [], []
+    for subject_id, subject_genotypes in subjects:
+        try:
+            subject_id = int(subject_id)
+        except ValueError:
+            raise ValueError(f"The ID of {subject_id!r} is not an integer.") from None
+        for k, (genotype, prob) in enumerate(subject_genotypes):
+            ids.append(subject_id)
+            genotypes.append(gl_string_to_integers(genotype))
+            probabilities.append(prob)
+            indices.append(k)
+
+    genotypes = np.array(genotypes, dtype=np.uint16).reshape(-1, 10)
+    genotypes.reshape(-1, 5, 2).sort(axis=2)  # the alleles of each locus are sorted, as in parse_imputation_lines
+    return ImputationBlock(np.array(ids, dtype=np.int64), genotypes, np.array(probabilities, dtype=np.float64),
+                           np.array(indices, dtype=np.int64))
@@ -7,9 +7,14 @@ cimport numpy as np
 
 ctypedef np.int32_t INT
 ctypedef np.uint32_t UINT
+ctypedef np.uint8_t UINT8
 ctypedef np.uint16_t UINT16
+ctypedef np.uint64_t UINT64
 ctypedef np.float32_t FLOAT
 
+# A quantized weight is stored as round(weight * QUANTIZED_WEIGHT_SCALE) (see grma.match.graph_compression).
+cdef FLOAT QUANTIZED_WEIGHT_SCALE = 65535.
+
 cdef class LolGraph:
     cdef:
         UINT[:] _index_list
@@ -177,8 +182,225 @@ cdef class LolGraph:
                 neighbors_id[pointer] = self._neighbors_list[j]
                 pointer += 1
 
-        neighbors_value = np.zeros((num_of_neighbors_2nd - 1, 10), dtype=np.uint16)
-        for i in range(len(neighbors_id) - 1):
+        neighbors_value = np.zeros((num_of_neighbors_2nd, 10), dtype=np.uint16)
+        for i in range(len(neighbors_id)):
+            neighbor_id = neighbors_id[i]
+            arr = self.arr_node_value_from_id(neighbor_id)
+            for j in range(10):
+                neighbors_value[i, j] = arr[j]
+
+        return neighbors_id, neighbors_value
+
+
+cdef class CompressedLolGraph:
+    """
+    A LolGraph with compressed neighbors' lists (see grma.match.graph_compression).
+    The (sorted) neighbors of a node are stored as LEB128 varints: the first neighbor, then the gaps between
+    consecutive neighbors. Only the edges of the genotypes (to their donors) have weights,
+    stored as float32 or quantized to uint16. The edges keep their positions in index_list.
+    """
+    cdef:
+        UINT[:] _index_list
+        UINT[:] _neighbors_offsets
+        UINT64[:] _wide_neighbors_offsets
+        UINT8[:] _neighbors_bytes
+        FLOAT[:] _weights_list
+        UINT16[:] _quantized_weights
+        UINT[:] _degrees_2nd
+        UINT[:] _map_number_to_num_node
+        UINT16[:, :] _map_number_to_arr_node
+        UINT _arrays_start
+        UINT _subclasses_start
+        UINT _weights_start
+        UINT _weights_end
+        bint wide_offsets
+        bint quantized
+        bint directed
+        bint weighted
+
+    def __init__(self, UINT[:] index_list,
+                 np.ndarray neighbors_offsets,
+                 UINT8[:] neighbors_bytes,
+                 np.ndarray donor_weights,
+                 UINT[:] degrees_2nd,
+                 UINT[:] map_number_to_num_node,
+                 UINT16[:, :] map_number_to_arr_node,
+                 UINT arrays_start,
+                 bint directed, bint weighted):
+        self._index_list = index_list
+        # the offsets are uint64 only when the neighbors' bytes don't fit in uint32 offsets
+        self.wide_offsets = neighbors_offsets.dtype == np.uint64
+        if self.wide_offsets:
+            self._neighbors_offsets = np.zeros(0, dtype=np.uint32)
+            self._wide_neighbors_offsets = neighbors_offsets
+        else:
+            self._neighbors_offsets = neighbors_offsets
+            self._wide_neighbors_offsets = np.zeros(0, dtype=np.uint64)
+        self._neighbors_bytes = neighbors_bytes
+        self.quantized = donor_weights.dtype == np.uint16
+        if self.quantized:
+            self._quantized_weights = donor_weights
+            self._weights_list = np.zeros(0, dtype=np.float32)
+        else:
+            self._quantized_weights = np.zeros(0, dtype=np.uint16)
+            self._weights_list = donor_weights
+        self._degrees_2nd = degrees_2nd
+        self._map_number_to_num_node = map_number_to_num_node
+        self._map_number_to_arr_node = map_number_to_arr_node
+        self._arrays_start = arrays_start
+        self._subclasses_start = len(map_number_to_num_node)
+        # the weights are stored for the edges of the genotypes' lists
+        self._weights_start = index_list[arrays_start]
+        self._weights_end = index_list[arrays_start + len(map_number_to_arr_node)]
+        self.directed = directed
+        self.weighted = weighted
+
+    @property
+    def array_start(self):
+        return self._arrays_start
+
+    cpdef bint is_directed(self):
+        return self.directed
+
+    cpdef bint is_weighted(self):
+        return self.weighted
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef UINT16[:] arr_node_value_from_id(self, UINT node_id):
+        return self._map_number_to_arr_node[node_id - self._arrays_start]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef UINT num_node_value_from_id(self, UINT node_id):
+        return self._map_number_to_num_node[node_id]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline FLOAT weight_at(self, UINT position):
+        """return the weight of the edge in the given position of index_list"""
+        if position < self._weights_start or position >= self._weights_end:
+            return 0
+        if self.quantized:
+            return <FLOAT>self._quantized_weights[position - self._weights_start] / QUANTIZED_WEIGHT_SCALE
+        return self._weights_list[position - self._weights_start]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef inline UINT64 list_offset(self, UINT node):
+        """return the offset of the node's list in the neighbors' bytes"""
+        if self.wide_offsets:
+            return self._wide_neighbors_offsets[node]
+        return self._neighbors_offsets[node]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef UINT decode_into(self, UINT node, UINT[:] out, UINT start):
+        """decode the neighbors of a node into out, from position start. return the number of neighbors"""
+        cdef UINT64 pos, end
+        cdef UINT value = 0, gap, count = 0
+        cdef UINT8 byte
+        cdef int shift
+
+        pos = self.list_offset(node)
+        end = self.list_offset(node + 1)
+        while pos < end:
+            gap = 0
+            shift = 0
+            while True:
+                byte = self._neighbors_bytes[pos]
+                pos += 1
+                gap |= <UINT>(byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            value += gap
+            out[start + count] = value
+            count += 1
+        return count
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef FLOAT get_edge_data(self, UINT node1, UINT node2) except -1:
+        """return the weight between two edges"""
+        cdef UINT64 pos, end
+        cdef UINT value = 0, gap, count = 0
+        cdef UINT8 byte
+        cdef int shift
+
+        # the neighbors are sorted, so the scan stops at the first neighbor greater than node2
+        pos = self.list_offset(node1)
+        end = self.list_offset(node1 + 1)
+        while pos < end:
+            gap = 0
+            shift = 0
+            while True:
+                byte = self._neighbors_bytes[pos]
+                pos += 1
+                gap |= <UINT>(byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            value += gap
+            if value == node2:
+                if self.is_weighted():
+                    return self.weight_at(self._index_list[node1] + count)
+                return -1
+            if value > node2:
+                break
+            count += 1
+        return -1
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef tuple neighbors_weighted(self, UINT node):
+        """return the neighbors for weighted graph"""
+        cdef UINT idx, idx_end, i
+        cdef np.ndarray[UINT, ndim=1] neighbors_list_id
+        cdef np.ndarray[FLOAT, ndim=1] weights_list
+
+        idx = self._index_list[node]
+        idx_end = self._index_list[node + 1]
+
+        neighbors_list_id = np.zeros(idx_end - idx, dtype=np.uint32)
+        self.decode_into(node, neighbors_list_id, 0)
+
+        weights_list = np.zeros(idx_end - idx, dtype=np.float32)
+        for i in range(idx, idx_end):
+            weights_list[i - idx] = self.weight_at(i)
+
+        return neighbors_list_id, weights_list
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef np.ndarray[UINT, ndim=1] neighbors_unweighted(self, UINT node):
+        """return the neighbors for unweighted graph"""
+        cdef np.ndarray[UINT, ndim=1] neighbors_list_id
+
+        neighbors_list_id = np.zeros(self._index_list[node + 1] - self._index_list[node], dtype=np.uint32)
+        self.decode_into(node, neighbors_list_id, 0)
+        return neighbors_list_id
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cpdef tuple neighbors_2nd(self, UINT node):
+        """return the second degree neighbors of a node - neighbors of neighbors."""
+        cdef UINT i, j, pointer, neighbor_id
+        cdef np.ndarray[UINT, ndim=1] neighbors_list_id, neighbors_id
+        cdef UINT16[:] arr
+        cdef np.ndarray[UINT16, ndim=2] neighbors_value
+        cdef UINT num_of_neighbors_2nd
+
+        neighbors_list_id = self.neighbors_unweighted(node)
+        num_of_neighbors_2nd = self._degrees_2nd[node - self._subclasses_start]
+
+        neighbors_id = np.zeros(int(num_of_neighbors_2nd), dtype=np.uint32)
+        pointer = 0
+        for i in range(len(neighbors_list_id)):
+            pointer += self.decode_into(neighbors_list_id[i], neighbors_id, pointer)
+
+        neighbors_value = np.zeros((num_of_neighbors_2nd, 10), dtype=np.uint16)
+        for i in range(len(neighbors_id)):
             neighbor_id = neighbors_id[i]
             arr = self.arr_node_value_from_id(neighbor_id)
             for j in range(10):
@@ -1,31 +1,63 @@
 import os
-import sys
+import shutil
 import time
 import json
 from os import PathLike
-from typing import Iterable, Union, Dict
+from typing import Iterable, Union, Dict, List, Mapping, Sequence, Tuple
 import pickle
 import pandas as pd
-from grim import grim
 import csv
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, redirect_stdout
 
 from grma.match import Graph as MatchingGraph
-from grma.match.donors_matching import DonorsMatching, _init_results_df
+from grma.match.candidates import CandidatesWriter, load_candidates
+from grma.match.donors_matching import DonorsMatching, _init_results_df, copy_patient_results, add_donors_info, \
+    iter_patients, patient_fingerprint
+from grma.match.graph_handle import GraphHandle
 from grma.match.graph_wrapper import Graph
+from grma.match.imputation import GrimImputer, build_grim_graph
+from grma.match.parallel import parallel_find_matches, iter_patients_records
+from grma.match.pipeline import pipelined_matching
+from grma.match.profiling import MatchingProfiler, profile_patient, profile_stage
+from grma.match.result_cache import MatchResultCache
+from grma.match.result_writer import ResultWriter, PatientsCSVWriter, open_result_writer
+from grma.utilities.imputation_reader import ImputationBlock
 from grma.utilities.utils import print_time, donor_mismatch_format
 
 GRIM_DEFAULT_OUTPUT_PATH = "./output/don.pmug"
 GRIM_RESULT_DIR_FIELD = "imuptation_out_path"
 GRIM_RESULT_GENO_FILE_FIELD = "imputation_out_umug_freq_filename"
+GraphVersions = Union[str, Dict[Union[str, int], str]]  # the version of a graph, or {graph's name: its version}
 
 
-def run_grim(config_file_path=""):
+class MatchingError(RuntimeError):
+    """
+    Raised by find_matches when the search of some patients failed in the workers (their errors are printed).
+    The other patients are searched as usual: their results are in results (as find_matches would return them),
+    and they are saved and cached.
+    """
+
+    def __init__(self, failed_patients: List[int], results: dict):
+        super().__init__(f"Matching failed for {len(failed_patients)} patients: "
+                         f"{', '.join(map(str, failed_patients))}")
+        self.failed_patients = failed_patients
+        self.results = results
+
+
+def run_grim(config_file_path="", reuse_graph: bool = True):
     """"
     This function applies grim imputation with the default/user's configuration file.
 
     :param config_file_path: A path to configuration file for grim imputation. default is grim default config.
+    :param reuse_graph: A boolean flag for whether to reuse grim's frequency graph files in graph_files_path
+    if they were built from the same frequency file and configuration
+    (see grma.match.imputation.grim_graph_fingerprint),
+    instead of building the graph again. default is True.
     :return: The path to the imputation output file.
     """
+    from grim import grim  # imported on first use, it is not needed for matching imputed patients
+
     if not config_file_path:
         grim.graph_freqs()
         grim.impute()
@@ -42,14 +74,14 @@ def run_grim(config_file_path=""):
     file_name = conf[GRIM_RESULT_GENO_FILE_FIELD]
     path = os.path.join(dir_path, file_name)
 
-    grim.graph_freqs(config_file_path)
+    build_grim_graph(config_file_path, conf, reuse_graph)
     grim.impute(config_file_path)
 
     return path
 
 
 def search_in_levels(patient_id: int, g_m: DonorsMatching, donors_info: Iterable, threshold: float,
-                     cutof: int, classes: Iterable, subclasses: Iterable):
+                     cutof: int, classes: Iterable, subclasses: Iterable, expand_all: bool = False):
     """"
     This function gets the information about the patient and other settings, and search for donors in levels.
     First, it will search only for 10 matches donors (compare only genotypes). If there aren't enough donors,
@@ -62,14 +94,26 @@ def search_in_levels(patient_id: int, g_m: DonorsMatching, donors_info: Iterable
     :param cutof: Maximum number of matches to return. default is 50.
     :param classes: An iterable with the all the possible classes of the patient.
     :param subclasses: An iterable with the all the possible subclasses of the patient.
+    :param expand_all: A boolean flag for whether to find all the genotype candidates of the patient
+    (up to 3 mismatches) before scoring, even if enough matches are found in an early level. default is False.
     :return: A pandas.DataFrame with the matches for this patient.
     """
+    profiler = g_m.profiler
+    if expand_all:
+        with profile_stage(profiler, "genotypes"):
+            g_m.find_geno_candidates_by_genotypes(patient_id)
+        with profile_stage(profiler, "classes"):
+            g_m.find_geno_candidates_by_classes(classes)
+        with profile_stage(profiler, "subclasses"):
+            g_m.find_geno_candidates_by_subclasses(subclasses)
+        return score_in_levels(patient_id, g_m, donors_info, threshold, cutof)
 
     matched = set()  # set of donors ID that have already matched for this patient
     results_df = _init_results_df(donors_info)  # initialize the df according to the given fields
     # print(f"Before find_geno_candidates_by_genotypes: patient_id={patient_id}")
     # We can give to this function the genotypes instead
-    g_m.find_geno_candidates_by_genotypes(patient_id)
+    with profile_stage(profiler, "genotypes"):
+        g_m.find_geno_candidates_by_genotypes(patient_id)
     # print(f"After find_geno_candidates_by_genotypes")
 
     matched, count, results_df = g_m.score_matches(0, results_df, donors_info, patient_id, threshold, cutof, matched)
@@ -77,13 +121,15 @@ def search_in_levels(patient_id: int, g_m: DonorsMatching, donors_info: Iterable
     if len(matched) >= cutof:
         return results_df
 
-    g_m.find_geno_candidates_by_classes(classes)
+    with profile_stage(profiler, "classes"):
+        g_m.find_geno_candidates_by_classes(classes)
     matched, count, results_df = g_m.score_matches(1, results_df, donors_info, patient_id, threshold, cutof, matched)
 
     if len(matched) >= cutof:
         return results_df
 
-    g_m.find_geno_candidates_by_subclasses(subclasses)
+    with profile_stage(profiler, "subclasses"):
+        g_m.find_geno_candidates_by_subclasses(subclasses)
 
     # loop over possible mismatches: 2, 3.
     for mismatches in range(2, 4):
@@ -93,18 +139,54 @@ def search_in_levels(patient_id: int, g_m: DonorsMatching, donors_info: Iterable
     return results_df
 
 
-def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
+def score_in_levels(patient_id: int, g_m: DonorsMatching, donors_info: Iterable, threshold: float, cutof: int):
+    """
+    Score the genotype candidates that were already found for the patient, level by level (0-3 mismatches),
+    without searching the donors' graph.
+
+    :param patient_id: The id of the patient.
+    :param g_m: The patients graph with the genotype candidates of the patient.
+    :param donors_info: An iterable of fields from the database to include in the results.
+    :param threshold: Minimal score value for a valid match.
+    :param cutof: Maximum number of matches to return.
+    :return: A pandas.DataFrame with the matches for this patient.
+    """
+    matched = set()
+    results_df = _init_results_df(donors_info)
+    for mismatches in range(4):
+        matched, count, results_df = g_m.score_matches(mismatches, results_df, donors_info,
+                                                       patient_id, threshold, cutof, matched)
+        if len(matched) >= cutof:
+            break
+
+    return results_df
+
+
+def find_matches(imputation_filename: Union[str, PathLike, ImputationBlock],
+                 match_graph: Union[Graph, GraphHandle, Sequence[Graph], Mapping[str, Graph]],
                  search_id: int = 1, donors_info: Iterable[str] = [],
                  threshold: float = 0.1, cutof: int = 100,
                  verbose: bool = False, save_to_csv: bool = False,
-                 calculate_time: bool = False):
+                 calculate_time: bool = False, workers: int = 1, deduplicate: bool = True,
+                 cache: Union[str, PathLike, MatchResultCache, None] = None,
+                 save_candidates: Union[str, PathLike, None] = None,
+                 save_results: Union[str, PathLike, ResultWriter, None] = None,
+                 profiler: Union[MatchingProfiler, None] = None):
     """
     The main function responsible for performing the matching.
     Note: for each patient, if a donor has been found as a
     match in an early stage (0, 1, or 2 mm), he will not be searched as a match for the further mismatches.
 
-    :param imputation_filename: Path to the output file of the imputation made by grim.
-    :param match_graph: A Graph object from grma.match
+    :param imputation_filename: Path to the output file of the imputation made by grim, or an in-memory imputation
+    (an ImputationBlock, e.g. by grma.match.imputation.GrimImputer). workers and cache can't be used with
+    an in-memory imputation.
+    :param match_graph: A Graph object from grma.match, or several graphs (a list, or a dict {name: graph})
+    to search together, e.g. the graphs of several registries. The patients are parsed once and searched in
+    all the graphs concurrently, and the matches of each patient are merged: the matches with fewer mismatches first,
+    then by their score, up to cutof matches in all the graphs. A 'Graph' column tells the graph of each match
+    (its position in the list, or its name). workers, cache and save_candidates can't be used with several graphs.
+    A GraphHandle (also in a list or a dict) is searched in its current snapshot, which is kept for the whole search
+    even if a new graph is swapped in, and a 'Graph_Version' column tells the version of the graph of each match.
     :param search_id: An integer identification of the search. default is 0.
     :param donors_info: An iterable of fields from the database to include in the results. default is None.
     :param threshold: Minimal score value for a valid match. default is 0.1.
@@ -112,22 +194,271 @@ def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
     :param verbose: A boolean flag for whether to print the documentation. default is False
     :param save_to_csv: A boolean flag for whether to save the matching results into a csv file. default is False.
     :param calculate_time: A boolean flag for whether to return the matching time for patient. default is False.
+    :param workers: Number of worker processes to match the patients with. default is 1 (match in this process).
+    The workers share a memory-mapped copy of the graph (see Graph.from_directory).
+    :param deduplicate: A boolean flag for whether to search only once for patients with identical genotypes
+    distribution (same genotypes and probabilities), and copy the results to the others. default is True.
+    :param cache: A MatchResultCache, or a path to its file. default is None (no cache).
+    Patients with the same genotypes distribution as a cached patient (for the same graph, threshold and cutof)
+    get the stored results without searching the graph, and the results of the other patients are stored.
+    :param save_candidates: A path to save the genotype candidates of the patients to (.npz). default is None.
+    All the candidates up to 3 mismatches are found for each patient, so the patients can be scored again
+    with other parameters by rescore, without searching the graph. The cache is not read when it is set.
+    :param save_results: A path to save the results of all the patients to, in one file: a CSV file for a .csv path,
+    and a binary columnar file otherwise (see grma.match.result_writer.read_results), or a ResultWriter
+    (which is not closed, so it can collect the results of several searches). default is None (not saved).
+    It can't be used with save_to_csv. The results (of both) are written in a background thread.
+    :param profiler: A grma.match.profiling.MatchingProfiler to collect the time of each stage of the matching and
+    counters in, for each patient and in total. default is None. It can't be used with workers.
     If one wishes to save the results to csv files, a directory named 'Matching_Results_{searchId}' will be created in
     the working directory. If a directory by this name was already created, an error will be raised.
     Note: saving a pandas into a csv might take a couple of seconds
     :return: A dictionary that maps each patient to its matching results formatted as a pandas.DataFrame
+    :raises MatchingError: If the search of some patients failed in the workers (e.g. malformed lines,
+    or a worker process that died). The error has the IDs of the failed patients and the results of the others.
+    """
+    if _has_graph_handles(match_graph):
+        return _find_matches_in_snapshots(imputation_filename, match_graph, calculate_time, search_id=search_id,
+                                          donors_info=donors_info, threshold=threshold, cutof=cutof,
+                                          verbose=verbose, save_to_csv=save_to_csv, workers=workers,
+                                          deduplicate=deduplicate, cache=cache, save_candidates=save_candidates,
+                                          save_results=save_results, profiler=profiler)
+    return _find_matches(imputation_filename, match_graph, search_id, donors_info, threshold, cutof, verbose,
+                         save_to_csv, calculate_time, workers, deduplicate, cache, save_candidates, save_results,
+                         profiler)
+
+
+def _find_matches(imputation_filename: Union[str, PathLike, ImputationBlock],
+                  match_graph: Union[Graph, Sequence[Graph], Mapping[str, Graph]],
+                  search_id: int = 1, donors_info: Iterable[str] = [],
+                  threshold: float = 0.1, cutof: int = 100,
+                  verbose: bool = False, save_to_csv: bool = False,
+                  calculate_time: bool = False, workers: int = 1, deduplicate: bool = True,
+                  cache: Union[str, PathLike, MatchResultCache, None] = None,
+                  save_candidates: Union[str, PathLike, None] = None,
+                  save_results: Union[str, PathLike, ResultWriter, None] = None,
+                  profiler: Union[MatchingProfiler, None] = None,
+                  graph_versions: Union[GraphVersions, None] = None):
+    """
+    find_matches in graphs that are not in GraphHandles. The arguments are the same as in find_matches.
+    :param graph_versions: The version of the graph (or {graph's name: its version}) to add to the results
+    as a 'Graph_Version' column, also in the results that are saved (see _with_graph_version). default is None.
     """
+    if isinstance(imputation_filename, ImputationBlock) and (workers > 1 or cache is not None):
+        raise ValueError("workers and cache can't be used with an in-memory imputation.")
+
+    if not isinstance(match_graph, Graph) and (workers > 1 or cache is not None or save_candidates is not None):
+        raise ValueError("workers, cache and save_candidates can be used only with a single graph.")
+
+    if profiler is not None and workers > 1:
+        raise ValueError("profiler can't be used with workers.")
+
+    with ExitStack() as stack:
+        writer = _results_writer(stack, save_to_csv, save_results, search_id, verbose)
+
+        if verbose:
+            print_time("Start graph matching")
+
+        if not isinstance(match_graph, Graph):
+            graphs = list(match_graph.items()) if isinstance(match_graph, Mapping) else list(enumerate(match_graph))
+            patients_results = _search_graphs(imputation_filename, graphs, search_id, donors_info, threshold, cutof,
+                                              verbose, writer, deduplicate, profiler, graph_versions)
+            return _format_results(patients_results, donors_info, calculate_time, graph_versions)
+
+        candidates = CandidatesWriter(match_graph.content_hash) if save_candidates is not None else None
+
+        if cache is None:
+            patients_results = _search_patients(imputation_filename, match_graph, search_id, donors_info, threshold,
+                                                cutof, verbose, writer, workers, deduplicate, candidates,
+                                                profiler, graph_versions)
+        elif not isinstance(cache, MatchResultCache):
+            with MatchResultCache(cache, match_graph.content_hash) as cache:
+                patients_results = _search_with_cache(imputation_filename, match_graph, search_id, donors_info,
+                                                      threshold, cutof, verbose, writer, workers, deduplicate,
+                                                      cache, candidates, profiler, graph_versions)
+        else:
+            patients_results = _search_with_cache(imputation_filename, match_graph, search_id, donors_info,
+                                                  threshold, cutof, verbose, writer, workers, deduplicate, cache,
+                                                  candidates, profiler, graph_versions)
+
+    if candidates is not None:
+        candidates.save(save_candidates)
+        if verbose:
+            print_time(f"Saved the genotype candidates in {save_candidates}")
+
+    return _format_results(patients_results, donors_info, calculate_time, graph_versions)
+
+
+def _results_writer(stack: ExitStack, save_to_csv: bool, save_results: Union[str, PathLike, ResultWriter, None],
+                    search_id: int, verbose: bool) -> Union[ResultWriter, None]:
+    """
+    The writer of the results by save_to_csv/save_results (None if they are not saved).
+    A writer that is created here is closed (after the queued results are written) when the stack exits.
+    """
+    if save_to_csv and save_results is not None:
+        raise ValueError("save_to_csv and save_results can't be used together.")
+    if isinstance(save_results, ResultWriter):
+        return save_results
     if save_to_csv:
-        os.makedirs(f"Matching_Results_{search_id}", exist_ok=True)
+        return stack.enter_context(PatientsCSVWriter(f"Matching_Results_{search_id}", verbose=verbose))
+    if save_results is not None:
+        return stack.enter_context(open_result_writer(save_results, verbose=verbose))
+    return None
+
+
+def _has_graph_handles(match_graph) -> bool:
+    if isinstance(match_graph, (Graph, GraphHandle)):
+        return isinstance(match_graph, GraphHandle)
+    graphs = match_graph.values() if isinstance(match_graph, Mapping) else match_graph
+    return any(isinstance(graph, GraphHandle) for graph in graphs)
+
+
+def _find_matches_in_snapshots(imputation_filename: Union[str, PathLike, ImputationBlock],
+                               match_graph: Union[GraphHandle, Sequence, Mapping], calculate_time: bool, **kwargs):
+    """
+    find_matches with GraphHandles: the current snapshot of each handle is pinned for the whole search,
+    and a 'Graph_Version' column of the version of the graph is added to the results, before they are saved
+    (the content hash for a Graph that is not in a handle).
+    """
+    with ExitStack() as stack:
+        def pin(graph: Union[Graph, GraphHandle]) -> Tuple[Graph, str]:
+            if isinstance(graph, GraphHandle):
+                snapshot = stack.enter_context(graph.acquire())
+                return snapshot.graph, snapshot.version
+            return graph, graph.content_hash
+
+        if isinstance(match_graph, GraphHandle):
+            graphs, versions = pin(match_graph)
+        else:
+            pinned = [(name, pin(graph)) for name, graph in
+                      (match_graph.items() if isinstance(match_graph, Mapping) else enumerate(match_graph))]
+            versions = {name: graph_version for name, (_, graph_version) in pinned}
+            graphs = {name: graph for name, (graph, _) in pinned} if isinstance(match_graph, Mapping) else \
+                [graph for _, (graph, _) in pinned]
+
+        return _find_matches(imputation_filename, graphs, calculate_time=calculate_time, graph_versions=versions,
+                             **kwargs)
+
+
+def _with_graph_version(results_df: pd.DataFrame, graph_versions: Union[GraphVersions, None]) -> pd.DataFrame:
+    """
+    The results of a patient with a 'Graph_Version' column (a shallow copy, the results are not changed):
+    after Donor_ID for the version of a single graph, or after Graph for {graph's name: its version}.
+    """
+    if graph_versions is None:
+        return results_df
+    results_df = results_df.copy(deep=False)
+    if isinstance(graph_versions, dict):
+        results_df.insert(results_df.columns.get_loc("Graph") + 1, "Graph_Version",
+                          results_df["Graph"].map(graph_versions))
+    else:
+        results_df.insert(results_df.columns.get_loc("Donor_ID") + 1, "Graph_Version", graph_versions)
+    return results_df
+
+
+def _search_with_cache(imputation_filename: Union[str, PathLike], match_graph: Graph, search_id: int,
+                       donors_info: Iterable[str], threshold: float, cutof: int, verbose: bool,
+                       writer: Union[ResultWriter, None], workers: int, deduplicate: bool, cache: MatchResultCache,
+                       candidates: Union[CandidatesWriter, None] = None,
+                       profiler: Union[MatchingProfiler, None] = None,
+                       graph_versions: Union[GraphVersions, None] = None) -> Dict[int, tuple]:
+    """_search_patients that serves the patients in the cache and searches only the others"""
+    fingerprints = {}
+    cached_results = {}
+    records = list(iter_patients_records(imputation_filename))
+    for patient, lines in records:
+        start = time.time()
+        try:
+            fingerprints[patient] = patient_fingerprint(next(iter_patients(lines))[1])
+        except Exception:
+            continue  # a malformed patient is searched (and fails) as usual
+        results_df = cache.get(fingerprints[patient], threshold, cutof) if candidates is None else None
+        if results_df is not None:
+            results_df = add_donors_info(copy_patient_results(results_df, patient), donors_info)
+            cached_results[patient] = (results_df, time.time() - start)
 
     if verbose:
-        print_time("Start graph matching")
+        print_time(f"Found {len(cached_results)} of {len(records)} patients in the results cache")
+
+    lines_to_search = [line for patient, lines in records if patient not in cached_results for line in lines]
+    searched_results = _search_patients(lines_to_search, match_graph, search_id, donors_info, threshold, cutof,
+                                        verbose, writer, workers, deduplicate, candidates, profiler, graph_versions)
+
+    patients_results = {}
+    for patient, _ in records:
+        if patient in cached_results:
+            patients_results[patient] = cached_results[patient]
+            if writer is not None:
+                _write_results(writer, profiler, patient, cached_results[patient][0], graph_versions)
+            continue
+
+        results_df, _ = patients_results[patient] = searched_results[patient]
+        if patient in fingerprints and results_df is not None:
+            cache.put(fingerprints[patient], threshold, cutof,
+                      results_df.drop(columns=[field for field in donors_info if field in results_df.columns]))
+    cache.commit()
+
+    return patients_results
 
-    g_m = DonorsMatching(match_graph, verbose=verbose)
+
+def _write_results(writer: ResultWriter, profiler: Union[MatchingProfiler, None], patient: int,
+                   results_df: pd.DataFrame, graph_versions: Union[GraphVersions, None] = None):
+    """queue the results of a patient to the writer, and count it in the patient's 'output' stage"""
+    start = time.perf_counter()
+    writer.write(patient, _with_graph_version(results_df, graph_versions))
+    if profiler is not None:
+        profiler.add_time("output", time.perf_counter() - start, patient=patient)
+
+
+def _format_results(patients_results: Dict[int, tuple], donors_info: Iterable[str], calculate_time: bool,
+                    graph_versions: Union[GraphVersions, None] = None):
+    """
+    Convert {patient: (results_df, time)} to the format find_matches returns.
+    Raises a MatchingError with the formatted results of the others if some patients failed in the workers.
+    """
+    formatted, failed_patients = {}, []
+    for patient, (results_df, patient_time) in patients_results.items():
+        if results_df is None:  # the patient failed in a worker
+            failed_patients.append(patient)
+            continue
+        results_df = _with_graph_version(results_df, graph_versions)
+        formatted[patient] = (results_df, patient_time) if calculate_time else results_df
+    if failed_patients:
+        raise MatchingError(failed_patients, formatted)
+    return formatted
+
+
+def _search_patients(imputation: Union[str, PathLike, Iterable[str], ImputationBlock], match_graph: Graph,
+                     search_id: int,
+                     donors_info: Iterable[str], threshold: float, cutof: int, verbose: bool,
+                     writer: Union[ResultWriter, None], workers: int, deduplicate: bool,
+                     candidates: Union[CandidatesWriter, None] = None,
+                     profiler: Union[MatchingProfiler, None] = None,
+                     graph_versions: Union[GraphVersions, None] = None) -> Dict[int, tuple]:
+    """
+    Search the patients of an imputation file (or of its lines) in the donors' graph.
+    The arguments are the same as in find_matches. The results are written with writer, if it is given.
+    If candidates is given, all the genotype candidates of each patient are found and added to it.
+    If profiler is given, the stages of the search of each patient are timed in it.
+    :return: {patient: (results_df, time)}. results_df is None for a patient that failed in a worker.
+    """
+    if workers > 1:
+        patients_results = {}
+        for patient, results_df, patient_time, patient_candidates in parallel_find_matches(
+                imputation, match_graph, workers, donors_info, threshold, cutof, deduplicate=deduplicate,
+                with_candidates=candidates is not None, verbose=verbose):
+            patients_results[patient] = (results_df, patient_time)
+            if patient_candidates is not None:
+                candidates.add(patient, patient_candidates)
+            if writer is not None and results_df is not None:
+                _write_results(writer, profiler, patient, results_df, graph_versions)
+        return patients_results
+
+    g_m = DonorsMatching(match_graph, verbose=verbose, profiler=profiler)
 
     # create patients graph and find all candidates
     start_build_graph = time.time()
-    subclasses_by_patient, classes_by_patient = g_m.create_patients_graph(imputation_filename)
+    subclasses_by_patient, classes_by_patient = g_m.create_patients_graph(imputation, deduplicate=deduplicate)
 
     # wierd_edges = {}
     # for patient in g_m.patients:
@@ -159,7 +490,7 @@ def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
     #         patient_id = row[0].split(',')[0]
     #         patient_ids.append(patient_id)
     # print(len(patient_ids))
-    patients = list(g_m.patients.keys())
+    patients = list(g_m.representatives.keys())
     # print(len(patients))
     # if patients == patient_ids:
     #     print("--------------------TRUE--------------------------")
@@ -170,6 +501,7 @@ def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
 
     # the returned dictionary. {patient ID: pd.DataFrame(matches + features)}
     patients_results = {patient: None for patient in patients}
+    patients_candidates = {}  # {representative: its candidates}, shared with its duplicates
 
     if patients:
         avg_build_time = (end_build_graph - start_build_graph) / len(patients)
@@ -177,6 +509,18 @@ def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
         avg_build_time = 0
 
     for patient in patients:
+        representative = g_m.representatives[patient]
+        if representative != patient:
+            # the patient has the same genotypes distribution as a patient that was already searched
+            results_df, patient_time = patients_results[representative]
+            results_df = copy_patient_results(results_df, patient)
+            patients_results[patient] = (results_df, patient_time)
+            if candidates is not None:
+                candidates.add(patient, patients_candidates[representative])
+            if writer is not None:
+                _write_results(writer, profiler, patient, results_df, graph_versions)
+            continue
+
         # print("\n","Patient", patient, "Verbose", verbose)
         # For each patient we search matches in the donor graph.
         # First we will look for perfect matches - only genotypes, then 9 matches - classes,
@@ -188,37 +532,171 @@ def find_matches(imputation_filename: Union[str, PathLike], match_graph: Graph,
 
         subclasses = subclasses_by_patient[patient]
         classes = classes_by_patient[patient]
-        results_df = search_in_levels(patient, g_m, donors_info, threshold, cutof, classes, subclasses)
+        with profile_patient(profiler, patient):
+            results_df = search_in_levels(patient, g_m, donors_info, threshold, cutof, classes, subclasses,
+                                          expand_all=candidates is not None)
 
         end = time.time()
         patient_time = end - start + avg_build_time
+        patients_results[patient] = (results_df, patient_time)
 
-        if calculate_time:
-            patients_results[patient] = (results_df, patient_time)
+        if candidates is not None:
+            patients_candidates[patient] = (g_m.patients[patient], g_m.candidates_arrays(patient))
+            candidates.add(patient, patients_candidates[patient])
+
+        if writer is not None:
+            _write_results(writer, profiler, patient, results_df, graph_versions)
+
+    return patients_results
+
+
+def _search_graphs(imputation: Union[str, PathLike, Iterable[str], ImputationBlock],
+                   graphs: List[Tuple[Union[str, int], Graph]],
+                   search_id: int, donors_info: Iterable[str], threshold: float, cutof: int, verbose: bool,
+                   writer: Union[ResultWriter, None], deduplicate: bool,
+                   profiler: Union[MatchingProfiler, None] = None,
+                   graph_versions: Union[GraphVersions, None] = None) -> Dict[int, tuple]:
+    """
+    Search the patients in several donors' graphs. The patients graph is created once, and each donors' graph
+    is searched in its own thread. The arguments are the same as in find_matches.
+    :return: {patient: (results_df, time)}, with the merged results of all the graphs (see merge_graphs_results).
+    """
+    g_m = DonorsMatching(graphs[0][1], verbose=verbose, profiler=profiler)
+
+    start_build_graph = time.time()
+    subclasses_by_patient, classes_by_patient = g_m.create_patients_graph(imputation, deduplicate=deduplicate)
+    patients = list(g_m.representatives.keys())
+    avg_build_time = (time.time() - start_build_graph) / len(patients) if patients else 0
+    if verbose:
+        print_time("Created patients graph")
+
+    def search_graph(graph: Graph) -> Dict[int, tuple]:
+        graph_matching = g_m.with_graph(graph)
+        graph_results = {}
+        for patient in patients:
+            if g_m.representatives[patient] != patient:
+                continue
+            start = time.time()
+            with profile_patient(profiler, patient):
+                results_df = search_in_levels(patient, graph_matching, donors_info, threshold, cutof,
+                                              classes_by_patient[patient], subclasses_by_patient[patient])
+            graph_results[patient] = (results_df, time.time() - start)
+        return graph_results
+
+    with ThreadPoolExecutor(max_workers=len(graphs), thread_name_prefix="grma-graph") as executor:
+        graphs_results = list(executor.map(search_graph, [graph for _, graph in graphs]))
+
+    patients_results = {}
+    for patient in patients:
+        representative = g_m.representatives[patient]
+        if representative != patient:
+            results_df, patient_time = patients_results[representative]
+            results_df = copy_patient_results(results_df, patient)
         else:
-            patients_results[patient] = results_df
+            results_df = merge_graphs_results([(name, graph_results[patient][0])
+                                               for (name, _), graph_results in zip(graphs, graphs_results)], cutof)
+            patient_time = avg_build_time + sum(graph_results[patient][1] for graph_results in graphs_results)
+        patients_results[patient] = (results_df, patient_time)
 
-        if save_to_csv:
-            # save results to csv
-            results_df.to_csv(os.path.join(f"Matching_Results_{search_id}", f"Patient_{patient}.csv"), index=True,
-                              float_format='%.2f')
-            if verbose:
-                print_time(f"Saved Matching results for {patient} in "
-                           f"{os.path.join(f'Matching_Results_{search_id}', f'Patient_{patient}.csv')}")
+        if writer is not None:
+            _write_results(writer, profiler, patient, results_df, graph_versions)
 
     return patients_results
 
 
-def matching(match_graph: MatchingGraph, grim_config_file="",
+def merge_graphs_results(graphs_results: Sequence[Tuple[Union[str, int], pd.DataFrame]], cutof: int) -> pd.DataFrame:
+    """
+    Merge the matches of a patient in several donors' graphs, in the order of search_in_levels:
+    the matches with fewer mismatches first, and the matches with the same number of mismatches by their score.
+    Each graph's results hold its best cutof matches in this order, so the first cutof merged matches are
+    the best of all the graphs.
+
+    :param graphs_results: (the graph's name, the patient's results in the graph) for each graph.
+    :param cutof: Maximum number of matches to return.
+    :return: The merged results, with a 'Graph' column of the graph's name after 'Donor_ID'.
+    """
+    frames = []
+    for name, results_df in graphs_results:
+        results_df = results_df.copy()
+        results_df.insert(results_df.columns.get_loc("Donor_ID") + 1, "Graph", name)
+        frames.append(results_df)
+
+    merged = pd.concat(frames, ignore_index=True)
+    merged = merged.sort_values(["Number_Of_Mismatches", "Matching_Probability"], ascending=[True, False],
+                                kind="stable")
+    return merged.head(cutof).reset_index(drop=True)
+
+
+def rescore(candidates_path: Union[str, PathLike], match_graph: Graph, donors_info: Iterable[str] = [],
+            threshold: float = 0.1, cutof: int = 100, verbose: bool = False, save_to_csv: bool = False,
+            search_id: int = 1, calculate_time: bool = False):
+    """
+    Score again patients whose genotype candidates were saved by find_matches (see save_candidates),
+    without searching the donors' graph. Only the scoring runs, so it is useful for trying other
+    thresholds, cutoffs or donors' fields.
+
+    :param candidates_path: A path to the candidates file saved by find_matches.
+    :param match_graph: The Graph object the candidates were found in.
+    :param donors_info: An iterable of fields from the database to include in the results. default is None.
+    :param threshold: Minimal score value for a valid match. default is 0.1.
+    :param cutof: Maximum number of matches to return. default is 100.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    :param save_to_csv: A boolean flag for whether to save the matching results into a csv file. default is False.
+    :param search_id: An integer identification of the search. default is 1.
+    :param calculate_time: A boolean flag for whether to return the scoring time for patient. default is False.
+    :return: A dictionary that maps each patient to its matching results formatted as a pandas.DataFrame
+    """
+    graph_hash, patients_candidates = load_candidates(candidates_path)
+    if graph_hash != match_graph.content_hash:
+        raise ValueError(f"The candidates in {candidates_path} were found in another graph.")
+
+    g_m = DonorsMatching(match_graph, verbose=verbose)
+    patients_results = {}
+    block_results = {}  # {block: results_df}, for patients with the same candidates
+    with ExitStack() as stack:
+        writer = _results_writer(stack, save_to_csv, None, search_id, verbose)
+        for patient, block, genotype, arrays in patients_candidates:
+            start = time.time()
+            if block in block_results:
+                results_df = copy_patient_results(block_results[block], patient)
+            else:
+                g_m.set_candidates_arrays(patient, genotype.tolist(), *arrays)
+                results_df = block_results[block] = score_in_levels(patient, g_m, donors_info, threshold, cutof)
+            patients_results[patient] = (results_df, time.time() - start)
+
+            if writer is not None:
+                writer.write(patient, results_df)
+
+    if verbose:
+        print_time(f"Scored {len(patients_results)} patients")
+
+    return _format_results(patients_results, donors_info, calculate_time)
+
+
+def _save_imputation_path(save_imputation: Union[bool, str, PathLike], search_id: int) -> Union[str, PathLike, None]:
+    """the path to save the imputation to, by matching's save_imputation (None if it should not be saved)"""
+    if save_imputation is True:
+        return f"imputation{search_id}.csv"
+    if not save_imputation:
+        return None
+    directory = os.path.dirname(os.path.abspath(save_imputation))
+    return save_imputation if os.path.isdir(directory) else None
+
+
+def matching(match_graph: Union[MatchingGraph, GraphHandle, Sequence[MatchingGraph], Mapping[str, MatchingGraph]],
+             grim_config_file="",
              save_imputation: Union[bool, str, PathLike] = False,
              donors_info: Union[Iterable[str], None] = None, search_id: int = 0,
              threshold: float = 0.1, cutof: int = 100,
-             verbose: bool = False, save_to_csv: bool = False):
+             verbose: bool = False, save_to_csv: bool = False, imputer: Union[GrimImputer, None] = None,
+             batch_size: Union[int, None] = None, save_results: Union[str, PathLike, ResultWriter, None] = None):
     """
     A function that performs the patients imputation with the matching.
-    The imputation is performed with GRIM algorithm.
+    The imputation is performed with GRIM algorithm, in memory (see grma.match.imputation.GrimImputer):
+    the imputed genotypes are passed to the matching without writing them to a file and reading them again.
 
-    :param match_graph: A Graph object from grma.match
+    :param match_graph: A Graph object from grma.match, a GraphHandle, or several graphs to search together
+    (see find_matches).
     :param grim_config_file: A path to configuration file for grim imputation. default is grim default config.
     :param save_imputation: A flag for whether to save the imputation results. default is False.
     Accepts boolean/str/PathLike values - False will not save a file,
@@ -234,22 +712,44 @@ def matching(match_graph: MatchingGraph, grim_config_file="",
     If one wishes to save the results to csv files, a directory named 'Matching_Results_{searchId}' will be created in
     the working directory. If a directory by this name was already created, an error will be raised.
     Note: saving a pandas into a csv might take a couple of seconds
+    :param imputer: The imputer of the patients - a GrimImputer, or any object with the same impute method.
+    A GrimImputer that is kept between calls loads grim's graph only once. default is a GrimImputer of
+    grim_config_file, which imputes the patients in its imputation_in_file.
+    :param batch_size: Number of patients in a batch of the pipelined mode. default is None (impute all the patients,
+    and then match them). If it is set, the patients are imputed in batches in a separate process, while the
+    previous batches are matched (see grma.match.pipeline.pipelined_matching). imputer can't be set with it.
+    :param save_results: A path (or a ResultWriter) to save the results of all the patients to, in one file
+    (see find_matches). default is None (not saved).
     :return: A dictionary that maps each patient to its matching results formatted as a pandas.DataFrame
     """
     if donors_info is None:
         donors_info = []
 
-    # disable output from grim
-    if not verbose:
-        sys.stdout = open(os.devnull, 'w')
-
-    imputation_path: str = run_grim(grim_config_file)
-
-    # enable output if disabled
-    if not verbose:
-        sys.stdout = sys.__stdout__
+    save_path = _save_imputation_path(save_imputation, search_id)
+    if batch_size is not None:
+        if imputer is not None:
+            raise ValueError("imputer can't be used with batch_size (see pipelined_matching's imputer_factory).")
+        return pipelined_matching(match_graph, grim_config_file, batch_size=batch_size, save_imputation=save_path,
+                                  donors_info=donors_info, search_id=search_id, threshold=threshold, cutof=cutof,
+                                  verbose=verbose, save_to_csv=save_to_csv, save_results=save_results)
+
+    with ExitStack() as stack:
+        # disable output from grim (it is enabled again even if the imputation fails)
+        if not verbose:
+            stack.enter_context(redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+
+        if imputer is None and not grim_config_file:
+            # grim's default configuration, which is imputed to grim's output file
+            imputation = run_grim()
+            if save_path is not None:
+                shutil.copyfile(imputation, save_path)
+        else:
+            if imputer is None:
+                imputer = GrimImputer(grim_config_file, verbose=verbose)
+            imputation = imputer.impute(save_to=save_path)
 
-    all_matches: Dict[int, pd.DataFrame] = find_matches(imputation_path, match_graph, search_id, donors_info,
-                                                        threshold, cutof, verbose, save_to_csv)
+    all_matches: Dict[int, pd.DataFrame] = find_matches(imputation, match_graph, search_id, donors_info,
+                                                        threshold, cutof, verbose, save_to_csv,
+                                                        save_results=save_results)
 
     return all_matches
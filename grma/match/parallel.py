@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import io
+import shutil
+import tempfile
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from os import PathLike
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+import pandas as pd
+
+from grma.match import donors_matching
+from grma.match.candidates import PatientCandidates
+from grma.match.donors_matching import DonorsMatching, set_database, copy_patient_results, \
+    iter_patients, patient_fingerprint
+from grma.match.graph_wrapper import Graph
+from grma.match.scheduling import estimate_patient_cost, longest_job_first_tasks
+from grma.utilities.imputation_reader import open_imputation_file
+from grma.utilities.utils import print_time, reset_tqdm_lock
+
+DEFAULT_CHUNK_SIZE: int = 16
+
+# The donors' graph of a worker process. It is set once, when the worker starts.
+_WORKER_GRAPH: Union[Graph, None] = None
+
+PatientRecords = Tuple[int, List[str]]  # (patient ID, the patient's lines in the imputation file)
+# (patient, df, time, error, candidates)
+PatientResult = Tuple[int, Union[pd.DataFrame, None], float, Union[str, None], Union[PatientCandidates, None]]
+# (patient, df, time, candidates) as yielded by parallel_find_matches
+PatientMatches = Tuple[int, Union[pd.DataFrame, None], float, Union[PatientCandidates, None]]
+# the search parameters sent to the workers
+SearchParameters = namedtuple("SearchParameters", ["donors_info", "threshold", "cutof", "with_candidates"])
+
+
+def iter_patients_records(imputation: Union[str, PathLike, Iterable[str]]) -> Iterator[PatientRecords]:
+    """
+    Split an imputation file (or its lines) into the lines of each patient, in the order of the file.
+    A new patient starts at a line with genotype index 0 (the same rule as in DonorsMatching.create_patients_graph).
+    """
+    if isinstance(imputation, (str, PathLike)):
+        with io.TextIOWrapper(open_imputation_file(imputation)) as f:
+            yield from iter_patients_records(f)
+        return
+
+    patient_id, lines = None, []
+    for line in imputation:
+        if not line.strip():
+            continue
+        # A malformed line stays with the current patient and fails only this patient in the worker.
+        index = line.rsplit(",", 1)[-1].strip()
+        if index.isdigit() and int(index) == 0 and lines:
+            yield patient_id, lines
+            lines = []
+        if not lines:
+            patient_id = line.split(",", 1)[0]
+            patient_id = int(patient_id) if patient_id.isdigit() else patient_id
+        lines.append(line)
+    if lines:
+        yield patient_id, lines
+
+
+def _init_worker(graph_directory: Union[str, PathLike], donors_db: pd.DataFrame):
+    """Memory-map the donors' graph once per worker process"""
+    global _WORKER_GRAPH
+    reset_tqdm_lock()
+    _WORKER_GRAPH = Graph.from_directory(graph_directory)
+    set_database(donors_db)
+
+
+def _match_records(records: List[PatientRecords], params: SearchParameters) -> List[PatientResult]:
+    """Match a batch of patients in a single patients graph"""
+    from grma.match.match import search_in_levels
+
+    g_m = DonorsMatching(_WORKER_GRAPH)
+    start_build_graph = time.time()
+    subclasses_by_patient, classes_by_patient = g_m.create_patients_graph(
+        [line for _, lines in records for line in lines])
+    avg_build_time = (time.time() - start_build_graph) / len(records)
+
+    results = []
+    for patient, _ in records:
+        start = time.time()
+        try:
+            results_df = search_in_levels(patient, g_m, params.donors_info, params.threshold, params.cutof,
+                                          classes_by_patient[patient], subclasses_by_patient[patient],
+                                          expand_all=params.with_candidates)
+            candidates = (g_m.patients[patient], g_m.candidates_arrays(patient)) if params.with_candidates else None
+            results.append((patient, results_df, time.time() - start + avg_build_time, None, candidates))
+        except Exception:
+            results.append((patient, None, time.time() - start + avg_build_time, traceback.format_exc(), None))
+    return results
+
+
+def _match_task(records: List[PatientRecords], params: SearchParameters) -> List[PatientResult]:
+    """
+    The task a worker runs. If the patients graph of the batch can't be built (e.g. a malformed line),
+    the patients are matched one by one, so only the bad patient fails.
+    """
+    try:
+        return _match_records(records, params)
+    except Exception:
+        if len(records) == 1:
+            return [(records[0][0], None, 0., traceback.format_exc(), None)]
+    return [result for record in records for result in _match_task([record], params)]
+
+
+def _estimate_cost(match_graph: Graph, lines: List[str]) -> float:
+    try:
+        return estimate_patient_cost(match_graph, lines)
+    except Exception:
+        return 0.  # a malformed patient fails fast in the worker
+
+
+def _deduplicate(records: List[PatientRecords]) -> Tuple[List[PatientRecords], Dict[int, int]]:
+    """
+    Returns the records of the patients with distinct genotypes distributions,
+    and the representative patient of each of the other records (by their positions in records).
+    """
+    unique, duplicates = [], {}
+    representative_by_fingerprint: Dict[str, int] = {}
+    for i, (patient, lines) in enumerate(records):
+        try:
+            fingerprint = patient_fingerprint(next(iter_patients(lines))[1])
+        except Exception:
+            unique.append((patient, lines))  # a malformed patient fails in the worker
+            continue
+        if fingerprint in representative_by_fingerprint:
+            duplicates[i] = representative_by_fingerprint[fingerprint]
+        else:
+            representative_by_fingerprint[fingerprint] = patient
+            unique.append((patient, lines))
+    return unique, duplicates
+
+
+def _fan_out(records: List[PatientRecords], duplicates: Dict[int, int],
+             results: Iterator[PatientMatches]) -> Iterator[PatientMatches]:
+    """
+    Merge the results of the unique patients with copies for their duplicates, in the order of the records.
+    A duplicate shares the candidates object of its representative.
+    """
+    representatives = set(duplicates.values())
+    kept = {}
+    for i, (patient, _) in enumerate(records):
+        if i in duplicates:
+            results_df, patient_time, candidates = kept[duplicates[i]]
+            yield patient, copy_patient_results(results_df, patient), patient_time, candidates
+            continue
+
+        patient, results_df, patient_time, candidates = next(results)
+        if patient in representatives:
+            kept[patient] = (results_df, patient_time, candidates)
+        yield patient, results_df, patient_time, candidates
+
+
+def parallel_find_matches(imputation: Union[str, PathLike, Iterable[str]], match_graph: Graph, workers: int,
+                          donors_info: Iterable[str], threshold: float, cutof: int,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, deduplicate: bool = True,
+                          with_candidates: bool = False, verbose: bool = False) -> Iterator[PatientMatches]:
+    """
+    Match the patients of an imputation file in a pool of worker processes.
+    All the workers memory-map the same graph directory, so the graph is loaded into memory only once.
+    If the graph was not loaded from a graph directory, it is saved to a temporary one for the run.
+    The patients are scheduled dynamically, the most expensive first, according to estimate_patient_cost.
+
+    A patient that fails (raises an error, or kills its worker process) gets None instead of a results DataFrame,
+    and the other patients are not affected (find_matches reports the failed patients in a MatchingError).
+
+    :param imputation: Path to the output file of the imputation made by grim, or the lines of the file.
+    :param match_graph: A Graph object from grma.match
+    :param workers: Number of worker processes.
+    :param donors_info: An iterable of fields from the database to include in the results.
+    :param threshold: Minimal score value for a valid match.
+    :param cutof: Maximum number of matches to return.
+    :param chunk_size: Maximum number of patients sent to a worker in each task.
+    :param deduplicate: A boolean flag for whether to search only once for patients with identical genotypes
+    distribution. default is True.
+    :param with_candidates: A boolean flag for whether to find all the genotype candidates of each patient
+    and return them (see CandidatesWriter). default is False.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    :return: A generator of (patient, results_df, patient_time, candidates), in the order of the patients in the file.
+    candidates is None unless with_candidates is set.
+    """
+    records = list(iter_patients_records(imputation))
+    if not records:
+        return
+    unique, duplicates = _deduplicate(records) if deduplicate else (records, {})
+
+    graph_directory = match_graph.directory
+    temp_directory = None
+    if graph_directory is None:
+        temp_directory = tempfile.mkdtemp(prefix="grma_graph_")
+        graph_directory = temp_directory
+        match_graph.to_directory(graph_directory)
+        if verbose:
+            print_time(f"Saved the donors' graph for the workers in {graph_directory}")
+
+    try:
+        # tasks are lists of positions in records, scheduled longest job first.
+        tasks = longest_job_first_tasks([_estimate_cost(match_graph, lines) for _, lines in unique],
+                                        workers, chunk_size)
+        params = SearchParameters(list(donors_info), threshold, cutof, with_candidates)
+        results = _run_tasks(unique, tasks, graph_directory, workers, params, verbose)
+        yield from _fan_out(records, duplicates, results)
+    finally:
+        if temp_directory is not None:
+            shutil.rmtree(temp_directory, ignore_errors=True)
+
+
+def _run_tasks(records: List[PatientRecords], tasks: List[List[int]], graph_directory: Union[str, PathLike],
+               workers: int, params: SearchParameters, verbose: bool) -> Iterator[PatientMatches]:
+    """
+    Run the tasks in a process pool and yield the results in the order of the records.
+    When a worker process dies, the pool is broken, and we can't tell which patient killed it.
+    The unfinished patients are split into two halves, each one retried in a new pool,
+    until the patient that breaks a pool when it runs alone is found and marked as failed.
+    """
+    done: Dict[int, PatientResult] = {}
+    next_to_yield = 0
+    groups = [tasks]  # each group of tasks runs in its own pool
+
+    while groups:
+        group = groups.pop(0)
+        unfinished = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(group)), initializer=_init_worker,
+                                 initargs=(graph_directory, donors_matching.DONORS_DB)) as executor:
+            futures = {executor.submit(_match_task, [records[i] for i in task], params): task for task in group}
+
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    for i, result in zip(task, future.result()):
+                        done[i] = result
+                except BrokenProcessPool:
+                    unfinished.extend(task)
+                    continue
+
+                while next_to_yield in done:
+                    yield _finish_patient(done.pop(next_to_yield), verbose)
+                    next_to_yield += 1
+
+        if len(group) == 1 and len(unfinished) == 1:
+            i = unfinished[0]
+            done[i] = (records[i][0], None, 0., "The worker process matching the patient died.", None)
+        elif unfinished:
+            unfinished.sort()
+            half = (len(unfinished) + 1) // 2
+            groups[:0] = [[[i] for i in part] for part in (unfinished[:half], unfinished[half:]) if part]
+
+        while next_to_yield in done:
+            yield _finish_patient(done.pop(next_to_yield), verbose)
+            next_to_yield += 1
+
+
+def _finish_patient(result: PatientResult, verbose: bool) -> PatientMatches:
+    patient, results_df, patient_time, error, candidates = result
+    if error is not None:
+        print_time(f"Matching failed for patient {patient}:\n{error}")
+    elif verbose:
+        print_time(f"Found matches for {patient}")
+    return patient, results_df, patient_time, candidates
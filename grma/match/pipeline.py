@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import functools
+import multiprocessing
+import os
+import queue
+import time
+import traceback
+from contextlib import ExitStack, redirect_stdout
+from os import PathLike
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Union
+
+import pandas as pd
+
+from grma.match.graph_handle import GraphHandle
+from grma.match.graph_wrapper import Graph
+from grma.match.imputation import GrimImputer, iter_grim_input
+from grma.match.result_writer import ResultWriter, open_result_writer
+from grma.utilities.utils import print_time, reset_tqdm_lock
+
+DEFAULT_BATCH_SIZE: int = 500  # patients
+DEFAULT_QUEUE_SIZE: int = 2  # imputed batches that wait for the matching
+
+
+def iter_input_batches(patients: Union[str, PathLike, Iterable[str]], batch_size: int) -> Iterator[List[str]]:
+    """Split grim's input (a path to the patients' file, or its lines) into batches of batch_size patients"""
+    batch = []
+    for record in iter_grim_input(patients):
+        batch.append(",".join(field for field in record if field is not None))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _impute_batches(imputer_factory: Callable, patients: Union[str, PathLike, Iterable[str], None],
+                    batch_size: int, save_imputation: Union[str, PathLike, None], blocks: multiprocessing.Queue,
+                    verbose: bool):
+    """
+    The imputation process: impute the patients batch by batch, and put each imputed batch in the queue.
+    The queue is bounded, so the imputation waits when the matching falls behind.
+    """
+    reset_tqdm_lock()
+    try:
+        with ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            save_file = stack.enter_context(open(save_imputation, "w")) if save_imputation is not None else None
+
+            imputer = imputer_factory()
+            for batch in iter_input_batches(patients if patients is not None else imputer.input_file, batch_size):
+                blocks.put(("block", imputer.impute(batch, save_to=save_file)))
+    except BaseException:
+        blocks.put(("error", traceback.format_exc()))
+    blocks.put(("end", None))
+
+
+def _next_block(blocks: multiprocessing.Queue, process: multiprocessing.Process) -> tuple:
+    """wait for the next item of the imputation process, and fail if the process died without sending it"""
+    while True:
+        try:
+            return blocks.get(timeout=1)
+        except queue.Empty:
+            if not process.is_alive():
+                raise RuntimeError("The imputation process stopped unexpectedly.")
+
+
+def pipelined_matching(match_graph: Union[Graph, GraphHandle, Sequence[Graph], Mapping[str, Graph]],
+                       grim_config_file: Union[str, PathLike, None] = None,
+                       patients: Union[str, PathLike, Iterable[str], None] = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE, queue_size: int = DEFAULT_QUEUE_SIZE,
+                       save_imputation: Union[str, PathLike, None] = None,
+                       donors_info: Iterable[str] = (), search_id: int = 0, threshold: float = 0.1,
+                       cutof: int = 100, verbose: bool = False, save_to_csv: bool = False,
+                       imputer_factory: Union[Callable, None] = None,
+                       save_results: Union[str, PathLike, ResultWriter, None] = None) -> Dict[int, pd.DataFrame]:
+    """
+    Impute and match the patients in a pipeline: the patients are split into batches, and while a batch is matched
+    (in this process), the next batches are imputed in a separate process. The imputed batches are passed through
+    a bounded queue, in memory (see GrimImputer). The total time approaches the longer of the imputation and the
+    matching, instead of their sum.
+
+    :param match_graph: The donors' graph, or several graphs to search together (see find_matches).
+    :param grim_config_file: A path to configuration file for grim imputation.
+    :param patients: grim's input - a path to the patients' file, or its lines.
+    default is the imputation_in_file of the configuration.
+    :param batch_size: Number of patients in a batch. default is 500.
+    :param queue_size: Maximum number of imputed batches that wait for the matching. default is 2.
+    :param save_imputation: A path to save the imputation to. default is None (not saved).
+    :param donors_info: An iterable of fields from the database to include in the results. default is None.
+    :param search_id: An integer identification of the search. default is 0.
+    :param threshold: Minimal score value for a valid match. default is 0.1.
+    :param cutof: Maximum number of matches to return. default is 100.
+    :param verbose: A boolean flag for whether to print the documentation. default is False
+    :param save_to_csv: A boolean flag for whether to save the matching results into a csv file. default is False.
+    :param imputer_factory: A function (that can be sent to another process) that creates the imputer in the
+    imputation process. default is a GrimImputer of grim_config_file.
+    :param save_results: A path (or a ResultWriter) to save the results of all the batches to, in one file
+    (see find_matches). default is None (not saved).
+    :return: A dictionary that maps each patient to its matching results formatted as a pandas.DataFrame
+    """
+    if imputer_factory is None:
+        if not grim_config_file:
+            raise ValueError("A grim configuration file or an imputer factory is required.")
+        imputer_factory = functools.partial(GrimImputer, grim_config_file, verbose=verbose)
+
+    blocks = multiprocessing.Queue(maxsize=queue_size)
+    process = multiprocessing.Process(target=_impute_batches, name="grma-imputation", daemon=True,
+                                      args=(imputer_factory, patients, batch_size, save_imputation, blocks, verbose))
+    process.start()
+
+    all_matches: Dict[int, pd.DataFrame] = {}
+    with ExitStack() as stack:
+        if save_results is not None and not isinstance(save_results, ResultWriter):
+            save_results = stack.enter_context(open_result_writer(save_results, verbose=verbose))
+        try:
+            _match_batches(blocks, process, match_graph, all_matches, search_id, donors_info, threshold, cutof,
+                           verbose, save_to_csv, save_results)
+        finally:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    return all_matches
+
+
+def _match_batches(blocks: multiprocessing.Queue, process: multiprocessing.Process, match_graph, all_matches: dict,
+                   search_id: int, donors_info: Iterable[str], threshold: float, cutof: int, verbose: bool,
+                   save_to_csv: bool, save_results: Union[ResultWriter, None]):
+    """match the imputed batches of the imputation process, until it ends"""
+    from grma.match.match import find_matches
+
+    batch_number = 0
+    while True:
+        start = time.time()
+        kind, value = _next_block(blocks, process)
+        if kind == "end":
+            break
+        if kind == "error":
+            raise RuntimeError(f"The imputation failed:\n{value}")
+
+        batch_number += 1
+        if verbose:
+            print_time(f"Waited {time.time() - start:.2f}s for imputed batch {batch_number}")
+        all_matches.update(find_matches(value, match_graph, search_id, donors_info, threshold, cutof, verbose,
+                                        save_to_csv, save_results=save_results))
+        if verbose:
+            print_time(f"Matched batch {batch_number} ({len(all_matches)} patients)")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import cProfile
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from os import PathLike
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Tuple, Union
+
+# The stages of a patient's search, in their order. The time of a stage does not include the stages in it
+# (e.g. "classes" does not include the "similarity" checks of the class candidates).
+STAGES = ("parse", "genotypes", "classes", "subclasses", "similarity", "scoring", "enrichment", "output", "other")
+COUNTERS = ("candidates_examined", "pairs_7_plus", "donor_nodes_scored", "donors_scored", "matches")
+
+
+class _PatientProfile(object):
+    __slots__ = "seconds", "stages", "counters"
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.stages: Dict[str, float] = {}
+        self.counters: Dict[str, int] = {}
+
+
+class MatchingProfiler(object):
+    """
+    Collects the time of each stage of the matching (see STAGES), and counters (see COUNTERS), for each patient and
+    in total. find_matches fills it when it is given one (profiler=...), and it is read by report or to_dataframe.
+    The work of a search is counted for the patient that is searched, including the candidates it finds for
+    other patients with the same genotypes (in classes and subclasses).
+    The searches of patients that are slower than profile_slower_than are also saved as cProfile statistics.
+
+    >>> profiler = MatchingProfiler(profile_slower_than=1.0, profile_dir="./profiles")
+    >>> results = find_matches(PATH_TO_PATIENTS_FILE, donors_graph, profiler=profiler)
+    >>> profiler.report()["stages"]
+    """
+    __slots__ = "profile_slower_than", "profile_dir", "_patients", "_stages", "_counters", "_slow_patients", \
+        "_lock", "_local"
+
+    def __init__(self, profile_slower_than: Union[float, None] = None,
+                 profile_dir: Union[str, PathLike] = "grma_profiles"):
+        """
+        :param profile_slower_than: Minimal search time (in seconds) of a patient to save its cProfile statistics.
+        default is None (cProfile is not used).
+        :param profile_dir: A directory to save the cProfile statistics to, as patient_{patient}.prof files
+        (see pstats). default is 'grma_profiles'.
+        """
+        self.profile_slower_than = profile_slower_than
+        self.profile_dir = profile_dir
+        self._patients: Dict[int, _PatientProfile] = {}
+        self._stages: Dict[str, float] = {}
+        self._counters: Dict[str, int] = {}
+        self._slow_patients: Dict[int, str] = {}  # {patient: path of its cProfile statistics}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # the patient and the stages stack of each thread
+
+    def _patient_profile(self, patient: int) -> _PatientProfile:
+        profile = self._patients.get(patient)
+        if profile is None:
+            profile = self._patients[patient] = _PatientProfile()
+        return profile
+
+    def _stack(self) -> List[list]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def add_time(self, stage: str, seconds: float, patient: Union[int, None] = None):
+        """Add time to a stage of a patient (default is the patient that is searched in this thread)"""
+        stack = self._stack()
+        if stack:
+            stack[-1][2] += seconds  # not counted in the enclosing stage
+        if patient is None:
+            patient = getattr(self._local, "patient", None)
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+            if patient is not None:
+                stages = self._patient_profile(patient).stages
+                stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def count(self, counter: str, n: int = 1):
+        """Add n to a counter of the patient that is searched in this thread (and to the total)"""
+        patient = getattr(self._local, "patient", None)
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + n
+            if patient is not None:
+                counters = self._patient_profile(patient).counters
+                counters[counter] = counters.get(counter, 0) + n
+
+    @contextmanager
+    def stage(self, stage: str) -> Iterator[None]:
+        """Time a stage of the search of the current patient"""
+        stack = self._stack()
+        entry = [stage, time.perf_counter(), 0.0]  # [stage, start, time of the stages in it]
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            stack.pop()
+            self.add_time(stage, time.perf_counter() - entry[1] - entry[2])
+
+    @contextmanager
+    def patient(self, patient: int) -> Iterator[None]:
+        """
+        Profile the search of a patient in this thread. The time of the search that is not in any stage is
+        counted as 'other'.
+        """
+        self._local.patient = patient
+        stack = self._stack()
+        entry = ["other", time.perf_counter(), 0.0]
+        stack.append(entry)
+        profile = None
+        if self.profile_slower_than is not None:
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:  # another profiler is active (e.g. in another thread)
+                profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            stack.pop()
+            seconds = time.perf_counter() - entry[1]
+            self.add_time("other", seconds - entry[2])
+            self._local.patient = None
+            with self._lock:
+                self._patient_profile(patient).seconds += seconds
+            if profile is not None and seconds >= self.profile_slower_than:
+                self._dump(patient, profile)
+
+    def _dump(self, patient: int, profile: cProfile.Profile):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"patient_{patient}.prof")
+        profile.dump_stats(path)
+        with self._lock:
+            self._slow_patients[patient] = path
+
+    def timed_patients(self, patients: Iterable[Tuple[int, Any]]) -> Iterator[Tuple[int, Any]]:
+        """
+        Wrap an iterator of (patient, ...) - e.g. iter_patients - to count the time of reading each patient
+        and of the work on it until the next patient is read, as the patient's 'parse' stage.
+        """
+        last = time.perf_counter()
+        for item in patients:
+            yield item
+            now = time.perf_counter()
+            self.add_time("parse", now - last, patient=item[0])
+            last = now
+
+    def report(self) -> Dict[str, Any]:
+        """
+        The profile as a dictionary:
+        {"patients": {patient: {"seconds": search time, "stages": {stage: seconds}, "counters": {counter: n}}},
+        "stages": {stage: total seconds}, "counters": {counter: total}, "slow_patients": {patient: cProfile file}}.
+        A patient's seconds are the time of its search, without its 'parse' stage.
+        """
+        with self._lock:
+            return {
+                "patients": {patient: {"seconds": profile.seconds, "stages": dict(profile.stages),
+                                       "counters": dict(profile.counters)}
+                             for patient, profile in self._patients.items()},
+                "stages": dict(self._stages),
+                "counters": dict(self._counters),
+                "slow_patients": dict(self._slow_patients),
+            }
+
+    def to_dataframe(self):
+        """The profile of the patients as a pandas.DataFrame: a row for each patient, with its search time,
+        the time of each stage and the counters"""
+        import pandas as pd
+
+        with self._lock:
+            rows = {patient: {"seconds": profile.seconds,
+                              **{stage: profile.stages.get(stage, 0.0) for stage in STAGES},
+                              **{counter: profile.counters.get(counter, 0) for counter in COUNTERS}}
+                    for patient, profile in self._patients.items()}
+        df = pd.DataFrame.from_dict(rows, orient="index", columns=["seconds", *STAGES, *COUNTERS])
+        df.index.name = "Patient_ID"
+        return df
+
+
+def profile_stage(profiler: Union[MatchingProfiler, None], stage: str) -> ContextManager:
+    """profiler.stage(stage), or a context that does nothing without a profiler"""
+    return profiler.stage(stage) if profiler is not None else nullcontext()
+
+
+def profile_patient(profiler: Union[MatchingProfiler, None], patient: int) -> ContextManager:
+    """profiler.patient(patient), or a context that does nothing without a profiler"""
+    return profiler.patient(patient) if profiler is not None else nullcontext()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import pickle
+import sqlite3
+import time
+from os import PathLike
+from typing import Union
+
+import pandas as pd
+
+DEFAULT_MAX_CACHE_BYTES: int = 1 << 30  # 1GB
+
+
+class MatchResultCache(object):
+    """
+    An on-disk cache of matching results, stored in a local SQLite file.
+    A result is keyed by the patient's genotypes distribution fingerprint (see patient_fingerprint),
+    the search parameters and the content hash of the donors' graph, so several graphs (e.g. the versions of a
+    GraphHandle, or the graphs of several registries) can share a cache file.
+    The least recently used results are evicted when the cache grows over max_bytes, so the results of graphs
+    that are no longer searched are evicted first.
+    """
+    __slots__ = "_path", "_max_bytes", "_graph_hash", "_connection"
+
+    def __init__(self, path: Union[str, PathLike], graph_hash: str, max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 drop_other_graphs: bool = False):
+        """
+        :param path: A path to the cache file. It will be created if it does not exist.
+        :param graph_hash: The content hash of the donors' graph (Graph.content_hash).
+        :param max_bytes: Maximum size of the stored results.
+        :param drop_other_graphs: A boolean flag for whether to drop the stored results of the other graphs.
+        default is False.
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._graph_hash = graph_hash
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS results ("
+                                 "key TEXT PRIMARY KEY, graph_hash TEXT, value BLOB, size INTEGER, last_used REAL)")
+        self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+        if drop_other_graphs:
+            self._connection.execute("DELETE FROM results WHERE graph_hash != ?", (graph_hash,))
+        self._connection.commit()
+
+    def _key(self, fingerprint: str, threshold: float, cutof: int) -> str:
+        return f"{self._graph_hash}:{fingerprint}:{threshold!r}:{cutof}"
+
+    def get(self, fingerprint: str, threshold: float, cutof: int) -> Union[pd.DataFrame, None]:
+        """return the stored results, None if they are not in the cache"""
+        key = self._key(fingerprint, threshold, cutof)
+        row = self._connection.execute("SELECT value FROM results WHERE key = ? AND graph_hash = ?",
+                                       (key, self._graph_hash)).fetchone()
+        if row is None:
+            return None
+
+        self._connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return pickle.loads(row[0])
+
+    def put(self, fingerprint: str, threshold: float, cutof: int, results_df: pd.DataFrame):
+        """store results, and evict the least recently used results if the cache is full"""
+        value = pickle.dumps(results_df, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(value) > self._max_bytes:
+            return
+
+        self._connection.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                                 (self._key(fingerprint, threshold, cutof), self._graph_hash, value, len(value),
+                                  time.time()))
+        self._evict()
+
+    def _evict(self):
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT key, size FROM results ORDER BY last_used").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self._max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._connection.executemany("DELETE FROM results WHERE key = ?", to_delete)
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def clear(self):
+        self._connection.execute("DELETE FROM results")
+        self._connection.commit()
+
+    def commit(self):
+        self._connection.commit()
+
+    def close(self):
+        self._connection.commit()
+        self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
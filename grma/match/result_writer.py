@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import os
+import pickle
+import queue
+import threading
+from abc import ABC, abstractmethod
+from os import PathLike
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from grma.utilities.utils import print_time
+
+DEFAULT_QUEUE_SIZE: int = 1024  # patients' results that wait for the writer
+DEFAULT_FLUSH_ROWS: int = 50000  # rows that are buffered before a bulk write
+CSV_FLOAT_FORMAT = "%.2f"
+COLUMNAR_HEADER = {"format": "grma-results", "version": 1}
+COLUMNAR_INDEX = "__index__"
+
+
+class ResultWriter(ABC):
+    """
+    Writes the matching results of the patients in a background thread, so the matching does not wait for the disk.
+    The results are passed through a bounded queue (the matching waits only when the writer falls queue_size
+    patients behind), and are buffered and written in bulk (see flush_rows).
+    find_matches creates one for save_to_csv/save_results, or uses a ResultWriter it is given (and does not close it),
+    e.g. to write the results of several searches to one file.
+
+    >>> with open_result_writer("./results.csv") as writer:
+    >>>     find_matches(PATH_TO_PATIENTS_FILE, donors_graph, save_results=writer)
+    """
+    __slots__ = "flush_rows", "verbose", "_queue", "_thread", "_error", "_closed", "patients", "rows"
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE, flush_rows: int = DEFAULT_FLUSH_ROWS,
+                 verbose: bool = False):
+        """
+        :param queue_size: Maximum number of patients' results that wait for the writer. default is 1024.
+        :param flush_rows: Number of rows to buffer before they are written. default is 50000.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        self.flush_rows = flush_rows
+        self.verbose = verbose
+        self.patients = 0  # written so far
+        self.rows = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error: Union[BaseException, None] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="grma-result-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, patient: int, results_df: pd.DataFrame):
+        """Queue the results of a patient to be written"""
+        if self._closed:
+            raise ValueError("The results writer is closed.")
+        if self._error is not None:
+            raise RuntimeError("The results writer failed.") from self._error
+        # a shallow copy, so the results can be changed (e.g. by the caller) while they wait to be written
+        self._queue.put((patient, results_df.copy(deep=False)))
+
+    def close(self):
+        """Write the queued results, and wait for the writer. Raises the writer's error if it failed."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+            if self.verbose and self._error is None:
+                print_time(f"Wrote the results of {self.patients} patients ({self.rows} rows)")
+        if self._error is not None:
+            raise RuntimeError("The results writer failed.") from self._error
+
+    def __enter__(self) -> ResultWriter:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.close()
+        except RuntimeError:
+            if exc_type is None:  # don't hide the error of the search
+                raise
+
+    def _run(self):
+        buffer: List[Tuple[int, pd.DataFrame]] = []
+        buffered_rows = 0
+        while True:
+            item = self._queue.get()
+            if item is not None:
+                if self._error is None:  # after an error the results are dropped, so the matching is not blocked
+                    buffer.append(item)
+                    buffered_rows += len(item[1])
+                if buffered_rows < self.flush_rows:
+                    continue
+
+            if buffer:
+                try:
+                    self._write(buffer)
+                    self.patients += len(buffer)
+                    self.rows += buffered_rows
+                except BaseException as e:
+                    self._error = e
+                buffer, buffered_rows = [], 0
+            if item is None:
+                break
+
+    @abstractmethod
+    def _write(self, results: List[Tuple[int, pd.DataFrame]]):
+        """write a buffer of (patient, results_df), in the writer's thread"""
+
+
+class PatientsCSVWriter(ResultWriter):
+    """
+    Writes the results of each patient to its own CSV file, Patient_{patient}.csv (the layout of save_to_csv).
+    Set flush_rows=1 to write the file of each patient as soon as its results are queued.
+    """
+    __slots__ = "directory", "file_name", "index", "float_format"
+
+    def __init__(self, directory: Union[str, PathLike], file_name: str = "Patient_{patient}.csv", index: bool = True,
+                 float_format: Union[str, None] = CSV_FLOAT_FORMAT, **kwargs):
+        """
+        :param directory: A directory to write the files to. It is created if it does not exist.
+        :param file_name: The name of the file of a patient, formatted with the patient's ID (as 'patient').
+        default is 'Patient_{patient}.csv'.
+        :param index: A boolean flag for whether to write the index of the results (the patient's ID). default is True.
+        :param float_format: The format of the probabilities in the files. default is '%.2f'
+        (None writes them in full precision).
+        The other keyword arguments are passed to ResultWriter.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.file_name = file_name
+        self.index = index
+        self.float_format = float_format
+        super().__init__(**kwargs)
+
+    def _write(self, results: List[Tuple[int, pd.DataFrame]]):
+        for patient, results_df in results:
+            path = os.path.join(self.directory, self.file_name.format(patient=patient))
+            results_df.to_csv(path, index=self.index, float_format=self.float_format)
+            if self.verbose:
+                print_time(f"Saved Matching results for {patient} in {path}")
+
+
+class CSVResultWriter(ResultWriter):
+    """
+    Appends the results of all the patients to a single CSV file, with the header once.
+    The rows are the rows of the patients' CSV files (see PatientsCSVWriter), with their Patient_ID column.
+    """
+    __slots__ = "_file", "_header"
+
+    def __init__(self, path: Union[str, PathLike], **kwargs):
+        self._file = open(path, "w", newline="")
+        self._header = True
+        super().__init__(**kwargs)
+
+    def _write(self, results: List[Tuple[int, pd.DataFrame]]):
+        frames = [results_df for _, results_df in results if len(results_df)] or [results[0][1]]
+        pd.concat(frames).to_csv(self._file, header=self._header, index=True, float_format=CSV_FLOAT_FORMAT)
+        self._header = False
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+class ColumnarResultWriter(ResultWriter):
+    """
+    Appends the results of all the patients to a single binary file, column by column: each bulk write is a chunk
+    of {column: numpy array} (pickled), with the Patient_ID column. The probabilities are kept in full precision.
+    Read it with read_results.
+    """
+    __slots__ = "_file",
+
+    def __init__(self, path: Union[str, PathLike], **kwargs):
+        self._file = open(path, "wb")
+        pickle.dump(COLUMNAR_HEADER, self._file)
+        super().__init__(**kwargs)
+
+    def _write(self, results: List[Tuple[int, pd.DataFrame]]):
+        # a batch without matches is written as an empty chunk, so the file keeps the columns
+        frames = [results_df for _, results_df in results if len(results_df)] or [results[0][1]]
+        chunk = pd.concat(frames)
+        columns: Dict[str, np.ndarray] = {COLUMNAR_INDEX: chunk.index.to_numpy()}
+        columns.update((column, chunk[column].to_numpy()) for column in chunk.columns)
+        pickle.dump(columns, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._file.close()
+
+
+def open_result_writer(path: Union[str, PathLike], **kwargs) -> ResultWriter:
+    """
+    A writer of the results of all the patients to a single file: a CSV file for a .csv path,
+    and a binary columnar file otherwise (see ColumnarResultWriter).
+    The keyword arguments are passed to the writer (see ResultWriter).
+    """
+    if os.fspath(path).endswith(".csv"):
+        return CSVResultWriter(path, **kwargs)
+    return ColumnarResultWriter(path, **kwargs)
+
+
+def read_results(path: Union[str, PathLike]) -> pd.DataFrame:
+    """Read a results file written by open_result_writer, as one pandas.DataFrame"""
+    if os.fspath(path).endswith(".csv"):
+        return pd.read_csv(path, index_col=0)
+
+    chunks = []
+    with open(path, "rb") as f:
+        if pickle.load(f) != COLUMNAR_HEADER:
+            raise ValueError(f"{path} is not a results file.")
+        while True:
+            try:
+                columns = pickle.load(f)
+            except EOFError:
+                break
+            index = columns.pop(COLUMNAR_INDEX)
+            chunks.append(pd.DataFrame(columns, index=index))
+    return pd.concat([chunk for chunk in chunks if len(chunk)] or chunks[:1]) if chunks else pd.DataFrame()
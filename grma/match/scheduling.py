@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Sequence
+
+from grma.match.donors_matching import classes_and_subclasses_from_genotype
+from grma.match.graph_wrapper import Graph
+from grma.utilities.geno_representation import HashableArray
+from grma.utilities.imputation_reader import parse_imputation_lines
+
+# Relative costs of the search steps, in units of one similarity check between two genotypes.
+GENOTYPE_LOOKUP_COST: float = 1.
+PATIENT_COST: float = 50.  # the patient's fixed overhead: patients graph, scoring and results df.
+
+# A task is closed when it reaches this fraction of the average work per worker,
+# so the cheap patients are batched and the expensive ones run alone.
+TASK_COST_FRACTION: float = 0.05
+
+
+def estimate_patient_cost(graph: Graph, lines: Iterable[str]) -> float:
+    """
+    A cheap estimation of the time it takes to match a patient, without searching the graph.
+    Every class (subclass) of the patient is checked against all the genotypes connected to it
+    (its second degree neighbors), once for each of the patient's genotypes that has it.
+
+    :param graph: The donors' graph.
+    :param lines: The patient's lines in the imputation file.
+    :return: The estimated cost of the patient, in units of one similarity check.
+    """
+    genos_per_class: Dict[int, int] = {}
+    genos_per_subclass: Dict[int, int] = {}
+    genotypes = set()
+    for geno in map(HashableArray, parse_imputation_lines(lines).genotypes):
+        if geno in genotypes:
+            continue
+        genotypes.add(geno)
+
+        classes, subclasses = classes_and_subclasses_from_genotype(geno)
+        for clss in classes:
+            genos_per_class[clss] = genos_per_class.get(clss, 0) + 1
+        for subclass in subclasses:
+            genos_per_subclass[subclass.subclass] = genos_per_subclass.get(subclass.subclass, 0) + 1
+
+    cost = PATIENT_COST + GENOTYPE_LOOKUP_COST * len(genotypes)
+    cost += sum(graph.degree(clss) * count for clss, count in genos_per_class.items())
+    cost += sum(graph.degree_2nd(sub) * count for sub, count in genos_per_subclass.items())
+    return cost
+
+
+def longest_job_first_tasks(costs: Sequence[float], workers: int, max_task_size: int) -> List[List[int]]:
+    """
+    Group patients into tasks for a dynamic scheduler (workers take the next task when they are free).
+    The tasks are ordered from the most expensive to the cheapest, so the long patients start first
+    and the cheap ones fill the gaps at the end of the run.
+
+    :param costs: The estimated cost of each patient.
+    :param workers: Number of worker processes.
+    :param max_task_size: Maximum number of patients in a task.
+    :return: The tasks, as lists of the patients' positions in costs.
+    """
+    order = sorted(range(len(costs)), key=lambda i: costs[i], reverse=True)
+    task_cost_limit = TASK_COST_FRACTION * sum(costs) / max(workers, 1)
+
+    tasks = []
+    task, task_cost = [], 0.
+    for i in order:
+        task.append(i)
+        task_cost += costs[i]
+        if task_cost >= task_cost_limit or len(task) >= max_task_size:
+            tasks.append(task)
+            task, task_cost = [], 0.
+    if task:
+        tasks.append(task)
+    return tasks
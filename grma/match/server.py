@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import itertools
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import PathLike
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from grma.match.donors_matching import copy_patient_results
+from grma.match.graph_handle import GraphHandle
+from grma.match.graph_wrapper import Graph
+from grma.match.parallel import iter_patients_records
+from grma.utilities.imputation_reader import parse_imputation_lines
+from grma.utilities.utils import print_time
+
+DEFAULT_MAX_BATCH_SIZE: int = 64  # requests
+DEFAULT_MAX_BATCH_DELAY: float = 0.005  # seconds to wait for more requests before a batch is searched
+LATENCY_WINDOW: int = 10000  # number of recent requests in the latency percentiles
+STREAM_LIMIT: int = 1 << 26  # the longest request/response line
+
+
+def _json_default(value):
+    """convert numpy scalars in the results to python values"""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _Request(object):
+    """A match request that waits in the queue for its batch"""
+    __slots__ = "records", "graph", "params", "future", "received"
+
+    def __init__(self, records: List[Tuple[int, List[str]]], graph: Union[str, None], params: tuple,
+                 future: asyncio.Future):
+        self.records = records
+        self.graph = graph
+        self.params = params  # (threshold, cutof, donors_info)
+        self.future = future
+        self.received = time.perf_counter()
+
+
+class MatchingServer(object):
+    """
+    A resident matching service, which keeps the donors' graphs loaded and matches patients on request.
+    It listens on a unix socket (or a local TCP port) for requests of newline delimited JSON objects:
+     - {"id": ..., "method": "match", "lines": [the patient's imputation lines], "graph": name, "threshold": 0.1,
+       "cutof": 100, "donors_info": []} - the results are {patient: {"columns": [...], "data": [matches' rows]}}.
+       graph is optional, default is all the graphs (see find_matches).
+     - {"id": ..., "method": "stats"} - the queue depth, the number of batches and the latency percentiles.
+    Every response has the id of its request (null if the request is not a JSON object), and either "results"
+    or "error".
+
+    The requests that arrive together are searched in a micro-batch - one find_matches call on all their patients,
+    so they share a patients graph (and patients with identical genotypes are searched once).
+    A request that fails (e.g. with malformed lines) gets its error, and does not fail the other requests of its batch.
+    A batch is closed when it has max_batch_size requests, or max_batch_delay seconds after its first request.
+    The batches are searched one at a time, in a worker thread, and the next batch fills while one is searched.
+
+    >>> server = MatchingServer({"registry": Graph.from_directory("./data/donors_graph")})
+    >>> asyncio.run(server.serve_forever(path="/tmp/grma.sock"))
+    """
+    __slots__ = "_graphs", "_max_batch_size", "_max_batch_delay", "_verbose", "_queue", "_server", "_batcher", \
+        "_executor", "_patient_ids", "_in_flight", "_latencies", "_num_requests", "_num_batches"
+
+    def __init__(self, graphs: Union[Graph, GraphHandle, Mapping[str, Union[Graph, GraphHandle]]],
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_batch_delay: float = DEFAULT_MAX_BATCH_DELAY, verbose: bool = False):
+        """
+        :param graphs: The donors' graph, or a dict of named graphs. A graph in a GraphHandle can be swapped
+        for a new version while the server runs, and the results have the version of the graph they were found in.
+        :param max_batch_size: Maximum number of requests in a batch. default is 64.
+        :param max_batch_delay: Maximum time (in seconds) a request waits for the other requests of its batch.
+        default is 0.005.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        """
+        self._graphs: Dict[str, Union[Graph, GraphHandle]] = \
+            {"default": graphs} if isinstance(graphs, (Graph, GraphHandle)) else dict(graphs)
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        self._verbose = verbose
+        self._queue = None  # created in the server's event loop
+        self._server = None
+        self._batcher = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grma-match")
+        self._patient_ids = itertools.count(1)  # the patients are renamed, so the IDs of requests don't collide
+        self._in_flight = 0  # number of requests in the batch that is searched
+        self._latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._num_requests = 0
+        self._num_batches = 0
+
+    async def start(self, path: Union[str, PathLike, None] = None, host: str = "127.0.0.1", port: int = 0):
+        """
+        Start listening, on a unix socket if path is given, otherwise on a TCP port.
+
+        :param path: A path to the unix socket.
+        :param host: The host of the TCP server. default is localhost.
+        :param port: The port of the TCP server. default is 0 (a free port, see address).
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._batch_loop())
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path, limit=STREAM_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port,
+                                                      limit=STREAM_LIMIT)
+        if self._verbose:
+            print_time(f"Matching server is listening on {self.address}")
+
+    @property
+    def address(self):
+        """The address the server listens on (a unix socket's path, or (host, port))"""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self, path: Union[str, PathLike, None] = None, host: str = "127.0.0.1", port: int = 0):
+        await self.start(path, host, port)
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def close(self):
+        """Stop listening and searching. The requests that were not searched yet get an error."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        while self._queue is not None and not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(RuntimeError("The matching server was closed."))
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        """The state of the server: the requests in the queue and in the searched batch, the latency
+        percentiles (in milliseconds, from the arrival of a request to its results or error) of the recent requests,
+        and the version of each graph that new requests are searched in."""
+        latencies = np.array(self._latencies, dtype=np.float64) * 1000
+        percentiles = np.percentile(latencies, [50, 90, 99]).tolist() if len(latencies) else [0., 0., 0.]
+        return {"queue_depth": self._queue.qsize() if self._queue is not None else 0,
+                "in_flight": self._in_flight,
+                "requests": self._num_requests,
+                "batches": self._num_batches,
+                "mean_batch_size": self._num_requests / self._num_batches if self._num_batches else 0.,
+                "latency_ms": dict(zip(("p50", "p90", "p99"), percentiles)),
+                "graph_versions": {name: graph.version if isinstance(graph, GraphHandle) else graph.content_hash
+                                   for name, graph in self._graphs.items()}}
+
+    async def match(self, lines: Iterable[str], graph: Union[str, None] = None, threshold: float = 0.1,
+                    cutof: int = 100, donors_info: Iterable[str] = ()) -> Dict[Union[int, str], pd.DataFrame]:
+        """
+        Queue patients for the next batch, and wait for their matches.
+
+        :param lines: The patients' lines in the imputation file.
+        :param graph: The name of the graph to search. default is all the graphs.
+        :param threshold: Minimal score value for a valid match. default is 0.1.
+        :param cutof: Maximum number of matches to return. default is 100.
+        :param donors_info: An iterable of fields from the database to include in the results. default is None.
+        :return: {patient: the patient's results DataFrame}
+        """
+        if graph is not None and graph not in self._graphs:
+            raise KeyError(f"There is no graph named {graph}.")
+        future = asyncio.get_running_loop().create_future()
+        records = list(iter_patients_records(list(lines)))
+        self._queue.put_nowait(_Request(records, graph, (float(threshold), int(cutof), tuple(donors_info)), future))
+        return await future
+
+    async def _batch_loop(self):
+        """Collect the queued requests into batches and search them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_batch_delay
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0 and self._queue.empty():
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), max(timeout, 0)))
+                except asyncio.TimeoutError:
+                    break
+
+            # the requests of a batch are searched together if they have the same search parameters
+            groups: Dict[tuple, List[_Request]] = {}
+            for request in batch:
+                groups.setdefault((request.graph, request.params), []).append(request)
+
+            self._in_flight = len(batch)
+            for (graph, params), requests in groups.items():
+                try:
+                    outcomes = await loop.run_in_executor(self._executor, self._search, requests, graph, params)
+                except Exception as e:
+                    outcomes = [e] * len(requests)
+                now = time.perf_counter()
+                for request, outcome in zip(requests, outcomes):
+                    self._latencies.append(now - request.received)
+                    if request.future.done():
+                        continue
+                    if isinstance(outcome, Exception):
+                        request.future.set_exception(outcome)
+                    else:
+                        request.future.set_result(outcome)
+            self._in_flight = 0
+            self._num_requests += len(batch)
+            self._num_batches += 1
+            if self._verbose:
+                print_time(f"Searched a batch of {len(batch)} requests")
+
+    def _search(self, requests: List[_Request], graph: Union[str, None],
+                params: tuple) -> List[Union[Dict[Union[int, str], pd.DataFrame], Exception]]:
+        """
+        Search the patients of several requests in one find_matches call (runs in the worker thread).
+        A request with malformed lines is not searched, and if the search of the batch fails, each request is
+        searched alone, so a failed request does not fail the others.
+
+        :return: The results of each request, or its error.
+        """
+        outcomes: List[Union[Dict[Union[int, str], pd.DataFrame], Exception, None]] = [None] * len(requests)
+        valid = []
+        for i, request in enumerate(requests):
+            try:
+                parse_imputation_lines([line for _, patient_lines in request.records for line in patient_lines])
+            except ValueError as e:
+                outcomes[i] = e
+            else:
+                valid.append(i)
+
+        if not valid:
+            return outcomes
+        try:
+            for i, request_results in zip(valid, self._search_requests([requests[i] for i in valid], graph, params)):
+                outcomes[i] = request_results
+        except Exception as e:
+            if len(valid) == 1:
+                outcomes[valid[0]] = e
+                return outcomes
+            for i in valid:
+                try:
+                    outcomes[i] = self._search_requests([requests[i]], graph, params)[0]
+                except Exception as request_error:
+                    outcomes[i] = request_error
+        return outcomes
+
+    def _search_requests(self, requests: List[_Request], graph: Union[str, None],
+                         params: tuple) -> List[Dict[Union[int, str], pd.DataFrame]]:
+        """search the patients of the requests together, renamed so their IDs don't collide"""
+        from grma.match.match import find_matches
+
+        threshold, cutof, donors_info = params
+        lines, renamed = [], []  # renamed - [(request's position, the patient's ID in the request)]
+        for i, request in enumerate(requests):
+            for patient, patient_lines in request.records:
+                patient_id = next(self._patient_ids)
+                renamed.append((patient_id, i, patient))
+                lines.extend(f"{patient_id},{line.split(',', 1)[1]}" for line in patient_lines)
+
+        match_graph = self._graphs[graph] if graph is not None else \
+            (next(iter(self._graphs.values())) if len(self._graphs) == 1 else self._graphs)
+        matches = find_matches(lines, match_graph, donors_info=list(donors_info), threshold=threshold, cutof=cutof)
+
+        results = [{} for _ in requests]
+        for patient_id, i, patient in renamed:
+            results[i][patient] = copy_patient_results(matches[patient_id], patient)
+        return results
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer the requests of a connection. The requests are answered when they are done, not in order."""
+        write_lock = asyncio.Lock()
+        pending = set()
+
+        async def answer(line: bytes):
+            response = {"id": None}
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("A request must be a JSON object.")
+                response["id"] = message.get("id")
+                if message.get("method") == "stats":
+                    response["results"] = self.stats()
+                elif message.get("method") == "match":
+                    matches = await self.match(message["lines"], message.get("graph"),
+                                               message.get("threshold", 0.1), message.get("cutof", 100),
+                                               message.get("donors_info", ()))
+                    # the columns are sent with the rows, so results without matches keep them
+                    response["results"] = {str(patient): results_df.to_dict(orient="split", index=False)
+                                           for patient, results_df in matches.items()}
+                else:
+                    raise ValueError(f"Unknown method {message.get('method')}.")
+            except Exception as e:
+                response = {"id": response["id"], "error": f"{type(e).__name__}: {e}"}
+            async with write_lock:
+                writer.write(json.dumps(response, default=_json_default).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(answer(line))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class MatchingClient(object):
+    """
+    An asyncio client of a MatchingServer. Several requests can be sent at once on the same connection.
+
+    >>> client = await MatchingClient.connect(path="/tmp/grma.sock")
+    >>> matches = await client.match(patient_lines, threshold=0.1, cutof=100)
+    >>> await client.close()
+    """
+    __slots__ = "_reader", "_writer", "_pending", "_request_ids", "_reader_task"
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._reader_task = asyncio.ensure_future(self._read_responses())
+
+    @classmethod
+    async def connect(cls, path: Union[str, PathLike, None] = None, host: str = "127.0.0.1",
+                      port: Union[int, None] = None) -> MatchingClient:
+        """Connect to a server on a unix socket if path is given, otherwise on a TCP port."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=STREAM_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+        return cls(reader, writer)
+
+    async def _read_responses(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                response = json.loads(line)
+                future = self._pending.pop(response.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response["results"])
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The connection to the matching server was closed."))
+            self._pending.clear()
+
+    async def _request(self, message: dict):
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(json.dumps({"id": request_id, **message}).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def match(self, lines: Iterable[str], graph: Union[str, None] = None, threshold: float = 0.1,
+                    cutof: int = 100, donors_info: Iterable[str] = ()) -> Dict[str, pd.DataFrame]:
+        """
+        Match patients in the server (see MatchingServer.match).
+
+        :return: {patient (as str): the patient's results DataFrame}
+        """
+        results = await self._request({"method": "match", "lines": list(lines), "graph": graph,
+                                       "threshold": threshold, "cutof": cutof, "donors_info": list(donors_info)})
+        return {patient: pd.DataFrame(result["data"], columns=result["columns"])
+                for patient, result in results.items()}
+
+    async def stats(self) -> dict:
+        """The server's queue depth, batches and latency percentiles (see MatchingServer.stats)"""
+        return await self._request({"method": "stats"})
+
+    async def close(self):
+        self._writer.close()
+        await self._writer.wait_closed()
+        await self._reader_task
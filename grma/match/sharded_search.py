@@ -0,0 +1,364 @@
+from __future__ import annotations
+
+import hashlib
+import multiprocessing
+import time
+import traceback
+from os import PathLike
+from typing import Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from grma.donorsgraph.sharded_build import load_shards_manifest, load_route_keys, shard_of_genotypes
+from grma.match.donors_matching import DonorsMatching, _init_results_df, append_matching_donor, \
+    alleles_match_probabilities, classes_and_subclasses_from_genotype, copy_patient_results, iter_patients, \
+    locuses_match_between_genos, most_common_genotype, patient_fingerprint
+from grma.match.graph_wrapper import Graph
+from grma.match.parallel import iter_patients_records
+from grma.utilities.utils import print_time, reset_tqdm_lock
+
+DEFAULT_BATCH_SIZE: int = 256
+# The mismatches that are scored after each level of the search (as in search_in_levels):
+# genotypes (0 mismatches), classes (1) and subclasses (2 and 3).
+LEVELS_MISMATCHES: Tuple[Tuple[int, ...], ...] = ((0,), (1,), (2, 3))
+
+# (shard has any of the patient's genotypes, the patient's classes in the shard, the patient's subclasses in the shard)
+ShardRoute = Tuple[bool, Set[int], Set[int]]
+DonorsScores = Tuple[np.ndarray, np.ndarray]  # (donors' IDs, their scores)
+
+
+class ShardSearcher(object):
+    """
+    The search in a single shard of a sharded graph (see grma.donorsgraph.sharded_build).
+    It finds the genotype candidates of the patients in the shard, for the expansions that the coordinator
+    routes to it, and returns the donors' scores in the shard - a part of their scores in the whole graph.
+    """
+    __slots__ = "_graph", "_matching", "_classes", "_subclasses"
+
+    def __init__(self, graph: Graph):
+        self._graph = graph
+        self._matching = None
+        self._classes: Dict[int, Set[int]] = {}
+        self._subclasses: Dict[int, Set] = {}
+
+    def add_patients(self, lines: List[str]):
+        """Start a new batch of patients, from their lines in the imputation file"""
+        self._matching = DonorsMatching(self._graph)
+        self._subclasses, self._classes = self._matching.create_patients_graph(lines)
+
+    def search_level(self, level: int, expansions: Dict[int, Set[int]]) -> Dict[int, List[DonorsScores]]:
+        """
+        Find the genotype candidates of a level of the search (see LEVELS_MISMATCHES) and score them.
+
+        :param level: 0 - the patients' genotypes, 1 - their classes, 2 - their subclasses.
+        :param expansions: {patient: the classes (subclasses) of the patient to search in this shard}.
+        The genotypes' level searches all the patient's genotypes.
+        :return: {patient: [the donors' scores for each number of mismatches of the level]}
+        """
+        scores = {}
+        for patient, keys in expansions.items():
+            if level == 0:
+                self._matching.find_geno_candidates_by_genotypes(patient)
+            elif level == 1:
+                self._matching.find_geno_candidates_by_classes([clss for clss in self._classes[patient]
+                                                                if clss in keys])
+            else:
+                self._matching.find_geno_candidates_by_subclasses([sub for sub in self._subclasses[patient]
+                                                                   if sub.subclass in keys])
+            scores[patient] = [self._donors_scores(patient, mismatch) for mismatch in LEVELS_MISMATCHES[level]]
+        return scores
+
+    def _donors_scores(self, patient: int, mismatch: int) -> DonorsScores:
+        """the scores of the donors of the scored donor nodes"""
+        donors, scores = [], []
+        for donor_node, score in self._matching.donor_nodes_scores(patient, mismatch).items():
+            for donor in self._graph.donors_of(donor_node):
+                donors.append(donor)
+                scores.append(score)
+        return np.array(donors, dtype=np.int64), np.array(scores, dtype=np.float64)
+
+    def donors_genotypes(self, donors: Iterable[int]) -> Dict[int, List[Tuple[Tuple[int, ...], float]]]:
+        """return the (genotype, probability) pairs of the donors that are in the shard"""
+        genotypes = {}
+        for donor in donors:
+            node_num = self._graph.get_node_id(donor)
+            if node_num is None:
+                continue
+            geno_ids, weights = self._graph.neighbors_ids(node_num)
+            genotypes[donor] = [(tuple(np.asarray(self._graph.node_value_from_id(geno_id)).tolist()), weight)
+                                for geno_id, weight in zip(geno_ids.tolist(), weights.tolist())]
+        return genotypes
+
+
+def _serve_shard(shard_directory: Union[str, PathLike], connection):
+    """The loop of a shard's process: run the coordinator's requests on the memory-mapped shard"""
+    reset_tqdm_lock()
+    searcher = ShardSearcher(Graph.from_directory(shard_directory))
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            connection.send((True, getattr(searcher, method)(*args)))
+        except Exception:
+            connection.send((False, traceback.format_exc()))
+    connection.close()
+
+
+class _LocalShard(object):
+    """A shard that is searched in the coordinator's process"""
+    __slots__ = "_searcher", "_result"
+
+    def __init__(self, shard_directory: Union[str, PathLike]):
+        self._searcher = ShardSearcher(Graph.from_directory(shard_directory))
+        self._result = None
+
+    def submit(self, method: str, *args):
+        self._result = getattr(self._searcher, method)(*args)
+
+    def result(self):
+        return self._result
+
+    def close(self):
+        pass
+
+
+class _ProcessShard(object):
+    """A shard that is searched in its own process. The requests of all the shards are sent before waiting."""
+    __slots__ = "_directory", "_connection", "_process"
+
+    def __init__(self, shard_directory: Union[str, PathLike]):
+        self._directory = shard_directory
+        self._connection, child_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_shard, args=(shard_directory, child_connection),
+                                                daemon=True)
+        self._process.start()
+        child_connection.close()
+
+    def submit(self, method: str, *args):
+        self._connection.send((method, args))
+
+    def result(self):
+        ok, value = self._connection.recv()
+        if not ok:
+            raise RuntimeError(f"The search failed in the shard {self._directory}:\n{value}")
+        return value
+
+    def close(self):
+        if self._process.is_alive():
+            self._connection.send(None)
+            self._process.join()
+        self._connection.close()
+
+
+def _select_matches(scores: List[DonorsScores], threshold: float, cutof: int,
+                    matched: Set[int]) -> List[Tuple[int, float]]:
+    """
+    Merge the donors' scores of the shards, and select the matches as score_matches does:
+    the donors with a score of at least threshold that were not matched yet, the best first, up to cutof matches.
+    """
+    if len(matched) >= cutof or not scores:
+        return []
+    donors, inverse = np.unique(np.concatenate([donors for donors, _ in scores]), return_inverse=True)
+    totals = np.bincount(inverse.ravel(), weights=np.concatenate([donor_scores for _, donor_scores in scores]),
+                         minlength=len(donors))
+
+    selected = []
+    for i in np.argsort(-totals, kind="stable").tolist():
+        if totals[i] < threshold or len(matched) >= cutof:
+            break
+        donor = int(donors[i])
+        if donor in matched:
+            continue
+        matched.add(donor)
+        selected.append((donor, float(totals[i])))
+    return selected
+
+
+class ShardCoordinator(object):
+    """
+    Searches a sharded graph (see grma.donorsgraph.sharded_build.build_sharded_graph).
+    Each shard is searched by its own searcher, in a process of its own (or in this process).
+    The expansions of each patient are routed only to the shards that can hold candidates for them:
+    a genotype to the shard of its class I range, and a class or a subclass to the shards that have it.
+    The donors' scores of the shards are added up, and the matches are selected level by level,
+    as in search_in_levels, with the same results as the search of a single graph of all the donors
+    (donors with equal scores might be ordered differently, which matters at the cutof).
+
+    >>> with ShardCoordinator("./data/donors_shards") as coordinator:
+    ...     matches = coordinator.find_matches("./data/patients.csv")
+    """
+    __slots__ = "_bounds", "_directories", "_content_hashes", "_route_keys", "_shards"
+
+    def __init__(self, sharded_directory: Union[str, PathLike], processes: bool = True):
+        """
+        :param sharded_directory: A path to the sharded graph's directory.
+        :param processes: A boolean flag for whether to search each shard in its own process. default is True.
+        """
+        self._bounds, self._directories, self._content_hashes = load_shards_manifest(sharded_directory)
+        self._route_keys = [load_route_keys(directory) for directory in self._directories]
+        shard_class = _ProcessShard if processes else _LocalShard
+        self._shards = []
+        try:
+            for directory in self._directories:
+                self._shards.append(shard_class(directory))
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self) -> ShardCoordinator:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Stop the shards' processes"""
+        for shard in self._shards:
+            shard.close()
+        self._shards = []
+
+    @property
+    def num_shards(self) -> int:
+        return len(self._directories)
+
+    @property
+    def content_hash(self) -> str:
+        """A hash of the shards' content hashes, which identifies the version of the sharded graph"""
+        h = hashlib.blake2b(digest_size=16)
+        for content_hash in self._content_hashes:
+            h.update(content_hash.encode())
+        return h.hexdigest()
+
+    def route(self, genotypes: Sequence) -> List[ShardRoute]:
+        """
+        Route the expansions of a patient to the shards.
+
+        :param genotypes: The patient's genotypes (HashableArray).
+        :return: The patient's route in each shard - (shard has any of the patient's genotypes,
+        the classes of the patient in the shard, the subclasses of the patient in the shard).
+        """
+        genotype_shards = set(shard_of_genotypes(self._bounds, np.array([geno.np() for geno in genotypes],
+                                                                        dtype=np.uint16)).tolist())
+        classes, subclasses = set(), set()
+        for geno in genotypes:
+            geno_classes, geno_subclasses = classes_and_subclasses_from_genotype(geno)
+            classes.update(geno_classes)
+            subclasses.update(sub.subclass for sub in geno_subclasses)
+
+        return [(i in genotype_shards, {clss for clss in classes if clss in route_keys},
+                 {sub for sub in subclasses if sub in route_keys})
+                for i, route_keys in enumerate(self._route_keys)]
+
+    def find_matches(self, imputation: Union[str, PathLike, Iterable[str]], donors_info: Iterable[str] = (),
+                     threshold: float = 0.1, cutof: int = 100, verbose: bool = False,
+                     calculate_time: bool = False, deduplicate: bool = True,
+                     batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Match the patients of an imputation file in the sharded graph (see grma.match.find_matches).
+
+        :param imputation: Path to the output file of the imputation made by grim, or the lines of the file.
+        :param donors_info: An iterable of fields from the database to include in the results. default is None.
+        :param threshold: Minimal score value for a valid match. default is 0.1.
+        :param cutof: Maximum number of matches to return. default is 100.
+        :param verbose: A boolean flag for whether to print the documentation. default is False
+        :param calculate_time: A boolean flag for whether to return the matching time for patient. default is False.
+        :param deduplicate: A boolean flag for whether to search only once for patients with identical genotypes
+        distribution. default is True.
+        :param batch_size: Number of patients that are sent to the shards at once. default is 256.
+        :return: A dictionary that maps each patient to its matching results formatted as a pandas.DataFrame
+        """
+        donors_info = list(donors_info)
+        records = list(iter_patients_records(imputation))
+        results = {}
+        representatives = {}  # {patient: the patient with the same genotypes distribution that is searched}
+        unique = []
+        representative_by_fingerprint: Dict[str, int] = {}
+        for patient, lines in records:
+            genotypes = next(iter_patients(lines))[1]
+            fingerprint = patient_fingerprint(genotypes) if deduplicate else None
+            if fingerprint is not None and fingerprint in representative_by_fingerprint:
+                representatives[patient] = representative_by_fingerprint[fingerprint]
+                continue
+            representative_by_fingerprint[fingerprint] = representatives[patient] = patient
+            unique.append((patient, lines, genotypes))
+
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start: start + batch_size]
+            batch_start = time.time()
+            batch_results = self._search_batch(batch, donors_info, threshold, cutof)
+            patient_time = (time.time() - batch_start) / len(batch)
+            for patient, results_df in batch_results.items():
+                results[patient] = (results_df, patient_time)
+            if verbose:
+                print_time(f"Searched {start + len(batch)} of {len(unique)} patients in {self.num_shards} shards")
+
+        formatted = {}
+        for patient, _ in records:
+            results_df, patient_time = results[representatives[patient]]
+            if representatives[patient] != patient:
+                results_df = copy_patient_results(results_df, patient)
+            formatted[patient] = (results_df, patient_time) if calculate_time else results_df
+        return formatted
+
+    def _search_batch(self, batch: List[Tuple[int, List[str], list]], donors_info: List[str], threshold: float,
+                      cutof: int) -> Dict[int, pd.DataFrame]:
+        """search a batch of (patient, lines, parsed genotypes) in the shards, level by level"""
+        routes = {patient: self.route(list(dict.fromkeys(geno for geno, _, _ in genotypes)))
+                  for patient, _, genotypes in batch}
+        for i, shard in enumerate(self._shards):
+            shard.submit("add_patients", [line for patient, lines, _ in batch if any(routes[patient][i])
+                                          for line in lines])
+        for shard in self._shards:
+            shard.result()
+
+        matched = {patient: set() for patient, _, _ in batch}
+        selected = {patient: [] for patient, _, _ in batch}  # {patient: [(donor, score, mismatches)]}
+        active = [patient for patient, _, _ in batch]
+        for level, mismatches in enumerate(LEVELS_MISMATCHES):
+            requested = []
+            for i, shard in enumerate(self._shards):
+                expansions = {patient: routes[patient][i][level] for patient in active if routes[patient][i][level]}
+                if expansions:
+                    shard.submit("search_level", level, expansions)
+                    requested.append(shard)
+
+            # {patient: [[the shards' scores] for each number of mismatches of the level]}
+            level_scores = {patient: [[] for _ in mismatches] for patient in active}
+            for shard in requested:
+                for patient, patient_scores in shard.result().items():
+                    for k, scores in enumerate(patient_scores):
+                        level_scores[patient][k].append(scores)
+
+            for patient in active:
+                for k, mismatch in enumerate(mismatches):
+                    selected[patient].extend((donor, score, mismatch) for donor, score in _select_matches(
+                        level_scores[patient][k], threshold, cutof, matched[patient]))
+            active = [patient for patient in active if len(matched[patient]) < cutof]
+
+        return self._results(batch, selected, donors_info)
+
+    def _results(self, batch: List[Tuple[int, List[str], list]], selected: Dict[int, List[Tuple[int, float, int]]],
+                 donors_info: List[str]) -> Dict[int, pd.DataFrame]:
+        """create the results' DataFrames, with the properties of the donors from all their shards"""
+        donors = sorted({donor for matches in selected.values() for donor, _, _ in matches})
+        for shard in self._shards:
+            shard.submit("donors_genotypes", donors)
+        donors_genotypes: Dict[int, list] = {}
+        for shard in self._shards:  # in the order of the shards, which is the order of the genotypes
+            for donor, genotypes in shard.result().items():
+                donors_genotypes.setdefault(donor, []).extend(genotypes)
+
+        results = {}
+        for patient, _, genotypes in batch:
+            pat_geno = genotypes[0][0].np().tolist()
+            results_df = _init_results_df(donors_info)
+            add_donors = {col: [] for col in results_df.columns.values.tolist()}
+            for donor, score, mismatch in selected[patient]:
+                node_properties = (locuses_match_between_genos(pat_geno, most_common_genotype(donors_genotypes[donor])),
+                                   alleles_match_probabilities(donors_genotypes[donor], pat_geno))
+                append_matching_donor(add_donors, donors_info, patient, donor, score * 100, mismatch, node_properties)
+            results[patient] = pd.concat([results_df, pd.DataFrame(add_donors)], ignore_index=True)
+        return results
@@ -762,14 +762,15 @@ static CYTHON_INLINE float __PYX_NAN() {
 /* Early includes */
 #include <string.h>
 #include <stdio.h>
+
+    /* Using NumPy API declarations from "numpy/__init__.pxd" */
+    
 #include "numpy/arrayobject.h"
 #include "numpy/ndarrayobject.h"
 #include "numpy/ndarraytypes.h"
 #include "numpy/arrayscalars.h"
 #include "numpy/ufuncobject.h"
-
-    /* NumPy API declarations from "numpy/__init__.pxd" */
-    
+#include <stdlib.h>
 #ifdef _OPENMP
 #include <omp.h>
 #endif /* _OPENMP */
@@ -1042,7 +1043,7 @@ typedef struct {
 } __Pyx_BufFmt_Context;
 
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":689
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":659
  * # in Cython to enable them only on the right systems.
  * 
  * ctypedef npy_int8       int8_t             # <<<<<<<<<<<<<<
@@ -1051,7 +1052,7 @@ typedef struct {
  */
 typedef npy_int8 __pyx_t_5numpy_int8_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":690
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":660
  * 
  * ctypedef npy_int8       int8_t
  * ctypedef npy_int16      int16_t             # <<<<<<<<<<<<<<
@@ -1060,26 +1061,26 @@ typedef npy_int8 __pyx_t_5numpy_int8_t;
  */
 typedef npy_int16 __pyx_t_5numpy_int16_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":691
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":661
  * ctypedef npy_int8       int8_t
  * ctypedef npy_int16      int16_t
  * ctypedef npy_int32      int32_t             # <<<<<<<<<<<<<<
  * ctypedef npy_int64      int64_t
- * #ctypedef npy_int96      int96_t
+ * 
  */
 typedef npy_int32 __pyx_t_5numpy_int32_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":692
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":662
  * ctypedef npy_int16      int16_t
  * ctypedef npy_int32      int32_t
  * ctypedef npy_int64      int64_t             # <<<<<<<<<<<<<<
- * #ctypedef npy_int96      int96_t
- * #ctypedef npy_int128     int128_t
+ * 
+ * ctypedef npy_uint8      uint8_t
  */
 typedef npy_int64 __pyx_t_5numpy_int64_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":696
- * #ctypedef npy_int128     int128_t
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":664
+ * ctypedef npy_int64      int64_t
  * 
  * ctypedef npy_uint8      uint8_t             # <<<<<<<<<<<<<<
  * ctypedef npy_uint16     uint16_t
@@ -1087,7 +1088,7 @@ typedef npy_int64 __pyx_t_5numpy_int64_t;
  */
 typedef npy_uint8 __pyx_t_5numpy_uint8_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":697
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":665
  * 
  * ctypedef npy_uint8      uint8_t
  * ctypedef npy_uint16     uint16_t             # <<<<<<<<<<<<<<
@@ -1096,26 +1097,26 @@ typedef npy_uint8 __pyx_t_5numpy_uint8_t;
  */
 typedef npy_uint16 __pyx_t_5numpy_uint16_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":698
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":666
  * ctypedef npy_uint8      uint8_t
  * ctypedef npy_uint16     uint16_t
  * ctypedef npy_uint32     uint32_t             # <<<<<<<<<<<<<<
  * ctypedef npy_uint64     uint64_t
- * #ctypedef npy_uint96     uint96_t
+ * 
  */
 typedef npy_uint32 __pyx_t_5numpy_uint32_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":699
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":667
  * ctypedef npy_uint16     uint16_t
  * ctypedef npy_uint32     uint32_t
  * ctypedef npy_uint64     uint64_t             # <<<<<<<<<<<<<<
- * #ctypedef npy_uint96     uint96_t
- * #ctypedef npy_uint128    uint128_t
+ * 
+ * ctypedef npy_float32    float32_t
  */
 typedef npy_uint64 __pyx_t_5numpy_uint64_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":703
- * #ctypedef npy_uint128    uint128_t
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":669
+ * ctypedef npy_uint64     uint64_t
  * 
  * ctypedef npy_float32    float32_t             # <<<<<<<<<<<<<<
  * ctypedef npy_float64    float64_t
@@ -1123,7 +1124,7 @@ typedef npy_uint64 __pyx_t_5numpy_uint64_t;
  */
 typedef npy_float32 __pyx_t_5numpy_float32_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":704
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":670
  * 
  * ctypedef npy_float32    float32_t
  * ctypedef npy_float64    float64_t             # <<<<<<<<<<<<<<
@@ -1132,61 +1133,25 @@ typedef npy_float32 __pyx_t_5numpy_float32_t;
  */
 typedef npy_float64 __pyx_t_5numpy_float64_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":713
- * # The int types are mapped a bit surprising --
- * # numpy.int corresponds to 'l' and numpy.long to 'q'
- * ctypedef npy_long       int_t             # <<<<<<<<<<<<<<
- * ctypedef npy_longlong   long_t
- * ctypedef npy_longlong   longlong_t
- */
-typedef npy_long __pyx_t_5numpy_int_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":714
- * # numpy.int corresponds to 'l' and numpy.long to 'q'
- * ctypedef npy_long       int_t
- * ctypedef npy_longlong   long_t             # <<<<<<<<<<<<<<
- * ctypedef npy_longlong   longlong_t
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":677
+ * ctypedef double complex complex128_t
  * 
- */
-typedef npy_longlong __pyx_t_5numpy_long_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":715
- * ctypedef npy_long       int_t
- * ctypedef npy_longlong   long_t
  * ctypedef npy_longlong   longlong_t             # <<<<<<<<<<<<<<
+ * ctypedef npy_ulonglong  ulonglong_t
  * 
- * ctypedef npy_ulong      uint_t
  */
 typedef npy_longlong __pyx_t_5numpy_longlong_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":717
- * ctypedef npy_longlong   longlong_t
- * 
- * ctypedef npy_ulong      uint_t             # <<<<<<<<<<<<<<
- * ctypedef npy_ulonglong  ulong_t
- * ctypedef npy_ulonglong  ulonglong_t
- */
-typedef npy_ulong __pyx_t_5numpy_uint_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":718
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":678
  * 
- * ctypedef npy_ulong      uint_t
- * ctypedef npy_ulonglong  ulong_t             # <<<<<<<<<<<<<<
- * ctypedef npy_ulonglong  ulonglong_t
- * 
- */
-typedef npy_ulonglong __pyx_t_5numpy_ulong_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":719
- * ctypedef npy_ulong      uint_t
- * ctypedef npy_ulonglong  ulong_t
+ * ctypedef npy_longlong   longlong_t
  * ctypedef npy_ulonglong  ulonglong_t             # <<<<<<<<<<<<<<
  * 
  * ctypedef npy_intp       intp_t
  */
 typedef npy_ulonglong __pyx_t_5numpy_ulonglong_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":721
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":680
  * ctypedef npy_ulonglong  ulonglong_t
  * 
  * ctypedef npy_intp       intp_t             # <<<<<<<<<<<<<<
@@ -1195,7 +1160,7 @@ typedef npy_ulonglong __pyx_t_5numpy_ulonglong_t;
  */
 typedef npy_intp __pyx_t_5numpy_intp_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":722
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":681
  * 
  * ctypedef npy_intp       intp_t
  * ctypedef npy_uintp      uintp_t             # <<<<<<<<<<<<<<
@@ -1204,7 +1169,7 @@ typedef npy_intp __pyx_t_5numpy_intp_t;
  */
 typedef npy_uintp __pyx_t_5numpy_uintp_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":724
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":683
  * ctypedef npy_uintp      uintp_t
  * 
  * ctypedef npy_double     float_t             # <<<<<<<<<<<<<<
@@ -1213,7 +1178,7 @@ typedef npy_uintp __pyx_t_5numpy_uintp_t;
  */
 typedef npy_double __pyx_t_5numpy_float_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":725
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":684
  * 
  * ctypedef npy_double     float_t
  * ctypedef npy_double     double_t             # <<<<<<<<<<<<<<
@@ -1222,17 +1187,17 @@ typedef npy_double __pyx_t_5numpy_float_t;
  */
 typedef npy_double __pyx_t_5numpy_double_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":726
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":685
  * ctypedef npy_double     float_t
  * ctypedef npy_double     double_t
  * ctypedef npy_longdouble longdouble_t             # <<<<<<<<<<<<<<
  * 
- * ctypedef npy_cfloat      cfloat_t
+ * ctypedef float complex       cfloat_t
  */
 typedef npy_longdouble __pyx_t_5numpy_longdouble_t;
 
-/* "grma/utilities/cutils.pyx":7
- * cimport numpy as np
+/* "grma/utilities/cutils.pyx":8
+ * from libc.stdlib cimport strtod
  * 
  * ctypedef np.uint8_t UINT8             # <<<<<<<<<<<<<<
  * ctypedef np.int8_t INT8
@@ -1240,7 +1205,7 @@ typedef npy_longdouble __pyx_t_5numpy_longdouble_t;
  */
 typedef __pyx_t_5numpy_uint8_t __pyx_t_4grma_9utilities_6cutils_UINT8;
 
-/* "grma/utilities/cutils.pyx":8
+/* "grma/utilities/cutils.pyx":9
  * 
  * ctypedef np.uint8_t UINT8
  * ctypedef np.int8_t INT8             # <<<<<<<<<<<<<<
@@ -1249,23 +1214,32 @@ typedef __pyx_t_5numpy_uint8_t __pyx_t_4grma_9utilities_6cutils_UINT8;
  */
 typedef __pyx_t_5numpy_int8_t __pyx_t_4grma_9utilities_6cutils_INT8;
 
-/* "grma/utilities/cutils.pyx":9
+/* "grma/utilities/cutils.pyx":10
  * ctypedef np.uint8_t UINT8
  * ctypedef np.int8_t INT8
  * ctypedef np.uint16_t UINT16             # <<<<<<<<<<<<<<
  * ctypedef np.uint32_t UINT32
- * 
+ * ctypedef np.int64_t INT64
  */
 typedef __pyx_t_5numpy_uint16_t __pyx_t_4grma_9utilities_6cutils_UINT16;
 
-/* "grma/utilities/cutils.pyx":10
+/* "grma/utilities/cutils.pyx":11
  * ctypedef np.int8_t INT8
  * ctypedef np.uint16_t UINT16
  * ctypedef np.uint32_t UINT32             # <<<<<<<<<<<<<<
- * 
+ * ctypedef np.int64_t INT64
  * 
  */
 typedef __pyx_t_5numpy_uint32_t __pyx_t_4grma_9utilities_6cutils_UINT32;
+
+/* "grma/utilities/cutils.pyx":12
+ * ctypedef np.uint16_t UINT16
+ * ctypedef np.uint32_t UINT32
+ * ctypedef np.int64_t INT64             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+typedef __pyx_t_5numpy_int64_t __pyx_t_4grma_9utilities_6cutils_INT64;
 /* Declarations.proto */
 #if CYTHON_CCOMPLEX
   #ifdef __cplusplus
@@ -1290,44 +1264,20 @@ static CYTHON_INLINE __pyx_t_float_complex __pyx_t_float_complex_from_parts(floa
 #endif
 static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double, double);
 
+/* Declarations.proto */
+#if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    typedef ::std::complex< long double > __pyx_t_long_double_complex;
+  #else
+    typedef long double _Complex __pyx_t_long_double_complex;
+  #endif
+#else
+    typedef struct { long double real, imag; } __pyx_t_long_double_complex;
+#endif
+static CYTHON_INLINE __pyx_t_long_double_complex __pyx_t_long_double_complex_from_parts(long double, long double);
 
-/*--- Type declarations ---*/
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":728
- * ctypedef npy_longdouble longdouble_t
- * 
- * ctypedef npy_cfloat      cfloat_t             # <<<<<<<<<<<<<<
- * ctypedef npy_cdouble     cdouble_t
- * ctypedef npy_clongdouble clongdouble_t
- */
-typedef npy_cfloat __pyx_t_5numpy_cfloat_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":729
- * 
- * ctypedef npy_cfloat      cfloat_t
- * ctypedef npy_cdouble     cdouble_t             # <<<<<<<<<<<<<<
- * ctypedef npy_clongdouble clongdouble_t
- * 
- */
-typedef npy_cdouble __pyx_t_5numpy_cdouble_t;
-
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":730
- * ctypedef npy_cfloat      cfloat_t
- * ctypedef npy_cdouble     cdouble_t
- * ctypedef npy_clongdouble clongdouble_t             # <<<<<<<<<<<<<<
- * 
- * ctypedef npy_cdouble     complex_t
- */
-typedef npy_clongdouble __pyx_t_5numpy_clongdouble_t;
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":732
- * ctypedef npy_clongdouble clongdouble_t
- * 
- * ctypedef npy_cdouble     complex_t             # <<<<<<<<<<<<<<
- * 
- * cdef inline object PyArray_MultiIterNew1(a):
- */
-typedef npy_cdouble __pyx_t_5numpy_complex_t;
+/*--- Type declarations ---*/
 
 /* --- Runtime support code (head) --- */
 /* Refnanny.proto */
@@ -1574,6 +1524,84 @@ static void __Pyx_WriteUnraisable(const char *name, int clineno,
                                   int lineno, const char *filename,
                                   int full_traceback, int nogil);
 
+/* PyIntBinop.proto */
+#if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, long intval, int inplace, int zerodivision_check);
+#else
+#define __Pyx_PyInt_AddObjC(op1, op2, intval, inplace, zerodivision_check)\
+    (inplace ? PyNumber_InPlaceAdd(op1, op2) : PyNumber_Add(op1, op2))
+#endif
+
+/* UnpackUnboundCMethod.proto */
+typedef struct {
+    PyObject *type;
+    PyObject **method_name;
+    PyCFunction func;
+    PyObject *method;
+    int flag;
+} __Pyx_CachedCFunction;
+
+/* CallUnboundCMethod1.proto */
+static PyObject* __Pyx__CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg);
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg);
+#else
+#define __Pyx_CallUnboundCMethod1(cfunc, self, arg)  __Pyx__CallUnboundCMethod1(cfunc, self, arg)
+#endif
+
+/* PyObjectFormatAndDecref.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_FormatSimpleAndDecref(PyObject* s, PyObject* f);
+static CYTHON_INLINE PyObject* __Pyx_PyObject_FormatAndDecref(PyObject* s, PyObject* f);
+
+/* PyCFunctionFastCall.proto */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject *__Pyx_PyCFunction_FastCall(PyObject *func, PyObject **args, Py_ssize_t nargs);
+#else
+#define __Pyx_PyCFunction_FastCall(func, args, nargs)  (assert(0), NULL)
+#endif
+
+/* PyFunctionFastCall.proto */
+#if CYTHON_FAST_PYCALL
+#define __Pyx_PyFunction_FastCall(func, args, nargs)\
+    __Pyx_PyFunction_FastCallDict((func), (args), (nargs), NULL)
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs);
+#else
+#define __Pyx_PyFunction_FastCallDict(func, args, nargs, kwargs) _PyFunction_FastCallDict(func, args, nargs, kwargs)
+#endif
+#define __Pyx_BUILD_ASSERT_EXPR(cond)\
+    (sizeof(char [1 - 2*!(cond)]) - 1)
+#ifndef Py_MEMBER_SIZE
+#define Py_MEMBER_SIZE(type, member) sizeof(((type *)0)->member)
+#endif
+#if CYTHON_FAST_PYCALL
+  static size_t __pyx_pyframe_localsplus_offset = 0;
+  #include "frameobject.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
+  #define __Pxy_PyFrame_Initialize_Offsets()\
+    ((void)__Pyx_BUILD_ASSERT_EXPR(sizeof(PyFrameObject) == offsetof(PyFrameObject, f_localsplus) + Py_MEMBER_SIZE(PyFrameObject, f_localsplus)),\
+     (void)(__pyx_pyframe_localsplus_offset = ((size_t)PyFrame_Type.tp_basicsize) - Py_MEMBER_SIZE(PyFrameObject, f_localsplus)))
+  #define __Pyx_PyFrame_GetLocalsplus(frame)\
+    (assert(__pyx_pyframe_localsplus_offset), (PyObject **)(((char *)(frame)) + __pyx_pyframe_localsplus_offset))
+#endif // CYTHON_FAST_PYCALL
+#endif
+
+/* PyObjectCallMethO.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg);
+#endif
+
+/* PyObjectCallOneArg.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg);
+
+/* RaiseException.proto */
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
+
 /* GetTopmostException.proto */
 #if CYTHON_USE_EXC_INFO_STACK
 static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
@@ -1606,9 +1634,6 @@ static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject
 static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb);
 #endif
 
-/* RaiseException.proto */
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
-
 /* TypeImport.proto */
 #ifndef __PYX_HAVE_RT_ImportType_proto
 #define __PYX_HAVE_RT_ImportType_proto
@@ -1775,6 +1800,44 @@ typedef struct {
     #endif
 #endif
 
+/* Arithmetic.proto */
+#if CYTHON_CCOMPLEX
+    #define __Pyx_c_eq_long__double(a, b)   ((a)==(b))
+    #define __Pyx_c_sum_long__double(a, b)  ((a)+(b))
+    #define __Pyx_c_diff_long__double(a, b) ((a)-(b))
+    #define __Pyx_c_prod_long__double(a, b) ((a)*(b))
+    #define __Pyx_c_quot_long__double(a, b) ((a)/(b))
+    #define __Pyx_c_neg_long__double(a)     (-(a))
+  #ifdef __cplusplus
+    #define __Pyx_c_is_zero_long__double(z) ((z)==(long double)0)
+    #define __Pyx_c_conj_long__double(z)    (::std::conj(z))
+    #if 1
+        #define __Pyx_c_abs_long__double(z)     (::std::abs(z))
+        #define __Pyx_c_pow_long__double(a, b)  (::std::pow(a, b))
+    #endif
+  #else
+    #define __Pyx_c_is_zero_long__double(z) ((z)==0)
+    #define __Pyx_c_conj_long__double(z)    (conjl(z))
+    #if 1
+        #define __Pyx_c_abs_long__double(z)     (cabsl(z))
+        #define __Pyx_c_pow_long__double(a, b)  (cpowl(a, b))
+    #endif
+ #endif
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_sum_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_diff_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_prod_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_quot_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_neg_long__double(__pyx_t_long_double_complex);
+    static CYTHON_INLINE int __Pyx_c_is_zero_long__double(__pyx_t_long_double_complex);
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_conj_long__double(__pyx_t_long_double_complex);
+    #if 1
+        static CYTHON_INLINE long double __Pyx_c_abs_long__double(__pyx_t_long_double_complex);
+        static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_pow_long__double(__pyx_t_long_double_complex, __pyx_t_long_double_complex);
+    #endif
+#endif
+
 /* CIntFromPy.proto */
 static CYTHON_INLINE npy_uint8 __Pyx_PyInt_As_npy_uint8(PyObject *);
 
@@ -1787,15 +1850,15 @@ static CYTHON_INLINE PyObject* __Pyx_PyInt_From_npy_uint32(npy_uint32 value);
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_npy_uint8(npy_uint8 value);
 
+/* CIntFromPy.proto */
+static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
+
 /* CIntToPy.proto */
 static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
 
 /* CIntFromPy.proto */
 static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
 
-/* CIntFromPy.proto */
-static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
-
 /* FastTypeChecks.proto */
 #if CYTHON_COMPILING_IN_CPYTHON
 #define __Pyx_TypeCheck(obj, type) __Pyx_IsSubtype(Py_TYPE(obj), (PyTypeObject *)type)
@@ -1856,33 +1919,71 @@ static PyTypeObject *__pyx_ptype_5numpy_flexible = 0;
 static PyTypeObject *__pyx_ptype_5numpy_character = 0;
 static PyTypeObject *__pyx_ptype_5numpy_ufunc = 0;
 
+/* Module declarations from 'libc.stdlib' */
+
 /* Module declarations from 'grma.utilities.cutils' */
 static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches(PyArrayObject *, PyArrayObject *, int __pyx_skip_dispatch); /*proto*/
 static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArrayObject *, PyArrayObject *, PyArrayObject *, __pyx_t_4grma_9utilities_6cutils_UINT8, int __pyx_skip_dispatch); /*proto*/
 static __pyx_t_4grma_9utilities_6cutils_UINT32 __pyx_f_4grma_9utilities_6cutils_chash(PyArrayObject *, int __pyx_skip_dispatch); /*proto*/
+static CYTHON_INLINE int __pyx_f_4grma_9utilities_6cutils__is_space(char); /*proto*/
+static int __pyx_f_4grma_9utilities_6cutils__parse_int(char const *, Py_ssize_t, Py_ssize_t, __pyx_t_4grma_9utilities_6cutils_INT64 *); /*proto*/
+static int __pyx_f_4grma_9utilities_6cutils__parse_gl_string(char const *, Py_ssize_t, Py_ssize_t, __pyx_t_4grma_9utilities_6cutils_UINT16 *); /*proto*/
+static PyObject *__pyx_f_4grma_9utilities_6cutils__raise_malformed(PyObject *, Py_ssize_t, Py_ssize_t); /*proto*/
 static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT32 = { "UINT32", NULL, sizeof(__pyx_t_4grma_9utilities_6cutils_UINT32), { 0 }, 0, IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT32) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT32), 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT8 = { "INT8", NULL, sizeof(__pyx_t_4grma_9utilities_6cutils_INT8), { 0 }, 0, IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_INT8) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_INT8), 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16 = { "UINT16", NULL, sizeof(__pyx_t_4grma_9utilities_6cutils_UINT16), { 0 }, 0, IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT16) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT16), 0 };
 static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT8 = { "UINT8", NULL, sizeof(__pyx_t_4grma_9utilities_6cutils_UINT8), { 0 }, 0, IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT8) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_UINT8), 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT64 = { "INT64", NULL, sizeof(__pyx_t_4grma_9utilities_6cutils_INT64), { 0 }, 0, IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_INT64) ? 'U' : 'I', IS_UNSIGNED(__pyx_t_4grma_9utilities_6cutils_INT64), 0 };
+static __Pyx_TypeInfo __Pyx_TypeInfo_nn___pyx_t_5numpy_float64_t = { "float64_t", NULL, sizeof(__pyx_t_5numpy_float64_t), { 0 }, 0, 'R', 0, 0 };
 #define __Pyx_MODULE_NAME "grma.utilities.cutils"
 extern int __pyx_module_is_main_grma__utilities__cutils;
 int __pyx_module_is_main_grma__utilities__cutils = 0;
 
 /* Implementation of 'grma.utilities.cutils' */
 static PyObject *__pyx_builtin_range;
+static PyObject *__pyx_builtin_ValueError;
 static PyObject *__pyx_builtin_ImportError;
+static const char __pyx_k_i[] = "i";
+static const char __pyx_k__2[] = "\n";
 static const char __pyx_k_np[] = "np";
+static const char __pyx_k_buf[] = "buf";
 static const char __pyx_k_ids[] = "ids";
+static const char __pyx_k_pos[] = "pos";
+static const char __pyx_k_row[] = "row";
+static const char __pyx_k_data[] = "data";
 static const char __pyx_k_int8[] = "int8";
 static const char __pyx_k_main[] = "__main__";
 static const char __pyx_k_name[] = "__name__";
+static const char __pyx_k_prob[] = "prob";
 static const char __pyx_k_test[] = "__test__";
+static const char __pyx_k_blank[] = "blank";
+static const char __pyx_k_count[] = "count";
 static const char __pyx_k_dtype[] = "dtype";
+static const char __pyx_k_empty[] = "empty";
+static const char __pyx_k_genos[] = "genos";
+static const char __pyx_k_int64[] = "int64";
 static const char __pyx_k_numpy[] = "numpy";
+static const char __pyx_k_probs[] = "probs";
 static const char __pyx_k_range[] = "range";
+static const char __pyx_k_shape[] = "shape";
+static const char __pyx_k_value[] = "value";
 static const char __pyx_k_zeros[] = "zeros";
+static const char __pyx_k_commas[] = "commas";
+static const char __pyx_k_decode[] = "decode";
+static const char __pyx_k_errors[] = "errors";
 static const char __pyx_k_import[] = "__import__";
+static const char __pyx_k_length[] = "length";
+static const char __pyx_k_uint16[] = "uint16";
 static const char __pyx_k_uint32[] = "uint32";
+static const char __pyx_k_float64[] = "float64";
+static const char __pyx_k_indices[] = "indices";
+static const char __pyx_k_n_lines[] = "n_lines";
+static const char __pyx_k_replace[] = "replace";
+static const char __pyx_k_line_end[] = "line_end";
+static const char __pyx_k_subarray[] = "subarray";
+static const char __pyx_k_ValueError[] = "ValueError";
+static const char __pyx_k_num_commas[] = "num_commas";
+static const char __pyx_k_number_end[] = "number_end";
 static const char __pyx_k_ImportError[] = "ImportError";
 static const char __pyx_k_allele_range[] = "allele_range";
 static const char __pyx_k_donors_genos[] = "donors_genos";
@@ -1890,39 +1991,82 @@ static const char __pyx_k_similarities[] = "similarities";
 static const char __pyx_k_patients_geno[] = "patients_geno";
 static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
 static const char __pyx_k_init_count_similar[] = "init_count_similar";
-static const char __pyx_k_numpy_core_multiarray_failed_to[] = "numpy.core.multiarray failed to import";
-static const char __pyx_k_numpy_core_umath_failed_to_impor[] = "numpy.core.umath failed to import";
+static const char __pyx_k_grma_utilities_cutils[] = "grma.utilities.cutils";
+static const char __pyx_k_cparse_imputation_lines[] = "cparse_imputation_lines";
+static const char __pyx_k_Malformed_imputation_line[] = "Malformed imputation line: ";
+static const char __pyx_k_grma_utilities_cutils_pyx[] = "grma/utilities/cutils.pyx";
+static const char __pyx_k_numpy__core_multiarray_failed_to[] = "numpy._core.multiarray failed to import";
+static const char __pyx_k_numpy__core_umath_failed_to_impo[] = "numpy._core.umath failed to import";
 static PyObject *__pyx_n_s_ImportError;
+static PyObject *__pyx_kp_u_Malformed_imputation_line;
+static PyObject *__pyx_n_s_ValueError;
+static PyObject *__pyx_kp_b__2;
 static PyObject *__pyx_n_s_allele_range;
+static PyObject *__pyx_n_s_blank;
+static PyObject *__pyx_n_s_buf;
 static PyObject *__pyx_n_s_cline_in_traceback;
+static PyObject *__pyx_n_s_commas;
+static PyObject *__pyx_n_s_count;
+static PyObject *__pyx_n_s_cparse_imputation_lines;
+static PyObject *__pyx_n_s_data;
+static PyObject *__pyx_n_s_decode;
 static PyObject *__pyx_n_s_donors_genos;
 static PyObject *__pyx_n_s_dtype;
+static PyObject *__pyx_n_s_empty;
+static PyObject *__pyx_n_s_errors;
+static PyObject *__pyx_n_s_float64;
+static PyObject *__pyx_n_s_genos;
+static PyObject *__pyx_n_s_grma_utilities_cutils;
+static PyObject *__pyx_kp_s_grma_utilities_cutils_pyx;
+static PyObject *__pyx_n_s_i;
 static PyObject *__pyx_n_s_ids;
 static PyObject *__pyx_n_s_import;
+static PyObject *__pyx_n_s_indices;
 static PyObject *__pyx_n_s_init_count_similar;
+static PyObject *__pyx_n_s_int64;
 static PyObject *__pyx_n_s_int8;
+static PyObject *__pyx_n_s_length;
+static PyObject *__pyx_n_s_line_end;
 static PyObject *__pyx_n_s_main;
+static PyObject *__pyx_n_s_n_lines;
 static PyObject *__pyx_n_s_name;
 static PyObject *__pyx_n_s_np;
+static PyObject *__pyx_n_s_num_commas;
+static PyObject *__pyx_n_s_number_end;
 static PyObject *__pyx_n_s_numpy;
-static PyObject *__pyx_kp_u_numpy_core_multiarray_failed_to;
-static PyObject *__pyx_kp_u_numpy_core_umath_failed_to_impor;
+static PyObject *__pyx_kp_u_numpy__core_multiarray_failed_to;
+static PyObject *__pyx_kp_u_numpy__core_umath_failed_to_impo;
 static PyObject *__pyx_n_s_patients_geno;
+static PyObject *__pyx_n_s_pos;
+static PyObject *__pyx_n_s_prob;
+static PyObject *__pyx_n_s_probs;
 static PyObject *__pyx_n_s_range;
+static PyObject *__pyx_n_u_replace;
+static PyObject *__pyx_n_s_row;
+static PyObject *__pyx_n_s_shape;
 static PyObject *__pyx_n_s_similarities;
+static PyObject *__pyx_n_s_subarray;
 static PyObject *__pyx_n_s_test;
+static PyObject *__pyx_n_s_uint16;
 static PyObject *__pyx_n_s_uint32;
+static PyObject *__pyx_n_s_value;
 static PyObject *__pyx_n_s_zeros;
 static PyObject *__pyx_pf_4grma_9utilities_6cutils_cdrop_less_than_7_matches(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_ids, PyArrayObject *__pyx_v_similarities); /* proto */
 static PyObject *__pyx_pf_4grma_9utilities_6cutils_2ccheck_similarity(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_patients_geno, PyArrayObject *__pyx_v_donors_genos, PyArrayObject *__pyx_v_allele_range, __pyx_t_4grma_9utilities_6cutils_UINT8 __pyx_v_init_count_similar); /* proto */
 static PyObject *__pyx_pf_4grma_9utilities_6cutils_4chash(CYTHON_UNUSED PyObject *__pyx_self, PyArrayObject *__pyx_v_arr); /* proto */
+static PyObject *__pyx_pf_4grma_9utilities_6cutils_6cparse_imputation_lines(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_data); /* proto */
+static __Pyx_CachedCFunction __pyx_umethod_PyBytes_Type_count = {0, &__pyx_n_s_count, 0, 0, 0};
+static PyObject *__pyx_int_1;
 static PyObject *__pyx_int_2;
+static PyObject *__pyx_int_10;
 static PyObject *__pyx_slice_;
-static PyObject *__pyx_tuple__2;
 static PyObject *__pyx_tuple__3;
+static PyObject *__pyx_tuple__4;
+static PyObject *__pyx_tuple__5;
+static PyObject *__pyx_codeobj__6;
 /* Late includes */
 
-/* "grma/utilities/cutils.pyx":16
+/* "grma/utilities/cutils.pyx":18
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef np.ndarray[UINT32, ndim=2] cdrop_less_than_7_matches(np.ndarray[UINT32, ndim=1] ids,             # <<<<<<<<<<<<<<
@@ -1978,31 +2122,31 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
   __pyx_pybuffernd_similarities.rcbuffer = &__pyx_pybuffer_similarities;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_v_ids, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT32, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 16, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_v_ids, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT32, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 18, __pyx_L1_error)
   }
   __pyx_pybuffernd_ids.diminfo[0].strides = __pyx_pybuffernd_ids.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_ids.diminfo[0].shape = __pyx_pybuffernd_ids.rcbuffer->pybuffer.shape[0];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_similarities.rcbuffer->pybuffer, (PyObject*)__pyx_v_similarities, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 16, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_similarities.rcbuffer->pybuffer, (PyObject*)__pyx_v_similarities, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 18, __pyx_L1_error)
   }
   __pyx_pybuffernd_similarities.diminfo[0].strides = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_similarities.diminfo[0].shape = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.shape[0];
 
-  /* "grma/utilities/cutils.pyx":22
+  /* "grma/utilities/cutils.pyx":24
  *         UINT32 count, i
  * 
  *     ret = np.zeros((len(ids), 2), dtype=np.uint32)             # <<<<<<<<<<<<<<
  *     count = 0
  *     for i in range(len(ids)):
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_zeros); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_zeros); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_ids)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 22, __pyx_L1_error)
-  __pyx_t_1 = PyInt_FromSsize_t(__pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_ids)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 24, __pyx_L1_error)
+  __pyx_t_1 = PyInt_FromSsize_t(__pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_4 = PyTuple_New(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_4 = PyTuple_New(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_GIVEREF(__pyx_t_1);
   PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_t_1);
@@ -2010,26 +2154,26 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
   __Pyx_GIVEREF(__pyx_int_2);
   PyTuple_SET_ITEM(__pyx_t_4, 1, __pyx_int_2);
   __pyx_t_1 = 0;
-  __pyx_t_1 = PyTuple_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_1 = PyTuple_New(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __Pyx_GIVEREF(__pyx_t_4);
   PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_t_4);
   __pyx_t_4 = 0;
-  __pyx_t_4 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
-  __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_np); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_np); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_5);
-  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_uint32); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_uint32); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-  if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 22, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_1, __pyx_t_4); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 22, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_1, __pyx_t_4); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 24, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-  if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 22, __pyx_L1_error)
+  if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 24, __pyx_L1_error)
   __pyx_t_7 = ((PyArrayObject *)__pyx_t_6);
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
@@ -2046,13 +2190,13 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
       __pyx_t_9 = __pyx_t_10 = __pyx_t_11 = 0;
     }
     __pyx_pybuffernd_ret.diminfo[0].strides = __pyx_pybuffernd_ret.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_ret.diminfo[0].shape = __pyx_pybuffernd_ret.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_ret.diminfo[1].strides = __pyx_pybuffernd_ret.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_ret.diminfo[1].shape = __pyx_pybuffernd_ret.rcbuffer->pybuffer.shape[1];
-    if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 22, __pyx_L1_error)
+    if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 24, __pyx_L1_error)
   }
   __pyx_t_7 = 0;
   __pyx_v_ret = ((PyArrayObject *)__pyx_t_6);
   __pyx_t_6 = 0;
 
-  /* "grma/utilities/cutils.pyx":23
+  /* "grma/utilities/cutils.pyx":25
  * 
  *     ret = np.zeros((len(ids), 2), dtype=np.uint32)
  *     count = 0             # <<<<<<<<<<<<<<
@@ -2061,19 +2205,19 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
  */
   __pyx_v_count = 0;
 
-  /* "grma/utilities/cutils.pyx":24
+  /* "grma/utilities/cutils.pyx":26
  *     ret = np.zeros((len(ids), 2), dtype=np.uint32)
  *     count = 0
  *     for i in range(len(ids)):             # <<<<<<<<<<<<<<
  *         if similarities[i] != -1:
  *             ret[count, 0] = ids[i]
  */
-  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_ids)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 24, __pyx_L1_error)
+  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_ids)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 26, __pyx_L1_error)
   __pyx_t_12 = __pyx_t_3;
   for (__pyx_t_13 = 0; __pyx_t_13 < __pyx_t_12; __pyx_t_13+=1) {
     __pyx_v_i = __pyx_t_13;
 
-    /* "grma/utilities/cutils.pyx":25
+    /* "grma/utilities/cutils.pyx":27
  *     count = 0
  *     for i in range(len(ids)):
  *         if similarities[i] != -1:             # <<<<<<<<<<<<<<
@@ -2084,7 +2228,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
     __pyx_t_15 = (((*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT8 *, __pyx_pybuffernd_similarities.rcbuffer->pybuffer.buf, __pyx_t_14, __pyx_pybuffernd_similarities.diminfo[0].strides)) != -1L) != 0);
     if (__pyx_t_15) {
 
-      /* "grma/utilities/cutils.pyx":26
+      /* "grma/utilities/cutils.pyx":28
  *     for i in range(len(ids)):
  *         if similarities[i] != -1:
  *             ret[count, 0] = ids[i]             # <<<<<<<<<<<<<<
@@ -2096,7 +2240,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
       __pyx_t_17 = 0;
       *__Pyx_BufPtrStrided2d(__pyx_t_4grma_9utilities_6cutils_UINT32 *, __pyx_pybuffernd_ret.rcbuffer->pybuffer.buf, __pyx_t_16, __pyx_pybuffernd_ret.diminfo[0].strides, __pyx_t_17, __pyx_pybuffernd_ret.diminfo[1].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT32 *, __pyx_pybuffernd_ids.rcbuffer->pybuffer.buf, __pyx_t_14, __pyx_pybuffernd_ids.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":27
+      /* "grma/utilities/cutils.pyx":29
  *         if similarities[i] != -1:
  *             ret[count, 0] = ids[i]
  *             ret[count, 1] = similarities[i]             # <<<<<<<<<<<<<<
@@ -2108,7 +2252,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
       __pyx_t_17 = 1;
       *__Pyx_BufPtrStrided2d(__pyx_t_4grma_9utilities_6cutils_UINT32 *, __pyx_pybuffernd_ret.rcbuffer->pybuffer.buf, __pyx_t_16, __pyx_pybuffernd_ret.diminfo[0].strides, __pyx_t_17, __pyx_pybuffernd_ret.diminfo[1].strides) = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT8 *, __pyx_pybuffernd_similarities.rcbuffer->pybuffer.buf, __pyx_t_14, __pyx_pybuffernd_similarities.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":28
+      /* "grma/utilities/cutils.pyx":30
  *             ret[count, 0] = ids[i]
  *             ret[count, 1] = similarities[i]
  *             count += 1             # <<<<<<<<<<<<<<
@@ -2117,7 +2261,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
  */
       __pyx_v_count = (__pyx_v_count + 1);
 
-      /* "grma/utilities/cutils.pyx":25
+      /* "grma/utilities/cutils.pyx":27
  *     count = 0
  *     for i in range(len(ids)):
  *         if similarities[i] != -1:             # <<<<<<<<<<<<<<
@@ -2127,7 +2271,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
     }
   }
 
-  /* "grma/utilities/cutils.pyx":29
+  /* "grma/utilities/cutils.pyx":31
  *             ret[count, 1] = similarities[i]
  *             count += 1
  *     return ret[:count, :]             # <<<<<<<<<<<<<<
@@ -2135,12 +2279,12 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
  * 
  */
   __Pyx_XDECREF(((PyObject *)__pyx_r));
-  __pyx_t_6 = __Pyx_PyInt_From_npy_uint32(__pyx_v_count); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 29, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyInt_From_npy_uint32(__pyx_v_count); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
-  __pyx_t_4 = PySlice_New(Py_None, __pyx_t_6, Py_None); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 29, __pyx_L1_error)
+  __pyx_t_4 = PySlice_New(Py_None, __pyx_t_6, Py_None); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_6 = PyTuple_New(2); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 29, __pyx_L1_error)
+  __pyx_t_6 = PyTuple_New(2); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_GIVEREF(__pyx_t_4);
   PyTuple_SET_ITEM(__pyx_t_6, 0, __pyx_t_4);
@@ -2148,15 +2292,15 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches
   __Pyx_GIVEREF(__pyx_slice_);
   PyTuple_SET_ITEM(__pyx_t_6, 1, __pyx_slice_);
   __pyx_t_4 = 0;
-  __pyx_t_4 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_ret), __pyx_t_6); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 29, __pyx_L1_error)
+  __pyx_t_4 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_ret), __pyx_t_6); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  if (!(likely(((__pyx_t_4) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_4, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 29, __pyx_L1_error)
+  if (!(likely(((__pyx_t_4) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_4, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 31, __pyx_L1_error)
   __pyx_r = ((PyArrayObject *)__pyx_t_4);
   __pyx_t_4 = 0;
   goto __pyx_L0;
 
-  /* "grma/utilities/cutils.pyx":16
+  /* "grma/utilities/cutils.pyx":18
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef np.ndarray[UINT32, ndim=2] cdrop_less_than_7_matches(np.ndarray[UINT32, ndim=1] ids,             # <<<<<<<<<<<<<<
@@ -2227,11 +2371,11 @@ static PyObject *__pyx_pw_4grma_9utilities_6cutils_1cdrop_less_than_7_matches(Py
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_similarities)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("cdrop_less_than_7_matches", 1, 2, 2, 1); __PYX_ERR(0, 16, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("cdrop_less_than_7_matches", 1, 2, 2, 1); __PYX_ERR(0, 18, __pyx_L3_error)
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "cdrop_less_than_7_matches") < 0)) __PYX_ERR(0, 16, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "cdrop_less_than_7_matches") < 0)) __PYX_ERR(0, 18, __pyx_L3_error)
       }
     } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
       goto __pyx_L5_argtuple_error;
@@ -2244,14 +2388,14 @@ static PyObject *__pyx_pw_4grma_9utilities_6cutils_1cdrop_less_than_7_matches(Py
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("cdrop_less_than_7_matches", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 16, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("cdrop_less_than_7_matches", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 18, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("grma.utilities.cutils.cdrop_less_than_7_matches", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_ids), __pyx_ptype_5numpy_ndarray, 1, "ids", 0))) __PYX_ERR(0, 16, __pyx_L1_error)
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_similarities), __pyx_ptype_5numpy_ndarray, 1, "similarities", 0))) __PYX_ERR(0, 17, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_ids), __pyx_ptype_5numpy_ndarray, 1, "ids", 0))) __PYX_ERR(0, 18, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_similarities), __pyx_ptype_5numpy_ndarray, 1, "similarities", 0))) __PYX_ERR(0, 19, __pyx_L1_error)
   __pyx_r = __pyx_pf_4grma_9utilities_6cutils_cdrop_less_than_7_matches(__pyx_self, __pyx_v_ids, __pyx_v_similarities);
 
   /* function exit code */
@@ -2285,16 +2429,16 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_cdrop_less_than_7_matches(CYT
   __pyx_pybuffernd_similarities.rcbuffer = &__pyx_pybuffer_similarities;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_v_ids, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT32, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 16, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_v_ids, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT32, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 18, __pyx_L1_error)
   }
   __pyx_pybuffernd_ids.diminfo[0].strides = __pyx_pybuffernd_ids.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_ids.diminfo[0].shape = __pyx_pybuffernd_ids.rcbuffer->pybuffer.shape[0];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_similarities.rcbuffer->pybuffer, (PyObject*)__pyx_v_similarities, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 16, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_similarities.rcbuffer->pybuffer, (PyObject*)__pyx_v_similarities, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 18, __pyx_L1_error)
   }
   __pyx_pybuffernd_similarities.diminfo[0].strides = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_similarities.diminfo[0].shape = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.shape[0];
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = ((PyObject *)__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches(__pyx_v_ids, __pyx_v_similarities, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 16, __pyx_L1_error)
+  __pyx_t_1 = ((PyObject *)__pyx_f_4grma_9utilities_6cutils_cdrop_less_than_7_matches(__pyx_v_ids, __pyx_v_similarities, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 18, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
@@ -2322,7 +2466,7 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_cdrop_less_than_7_matches(CYT
   return __pyx_r;
 }
 
-/* "grma/utilities/cutils.pyx":34
+/* "grma/utilities/cutils.pyx":36
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef np.ndarray[INT8, ndim=1] ccheck_similarity(np.ndarray[UINT16, ndim=1] patients_geno,             # <<<<<<<<<<<<<<
@@ -2402,55 +2546,55 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
   __pyx_pybuffernd_allele_range.rcbuffer = &__pyx_pybuffer_allele_range;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_patients_geno.rcbuffer->pybuffer, (PyObject*)__pyx_v_patients_geno, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_patients_geno.rcbuffer->pybuffer, (PyObject*)__pyx_v_patients_geno, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_patients_geno.diminfo[0].strides = __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_patients_geno.diminfo[0].shape = __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.shape[0];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_donors_genos.rcbuffer->pybuffer, (PyObject*)__pyx_v_donors_genos, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_donors_genos.rcbuffer->pybuffer, (PyObject*)__pyx_v_donors_genos, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_donors_genos.diminfo[0].strides = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_donors_genos.diminfo[0].shape = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_donors_genos.diminfo[1].strides = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_donors_genos.diminfo[1].shape = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.shape[1];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_allele_range.rcbuffer->pybuffer, (PyObject*)__pyx_v_allele_range, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_allele_range.rcbuffer->pybuffer, (PyObject*)__pyx_v_allele_range, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_allele_range.diminfo[0].strides = __pyx_pybuffernd_allele_range.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_allele_range.diminfo[0].shape = __pyx_pybuffernd_allele_range.rcbuffer->pybuffer.shape[0];
 
-  /* "grma/utilities/cutils.pyx":52
+  /* "grma/utilities/cutils.pyx":54
  *         UINT16 patient_alleles0, patient_alleles1, donor_alleles0, donor_alleles1
  * 
  *     similarities = np.zeros(len(donors_genos), dtype=np.int8)             # <<<<<<<<<<<<<<
  *     number_of_alleles = len(allele_range)
  *     for i in range(len(donors_genos)):
  */
-  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_np); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_zeros); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_zeros); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_2);
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_donors_genos)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 52, __pyx_L1_error)
-  __pyx_t_1 = PyInt_FromSsize_t(__pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_donors_genos)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 54, __pyx_L1_error)
+  __pyx_t_1 = PyInt_FromSsize_t(__pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_4);
   __Pyx_GIVEREF(__pyx_t_1);
   PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_t_1);
   __pyx_t_1 = 0;
-  __pyx_t_1 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_np); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_np); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_5);
-  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_int8); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_int8); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 52, __pyx_L1_error)
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
-  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_4, __pyx_t_1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 52, __pyx_L1_error)
+  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_4, __pyx_t_1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 54, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_6);
   __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
   __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 52, __pyx_L1_error)
+  if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 54, __pyx_L1_error)
   __pyx_t_7 = ((PyArrayObject *)__pyx_t_6);
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
@@ -2467,35 +2611,35 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_9 = __pyx_t_10 = __pyx_t_11 = 0;
     }
     __pyx_pybuffernd_similarities.diminfo[0].strides = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_similarities.diminfo[0].shape = __pyx_pybuffernd_similarities.rcbuffer->pybuffer.shape[0];
-    if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 52, __pyx_L1_error)
+    if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 54, __pyx_L1_error)
   }
   __pyx_t_7 = 0;
   __pyx_v_similarities = ((PyArrayObject *)__pyx_t_6);
   __pyx_t_6 = 0;
 
-  /* "grma/utilities/cutils.pyx":53
+  /* "grma/utilities/cutils.pyx":55
  * 
  *     similarities = np.zeros(len(donors_genos), dtype=np.int8)
  *     number_of_alleles = len(allele_range)             # <<<<<<<<<<<<<<
  *     for i in range(len(donors_genos)):
  *         counted: int = init_count_similar
  */
-  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_allele_range)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 53, __pyx_L1_error)
+  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_allele_range)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 55, __pyx_L1_error)
   __pyx_v_number_of_alleles = __pyx_t_3;
 
-  /* "grma/utilities/cutils.pyx":54
+  /* "grma/utilities/cutils.pyx":56
  *     similarities = np.zeros(len(donors_genos), dtype=np.int8)
  *     number_of_alleles = len(allele_range)
  *     for i in range(len(donors_genos)):             # <<<<<<<<<<<<<<
  *         counted: int = init_count_similar
  *         count_similar: int = init_count_similar
  */
-  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_donors_genos)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 54, __pyx_L1_error)
+  __pyx_t_3 = PyObject_Length(((PyObject *)__pyx_v_donors_genos)); if (unlikely(__pyx_t_3 == ((Py_ssize_t)-1))) __PYX_ERR(0, 56, __pyx_L1_error)
   __pyx_t_12 = __pyx_t_3;
   for (__pyx_t_13 = 0; __pyx_t_13 < __pyx_t_12; __pyx_t_13+=1) {
     __pyx_v_i = __pyx_t_13;
 
-    /* "grma/utilities/cutils.pyx":55
+    /* "grma/utilities/cutils.pyx":57
  *     number_of_alleles = len(allele_range)
  *     for i in range(len(donors_genos)):
  *         counted: int = init_count_similar             # <<<<<<<<<<<<<<
@@ -2504,7 +2648,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
     __pyx_v_counted = __pyx_v_init_count_similar;
 
-    /* "grma/utilities/cutils.pyx":56
+    /* "grma/utilities/cutils.pyx":58
  *     for i in range(len(donors_genos)):
  *         counted: int = init_count_similar
  *         count_similar: int = init_count_similar             # <<<<<<<<<<<<<<
@@ -2513,16 +2657,16 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
     __pyx_v_count_similar = __pyx_v_init_count_similar;
 
-    /* "grma/utilities/cutils.pyx":57
+    /* "grma/utilities/cutils.pyx":59
  *         counted: int = init_count_similar
  *         count_similar: int = init_count_similar
  *         donors_geno = donors_genos[i]             # <<<<<<<<<<<<<<
  *         for j in range(number_of_alleles):
  *             allele_num = allele_range[j]
  */
-    __pyx_t_6 = __Pyx_GetItemInt(((PyObject *)__pyx_v_donors_genos), __pyx_v_i, Py_ssize_t, 1, PyInt_FromSsize_t, 0, 0, 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 57, __pyx_L1_error)
+    __pyx_t_6 = __Pyx_GetItemInt(((PyObject *)__pyx_v_donors_genos), __pyx_v_i, Py_ssize_t, 1, PyInt_FromSsize_t, 0, 0, 0); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 59, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_6);
-    if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 57, __pyx_L1_error)
+    if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 59, __pyx_L1_error)
     __pyx_t_14 = ((PyArrayObject *)__pyx_t_6);
     {
       __Pyx_BufFmt_StackElem __pyx_stack[1];
@@ -2539,13 +2683,13 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         __pyx_t_11 = __pyx_t_10 = __pyx_t_9 = 0;
       }
       __pyx_pybuffernd_donors_geno.diminfo[0].strides = __pyx_pybuffernd_donors_geno.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_donors_geno.diminfo[0].shape = __pyx_pybuffernd_donors_geno.rcbuffer->pybuffer.shape[0];
-      if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 57, __pyx_L1_error)
+      if (unlikely(__pyx_t_8 < 0)) __PYX_ERR(0, 59, __pyx_L1_error)
     }
     __pyx_t_14 = 0;
     __Pyx_XDECREF_SET(__pyx_v_donors_geno, ((PyArrayObject *)__pyx_t_6));
     __pyx_t_6 = 0;
 
-    /* "grma/utilities/cutils.pyx":58
+    /* "grma/utilities/cutils.pyx":60
  *         count_similar: int = init_count_similar
  *         donors_geno = donors_genos[i]
  *         for j in range(number_of_alleles):             # <<<<<<<<<<<<<<
@@ -2557,7 +2701,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
     for (__pyx_t_17 = 0; __pyx_t_17 < __pyx_t_16; __pyx_t_17+=1) {
       __pyx_v_j = __pyx_t_17;
 
-      /* "grma/utilities/cutils.pyx":59
+      /* "grma/utilities/cutils.pyx":61
  *         donors_geno = donors_genos[i]
  *         for j in range(number_of_alleles):
  *             allele_num = allele_range[j]             # <<<<<<<<<<<<<<
@@ -2567,7 +2711,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_18 = __pyx_v_j;
       __pyx_v_allele_num = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT8 *, __pyx_pybuffernd_allele_range.rcbuffer->pybuffer.buf, __pyx_t_18, __pyx_pybuffernd_allele_range.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":60
+      /* "grma/utilities/cutils.pyx":62
  *         for j in range(number_of_alleles):
  *             allele_num = allele_range[j]
  *             counted += 2             # <<<<<<<<<<<<<<
@@ -2576,7 +2720,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
       __pyx_v_counted = (__pyx_v_counted + 2);
 
-      /* "grma/utilities/cutils.pyx":61
+      /* "grma/utilities/cutils.pyx":63
  *             allele_num = allele_range[j]
  *             counted += 2
  *             patient_alleles0 = patients_geno[allele_num]             # <<<<<<<<<<<<<<
@@ -2586,7 +2730,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_18 = __pyx_v_allele_num;
       __pyx_v_patient_alleles0 = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.buf, __pyx_t_18, __pyx_pybuffernd_patients_geno.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":62
+      /* "grma/utilities/cutils.pyx":64
  *             counted += 2
  *             patient_alleles0 = patients_geno[allele_num]
  *             patient_alleles1 = patients_geno[allele_num + 1]             # <<<<<<<<<<<<<<
@@ -2596,7 +2740,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_19 = (__pyx_v_allele_num + 1);
       __pyx_v_patient_alleles1 = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_patients_geno.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":63
+      /* "grma/utilities/cutils.pyx":65
  *             patient_alleles0 = patients_geno[allele_num]
  *             patient_alleles1 = patients_geno[allele_num + 1]
  *             donor_alleles0 = donors_geno[allele_num]             # <<<<<<<<<<<<<<
@@ -2606,7 +2750,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_18 = __pyx_v_allele_num;
       __pyx_v_donor_alleles0 = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_donors_geno.rcbuffer->pybuffer.buf, __pyx_t_18, __pyx_pybuffernd_donors_geno.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":64
+      /* "grma/utilities/cutils.pyx":66
  *             patient_alleles1 = patients_geno[allele_num + 1]
  *             donor_alleles0 = donors_geno[allele_num]
  *             donor_alleles1 = donors_geno[allele_num + 1]             # <<<<<<<<<<<<<<
@@ -2616,7 +2760,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_19 = (__pyx_v_allele_num + 1);
       __pyx_v_donor_alleles1 = (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_donors_geno.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_donors_geno.diminfo[0].strides));
 
-      /* "grma/utilities/cutils.pyx":66
+      /* "grma/utilities/cutils.pyx":68
  *             donor_alleles1 = donors_geno[allele_num + 1]
  * 
  *             if patient_alleles0 == donor_alleles0:             # <<<<<<<<<<<<<<
@@ -2626,7 +2770,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_20 = ((__pyx_v_patient_alleles0 == __pyx_v_donor_alleles0) != 0);
       if (__pyx_t_20) {
 
-        /* "grma/utilities/cutils.pyx":67
+        /* "grma/utilities/cutils.pyx":69
  * 
  *             if patient_alleles0 == donor_alleles0:
  *                 if patient_alleles1 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2636,7 +2780,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         __pyx_t_20 = ((__pyx_v_patient_alleles1 == __pyx_v_donor_alleles1) != 0);
         if (__pyx_t_20) {
 
-          /* "grma/utilities/cutils.pyx":68
+          /* "grma/utilities/cutils.pyx":70
  *             if patient_alleles0 == donor_alleles0:
  *                 if patient_alleles1 == donor_alleles1:
  *                     count_similar += 2             # <<<<<<<<<<<<<<
@@ -2645,7 +2789,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
           __pyx_v_count_similar = (__pyx_v_count_similar + 2);
 
-          /* "grma/utilities/cutils.pyx":67
+          /* "grma/utilities/cutils.pyx":69
  * 
  *             if patient_alleles0 == donor_alleles0:
  *                 if patient_alleles1 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2655,7 +2799,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
           goto __pyx_L8;
         }
 
-        /* "grma/utilities/cutils.pyx":70
+        /* "grma/utilities/cutils.pyx":72
  *                     count_similar += 2
  *                 else:
  *                     count_similar += 1             # <<<<<<<<<<<<<<
@@ -2667,7 +2811,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         }
         __pyx_L8:;
 
-        /* "grma/utilities/cutils.pyx":66
+        /* "grma/utilities/cutils.pyx":68
  *             donor_alleles1 = donors_geno[allele_num + 1]
  * 
  *             if patient_alleles0 == donor_alleles0:             # <<<<<<<<<<<<<<
@@ -2677,7 +2821,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         goto __pyx_L7;
       }
 
-      /* "grma/utilities/cutils.pyx":72
+      /* "grma/utilities/cutils.pyx":74
  *                     count_similar += 1
  * 
  *             elif patient_alleles1 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2687,7 +2831,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_20 = ((__pyx_v_patient_alleles1 == __pyx_v_donor_alleles1) != 0);
       if (__pyx_t_20) {
 
-        /* "grma/utilities/cutils.pyx":73
+        /* "grma/utilities/cutils.pyx":75
  * 
  *             elif patient_alleles1 == donor_alleles1:
  *                 count_similar += 1             # <<<<<<<<<<<<<<
@@ -2696,7 +2840,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
         __pyx_v_count_similar = (__pyx_v_count_similar + 1);
 
-        /* "grma/utilities/cutils.pyx":72
+        /* "grma/utilities/cutils.pyx":74
  *                     count_similar += 1
  * 
  *             elif patient_alleles1 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2706,7 +2850,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         goto __pyx_L7;
       }
 
-      /* "grma/utilities/cutils.pyx":77
+      /* "grma/utilities/cutils.pyx":79
  *             # It isn't possible that donor0=patient1 and donor1=patient0,
  *             # because the alleles are sorted.
  *             elif patient_alleles0 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2716,7 +2860,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_20 = ((__pyx_v_patient_alleles0 == __pyx_v_donor_alleles1) != 0);
       if (__pyx_t_20) {
 
-        /* "grma/utilities/cutils.pyx":78
+        /* "grma/utilities/cutils.pyx":80
  *             # because the alleles are sorted.
  *             elif patient_alleles0 == donor_alleles1:
  *                 count_similar += 1             # <<<<<<<<<<<<<<
@@ -2725,7 +2869,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
         __pyx_v_count_similar = (__pyx_v_count_similar + 1);
 
-        /* "grma/utilities/cutils.pyx":77
+        /* "grma/utilities/cutils.pyx":79
  *             # It isn't possible that donor0=patient1 and donor1=patient0,
  *             # because the alleles are sorted.
  *             elif patient_alleles0 == donor_alleles1:             # <<<<<<<<<<<<<<
@@ -2735,7 +2879,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         goto __pyx_L7;
       }
 
-      /* "grma/utilities/cutils.pyx":80
+      /* "grma/utilities/cutils.pyx":82
  *                 count_similar += 1
  * 
  *             elif patient_alleles1 == donor_alleles0:             # <<<<<<<<<<<<<<
@@ -2745,7 +2889,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_20 = ((__pyx_v_patient_alleles1 == __pyx_v_donor_alleles0) != 0);
       if (__pyx_t_20) {
 
-        /* "grma/utilities/cutils.pyx":81
+        /* "grma/utilities/cutils.pyx":83
  * 
  *             elif patient_alleles1 == donor_alleles0:
  *                 count_similar += 1             # <<<<<<<<<<<<<<
@@ -2754,7 +2898,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
         __pyx_v_count_similar = (__pyx_v_count_similar + 1);
 
-        /* "grma/utilities/cutils.pyx":80
+        /* "grma/utilities/cutils.pyx":82
  *                 count_similar += 1
  * 
  *             elif patient_alleles1 == donor_alleles0:             # <<<<<<<<<<<<<<
@@ -2764,7 +2908,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       }
       __pyx_L7:;
 
-      /* "grma/utilities/cutils.pyx":83
+      /* "grma/utilities/cutils.pyx":85
  *                 count_similar += 1
  * 
  *             if counted - count_similar > 3:             # <<<<<<<<<<<<<<
@@ -2774,7 +2918,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_20 = (((__pyx_v_counted - __pyx_v_count_similar) > 3) != 0);
       if (__pyx_t_20) {
 
-        /* "grma/utilities/cutils.pyx":84
+        /* "grma/utilities/cutils.pyx":86
  * 
  *             if counted - count_similar > 3:
  *                 similarities[i] = -1             # <<<<<<<<<<<<<<
@@ -2784,7 +2928,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
         __pyx_t_19 = __pyx_v_i;
         *__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT8 *, __pyx_pybuffernd_similarities.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_similarities.diminfo[0].strides) = -1;
 
-        /* "grma/utilities/cutils.pyx":85
+        /* "grma/utilities/cutils.pyx":87
  *             if counted - count_similar > 3:
  *                 similarities[i] = -1
  *                 break             # <<<<<<<<<<<<<<
@@ -2793,7 +2937,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
  */
         goto __pyx_L6_break;
 
-        /* "grma/utilities/cutils.pyx":83
+        /* "grma/utilities/cutils.pyx":85
  *                 count_similar += 1
  * 
  *             if counted - count_similar > 3:             # <<<<<<<<<<<<<<
@@ -2804,7 +2948,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
     }
     __pyx_L6_break:;
 
-    /* "grma/utilities/cutils.pyx":86
+    /* "grma/utilities/cutils.pyx":88
  *                 similarities[i] = -1
  *                 break
  *         if 10 - count_similar > 3:             # <<<<<<<<<<<<<<
@@ -2814,7 +2958,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
     __pyx_t_20 = (((10 - __pyx_v_count_similar) > 3) != 0);
     if (__pyx_t_20) {
 
-      /* "grma/utilities/cutils.pyx":87
+      /* "grma/utilities/cutils.pyx":89
  *                 break
  *         if 10 - count_similar > 3:
  *             similarities[i] = -1             # <<<<<<<<<<<<<<
@@ -2824,7 +2968,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       __pyx_t_19 = __pyx_v_i;
       *__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT8 *, __pyx_pybuffernd_similarities.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_similarities.diminfo[0].strides) = -1;
 
-      /* "grma/utilities/cutils.pyx":86
+      /* "grma/utilities/cutils.pyx":88
  *                 similarities[i] = -1
  *                 break
  *         if 10 - count_similar > 3:             # <<<<<<<<<<<<<<
@@ -2834,7 +2978,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
       goto __pyx_L10;
     }
 
-    /* "grma/utilities/cutils.pyx":89
+    /* "grma/utilities/cutils.pyx":91
  *             similarities[i] = -1
  *         else:
  *             similarities[i] = count_similar             # <<<<<<<<<<<<<<
@@ -2848,7 +2992,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
     __pyx_L10:;
   }
 
-  /* "grma/utilities/cutils.pyx":91
+  /* "grma/utilities/cutils.pyx":93
  *             similarities[i] = count_similar
  * 
  *     return similarities             # <<<<<<<<<<<<<<
@@ -2860,7 +3004,7 @@ static PyArrayObject *__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(PyArray
   __pyx_r = ((PyArrayObject *)__pyx_v_similarities);
   goto __pyx_L0;
 
-  /* "grma/utilities/cutils.pyx":34
+  /* "grma/utilities/cutils.pyx":36
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef np.ndarray[INT8, ndim=1] ccheck_similarity(np.ndarray[UINT16, ndim=1] patients_geno,             # <<<<<<<<<<<<<<
@@ -2943,23 +3087,23 @@ static PyObject *__pyx_pw_4grma_9utilities_6cutils_3ccheck_similarity(PyObject *
         case  1:
         if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_donors_genos)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 1); __PYX_ERR(0, 34, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 1); __PYX_ERR(0, 36, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  2:
         if (likely((values[2] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_allele_range)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 2); __PYX_ERR(0, 34, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 2); __PYX_ERR(0, 36, __pyx_L3_error)
         }
         CYTHON_FALLTHROUGH;
         case  3:
         if (likely((values[3] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_init_count_similar)) != 0)) kw_args--;
         else {
-          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 3); __PYX_ERR(0, 34, __pyx_L3_error)
+          __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, 3); __PYX_ERR(0, 36, __pyx_L3_error)
         }
       }
       if (unlikely(kw_args > 0)) {
-        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "ccheck_similarity") < 0)) __PYX_ERR(0, 34, __pyx_L3_error)
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "ccheck_similarity") < 0)) __PYX_ERR(0, 36, __pyx_L3_error)
       }
     } else if (PyTuple_GET_SIZE(__pyx_args) != 4) {
       goto __pyx_L5_argtuple_error;
@@ -2972,19 +3116,19 @@ static PyObject *__pyx_pw_4grma_9utilities_6cutils_3ccheck_similarity(PyObject *
     __pyx_v_patients_geno = ((PyArrayObject *)values[0]);
     __pyx_v_donors_genos = ((PyArrayObject *)values[1]);
     __pyx_v_allele_range = ((PyArrayObject *)values[2]);
-    __pyx_v_init_count_similar = __Pyx_PyInt_As_npy_uint8(values[3]); if (unlikely((__pyx_v_init_count_similar == ((npy_uint8)-1)) && PyErr_Occurred())) __PYX_ERR(0, 36, __pyx_L3_error)
+    __pyx_v_init_count_similar = __Pyx_PyInt_As_npy_uint8(values[3]); if (unlikely((__pyx_v_init_count_similar == ((npy_uint8)-1)) && PyErr_Occurred())) __PYX_ERR(0, 38, __pyx_L3_error)
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 34, __pyx_L3_error)
+  __Pyx_RaiseArgtupleInvalid("ccheck_similarity", 1, 4, 4, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 36, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("grma.utilities.cutils.ccheck_similarity", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_patients_geno), __pyx_ptype_5numpy_ndarray, 1, "patients_geno", 0))) __PYX_ERR(0, 34, __pyx_L1_error)
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_donors_genos), __pyx_ptype_5numpy_ndarray, 1, "donors_genos", 0))) __PYX_ERR(0, 35, __pyx_L1_error)
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_allele_range), __pyx_ptype_5numpy_ndarray, 1, "allele_range", 0))) __PYX_ERR(0, 36, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_patients_geno), __pyx_ptype_5numpy_ndarray, 1, "patients_geno", 0))) __PYX_ERR(0, 36, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_donors_genos), __pyx_ptype_5numpy_ndarray, 1, "donors_genos", 0))) __PYX_ERR(0, 37, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_allele_range), __pyx_ptype_5numpy_ndarray, 1, "allele_range", 0))) __PYX_ERR(0, 38, __pyx_L1_error)
   __pyx_r = __pyx_pf_4grma_9utilities_6cutils_2ccheck_similarity(__pyx_self, __pyx_v_patients_geno, __pyx_v_donors_genos, __pyx_v_allele_range, __pyx_v_init_count_similar);
 
   /* function exit code */
@@ -3024,21 +3168,21 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_2ccheck_similarity(CYTHON_UNU
   __pyx_pybuffernd_allele_range.rcbuffer = &__pyx_pybuffer_allele_range;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_patients_geno.rcbuffer->pybuffer, (PyObject*)__pyx_v_patients_geno, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_patients_geno.rcbuffer->pybuffer, (PyObject*)__pyx_v_patients_geno, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_patients_geno.diminfo[0].strides = __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_patients_geno.diminfo[0].shape = __pyx_pybuffernd_patients_geno.rcbuffer->pybuffer.shape[0];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_donors_genos.rcbuffer->pybuffer, (PyObject*)__pyx_v_donors_genos, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_donors_genos.rcbuffer->pybuffer, (PyObject*)__pyx_v_donors_genos, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_donors_genos.diminfo[0].strides = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_donors_genos.diminfo[0].shape = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_donors_genos.diminfo[1].strides = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_donors_genos.diminfo[1].shape = __pyx_pybuffernd_donors_genos.rcbuffer->pybuffer.shape[1];
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_allele_range.rcbuffer->pybuffer, (PyObject*)__pyx_v_allele_range, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 34, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_allele_range.rcbuffer->pybuffer, (PyObject*)__pyx_v_allele_range, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT8, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 36, __pyx_L1_error)
   }
   __pyx_pybuffernd_allele_range.diminfo[0].strides = __pyx_pybuffernd_allele_range.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_allele_range.diminfo[0].shape = __pyx_pybuffernd_allele_range.rcbuffer->pybuffer.shape[0];
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = ((PyObject *)__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(__pyx_v_patients_geno, __pyx_v_donors_genos, __pyx_v_allele_range, __pyx_v_init_count_similar, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 34, __pyx_L1_error)
+  __pyx_t_1 = ((PyObject *)__pyx_f_4grma_9utilities_6cutils_ccheck_similarity(__pyx_v_patients_geno, __pyx_v_donors_genos, __pyx_v_allele_range, __pyx_v_init_count_similar, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 36, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
@@ -3068,7 +3212,7 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_2ccheck_similarity(CYTHON_UNU
   return __pyx_r;
 }
 
-/* "grma/utilities/cutils.pyx":96
+/* "grma/utilities/cutils.pyx":98
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef UINT32 chash(np.ndarray[UINT16, ndim=1] arr):             # <<<<<<<<<<<<<<
@@ -3098,11 +3242,11 @@ static __pyx_t_4grma_9utilities_6cutils_UINT32 __pyx_f_4grma_9utilities_6cutils_
   __pyx_pybuffernd_arr.rcbuffer = &__pyx_pybuffer_arr;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_arr.rcbuffer->pybuffer, (PyObject*)__pyx_v_arr, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 96, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_arr.rcbuffer->pybuffer, (PyObject*)__pyx_v_arr, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 98, __pyx_L1_error)
   }
   __pyx_pybuffernd_arr.diminfo[0].strides = __pyx_pybuffernd_arr.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_arr.diminfo[0].shape = __pyx_pybuffernd_arr.rcbuffer->pybuffer.shape[0];
 
-  /* "grma/utilities/cutils.pyx":97
+  /* "grma/utilities/cutils.pyx":99
  * @cython.wraparound(False)
  * cpdef UINT32 chash(np.ndarray[UINT16, ndim=1] arr):
  *     cdef UINT32 h = 17             # <<<<<<<<<<<<<<
@@ -3111,37 +3255,40 @@ static __pyx_t_4grma_9utilities_6cutils_UINT32 __pyx_f_4grma_9utilities_6cutils_
  */
   __pyx_v_h = 17;
 
-  /* "grma/utilities/cutils.pyx":99
+  /* "grma/utilities/cutils.pyx":101
  *     cdef UINT32 h = 17
  *     cdef UINT8 i
  *     for i in range(len(arr)):             # <<<<<<<<<<<<<<
  *         h = h * 31 + arr[i]
  *     return h
  */
-  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_arr)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 99, __pyx_L1_error)
+  __pyx_t_1 = PyObject_Length(((PyObject *)__pyx_v_arr)); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 101, __pyx_L1_error)
   __pyx_t_2 = __pyx_t_1;
   for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
     __pyx_v_i = __pyx_t_3;
 
-    /* "grma/utilities/cutils.pyx":100
+    /* "grma/utilities/cutils.pyx":102
  *     cdef UINT8 i
  *     for i in range(len(arr)):
  *         h = h * 31 + arr[i]             # <<<<<<<<<<<<<<
  *     return h
+ * 
  */
     __pyx_t_4 = __pyx_v_i;
     __pyx_v_h = ((__pyx_v_h * 31) + (*__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_arr.rcbuffer->pybuffer.buf, __pyx_t_4, __pyx_pybuffernd_arr.diminfo[0].strides)));
   }
 
-  /* "grma/utilities/cutils.pyx":101
+  /* "grma/utilities/cutils.pyx":103
  *     for i in range(len(arr)):
  *         h = h * 31 + arr[i]
  *     return h             # <<<<<<<<<<<<<<
+ * 
+ * 
  */
   __pyx_r = __pyx_v_h;
   goto __pyx_L0;
 
-  /* "grma/utilities/cutils.pyx":96
+  /* "grma/utilities/cutils.pyx":98
  * @cython.boundscheck(False)
  * @cython.wraparound(False)
  * cpdef UINT32 chash(np.ndarray[UINT16, ndim=1] arr):             # <<<<<<<<<<<<<<
@@ -3176,7 +3323,7 @@ static PyObject *__pyx_pw_4grma_9utilities_6cutils_5chash(PyObject *__pyx_self,
   PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("chash (wrapper)", 0);
-  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_arr), __pyx_ptype_5numpy_ndarray, 1, "arr", 0))) __PYX_ERR(0, 96, __pyx_L1_error)
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_arr), __pyx_ptype_5numpy_ndarray, 1, "arr", 0))) __PYX_ERR(0, 98, __pyx_L1_error)
   __pyx_r = __pyx_pf_4grma_9utilities_6cutils_4chash(__pyx_self, ((PyArrayObject *)__pyx_v_arr));
 
   /* function exit code */
@@ -3204,11 +3351,11 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_4chash(CYTHON_UNUSED PyObject
   __pyx_pybuffernd_arr.rcbuffer = &__pyx_pybuffer_arr;
   {
     __Pyx_BufFmt_StackElem __pyx_stack[1];
-    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_arr.rcbuffer->pybuffer, (PyObject*)__pyx_v_arr, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 96, __pyx_L1_error)
+    if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_arr.rcbuffer->pybuffer, (PyObject*)__pyx_v_arr, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 1, 0, __pyx_stack) == -1)) __PYX_ERR(0, 98, __pyx_L1_error)
   }
   __pyx_pybuffernd_arr.diminfo[0].strides = __pyx_pybuffernd_arr.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_arr.diminfo[0].shape = __pyx_pybuffernd_arr.rcbuffer->pybuffer.shape[0];
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = __Pyx_PyInt_From_npy_uint32(__pyx_f_4grma_9utilities_6cutils_chash(__pyx_v_arr, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 96, __pyx_L1_error)
+  __pyx_t_1 = __Pyx_PyInt_From_npy_uint32(__pyx_f_4grma_9utilities_6cutils_chash(__pyx_v_arr, 0)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 98, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
@@ -3234,124 +3381,1903 @@ static PyObject *__pyx_pf_4grma_9utilities_6cutils_4chash(CYTHON_UNUSED PyObject
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":734
- * ctypedef npy_cdouble     complex_t
+/* "grma/utilities/cutils.pyx":106
  * 
- * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
- *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline bint _is_space(char ch):             # <<<<<<<<<<<<<<
+ *     return ch == c' ' or ch == c'\t' or ch == c'\r'
  * 
  */
 
-static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__pyx_v_a) {
-  PyObject *__pyx_r = NULL;
+static CYTHON_INLINE int __pyx_f_4grma_9utilities_6cutils__is_space(char __pyx_v_ch) {
+  int __pyx_r;
   __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("PyArray_MultiIterNew1", 0);
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("_is_space", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":735
+  /* "grma/utilities/cutils.pyx":107
+ * 
+ * cdef inline bint _is_space(char ch):
+ *     return ch == c' ' or ch == c'\t' or ch == c'\r'             # <<<<<<<<<<<<<<
  * 
- * cdef inline object PyArray_MultiIterNew1(a):
- *     return PyArray_MultiIterNew(1, <void*>a)             # <<<<<<<<<<<<<<
  * 
- * cdef inline object PyArray_MultiIterNew2(a, b):
  */
-  __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(1, ((void *)__pyx_v_a)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 735, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
+  switch (__pyx_v_ch) {
+    case ' ':
+    case '\t':
+    case '\r':
+    __pyx_t_1 = 1;
+    break;
+    default:
+    __pyx_t_1 = 0;
+    break;
+  }
   __pyx_r = __pyx_t_1;
-  __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":734
- * ctypedef npy_cdouble     complex_t
+  /* "grma/utilities/cutils.pyx":106
  * 
- * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
- *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline bint _is_space(char ch):             # <<<<<<<<<<<<<<
+ *     return ch == c' ' or ch == c'\t' or ch == c'\r'
  * 
  */
 
   /* function exit code */
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew1", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = 0;
   __pyx_L0:;
-  __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":737
- *     return PyArray_MultiIterNew(1, <void*>a)
+/* "grma/utilities/cutils.pyx":110
  * 
- * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
- *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
  * 
+ * cdef bint _parse_int(const char* buf, Py_ssize_t start, Py_ssize_t end, INT64* value):             # <<<<<<<<<<<<<<
+ *     """parse a base-10 integer field (surrounded by optional spaces). returns False if it is malformed."""
+ *     cdef INT64 result = 0
  */
 
-static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__pyx_v_a, PyObject *__pyx_v_b) {
-  PyObject *__pyx_r = NULL;
+static int __pyx_f_4grma_9utilities_6cutils__parse_int(char const *__pyx_v_buf, Py_ssize_t __pyx_v_start, Py_ssize_t __pyx_v_end, __pyx_t_4grma_9utilities_6cutils_INT64 *__pyx_v_value) {
+  __pyx_t_4grma_9utilities_6cutils_INT64 __pyx_v_result;
+  int __pyx_v_negative;
+  int __pyx_r;
   __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("PyArray_MultiIterNew2", 0);
+  int __pyx_t_1;
+  int __pyx_t_2;
+  __pyx_t_4grma_9utilities_6cutils_INT64 __pyx_t_3;
+  __Pyx_RefNannySetupContext("_parse_int", 0);
+
+  /* "grma/utilities/cutils.pyx":112
+ * cdef bint _parse_int(const char* buf, Py_ssize_t start, Py_ssize_t end, INT64* value):
+ *     """parse a base-10 integer field (surrounded by optional spaces). returns False if it is malformed."""
+ *     cdef INT64 result = 0             # <<<<<<<<<<<<<<
+ *     cdef bint negative = False
+ *     while start < end and _is_space(buf[start]):
+ */
+  __pyx_v_result = 0;
+
+  /* "grma/utilities/cutils.pyx":113
+ *     """parse a base-10 integer field (surrounded by optional spaces). returns False if it is malformed."""
+ *     cdef INT64 result = 0
+ *     cdef bint negative = False             # <<<<<<<<<<<<<<
+ *     while start < end and _is_space(buf[start]):
+ *         start += 1
+ */
+  __pyx_v_negative = 0;
+
+  /* "grma/utilities/cutils.pyx":114
+ *     cdef INT64 result = 0
+ *     cdef bint negative = False
+ *     while start < end and _is_space(buf[start]):             # <<<<<<<<<<<<<<
+ *         start += 1
+ *     while end > start and _is_space(buf[end - 1]):
+ */
+  while (1) {
+    __pyx_t_2 = ((__pyx_v_start < __pyx_v_end) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L5_bool_binop_done;
+    }
+    __pyx_t_2 = (__pyx_f_4grma_9utilities_6cutils__is_space((__pyx_v_buf[__pyx_v_start])) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L5_bool_binop_done:;
+    if (!__pyx_t_1) break;
+
+    /* "grma/utilities/cutils.pyx":115
+ *     cdef bint negative = False
+ *     while start < end and _is_space(buf[start]):
+ *         start += 1             # <<<<<<<<<<<<<<
+ *     while end > start and _is_space(buf[end - 1]):
+ *         end -= 1
+ */
+    __pyx_v_start = (__pyx_v_start + 1);
+  }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":738
- * 
- * cdef inline object PyArray_MultiIterNew2(a, b):
- *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)             # <<<<<<<<<<<<<<
- * 
- * cdef inline object PyArray_MultiIterNew3(a, b, c):
+  /* "grma/utilities/cutils.pyx":116
+ *     while start < end and _is_space(buf[start]):
+ *         start += 1
+ *     while end > start and _is_space(buf[end - 1]):             # <<<<<<<<<<<<<<
+ *         end -= 1
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):
  */
-  __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(2, ((void *)__pyx_v_a), ((void *)__pyx_v_b)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 738, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_r = __pyx_t_1;
-  __pyx_t_1 = 0;
-  goto __pyx_L0;
+  while (1) {
+    __pyx_t_2 = ((__pyx_v_end > __pyx_v_start) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L9_bool_binop_done;
+    }
+    __pyx_t_2 = (__pyx_f_4grma_9utilities_6cutils__is_space((__pyx_v_buf[(__pyx_v_end - 1)])) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L9_bool_binop_done:;
+    if (!__pyx_t_1) break;
+
+    /* "grma/utilities/cutils.pyx":117
+ *         start += 1
+ *     while end > start and _is_space(buf[end - 1]):
+ *         end -= 1             # <<<<<<<<<<<<<<
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):
+ *         negative = buf[start] == c'-'
+ */
+    __pyx_v_end = (__pyx_v_end - 1);
+  }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":737
- *     return PyArray_MultiIterNew(1, <void*>a)
- * 
- * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
- *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
- * 
+  /* "grma/utilities/cutils.pyx":118
+ *     while end > start and _is_space(buf[end - 1]):
+ *         end -= 1
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):             # <<<<<<<<<<<<<<
+ *         negative = buf[start] == c'-'
+ *         start += 1
  */
+  __pyx_t_2 = ((__pyx_v_start < __pyx_v_end) != 0);
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L12_bool_binop_done;
+  }
+  __pyx_t_2 = (((__pyx_v_buf[__pyx_v_start]) == '-') != 0);
+  if (!__pyx_t_2) {
+  } else {
+    __pyx_t_1 = __pyx_t_2;
+    goto __pyx_L12_bool_binop_done;
+  }
+  __pyx_t_2 = (((__pyx_v_buf[__pyx_v_start]) == '+') != 0);
+  __pyx_t_1 = __pyx_t_2;
+  __pyx_L12_bool_binop_done:;
+  if (__pyx_t_1) {
 
-  /* function exit code */
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew2", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = 0;
-  __pyx_L0:;
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
-}
+    /* "grma/utilities/cutils.pyx":119
+ *         end -= 1
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):
+ *         negative = buf[start] == c'-'             # <<<<<<<<<<<<<<
+ *         start += 1
+ *     if start == end:
+ */
+    __pyx_v_negative = ((__pyx_v_buf[__pyx_v_start]) == '-');
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":740
- *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
- * 
- * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
- *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
- * 
+    /* "grma/utilities/cutils.pyx":120
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):
+ *         negative = buf[start] == c'-'
+ *         start += 1             # <<<<<<<<<<<<<<
+ *     if start == end:
+ *         return False
  */
+    __pyx_v_start = (__pyx_v_start + 1);
 
-static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__pyx_v_a, PyObject *__pyx_v_b, PyObject *__pyx_v_c) {
-  PyObject *__pyx_r = NULL;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  int __pyx_lineno = 0;
-  const char *__pyx_filename = NULL;
-  int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("PyArray_MultiIterNew3", 0);
+    /* "grma/utilities/cutils.pyx":118
+ *     while end > start and _is_space(buf[end - 1]):
+ *         end -= 1
+ *     if start < end and (buf[start] == c'-' or buf[start] == c'+'):             # <<<<<<<<<<<<<<
+ *         negative = buf[start] == c'-'
+ *         start += 1
+ */
+  }
+
+  /* "grma/utilities/cutils.pyx":121
+ *         negative = buf[start] == c'-'
+ *         start += 1
+ *     if start == end:             # <<<<<<<<<<<<<<
+ *         return False
+ *     while start < end:
+ */
+  __pyx_t_1 = ((__pyx_v_start == __pyx_v_end) != 0);
+  if (__pyx_t_1) {
+
+    /* "grma/utilities/cutils.pyx":122
+ *         start += 1
+ *     if start == end:
+ *         return False             # <<<<<<<<<<<<<<
+ *     while start < end:
+ *         if buf[start] < c'0' or buf[start] > c'9':
+ */
+    __pyx_r = 0;
+    goto __pyx_L0;
+
+    /* "grma/utilities/cutils.pyx":121
+ *         negative = buf[start] == c'-'
+ *         start += 1
+ *     if start == end:             # <<<<<<<<<<<<<<
+ *         return False
+ *     while start < end:
+ */
+  }
+
+  /* "grma/utilities/cutils.pyx":123
+ *     if start == end:
+ *         return False
+ *     while start < end:             # <<<<<<<<<<<<<<
+ *         if buf[start] < c'0' or buf[start] > c'9':
+ *             return False
+ */
+  while (1) {
+    __pyx_t_1 = ((__pyx_v_start < __pyx_v_end) != 0);
+    if (!__pyx_t_1) break;
+
+    /* "grma/utilities/cutils.pyx":124
+ *         return False
+ *     while start < end:
+ *         if buf[start] < c'0' or buf[start] > c'9':             # <<<<<<<<<<<<<<
+ *             return False
+ *         result = result * 10 + (buf[start] - c'0')
+ */
+    __pyx_t_2 = (((__pyx_v_buf[__pyx_v_start]) < '0') != 0);
+    if (!__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L19_bool_binop_done;
+    }
+    __pyx_t_2 = (((__pyx_v_buf[__pyx_v_start]) > '9') != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L19_bool_binop_done:;
+    if (__pyx_t_1) {
+
+      /* "grma/utilities/cutils.pyx":125
+ *     while start < end:
+ *         if buf[start] < c'0' or buf[start] > c'9':
+ *             return False             # <<<<<<<<<<<<<<
+ *         result = result * 10 + (buf[start] - c'0')
+ *         start += 1
+ */
+      __pyx_r = 0;
+      goto __pyx_L0;
+
+      /* "grma/utilities/cutils.pyx":124
+ *         return False
+ *     while start < end:
+ *         if buf[start] < c'0' or buf[start] > c'9':             # <<<<<<<<<<<<<<
+ *             return False
+ *         result = result * 10 + (buf[start] - c'0')
+ */
+    }
+
+    /* "grma/utilities/cutils.pyx":126
+ *         if buf[start] < c'0' or buf[start] > c'9':
+ *             return False
+ *         result = result * 10 + (buf[start] - c'0')             # <<<<<<<<<<<<<<
+ *         start += 1
+ *     value[0] = -result if negative else result
+ */
+    __pyx_v_result = ((__pyx_v_result * 10) + ((__pyx_v_buf[__pyx_v_start]) - '0'));
+
+    /* "grma/utilities/cutils.pyx":127
+ *             return False
+ *         result = result * 10 + (buf[start] - c'0')
+ *         start += 1             # <<<<<<<<<<<<<<
+ *     value[0] = -result if negative else result
+ *     return True
+ */
+    __pyx_v_start = (__pyx_v_start + 1);
+  }
+
+  /* "grma/utilities/cutils.pyx":128
+ *         result = result * 10 + (buf[start] - c'0')
+ *         start += 1
+ *     value[0] = -result if negative else result             # <<<<<<<<<<<<<<
+ *     return True
+ * 
+ */
+  if ((__pyx_v_negative != 0)) {
+    __pyx_t_3 = (-__pyx_v_result);
+  } else {
+    __pyx_t_3 = __pyx_v_result;
+  }
+  (__pyx_v_value[0]) = __pyx_t_3;
+
+  /* "grma/utilities/cutils.pyx":129
+ *         start += 1
+ *     value[0] = -result if negative else result
+ *     return True             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = 1;
+  goto __pyx_L0;
+
+  /* "grma/utilities/cutils.pyx":110
+ * 
+ * 
+ * cdef bint _parse_int(const char* buf, Py_ssize_t start, Py_ssize_t end, INT64* value):             # <<<<<<<<<<<<<<
+ *     """parse a base-10 integer field (surrounded by optional spaces). returns False if it is malformed."""
+ *     cdef INT64 result = 0
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "grma/utilities/cutils.pyx":132
+ * 
+ * 
+ * cdef bint _parse_gl_string(const char* buf, Py_ssize_t start, Py_ssize_t end, UINT16* geno):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a GL string of 10 alleles into geno, the same way as utils.gl_string_to_integers:
+ */
+
+static int __pyx_f_4grma_9utilities_6cutils__parse_gl_string(char const *__pyx_v_buf, Py_ssize_t __pyx_v_start, Py_ssize_t __pyx_v_end, __pyx_t_4grma_9utilities_6cutils_UINT16 *__pyx_v_geno) {
+  Py_ssize_t __pyx_v_allele_end;
+  int __pyx_v_num_alleles;
+  int __pyx_v_digits;
+  int __pyx_v_i;
+  __pyx_t_4grma_9utilities_6cutils_UINT16 __pyx_v_allele;
+  __pyx_t_4grma_9utilities_6cutils_UINT16 __pyx_v_tmp;
+  int __pyx_v_after_star;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  Py_ssize_t __pyx_t_3;
+  Py_ssize_t __pyx_t_4;
+  int __pyx_t_5;
+  __Pyx_RefNannySetupContext("_parse_gl_string", 0);
+
+  /* "grma/utilities/cutils.pyx":141
+ *     cdef:
+ *         Py_ssize_t allele_end
+ *         int num_alleles = 0, digits, i             # <<<<<<<<<<<<<<
+ *         UINT16 allele, tmp
+ *         bint after_star
+ */
+  __pyx_v_num_alleles = 0;
+
+  /* "grma/utilities/cutils.pyx":145
+ *         bint after_star
+ * 
+ *     while start <= end:             # <<<<<<<<<<<<<<
+ *         allele_end = start
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+ */
+  while (1) {
+    __pyx_t_1 = ((__pyx_v_start <= __pyx_v_end) != 0);
+    if (!__pyx_t_1) break;
+
+    /* "grma/utilities/cutils.pyx":146
+ * 
+ *     while start <= end:
+ *         allele_end = start             # <<<<<<<<<<<<<<
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+ *             allele_end += 1
+ */
+    __pyx_v_allele_end = __pyx_v_start;
+
+    /* "grma/utilities/cutils.pyx":147
+ *     while start <= end:
+ *         allele_end = start
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':             # <<<<<<<<<<<<<<
+ *             allele_end += 1
+ *         if num_alleles == 10:
+ */
+    while (1) {
+      __pyx_t_2 = ((__pyx_v_allele_end < __pyx_v_end) != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L7_bool_binop_done;
+      }
+      __pyx_t_2 = (((__pyx_v_buf[__pyx_v_allele_end]) != '+') != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L7_bool_binop_done;
+      }
+      __pyx_t_2 = (((__pyx_v_buf[__pyx_v_allele_end]) != '^') != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L7_bool_binop_done;
+      }
+      __pyx_t_2 = (((__pyx_v_buf[__pyx_v_allele_end]) != '~') != 0);
+      __pyx_t_1 = __pyx_t_2;
+      __pyx_L7_bool_binop_done:;
+      if (!__pyx_t_1) break;
+
+      /* "grma/utilities/cutils.pyx":148
+ *         allele_end = start
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+ *             allele_end += 1             # <<<<<<<<<<<<<<
+ *         if num_alleles == 10:
+ *             return False
+ */
+      __pyx_v_allele_end = (__pyx_v_allele_end + 1);
+    }
+
+    /* "grma/utilities/cutils.pyx":149
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+ *             allele_end += 1
+ *         if num_alleles == 10:             # <<<<<<<<<<<<<<
+ *             return False
+ * 
+ */
+    __pyx_t_1 = ((__pyx_v_num_alleles == 10) != 0);
+    if (__pyx_t_1) {
+
+      /* "grma/utilities/cutils.pyx":150
+ *             allele_end += 1
+ *         if num_alleles == 10:
+ *             return False             # <<<<<<<<<<<<<<
+ * 
+ *         allele = 0
+ */
+      __pyx_r = 0;
+      goto __pyx_L0;
+
+      /* "grma/utilities/cutils.pyx":149
+ *         while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+ *             allele_end += 1
+ *         if num_alleles == 10:             # <<<<<<<<<<<<<<
+ *             return False
+ * 
+ */
+    }
+
+    /* "grma/utilities/cutils.pyx":152
+ *             return False
+ * 
+ *         allele = 0             # <<<<<<<<<<<<<<
+ *         digits = 0
+ *         after_star = False
+ */
+    __pyx_v_allele = 0;
+
+    /* "grma/utilities/cutils.pyx":153
+ * 
+ *         allele = 0
+ *         digits = 0             # <<<<<<<<<<<<<<
+ *         after_star = False
+ *         for i in range(start, allele_end):
+ */
+    __pyx_v_digits = 0;
+
+    /* "grma/utilities/cutils.pyx":154
+ *         allele = 0
+ *         digits = 0
+ *         after_star = False             # <<<<<<<<<<<<<<
+ *         for i in range(start, allele_end):
+ *             if buf[i] == c'*':
+ */
+    __pyx_v_after_star = 0;
+
+    /* "grma/utilities/cutils.pyx":155
+ *         digits = 0
+ *         after_star = False
+ *         for i in range(start, allele_end):             # <<<<<<<<<<<<<<
+ *             if buf[i] == c'*':
+ *                 if after_star:
+ */
+    __pyx_t_3 = __pyx_v_allele_end;
+    __pyx_t_4 = __pyx_t_3;
+    for (__pyx_t_5 = __pyx_v_start; __pyx_t_5 < __pyx_t_4; __pyx_t_5+=1) {
+      __pyx_v_i = __pyx_t_5;
+
+      /* "grma/utilities/cutils.pyx":156
+ *         after_star = False
+ *         for i in range(start, allele_end):
+ *             if buf[i] == c'*':             # <<<<<<<<<<<<<<
+ *                 if after_star:
+ *                     break
+ */
+      __pyx_t_1 = (((__pyx_v_buf[__pyx_v_i]) == '*') != 0);
+      if (__pyx_t_1) {
+
+        /* "grma/utilities/cutils.pyx":157
+ *         for i in range(start, allele_end):
+ *             if buf[i] == c'*':
+ *                 if after_star:             # <<<<<<<<<<<<<<
+ *                     break
+ *                 after_star = True
+ */
+        __pyx_t_1 = (__pyx_v_after_star != 0);
+        if (__pyx_t_1) {
+
+          /* "grma/utilities/cutils.pyx":158
+ *             if buf[i] == c'*':
+ *                 if after_star:
+ *                     break             # <<<<<<<<<<<<<<
+ *                 after_star = True
+ *             elif after_star and buf[i] != c':' and digits < 4:
+ */
+          goto __pyx_L13_break;
+
+          /* "grma/utilities/cutils.pyx":157
+ *         for i in range(start, allele_end):
+ *             if buf[i] == c'*':
+ *                 if after_star:             # <<<<<<<<<<<<<<
+ *                     break
+ *                 after_star = True
+ */
+        }
+
+        /* "grma/utilities/cutils.pyx":159
+ *                 if after_star:
+ *                     break
+ *                 after_star = True             # <<<<<<<<<<<<<<
+ *             elif after_star and buf[i] != c':' and digits < 4:
+ *                 if buf[i] < c'0' or buf[i] > c'9':
+ */
+        __pyx_v_after_star = 1;
+
+        /* "grma/utilities/cutils.pyx":156
+ *         after_star = False
+ *         for i in range(start, allele_end):
+ *             if buf[i] == c'*':             # <<<<<<<<<<<<<<
+ *                 if after_star:
+ *                     break
+ */
+        goto __pyx_L14;
+      }
+
+      /* "grma/utilities/cutils.pyx":160
+ *                     break
+ *                 after_star = True
+ *             elif after_star and buf[i] != c':' and digits < 4:             # <<<<<<<<<<<<<<
+ *                 if buf[i] < c'0' or buf[i] > c'9':
+ *                     return False
+ */
+      __pyx_t_2 = (__pyx_v_after_star != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L16_bool_binop_done;
+      }
+      __pyx_t_2 = (((__pyx_v_buf[__pyx_v_i]) != ':') != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L16_bool_binop_done;
+      }
+      __pyx_t_2 = ((__pyx_v_digits < 4) != 0);
+      __pyx_t_1 = __pyx_t_2;
+      __pyx_L16_bool_binop_done:;
+      if (__pyx_t_1) {
+
+        /* "grma/utilities/cutils.pyx":161
+ *                 after_star = True
+ *             elif after_star and buf[i] != c':' and digits < 4:
+ *                 if buf[i] < c'0' or buf[i] > c'9':             # <<<<<<<<<<<<<<
+ *                     return False
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ */
+        __pyx_t_2 = (((__pyx_v_buf[__pyx_v_i]) < '0') != 0);
+        if (!__pyx_t_2) {
+        } else {
+          __pyx_t_1 = __pyx_t_2;
+          goto __pyx_L20_bool_binop_done;
+        }
+        __pyx_t_2 = (((__pyx_v_buf[__pyx_v_i]) > '9') != 0);
+        __pyx_t_1 = __pyx_t_2;
+        __pyx_L20_bool_binop_done:;
+        if (__pyx_t_1) {
+
+          /* "grma/utilities/cutils.pyx":162
+ *             elif after_star and buf[i] != c':' and digits < 4:
+ *                 if buf[i] < c'0' or buf[i] > c'9':
+ *                     return False             # <<<<<<<<<<<<<<
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ *                 digits += 1
+ */
+          __pyx_r = 0;
+          goto __pyx_L0;
+
+          /* "grma/utilities/cutils.pyx":161
+ *                 after_star = True
+ *             elif after_star and buf[i] != c':' and digits < 4:
+ *                 if buf[i] < c'0' or buf[i] > c'9':             # <<<<<<<<<<<<<<
+ *                     return False
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ */
+        }
+
+        /* "grma/utilities/cutils.pyx":163
+ *                 if buf[i] < c'0' or buf[i] > c'9':
+ *                     return False
+ *                 allele = allele * 10 + (buf[i] - c'0')             # <<<<<<<<<<<<<<
+ *                 digits += 1
+ *         if after_star and digits == 0:
+ */
+        __pyx_v_allele = ((__pyx_v_allele * 10) + ((__pyx_v_buf[__pyx_v_i]) - '0'));
+
+        /* "grma/utilities/cutils.pyx":164
+ *                     return False
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ *                 digits += 1             # <<<<<<<<<<<<<<
+ *         if after_star and digits == 0:
+ *             return False
+ */
+        __pyx_v_digits = (__pyx_v_digits + 1);
+
+        /* "grma/utilities/cutils.pyx":160
+ *                     break
+ *                 after_star = True
+ *             elif after_star and buf[i] != c':' and digits < 4:             # <<<<<<<<<<<<<<
+ *                 if buf[i] < c'0' or buf[i] > c'9':
+ *                     return False
+ */
+      }
+      __pyx_L14:;
+    }
+    __pyx_L13_break:;
+
+    /* "grma/utilities/cutils.pyx":165
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ *                 digits += 1
+ *         if after_star and digits == 0:             # <<<<<<<<<<<<<<
+ *             return False
+ * 
+ */
+    __pyx_t_2 = (__pyx_v_after_star != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L23_bool_binop_done;
+    }
+    __pyx_t_2 = ((__pyx_v_digits == 0) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L23_bool_binop_done:;
+    if (__pyx_t_1) {
+
+      /* "grma/utilities/cutils.pyx":166
+ *                 digits += 1
+ *         if after_star and digits == 0:
+ *             return False             # <<<<<<<<<<<<<<
+ * 
+ *         geno[num_alleles] = allele
+ */
+      __pyx_r = 0;
+      goto __pyx_L0;
+
+      /* "grma/utilities/cutils.pyx":165
+ *                 allele = allele * 10 + (buf[i] - c'0')
+ *                 digits += 1
+ *         if after_star and digits == 0:             # <<<<<<<<<<<<<<
+ *             return False
+ * 
+ */
+    }
+
+    /* "grma/utilities/cutils.pyx":168
+ *             return False
+ * 
+ *         geno[num_alleles] = allele             # <<<<<<<<<<<<<<
+ *         num_alleles += 1
+ *         start = allele_end + 1
+ */
+    (__pyx_v_geno[__pyx_v_num_alleles]) = __pyx_v_allele;
+
+    /* "grma/utilities/cutils.pyx":169
+ * 
+ *         geno[num_alleles] = allele
+ *         num_alleles += 1             # <<<<<<<<<<<<<<
+ *         start = allele_end + 1
+ * 
+ */
+    __pyx_v_num_alleles = (__pyx_v_num_alleles + 1);
+
+    /* "grma/utilities/cutils.pyx":170
+ *         geno[num_alleles] = allele
+ *         num_alleles += 1
+ *         start = allele_end + 1             # <<<<<<<<<<<<<<
+ * 
+ *     if num_alleles != 10:
+ */
+    __pyx_v_start = (__pyx_v_allele_end + 1);
+  }
+
+  /* "grma/utilities/cutils.pyx":172
+ *         start = allele_end + 1
+ * 
+ *     if num_alleles != 10:             # <<<<<<<<<<<<<<
+ *         return False
+ *     for i in range(0, 10, 2):
+ */
+  __pyx_t_1 = ((__pyx_v_num_alleles != 10) != 0);
+  if (__pyx_t_1) {
+
+    /* "grma/utilities/cutils.pyx":173
+ * 
+ *     if num_alleles != 10:
+ *         return False             # <<<<<<<<<<<<<<
+ *     for i in range(0, 10, 2):
+ *         if geno[i] > geno[i + 1]:
+ */
+    __pyx_r = 0;
+    goto __pyx_L0;
+
+    /* "grma/utilities/cutils.pyx":172
+ *         start = allele_end + 1
+ * 
+ *     if num_alleles != 10:             # <<<<<<<<<<<<<<
+ *         return False
+ *     for i in range(0, 10, 2):
+ */
+  }
+
+  /* "grma/utilities/cutils.pyx":174
+ *     if num_alleles != 10:
+ *         return False
+ *     for i in range(0, 10, 2):             # <<<<<<<<<<<<<<
+ *         if geno[i] > geno[i + 1]:
+ *             tmp = geno[i]
+ */
+  for (__pyx_t_5 = 0; __pyx_t_5 < 10; __pyx_t_5+=2) {
+    __pyx_v_i = __pyx_t_5;
+
+    /* "grma/utilities/cutils.pyx":175
+ *         return False
+ *     for i in range(0, 10, 2):
+ *         if geno[i] > geno[i + 1]:             # <<<<<<<<<<<<<<
+ *             tmp = geno[i]
+ *             geno[i] = geno[i + 1]
+ */
+    __pyx_t_1 = (((__pyx_v_geno[__pyx_v_i]) > (__pyx_v_geno[(__pyx_v_i + 1)])) != 0);
+    if (__pyx_t_1) {
+
+      /* "grma/utilities/cutils.pyx":176
+ *     for i in range(0, 10, 2):
+ *         if geno[i] > geno[i + 1]:
+ *             tmp = geno[i]             # <<<<<<<<<<<<<<
+ *             geno[i] = geno[i + 1]
+ *             geno[i + 1] = tmp
+ */
+      __pyx_v_tmp = (__pyx_v_geno[__pyx_v_i]);
+
+      /* "grma/utilities/cutils.pyx":177
+ *         if geno[i] > geno[i + 1]:
+ *             tmp = geno[i]
+ *             geno[i] = geno[i + 1]             # <<<<<<<<<<<<<<
+ *             geno[i + 1] = tmp
+ *     return True
+ */
+      (__pyx_v_geno[__pyx_v_i]) = (__pyx_v_geno[(__pyx_v_i + 1)]);
+
+      /* "grma/utilities/cutils.pyx":178
+ *             tmp = geno[i]
+ *             geno[i] = geno[i + 1]
+ *             geno[i + 1] = tmp             # <<<<<<<<<<<<<<
+ *     return True
+ * 
+ */
+      (__pyx_v_geno[(__pyx_v_i + 1)]) = __pyx_v_tmp;
+
+      /* "grma/utilities/cutils.pyx":175
+ *         return False
+ *     for i in range(0, 10, 2):
+ *         if geno[i] > geno[i + 1]:             # <<<<<<<<<<<<<<
+ *             tmp = geno[i]
+ *             geno[i] = geno[i + 1]
+ */
+    }
+  }
+
+  /* "grma/utilities/cutils.pyx":179
+ *             geno[i] = geno[i + 1]
+ *             geno[i + 1] = tmp
+ *     return True             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __pyx_r = 1;
+  goto __pyx_L0;
+
+  /* "grma/utilities/cutils.pyx":132
+ * 
+ * 
+ * cdef bint _parse_gl_string(const char* buf, Py_ssize_t start, Py_ssize_t end, UINT16* geno):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a GL string of 10 alleles into geno, the same way as utils.gl_string_to_integers:
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "grma/utilities/cutils.pyx":184
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * def cparse_imputation_lines(bytes data):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_4grma_9utilities_6cutils_7cparse_imputation_lines(PyObject *__pyx_self, PyObject *__pyx_v_data); /*proto*/
+static char __pyx_doc_4grma_9utilities_6cutils_6cparse_imputation_lines[] = "\n    Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.\n\n    :returns: ids (int64), genotypes ((n, 10) uint16, the alleles of each locus are sorted),\n    probabilities (float64) and indices (int64).\n    Raises ValueError with the first malformed line.\n    ";
+static PyMethodDef __pyx_mdef_4grma_9utilities_6cutils_7cparse_imputation_lines = {"cparse_imputation_lines", (PyCFunction)__pyx_pw_4grma_9utilities_6cutils_7cparse_imputation_lines, METH_O, __pyx_doc_4grma_9utilities_6cutils_6cparse_imputation_lines};
+static PyObject *__pyx_pw_4grma_9utilities_6cutils_7cparse_imputation_lines(PyObject *__pyx_self, PyObject *__pyx_v_data) {
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("cparse_imputation_lines (wrapper)", 0);
+  if (unlikely(!__Pyx_ArgTypeTest(((PyObject *)__pyx_v_data), (&PyBytes_Type), 1, "data", 1))) __PYX_ERR(0, 184, __pyx_L1_error)
+  __pyx_r = __pyx_pf_4grma_9utilities_6cutils_6cparse_imputation_lines(__pyx_self, ((PyObject*)__pyx_v_data));
+
+  /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_4grma_9utilities_6cutils_6cparse_imputation_lines(CYTHON_UNUSED PyObject *__pyx_self, PyObject *__pyx_v_data) {
+  char const *__pyx_v_buf;
+  char *__pyx_v_number_end;
+  Py_ssize_t __pyx_v_length;
+  Py_ssize_t __pyx_v_pos;
+  Py_ssize_t __pyx_v_line_end;
+  Py_ssize_t __pyx_v_row;
+  Py_ssize_t __pyx_v_i;
+  Py_ssize_t __pyx_v_num_commas;
+  Py_ssize_t __pyx_v_commas[3];
+  __pyx_t_4grma_9utilities_6cutils_INT64 __pyx_v_value;
+  double __pyx_v_prob;
+  int __pyx_v_blank;
+  PyArrayObject *__pyx_v_ids = 0;
+  PyArrayObject *__pyx_v_genos = 0;
+  PyArrayObject *__pyx_v_probs = 0;
+  PyArrayObject *__pyx_v_indices = 0;
+  PyObject *__pyx_v_n_lines = NULL;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_genos;
+  __Pyx_Buffer __pyx_pybuffer_genos;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_ids;
+  __Pyx_Buffer __pyx_pybuffer_ids;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_indices;
+  __Pyx_Buffer __pyx_pybuffer_indices;
+  __Pyx_LocalBuf_ND __pyx_pybuffernd_probs;
+  __Pyx_Buffer __pyx_pybuffer_probs;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  char const *__pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  PyObject *__pyx_t_7 = NULL;
+  PyArrayObject *__pyx_t_8 = NULL;
+  int __pyx_t_9;
+  PyObject *__pyx_t_10 = NULL;
+  PyObject *__pyx_t_11 = NULL;
+  PyObject *__pyx_t_12 = NULL;
+  PyArrayObject *__pyx_t_13 = NULL;
+  PyArrayObject *__pyx_t_14 = NULL;
+  PyArrayObject *__pyx_t_15 = NULL;
+  int __pyx_t_16;
+  int __pyx_t_17;
+  Py_ssize_t __pyx_t_18;
+  Py_ssize_t __pyx_t_19;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("cparse_imputation_lines", 0);
+  __pyx_pybuffer_ids.pybuffer.buf = NULL;
+  __pyx_pybuffer_ids.refcount = 0;
+  __pyx_pybuffernd_ids.data = NULL;
+  __pyx_pybuffernd_ids.rcbuffer = &__pyx_pybuffer_ids;
+  __pyx_pybuffer_genos.pybuffer.buf = NULL;
+  __pyx_pybuffer_genos.refcount = 0;
+  __pyx_pybuffernd_genos.data = NULL;
+  __pyx_pybuffernd_genos.rcbuffer = &__pyx_pybuffer_genos;
+  __pyx_pybuffer_probs.pybuffer.buf = NULL;
+  __pyx_pybuffer_probs.refcount = 0;
+  __pyx_pybuffernd_probs.data = NULL;
+  __pyx_pybuffernd_probs.rcbuffer = &__pyx_pybuffer_probs;
+  __pyx_pybuffer_indices.pybuffer.buf = NULL;
+  __pyx_pybuffer_indices.refcount = 0;
+  __pyx_pybuffernd_indices.data = NULL;
+  __pyx_pybuffernd_indices.rcbuffer = &__pyx_pybuffer_indices;
+
+  /* "grma/utilities/cutils.pyx":193
+ *     """
+ *     cdef:
+ *         const char* buf = data             # <<<<<<<<<<<<<<
+ *         char* number_end
+ *         Py_ssize_t length = len(data), pos = 0, line_end, row = 0, i, num_commas
+ */
+  if (unlikely(__pyx_v_data == Py_None)) {
+    PyErr_SetString(PyExc_TypeError, "expected bytes, NoneType found");
+    __PYX_ERR(0, 193, __pyx_L1_error)
+  }
+  __pyx_t_1 = __Pyx_PyBytes_AsString(__pyx_v_data); if (unlikely((!__pyx_t_1) && PyErr_Occurred())) __PYX_ERR(0, 193, __pyx_L1_error)
+  __pyx_v_buf = __pyx_t_1;
+
+  /* "grma/utilities/cutils.pyx":195
+ *         const char* buf = data
+ *         char* number_end
+ *         Py_ssize_t length = len(data), pos = 0, line_end, row = 0, i, num_commas             # <<<<<<<<<<<<<<
+ *         Py_ssize_t commas[3]
+ *         INT64 value
+ */
+  if (unlikely(__pyx_v_data == Py_None)) {
+    PyErr_SetString(PyExc_TypeError, "object of type 'NoneType' has no len()");
+    __PYX_ERR(0, 195, __pyx_L1_error)
+  }
+  __pyx_t_2 = PyBytes_GET_SIZE(__pyx_v_data); if (unlikely(__pyx_t_2 == ((Py_ssize_t)-1))) __PYX_ERR(0, 195, __pyx_L1_error)
+  __pyx_v_length = __pyx_t_2;
+  __pyx_v_pos = 0;
+  __pyx_v_row = 0;
+
+  /* "grma/utilities/cutils.pyx":205
+ *         np.ndarray[INT64, ndim=1] indices
+ * 
+ *     n_lines = data.count(b"\n") + 1             # <<<<<<<<<<<<<<
+ *     ids = np.empty(n_lines, dtype=np.int64)
+ *     genos = np.empty((n_lines, 10), dtype=np.uint16)
+ */
+  __pyx_t_3 = __Pyx_CallUnboundCMethod1(&__pyx_umethod_PyBytes_Type_count, __pyx_v_data, __pyx_kp_b__2); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 205, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = __Pyx_PyInt_AddObjC(__pyx_t_3, __pyx_int_1, 1, 0, 0); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 205, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_v_n_lines = __pyx_t_4;
+  __pyx_t_4 = 0;
+
+  /* "grma/utilities/cutils.pyx":206
+ * 
+ *     n_lines = data.count(b"\n") + 1
+ *     ids = np.empty(n_lines, dtype=np.int64)             # <<<<<<<<<<<<<<
+ *     genos = np.empty((n_lines, 10), dtype=np.uint16)
+ *     probs = np.empty(n_lines, dtype=np.float64)
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_4, __pyx_n_s_np); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_empty); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_INCREF(__pyx_v_n_lines);
+  __Pyx_GIVEREF(__pyx_v_n_lines);
+  PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_v_n_lines);
+  __pyx_t_5 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __pyx_t_7 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_int64); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  if (PyDict_SetItem(__pyx_t_5, __pyx_n_s_dtype, __pyx_t_7) < 0) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  __pyx_t_7 = __Pyx_PyObject_Call(__pyx_t_3, __pyx_t_4, __pyx_t_5); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 206, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  if (!(likely(((__pyx_t_7) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_7, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 206, __pyx_L1_error)
+  __pyx_t_8 = ((PyArrayObject *)__pyx_t_7);
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_ids.rcbuffer->pybuffer);
+    __pyx_t_9 = __Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_t_8, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT64, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack);
+    if (unlikely(__pyx_t_9 < 0)) {
+      PyErr_Fetch(&__pyx_t_10, &__pyx_t_11, &__pyx_t_12);
+      if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_ids.rcbuffer->pybuffer, (PyObject*)__pyx_v_ids, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT64, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) {
+        Py_XDECREF(__pyx_t_10); Py_XDECREF(__pyx_t_11); Py_XDECREF(__pyx_t_12);
+        __Pyx_RaiseBufferFallbackError();
+      } else {
+        PyErr_Restore(__pyx_t_10, __pyx_t_11, __pyx_t_12);
+      }
+      __pyx_t_10 = __pyx_t_11 = __pyx_t_12 = 0;
+    }
+    __pyx_pybuffernd_ids.diminfo[0].strides = __pyx_pybuffernd_ids.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_ids.diminfo[0].shape = __pyx_pybuffernd_ids.rcbuffer->pybuffer.shape[0];
+    if (unlikely(__pyx_t_9 < 0)) __PYX_ERR(0, 206, __pyx_L1_error)
+  }
+  __pyx_t_8 = 0;
+  __pyx_v_ids = ((PyArrayObject *)__pyx_t_7);
+  __pyx_t_7 = 0;
+
+  /* "grma/utilities/cutils.pyx":207
+ *     n_lines = data.count(b"\n") + 1
+ *     ids = np.empty(n_lines, dtype=np.int64)
+ *     genos = np.empty((n_lines, 10), dtype=np.uint16)             # <<<<<<<<<<<<<<
+ *     probs = np.empty(n_lines, dtype=np.float64)
+ *     indices = np.empty(n_lines, dtype=np.int64)
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_7, __pyx_n_s_np); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_7, __pyx_n_s_empty); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  __pyx_t_7 = PyTuple_New(2); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_INCREF(__pyx_v_n_lines);
+  __Pyx_GIVEREF(__pyx_v_n_lines);
+  PyTuple_SET_ITEM(__pyx_t_7, 0, __pyx_v_n_lines);
+  __Pyx_INCREF(__pyx_int_10);
+  __Pyx_GIVEREF(__pyx_int_10);
+  PyTuple_SET_ITEM(__pyx_t_7, 1, __pyx_int_10);
+  __pyx_t_4 = PyTuple_New(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_GIVEREF(__pyx_t_7);
+  PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_t_7);
+  __pyx_t_7 = 0;
+  __pyx_t_7 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_np); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_uint16); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (PyDict_SetItem(__pyx_t_7, __pyx_n_s_dtype, __pyx_t_6) < 0) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  __pyx_t_6 = __Pyx_PyObject_Call(__pyx_t_5, __pyx_t_4, __pyx_t_7); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 207, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  if (!(likely(((__pyx_t_6) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_6, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 207, __pyx_L1_error)
+  __pyx_t_13 = ((PyArrayObject *)__pyx_t_6);
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_genos.rcbuffer->pybuffer);
+    __pyx_t_9 = __Pyx_GetBufferAndValidate(&__pyx_pybuffernd_genos.rcbuffer->pybuffer, (PyObject*)__pyx_t_13, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack);
+    if (unlikely(__pyx_t_9 < 0)) {
+      PyErr_Fetch(&__pyx_t_12, &__pyx_t_11, &__pyx_t_10);
+      if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_genos.rcbuffer->pybuffer, (PyObject*)__pyx_v_genos, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_UINT16, PyBUF_FORMAT| PyBUF_STRIDES, 2, 0, __pyx_stack) == -1)) {
+        Py_XDECREF(__pyx_t_12); Py_XDECREF(__pyx_t_11); Py_XDECREF(__pyx_t_10);
+        __Pyx_RaiseBufferFallbackError();
+      } else {
+        PyErr_Restore(__pyx_t_12, __pyx_t_11, __pyx_t_10);
+      }
+      __pyx_t_12 = __pyx_t_11 = __pyx_t_10 = 0;
+    }
+    __pyx_pybuffernd_genos.diminfo[0].strides = __pyx_pybuffernd_genos.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_genos.diminfo[0].shape = __pyx_pybuffernd_genos.rcbuffer->pybuffer.shape[0]; __pyx_pybuffernd_genos.diminfo[1].strides = __pyx_pybuffernd_genos.rcbuffer->pybuffer.strides[1]; __pyx_pybuffernd_genos.diminfo[1].shape = __pyx_pybuffernd_genos.rcbuffer->pybuffer.shape[1];
+    if (unlikely(__pyx_t_9 < 0)) __PYX_ERR(0, 207, __pyx_L1_error)
+  }
+  __pyx_t_13 = 0;
+  __pyx_v_genos = ((PyArrayObject *)__pyx_t_6);
+  __pyx_t_6 = 0;
+
+  /* "grma/utilities/cutils.pyx":208
+ *     ids = np.empty(n_lines, dtype=np.int64)
+ *     genos = np.empty((n_lines, 10), dtype=np.uint16)
+ *     probs = np.empty(n_lines, dtype=np.float64)             # <<<<<<<<<<<<<<
+ *     indices = np.empty(n_lines, dtype=np.int64)
+ * 
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_6, __pyx_n_s_np); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __pyx_t_7 = __Pyx_PyObject_GetAttrStr(__pyx_t_6, __pyx_n_s_empty); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  __pyx_t_6 = PyTuple_New(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_INCREF(__pyx_v_n_lines);
+  __Pyx_GIVEREF(__pyx_v_n_lines);
+  PyTuple_SET_ITEM(__pyx_t_6, 0, __pyx_v_n_lines);
+  __pyx_t_4 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_GetModuleGlobalName(__pyx_t_5, __pyx_n_s_np); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_5, __pyx_n_s_float64); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  if (PyDict_SetItem(__pyx_t_4, __pyx_n_s_dtype, __pyx_t_3) < 0) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = __Pyx_PyObject_Call(__pyx_t_7, __pyx_t_6, __pyx_t_4); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 208, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  if (!(likely(((__pyx_t_3) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_3, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 208, __pyx_L1_error)
+  __pyx_t_14 = ((PyArrayObject *)__pyx_t_3);
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_probs.rcbuffer->pybuffer);
+    __pyx_t_9 = __Pyx_GetBufferAndValidate(&__pyx_pybuffernd_probs.rcbuffer->pybuffer, (PyObject*)__pyx_t_14, &__Pyx_TypeInfo_nn___pyx_t_5numpy_float64_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack);
+    if (unlikely(__pyx_t_9 < 0)) {
+      PyErr_Fetch(&__pyx_t_10, &__pyx_t_11, &__pyx_t_12);
+      if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_probs.rcbuffer->pybuffer, (PyObject*)__pyx_v_probs, &__Pyx_TypeInfo_nn___pyx_t_5numpy_float64_t, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) {
+        Py_XDECREF(__pyx_t_10); Py_XDECREF(__pyx_t_11); Py_XDECREF(__pyx_t_12);
+        __Pyx_RaiseBufferFallbackError();
+      } else {
+        PyErr_Restore(__pyx_t_10, __pyx_t_11, __pyx_t_12);
+      }
+      __pyx_t_10 = __pyx_t_11 = __pyx_t_12 = 0;
+    }
+    __pyx_pybuffernd_probs.diminfo[0].strides = __pyx_pybuffernd_probs.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_probs.diminfo[0].shape = __pyx_pybuffernd_probs.rcbuffer->pybuffer.shape[0];
+    if (unlikely(__pyx_t_9 < 0)) __PYX_ERR(0, 208, __pyx_L1_error)
+  }
+  __pyx_t_14 = 0;
+  __pyx_v_probs = ((PyArrayObject *)__pyx_t_3);
+  __pyx_t_3 = 0;
+
+  /* "grma/utilities/cutils.pyx":209
+ *     genos = np.empty((n_lines, 10), dtype=np.uint16)
+ *     probs = np.empty(n_lines, dtype=np.float64)
+ *     indices = np.empty(n_lines, dtype=np.int64)             # <<<<<<<<<<<<<<
+ * 
+ *     while pos < length:
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_np); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_empty); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = PyTuple_New(1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_INCREF(__pyx_v_n_lines);
+  __Pyx_GIVEREF(__pyx_v_n_lines);
+  PyTuple_SET_ITEM(__pyx_t_3, 0, __pyx_v_n_lines);
+  __pyx_t_6 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_GetModuleGlobalName(__pyx_t_7, __pyx_n_s_np); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_7, __pyx_n_s_int64); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  if (PyDict_SetItem(__pyx_t_6, __pyx_n_s_dtype, __pyx_t_5) < 0) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_t_5 = __Pyx_PyObject_Call(__pyx_t_4, __pyx_t_3, __pyx_t_6); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 209, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  if (!(likely(((__pyx_t_5) == Py_None) || likely(__Pyx_TypeTest(__pyx_t_5, __pyx_ptype_5numpy_ndarray))))) __PYX_ERR(0, 209, __pyx_L1_error)
+  __pyx_t_15 = ((PyArrayObject *)__pyx_t_5);
+  {
+    __Pyx_BufFmt_StackElem __pyx_stack[1];
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_indices.rcbuffer->pybuffer);
+    __pyx_t_9 = __Pyx_GetBufferAndValidate(&__pyx_pybuffernd_indices.rcbuffer->pybuffer, (PyObject*)__pyx_t_15, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT64, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack);
+    if (unlikely(__pyx_t_9 < 0)) {
+      PyErr_Fetch(&__pyx_t_12, &__pyx_t_11, &__pyx_t_10);
+      if (unlikely(__Pyx_GetBufferAndValidate(&__pyx_pybuffernd_indices.rcbuffer->pybuffer, (PyObject*)__pyx_v_indices, &__Pyx_TypeInfo_nn___pyx_t_4grma_9utilities_6cutils_INT64, PyBUF_FORMAT| PyBUF_STRIDES| PyBUF_WRITABLE, 1, 0, __pyx_stack) == -1)) {
+        Py_XDECREF(__pyx_t_12); Py_XDECREF(__pyx_t_11); Py_XDECREF(__pyx_t_10);
+        __Pyx_RaiseBufferFallbackError();
+      } else {
+        PyErr_Restore(__pyx_t_12, __pyx_t_11, __pyx_t_10);
+      }
+      __pyx_t_12 = __pyx_t_11 = __pyx_t_10 = 0;
+    }
+    __pyx_pybuffernd_indices.diminfo[0].strides = __pyx_pybuffernd_indices.rcbuffer->pybuffer.strides[0]; __pyx_pybuffernd_indices.diminfo[0].shape = __pyx_pybuffernd_indices.rcbuffer->pybuffer.shape[0];
+    if (unlikely(__pyx_t_9 < 0)) __PYX_ERR(0, 209, __pyx_L1_error)
+  }
+  __pyx_t_15 = 0;
+  __pyx_v_indices = ((PyArrayObject *)__pyx_t_5);
+  __pyx_t_5 = 0;
+
+  /* "grma/utilities/cutils.pyx":211
+ *     indices = np.empty(n_lines, dtype=np.int64)
+ * 
+ *     while pos < length:             # <<<<<<<<<<<<<<
+ *         line_end = pos
+ *         num_commas = 0
+ */
+  while (1) {
+    __pyx_t_16 = ((__pyx_v_pos < __pyx_v_length) != 0);
+    if (!__pyx_t_16) break;
+
+    /* "grma/utilities/cutils.pyx":212
+ * 
+ *     while pos < length:
+ *         line_end = pos             # <<<<<<<<<<<<<<
+ *         num_commas = 0
+ *         blank = True
+ */
+    __pyx_v_line_end = __pyx_v_pos;
+
+    /* "grma/utilities/cutils.pyx":213
+ *     while pos < length:
+ *         line_end = pos
+ *         num_commas = 0             # <<<<<<<<<<<<<<
+ *         blank = True
+ *         while line_end < length and buf[line_end] != c'\n':
+ */
+    __pyx_v_num_commas = 0;
+
+    /* "grma/utilities/cutils.pyx":214
+ *         line_end = pos
+ *         num_commas = 0
+ *         blank = True             # <<<<<<<<<<<<<<
+ *         while line_end < length and buf[line_end] != c'\n':
+ *             if buf[line_end] == c',':
+ */
+    __pyx_v_blank = 1;
+
+    /* "grma/utilities/cutils.pyx":215
+ *         num_commas = 0
+ *         blank = True
+ *         while line_end < length and buf[line_end] != c'\n':             # <<<<<<<<<<<<<<
+ *             if buf[line_end] == c',':
+ *                 if num_commas < 3:
+ */
+    while (1) {
+      __pyx_t_17 = ((__pyx_v_line_end < __pyx_v_length) != 0);
+      if (__pyx_t_17) {
+      } else {
+        __pyx_t_16 = __pyx_t_17;
+        goto __pyx_L7_bool_binop_done;
+      }
+      __pyx_t_17 = (((__pyx_v_buf[__pyx_v_line_end]) != '\n') != 0);
+      __pyx_t_16 = __pyx_t_17;
+      __pyx_L7_bool_binop_done:;
+      if (!__pyx_t_16) break;
+
+      /* "grma/utilities/cutils.pyx":216
+ *         blank = True
+ *         while line_end < length and buf[line_end] != c'\n':
+ *             if buf[line_end] == c',':             # <<<<<<<<<<<<<<
+ *                 if num_commas < 3:
+ *                     commas[num_commas] = line_end
+ */
+      __pyx_t_16 = (((__pyx_v_buf[__pyx_v_line_end]) == ',') != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":217
+ *         while line_end < length and buf[line_end] != c'\n':
+ *             if buf[line_end] == c',':
+ *                 if num_commas < 3:             # <<<<<<<<<<<<<<
+ *                     commas[num_commas] = line_end
+ *                 num_commas += 1
+ */
+        __pyx_t_16 = ((__pyx_v_num_commas < 3) != 0);
+        if (__pyx_t_16) {
+
+          /* "grma/utilities/cutils.pyx":218
+ *             if buf[line_end] == c',':
+ *                 if num_commas < 3:
+ *                     commas[num_commas] = line_end             # <<<<<<<<<<<<<<
+ *                 num_commas += 1
+ *             if not _is_space(buf[line_end]):
+ */
+          (__pyx_v_commas[__pyx_v_num_commas]) = __pyx_v_line_end;
+
+          /* "grma/utilities/cutils.pyx":217
+ *         while line_end < length and buf[line_end] != c'\n':
+ *             if buf[line_end] == c',':
+ *                 if num_commas < 3:             # <<<<<<<<<<<<<<
+ *                     commas[num_commas] = line_end
+ *                 num_commas += 1
+ */
+        }
+
+        /* "grma/utilities/cutils.pyx":219
+ *                 if num_commas < 3:
+ *                     commas[num_commas] = line_end
+ *                 num_commas += 1             # <<<<<<<<<<<<<<
+ *             if not _is_space(buf[line_end]):
+ *                 blank = False
+ */
+        __pyx_v_num_commas = (__pyx_v_num_commas + 1);
+
+        /* "grma/utilities/cutils.pyx":216
+ *         blank = True
+ *         while line_end < length and buf[line_end] != c'\n':
+ *             if buf[line_end] == c',':             # <<<<<<<<<<<<<<
+ *                 if num_commas < 3:
+ *                     commas[num_commas] = line_end
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":220
+ *                     commas[num_commas] = line_end
+ *                 num_commas += 1
+ *             if not _is_space(buf[line_end]):             # <<<<<<<<<<<<<<
+ *                 blank = False
+ *             line_end += 1
+ */
+      __pyx_t_16 = ((!(__pyx_f_4grma_9utilities_6cutils__is_space((__pyx_v_buf[__pyx_v_line_end])) != 0)) != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":221
+ *                 num_commas += 1
+ *             if not _is_space(buf[line_end]):
+ *                 blank = False             # <<<<<<<<<<<<<<
+ *             line_end += 1
+ * 
+ */
+        __pyx_v_blank = 0;
+
+        /* "grma/utilities/cutils.pyx":220
+ *                     commas[num_commas] = line_end
+ *                 num_commas += 1
+ *             if not _is_space(buf[line_end]):             # <<<<<<<<<<<<<<
+ *                 blank = False
+ *             line_end += 1
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":222
+ *             if not _is_space(buf[line_end]):
+ *                 blank = False
+ *             line_end += 1             # <<<<<<<<<<<<<<
+ * 
+ *         if not blank:
+ */
+      __pyx_v_line_end = (__pyx_v_line_end + 1);
+    }
+
+    /* "grma/utilities/cutils.pyx":224
+ *             line_end += 1
+ * 
+ *         if not blank:             # <<<<<<<<<<<<<<
+ *             if num_commas != 3:
+ *                 _raise_malformed(data, pos, line_end)
+ */
+    __pyx_t_16 = ((!(__pyx_v_blank != 0)) != 0);
+    if (__pyx_t_16) {
+
+      /* "grma/utilities/cutils.pyx":225
+ * 
+ *         if not blank:
+ *             if num_commas != 3:             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ */
+      __pyx_t_16 = ((__pyx_v_num_commas != 3) != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":226
+ *         if not blank:
+ *             if num_commas != 3:
+ *                 _raise_malformed(data, pos, line_end)             # <<<<<<<<<<<<<<
+ * 
+ *             if not _parse_int(buf, pos, commas[0], &value):
+ */
+        __pyx_t_5 = __pyx_f_4grma_9utilities_6cutils__raise_malformed(__pyx_v_data, __pyx_v_pos, __pyx_v_line_end); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 226, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_5);
+        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+        /* "grma/utilities/cutils.pyx":225
+ * 
+ *         if not blank:
+ *             if num_commas != 3:             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":228
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ *             if not _parse_int(buf, pos, commas[0], &value):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             ids[row] = value
+ */
+      __pyx_t_16 = ((!(__pyx_f_4grma_9utilities_6cutils__parse_int(__pyx_v_buf, __pyx_v_pos, (__pyx_v_commas[0]), (&__pyx_v_value)) != 0)) != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":229
+ * 
+ *             if not _parse_int(buf, pos, commas[0], &value):
+ *                 _raise_malformed(data, pos, line_end)             # <<<<<<<<<<<<<<
+ *             ids[row] = value
+ * 
+ */
+        __pyx_t_5 = __pyx_f_4grma_9utilities_6cutils__raise_malformed(__pyx_v_data, __pyx_v_pos, __pyx_v_line_end); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 229, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_5);
+        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+        /* "grma/utilities/cutils.pyx":228
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ *             if not _parse_int(buf, pos, commas[0], &value):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             ids[row] = value
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":230
+ *             if not _parse_int(buf, pos, commas[0], &value):
+ *                 _raise_malformed(data, pos, line_end)
+ *             ids[row] = value             # <<<<<<<<<<<<<<
+ * 
+ *             if not _parse_gl_string(buf, commas[0] + 1, commas[1], <UINT16*> &genos[row, 0]):
+ */
+      __pyx_t_18 = __pyx_v_row;
+      *__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT64 *, __pyx_pybuffernd_ids.rcbuffer->pybuffer.buf, __pyx_t_18, __pyx_pybuffernd_ids.diminfo[0].strides) = __pyx_v_value;
+
+      /* "grma/utilities/cutils.pyx":232
+ *             ids[row] = value
+ * 
+ *             if not _parse_gl_string(buf, commas[0] + 1, commas[1], <UINT16*> &genos[row, 0]):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ */
+      __pyx_t_18 = __pyx_v_row;
+      __pyx_t_19 = 0;
+      __pyx_t_16 = ((!(__pyx_f_4grma_9utilities_6cutils__parse_gl_string(__pyx_v_buf, ((__pyx_v_commas[0]) + 1), (__pyx_v_commas[1]), ((__pyx_t_4grma_9utilities_6cutils_UINT16 *)(&(*__Pyx_BufPtrStrided2d(__pyx_t_4grma_9utilities_6cutils_UINT16 *, __pyx_pybuffernd_genos.rcbuffer->pybuffer.buf, __pyx_t_18, __pyx_pybuffernd_genos.diminfo[0].strides, __pyx_t_19, __pyx_pybuffernd_genos.diminfo[1].strides))))) != 0)) != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":233
+ * 
+ *             if not _parse_gl_string(buf, commas[0] + 1, commas[1], <UINT16*> &genos[row, 0]):
+ *                 _raise_malformed(data, pos, line_end)             # <<<<<<<<<<<<<<
+ * 
+ *             prob = strtod(buf + commas[1] + 1, &number_end)
+ */
+        __pyx_t_5 = __pyx_f_4grma_9utilities_6cutils__raise_malformed(__pyx_v_data, __pyx_v_pos, __pyx_v_line_end); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 233, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_5);
+        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+        /* "grma/utilities/cutils.pyx":232
+ *             ids[row] = value
+ * 
+ *             if not _parse_gl_string(buf, commas[0] + 1, commas[1], <UINT16*> &genos[row, 0]):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":235
+ *                 _raise_malformed(data, pos, line_end)
+ * 
+ *             prob = strtod(buf + commas[1] + 1, &number_end)             # <<<<<<<<<<<<<<
+ *             i = number_end - buf
+ *             while i < commas[2] and _is_space(buf[i]):
+ */
+      __pyx_v_prob = strtod(((__pyx_v_buf + (__pyx_v_commas[1])) + 1), (&__pyx_v_number_end));
+
+      /* "grma/utilities/cutils.pyx":236
+ * 
+ *             prob = strtod(buf + commas[1] + 1, &number_end)
+ *             i = number_end - buf             # <<<<<<<<<<<<<<
+ *             while i < commas[2] and _is_space(buf[i]):
+ *                 i += 1
+ */
+      __pyx_v_i = (__pyx_v_number_end - __pyx_v_buf);
+
+      /* "grma/utilities/cutils.pyx":237
+ *             prob = strtod(buf + commas[1] + 1, &number_end)
+ *             i = number_end - buf
+ *             while i < commas[2] and _is_space(buf[i]):             # <<<<<<<<<<<<<<
+ *                 i += 1
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:
+ */
+      while (1) {
+        __pyx_t_17 = ((__pyx_v_i < (__pyx_v_commas[2])) != 0);
+        if (__pyx_t_17) {
+        } else {
+          __pyx_t_16 = __pyx_t_17;
+          goto __pyx_L18_bool_binop_done;
+        }
+        __pyx_t_17 = (__pyx_f_4grma_9utilities_6cutils__is_space((__pyx_v_buf[__pyx_v_i])) != 0);
+        __pyx_t_16 = __pyx_t_17;
+        __pyx_L18_bool_binop_done:;
+        if (!__pyx_t_16) break;
+
+        /* "grma/utilities/cutils.pyx":238
+ *             i = number_end - buf
+ *             while i < commas[2] and _is_space(buf[i]):
+ *                 i += 1             # <<<<<<<<<<<<<<
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:
+ *                 _raise_malformed(data, pos, line_end)
+ */
+        __pyx_v_i = (__pyx_v_i + 1);
+      }
+
+      /* "grma/utilities/cutils.pyx":239
+ *             while i < commas[2] and _is_space(buf[i]):
+ *                 i += 1
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             probs[row] = prob
+ */
+      __pyx_t_17 = ((__pyx_v_number_end == ((__pyx_v_buf + (__pyx_v_commas[1])) + 1)) != 0);
+      if (!__pyx_t_17) {
+      } else {
+        __pyx_t_16 = __pyx_t_17;
+        goto __pyx_L21_bool_binop_done;
+      }
+      __pyx_t_17 = ((__pyx_v_i != (__pyx_v_commas[2])) != 0);
+      __pyx_t_16 = __pyx_t_17;
+      __pyx_L21_bool_binop_done:;
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":240
+ *                 i += 1
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:
+ *                 _raise_malformed(data, pos, line_end)             # <<<<<<<<<<<<<<
+ *             probs[row] = prob
+ * 
+ */
+        __pyx_t_5 = __pyx_f_4grma_9utilities_6cutils__raise_malformed(__pyx_v_data, __pyx_v_pos, __pyx_v_line_end); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 240, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_5);
+        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+        /* "grma/utilities/cutils.pyx":239
+ *             while i < commas[2] and _is_space(buf[i]):
+ *                 i += 1
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             probs[row] = prob
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":241
+ *             if number_end == buf + commas[1] + 1 or i != commas[2]:
+ *                 _raise_malformed(data, pos, line_end)
+ *             probs[row] = prob             # <<<<<<<<<<<<<<
+ * 
+ *             if not _parse_int(buf, commas[2] + 1, line_end, &value):
+ */
+      __pyx_t_19 = __pyx_v_row;
+      *__Pyx_BufPtrStrided1d(__pyx_t_5numpy_float64_t *, __pyx_pybuffernd_probs.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_probs.diminfo[0].strides) = __pyx_v_prob;
+
+      /* "grma/utilities/cutils.pyx":243
+ *             probs[row] = prob
+ * 
+ *             if not _parse_int(buf, commas[2] + 1, line_end, &value):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             indices[row] = value
+ */
+      __pyx_t_16 = ((!(__pyx_f_4grma_9utilities_6cutils__parse_int(__pyx_v_buf, ((__pyx_v_commas[2]) + 1), __pyx_v_line_end, (&__pyx_v_value)) != 0)) != 0);
+      if (__pyx_t_16) {
+
+        /* "grma/utilities/cutils.pyx":244
+ * 
+ *             if not _parse_int(buf, commas[2] + 1, line_end, &value):
+ *                 _raise_malformed(data, pos, line_end)             # <<<<<<<<<<<<<<
+ *             indices[row] = value
+ *             row += 1
+ */
+        __pyx_t_5 = __pyx_f_4grma_9utilities_6cutils__raise_malformed(__pyx_v_data, __pyx_v_pos, __pyx_v_line_end); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 244, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_5);
+        __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+
+        /* "grma/utilities/cutils.pyx":243
+ *             probs[row] = prob
+ * 
+ *             if not _parse_int(buf, commas[2] + 1, line_end, &value):             # <<<<<<<<<<<<<<
+ *                 _raise_malformed(data, pos, line_end)
+ *             indices[row] = value
+ */
+      }
+
+      /* "grma/utilities/cutils.pyx":245
+ *             if not _parse_int(buf, commas[2] + 1, line_end, &value):
+ *                 _raise_malformed(data, pos, line_end)
+ *             indices[row] = value             # <<<<<<<<<<<<<<
+ *             row += 1
+ * 
+ */
+      __pyx_t_19 = __pyx_v_row;
+      *__Pyx_BufPtrStrided1d(__pyx_t_4grma_9utilities_6cutils_INT64 *, __pyx_pybuffernd_indices.rcbuffer->pybuffer.buf, __pyx_t_19, __pyx_pybuffernd_indices.diminfo[0].strides) = __pyx_v_value;
+
+      /* "grma/utilities/cutils.pyx":246
+ *                 _raise_malformed(data, pos, line_end)
+ *             indices[row] = value
+ *             row += 1             # <<<<<<<<<<<<<<
+ * 
+ *         pos = line_end + 1
+ */
+      __pyx_v_row = (__pyx_v_row + 1);
+
+      /* "grma/utilities/cutils.pyx":224
+ *             line_end += 1
+ * 
+ *         if not blank:             # <<<<<<<<<<<<<<
+ *             if num_commas != 3:
+ *                 _raise_malformed(data, pos, line_end)
+ */
+    }
+
+    /* "grma/utilities/cutils.pyx":248
+ *             row += 1
+ * 
+ *         pos = line_end + 1             # <<<<<<<<<<<<<<
+ * 
+ *     return ids[:row], genos[:row], probs[:row], indices[:row]
+ */
+    __pyx_v_pos = (__pyx_v_line_end + 1);
+  }
+
+  /* "grma/utilities/cutils.pyx":250
+ *         pos = line_end + 1
+ * 
+ *     return ids[:row], genos[:row], probs[:row], indices[:row]             # <<<<<<<<<<<<<<
+ * 
+ * 
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = PyInt_FromSsize_t(__pyx_v_row); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_6 = PySlice_New(Py_None, __pyx_t_5, Py_None); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_t_5 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_ids), __pyx_t_6); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  __pyx_t_6 = PyInt_FromSsize_t(__pyx_v_row); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __pyx_t_3 = PySlice_New(Py_None, __pyx_t_6, Py_None); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  __pyx_t_6 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_genos), __pyx_t_3); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = PyInt_FromSsize_t(__pyx_v_row); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = PySlice_New(Py_None, __pyx_t_3, Py_None); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_probs), __pyx_t_4); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = PyInt_FromSsize_t(__pyx_v_row); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_7 = PySlice_New(Py_None, __pyx_t_4, Py_None); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = __Pyx_PyObject_GetItem(((PyObject *)__pyx_v_indices), __pyx_t_7); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+  __pyx_t_7 = PyTuple_New(4); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 250, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __Pyx_GIVEREF(__pyx_t_5);
+  PyTuple_SET_ITEM(__pyx_t_7, 0, __pyx_t_5);
+  __Pyx_GIVEREF(__pyx_t_6);
+  PyTuple_SET_ITEM(__pyx_t_7, 1, __pyx_t_6);
+  __Pyx_GIVEREF(__pyx_t_3);
+  PyTuple_SET_ITEM(__pyx_t_7, 2, __pyx_t_3);
+  __Pyx_GIVEREF(__pyx_t_4);
+  PyTuple_SET_ITEM(__pyx_t_7, 3, __pyx_t_4);
+  __pyx_t_5 = 0;
+  __pyx_t_6 = 0;
+  __pyx_t_3 = 0;
+  __pyx_t_4 = 0;
+  __pyx_r = __pyx_t_7;
+  __pyx_t_7 = 0;
+  goto __pyx_L0;
+
+  /* "grma/utilities/cutils.pyx":184
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * def cparse_imputation_lines(bytes data):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_7);
+  { PyObject *__pyx_type, *__pyx_value, *__pyx_tb;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&__pyx_type, &__pyx_value, &__pyx_tb);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_genos.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_ids.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_indices.rcbuffer->pybuffer);
+    __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_probs.rcbuffer->pybuffer);
+  __Pyx_ErrRestore(__pyx_type, __pyx_value, __pyx_tb);}
+  __Pyx_AddTraceback("grma.utilities.cutils.cparse_imputation_lines", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  goto __pyx_L2;
+  __pyx_L0:;
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_genos.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_ids.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_indices.rcbuffer->pybuffer);
+  __Pyx_SafeReleaseBuffer(&__pyx_pybuffernd_probs.rcbuffer->pybuffer);
+  __pyx_L2:;
+  __Pyx_XDECREF((PyObject *)__pyx_v_ids);
+  __Pyx_XDECREF((PyObject *)__pyx_v_genos);
+  __Pyx_XDECREF((PyObject *)__pyx_v_probs);
+  __Pyx_XDECREF((PyObject *)__pyx_v_indices);
+  __Pyx_XDECREF(__pyx_v_n_lines);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "grma/utilities/cutils.pyx":253
+ * 
+ * 
+ * cdef _raise_malformed(bytes data, Py_ssize_t start, Py_ssize_t end):             # <<<<<<<<<<<<<<
+ *     raise ValueError(f"Malformed imputation line: {data[start:end].decode(errors='replace')!r}")
+ */
+
+static PyObject *__pyx_f_4grma_9utilities_6cutils__raise_malformed(PyObject *__pyx_v_data, Py_ssize_t __pyx_v_start, Py_ssize_t __pyx_v_end) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_raise_malformed", 0);
+
+  /* "grma/utilities/cutils.pyx":254
+ * 
+ * cdef _raise_malformed(bytes data, Py_ssize_t start, Py_ssize_t end):
+ *     raise ValueError(f"Malformed imputation line: {data[start:end].decode(errors='replace')!r}")             # <<<<<<<<<<<<<<
+ */
+  if (unlikely(__pyx_v_data == Py_None)) {
+    PyErr_SetString(PyExc_TypeError, "'NoneType' object is not subscriptable");
+    __PYX_ERR(0, 254, __pyx_L1_error)
+  }
+  __pyx_t_1 = PySequence_GetSlice(__pyx_v_data, __pyx_v_start, __pyx_v_end); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_decode); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_errors, __pyx_n_u_replace) < 0) __PYX_ERR(0, 254, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_empty_tuple, __pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = __Pyx_PyObject_FormatSimpleAndDecref(PyObject_Repr(__pyx_t_3), __pyx_empty_unicode); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = __Pyx_PyUnicode_Concat(__pyx_kp_u_Malformed_imputation_line, __pyx_t_1); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_1 = __Pyx_PyObject_CallOneArg(__pyx_builtin_ValueError, __pyx_t_3); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 254, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __PYX_ERR(0, 254, __pyx_L1_error)
+
+  /* "grma/utilities/cutils.pyx":253
+ * 
+ * 
+ * cdef _raise_malformed(bytes data, Py_ssize_t start, Py_ssize_t end):             # <<<<<<<<<<<<<<
+ *     raise ValueError(f"Malformed imputation line: {data[start:end].decode(errors='replace')!r}")
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("grma.utilities.cutils._raise_malformed", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":692
+ * ctypedef long double complex clongdouble_t
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew1(PyObject *__pyx_v_a) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew1", 0);
+
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":693
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):
+ *     return PyArray_MultiIterNew(1, <void*>a)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(1, ((void *)__pyx_v_a)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 693, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":692
+ * ctypedef long double complex clongdouble_t
+ * 
+ * cdef inline object PyArray_MultiIterNew1(a):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew1", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":695
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew2(PyObject *__pyx_v_a, PyObject *__pyx_v_b) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew2", 0);
+
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":696
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)             # <<<<<<<<<<<<<<
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = PyArray_MultiIterNew(2, ((void *)__pyx_v_a), ((void *)__pyx_v_b)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 696, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":695
+ *     return PyArray_MultiIterNew(1, <void*>a)
+ * 
+ * cdef inline object PyArray_MultiIterNew2(a, b):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("numpy.PyArray_MultiIterNew2", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":698
+ *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
+ * 
+ * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
+ *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
+ * 
+ */
+
+static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__pyx_v_a, PyObject *__pyx_v_b, PyObject *__pyx_v_c) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("PyArray_MultiIterNew3", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":741
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":699
  * 
  * cdef inline object PyArray_MultiIterNew3(a, b, c):
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)             # <<<<<<<<<<<<<<
@@ -3359,13 +5285,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(3, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 741, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(3, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 699, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":740
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":698
  *     return PyArray_MultiIterNew(2, <void*>a, <void*>b)
  * 
  * cdef inline object PyArray_MultiIterNew3(a, b, c):             # <<<<<<<<<<<<<<
@@ -3384,7 +5310,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew3(PyObject *__
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":743
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":701
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
@@ -3401,7 +5327,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew4", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":744
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":702
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)             # <<<<<<<<<<<<<<
@@ -3409,13 +5335,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(4, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 744, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(4, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 702, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":743
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":701
  *     return PyArray_MultiIterNew(3, <void*>a, <void*>b, <void*> c)
  * 
  * cdef inline object PyArray_MultiIterNew4(a, b, c, d):             # <<<<<<<<<<<<<<
@@ -3434,7 +5360,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew4(PyObject *__
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":746
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":704
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
@@ -3451,7 +5377,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyArray_MultiIterNew5", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":747
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":705
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)             # <<<<<<<<<<<<<<
@@ -3459,13 +5385,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyArray_MultiIterNew(5, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d), ((void *)__pyx_v_e)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 747, __pyx_L1_error)
+  __pyx_t_1 = PyArray_MultiIterNew(5, ((void *)__pyx_v_a), ((void *)__pyx_v_b), ((void *)__pyx_v_c), ((void *)__pyx_v_d), ((void *)__pyx_v_e)); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 705, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":746
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":704
  *     return PyArray_MultiIterNew(4, <void*>a, <void*>b, <void*>c, <void*> d)
  * 
  * cdef inline object PyArray_MultiIterNew5(a, b, c, d, e):             # <<<<<<<<<<<<<<
@@ -3484,7 +5410,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyArray_MultiIterNew5(PyObject *__
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":749
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":707
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
@@ -3496,9 +5422,14 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
   PyObject *__pyx_r = NULL;
   __Pyx_RefNannyDeclarations
   int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("PyDataType_SHAPE", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":750
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":708
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
@@ -3508,7 +5439,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
   __pyx_t_1 = (PyDataType_HASSUBARRAY(__pyx_v_d) != 0);
   if (__pyx_t_1) {
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":751
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":709
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):
  *         return <tuple>d.subarray.shape             # <<<<<<<<<<<<<<
@@ -3516,11 +5447,17 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
  *         return ()
  */
     __Pyx_XDECREF(__pyx_r);
-    __Pyx_INCREF(((PyObject*)__pyx_v_d->subarray->shape));
-    __pyx_r = ((PyObject*)__pyx_v_d->subarray->shape);
+    __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_d), __pyx_n_s_subarray); if (unlikely(!__pyx_t_2)) __PYX_ERR(1, 709, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_t_2, __pyx_n_s_shape); if (unlikely(!__pyx_t_3)) __PYX_ERR(1, 709, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_INCREF(((PyObject*)__pyx_t_3));
+    __pyx_r = ((PyObject*)__pyx_t_3);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
     goto __pyx_L0;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":750
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":708
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):
  *     if PyDataType_HASSUBARRAY(d):             # <<<<<<<<<<<<<<
@@ -3529,7 +5466,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
  */
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":753
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":711
  *         return <tuple>d.subarray.shape
  *     else:
  *         return ()             # <<<<<<<<<<<<<<
@@ -3543,7 +5480,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
     goto __pyx_L0;
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":749
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":707
  *     return PyArray_MultiIterNew(5, <void*>a, <void*>b, <void*>c, <void*> d, <void*> e)
  * 
  * cdef inline tuple PyDataType_SHAPE(dtype d):             # <<<<<<<<<<<<<<
@@ -3552,13 +5489,18 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
  */
 
   /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("numpy.PyDataType_SHAPE", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
   __pyx_L0:;
   __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":928
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":908
  *     int _import_umath() except -1
  * 
  * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
@@ -3568,9 +5510,13 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_PyDataType_SHAPE(PyArray_Descr *__
 
 static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_arr, PyObject *__pyx_v_base) {
   __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("set_array_base", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":929
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":909
  * 
  * cdef inline void set_array_base(ndarray arr, object base):
  *     Py_INCREF(base) # important to do this before stealing the reference below!             # <<<<<<<<<<<<<<
@@ -3579,16 +5525,16 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
  */
   Py_INCREF(__pyx_v_base);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":930
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":910
  * cdef inline void set_array_base(ndarray arr, object base):
  *     Py_INCREF(base) # important to do this before stealing the reference below!
  *     PyArray_SetBaseObject(arr, base)             # <<<<<<<<<<<<<<
  * 
  * cdef inline object get_array_base(ndarray arr):
  */
-  (void)(PyArray_SetBaseObject(__pyx_v_arr, __pyx_v_base));
+  __pyx_t_1 = PyArray_SetBaseObject(__pyx_v_arr, __pyx_v_base); if (unlikely(__pyx_t_1 == ((int)-1))) __PYX_ERR(1, 910, __pyx_L1_error)
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":928
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":908
  *     int _import_umath() except -1
  * 
  * cdef inline void set_array_base(ndarray arr, object base):             # <<<<<<<<<<<<<<
@@ -3597,10 +5543,14 @@ static CYTHON_INLINE void __pyx_f_5numpy_set_array_base(PyArrayObject *__pyx_v_a
  */
 
   /* function exit code */
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_WriteUnraisable("numpy.set_array_base", __pyx_clineno, __pyx_lineno, __pyx_filename, 1, 0);
+  __pyx_L0:;
   __Pyx_RefNannyFinishContext();
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":932
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":912
  *     PyArray_SetBaseObject(arr, base)
  * 
  * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
@@ -3615,7 +5565,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   int __pyx_t_1;
   __Pyx_RefNannySetupContext("get_array_base", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":933
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":913
  * 
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)             # <<<<<<<<<<<<<<
@@ -3624,7 +5574,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
  */
   __pyx_v_base = PyArray_BASE(__pyx_v_arr);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":934
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":914
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)
  *     if base is NULL:             # <<<<<<<<<<<<<<
@@ -3634,7 +5584,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   __pyx_t_1 = ((__pyx_v_base == NULL) != 0);
   if (__pyx_t_1) {
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":935
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":915
  *     base = PyArray_BASE(arr)
  *     if base is NULL:
  *         return None             # <<<<<<<<<<<<<<
@@ -3645,7 +5595,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
     __pyx_r = Py_None; __Pyx_INCREF(Py_None);
     goto __pyx_L0;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":934
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":914
  * cdef inline object get_array_base(ndarray arr):
  *     base = PyArray_BASE(arr)
  *     if base is NULL:             # <<<<<<<<<<<<<<
@@ -3654,7 +5604,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
  */
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":936
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":916
  *     if base is NULL:
  *         return None
  *     return <object>base             # <<<<<<<<<<<<<<
@@ -3666,7 +5616,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   __pyx_r = ((PyObject *)__pyx_v_base);
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":932
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":912
  *     PyArray_SetBaseObject(arr, base)
  * 
  * cdef inline object get_array_base(ndarray arr):             # <<<<<<<<<<<<<<
@@ -3681,7 +5631,7 @@ static CYTHON_INLINE PyObject *__pyx_f_5numpy_get_array_base(PyArrayObject *__py
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":940
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":920
  * # Versions of the import_* functions which are more suitable for
  * # Cython code.
  * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
@@ -3705,7 +5655,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_array", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":941
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":921
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3721,16 +5671,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":942
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":922
  * cdef inline int import_array() except -1:
  *     try:
  *         __pyx_import_array()             # <<<<<<<<<<<<<<
  *     except Exception:
- *         raise ImportError("numpy.core.multiarray failed to import")
+ *         raise ImportError("numpy._core.multiarray failed to import")
  */
-      __pyx_t_4 = _import_array(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 942, __pyx_L3_error)
+      __pyx_t_4 = _import_array(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 922, __pyx_L3_error)
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":941
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":921
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3744,38 +5694,38 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":943
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":923
  *     try:
  *         __pyx_import_array()
  *     except Exception:             # <<<<<<<<<<<<<<
- *         raise ImportError("numpy.core.multiarray failed to import")
+ *         raise ImportError("numpy._core.multiarray failed to import")
  * 
  */
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 943, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 923, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":944
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":924
  *         __pyx_import_array()
  *     except Exception:
- *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy._core.multiarray failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_umath() except -1:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 944, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__3, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 924, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 944, __pyx_L5_except_error)
+      __PYX_ERR(1, 924, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":941
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":921
  * # Cython code.
  * cdef inline int import_array() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3790,7 +5740,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":940
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":920
  * # Versions of the import_* functions which are more suitable for
  * # Cython code.
  * cdef inline int import_array() except -1:             # <<<<<<<<<<<<<<
@@ -3813,8 +5763,8 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_array(void) {
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":946
- *         raise ImportError("numpy.core.multiarray failed to import")
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":926
+ *         raise ImportError("numpy._core.multiarray failed to import")
  * 
  * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
  *     try:
@@ -3837,7 +5787,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_umath", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":947
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":927
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3853,16 +5803,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":948
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":928
  * cdef inline int import_umath() except -1:
  *     try:
  *         _import_umath()             # <<<<<<<<<<<<<<
  *     except Exception:
- *         raise ImportError("numpy.core.umath failed to import")
+ *         raise ImportError("numpy._core.umath failed to import")
  */
-      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 948, __pyx_L3_error)
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 928, __pyx_L3_error)
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":947
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":927
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3876,38 +5826,38 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":949
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":929
  *     try:
  *         _import_umath()
  *     except Exception:             # <<<<<<<<<<<<<<
- *         raise ImportError("numpy.core.umath failed to import")
+ *         raise ImportError("numpy._core.umath failed to import")
  * 
  */
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_umath", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 949, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 929, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":950
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":930
  *         _import_umath()
  *     except Exception:
- *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy._core.umath failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_ufunc() except -1:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__3, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 950, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__4, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 930, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 950, __pyx_L5_except_error)
+      __PYX_ERR(1, 930, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":947
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":927
  * 
  * cdef inline int import_umath() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3922,8 +5872,8 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":946
- *         raise ImportError("numpy.core.multiarray failed to import")
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":926
+ *         raise ImportError("numpy._core.multiarray failed to import")
  * 
  * cdef inline int import_umath() except -1:             # <<<<<<<<<<<<<<
  *     try:
@@ -3945,8 +5895,8 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_umath(void) {
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":952
- *         raise ImportError("numpy.core.umath failed to import")
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":932
+ *         raise ImportError("numpy._core.umath failed to import")
  * 
  * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
  *     try:
@@ -3969,7 +5919,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
   int __pyx_clineno = 0;
   __Pyx_RefNannySetupContext("import_ufunc", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":953
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":933
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -3985,16 +5935,16 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     __Pyx_XGOTREF(__pyx_t_3);
     /*try:*/ {
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":954
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":934
  * cdef inline int import_ufunc() except -1:
  *     try:
  *         _import_umath()             # <<<<<<<<<<<<<<
  *     except Exception:
- *         raise ImportError("numpy.core.umath failed to import")
+ *         raise ImportError("numpy._core.umath failed to import")
  */
-      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 954, __pyx_L3_error)
+      __pyx_t_4 = _import_umath(); if (unlikely(__pyx_t_4 == ((int)-1))) __PYX_ERR(1, 934, __pyx_L3_error)
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":953
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":933
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4008,38 +5958,38 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     goto __pyx_L8_try_end;
     __pyx_L3_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":955
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":935
  *     try:
  *         _import_umath()
  *     except Exception:             # <<<<<<<<<<<<<<
- *         raise ImportError("numpy.core.umath failed to import")
+ *         raise ImportError("numpy._core.umath failed to import")
  * 
  */
     __pyx_t_4 = __Pyx_PyErr_ExceptionMatches(((PyObject *)(&((PyTypeObject*)PyExc_Exception)[0])));
     if (__pyx_t_4) {
       __Pyx_AddTraceback("numpy.import_ufunc", __pyx_clineno, __pyx_lineno, __pyx_filename);
-      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 955, __pyx_L5_except_error)
+      if (__Pyx_GetException(&__pyx_t_5, &__pyx_t_6, &__pyx_t_7) < 0) __PYX_ERR(1, 935, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_5);
       __Pyx_GOTREF(__pyx_t_6);
       __Pyx_GOTREF(__pyx_t_7);
 
-      /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":956
+      /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":936
  *         _import_umath()
  *     except Exception:
- *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy._core.umath failed to import")             # <<<<<<<<<<<<<<
+ * 
  * 
- * cdef extern from *:
  */
-      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__3, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 956, __pyx_L5_except_error)
+      __pyx_t_8 = __Pyx_PyObject_Call(__pyx_builtin_ImportError, __pyx_tuple__4, NULL); if (unlikely(!__pyx_t_8)) __PYX_ERR(1, 936, __pyx_L5_except_error)
       __Pyx_GOTREF(__pyx_t_8);
       __Pyx_Raise(__pyx_t_8, 0, 0, 0);
       __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
-      __PYX_ERR(1, 956, __pyx_L5_except_error)
+      __PYX_ERR(1, 936, __pyx_L5_except_error)
     }
     goto __pyx_L5_except_error;
     __pyx_L5_except_error:;
 
-    /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":953
+    /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":933
  * 
  * cdef inline int import_ufunc() except -1:
  *     try:             # <<<<<<<<<<<<<<
@@ -4054,8 +6004,8 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
     __pyx_L8_try_end:;
   }
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":952
- *         raise ImportError("numpy.core.umath failed to import")
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":932
+ *         raise ImportError("numpy._core.umath failed to import")
  * 
  * cdef inline int import_ufunc() except -1:             # <<<<<<<<<<<<<<
  *     try:
@@ -4077,7 +6027,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_import_ufunc(void) {
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":966
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":939
  * 
  * 
  * cdef inline bint is_timedelta64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4090,7 +6040,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("is_timedelta64_object", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":978
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":951
  *     bool
  *     """
  *     return PyObject_TypeCheck(obj, &PyTimedeltaArrType_Type)             # <<<<<<<<<<<<<<
@@ -4100,7 +6050,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   __pyx_r = PyObject_TypeCheck(__pyx_v_obj, (&PyTimedeltaArrType_Type));
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":966
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":939
  * 
  * 
  * cdef inline bint is_timedelta64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4114,7 +6064,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_timedelta64_object(PyObject *__pyx_v_
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":981
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":954
  * 
  * 
  * cdef inline bint is_datetime64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4127,7 +6077,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("is_datetime64_object", 0);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":993
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":966
  *     bool
  *     """
  *     return PyObject_TypeCheck(obj, &PyDatetimeArrType_Type)             # <<<<<<<<<<<<<<
@@ -4137,7 +6087,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   __pyx_r = PyObject_TypeCheck(__pyx_v_obj, (&PyDatetimeArrType_Type));
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":981
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":954
  * 
  * 
  * cdef inline bint is_datetime64_object(object obj):             # <<<<<<<<<<<<<<
@@ -4151,7 +6101,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":996
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":969
  * 
  * 
  * cdef inline npy_datetime get_datetime64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4162,7 +6112,7 @@ static CYTHON_INLINE int __pyx_f_5numpy_is_datetime64_object(PyObject *__pyx_v_o
 static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *__pyx_v_obj) {
   npy_datetime __pyx_r;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1003
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":976
  *     also needed.  That can be found using `get_datetime64_unit`.
  *     """
  *     return (<PyDatetimeScalarObject*>obj).obval             # <<<<<<<<<<<<<<
@@ -4172,7 +6122,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
   __pyx_r = ((PyDatetimeScalarObject *)__pyx_v_obj)->obval;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":996
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":969
  * 
  * 
  * cdef inline npy_datetime get_datetime64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4185,7 +6135,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1006
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":979
  * 
  * 
  * cdef inline npy_timedelta get_timedelta64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4196,7 +6146,7 @@ static CYTHON_INLINE npy_datetime __pyx_f_5numpy_get_datetime64_value(PyObject *
 static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject *__pyx_v_obj) {
   npy_timedelta __pyx_r;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1010
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":983
  *     returns the int64 value underlying scalar numpy timedelta64 object
  *     """
  *     return (<PyTimedeltaScalarObject*>obj).obval             # <<<<<<<<<<<<<<
@@ -4206,7 +6156,7 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
   __pyx_r = ((PyTimedeltaScalarObject *)__pyx_v_obj)->obval;
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1006
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":979
  * 
  * 
  * cdef inline npy_timedelta get_timedelta64_value(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4219,7 +6169,7 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
   return __pyx_r;
 }
 
-/* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1013
+/* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":986
  * 
  * 
  * cdef inline NPY_DATETIMEUNIT get_datetime64_unit(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4230,15 +6180,17 @@ static CYTHON_INLINE npy_timedelta __pyx_f_5numpy_get_timedelta64_value(PyObject
 static CYTHON_INLINE NPY_DATETIMEUNIT __pyx_f_5numpy_get_datetime64_unit(PyObject *__pyx_v_obj) {
   NPY_DATETIMEUNIT __pyx_r;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1017
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":990
  *     returns the unit part of the dtype for a numpy datetime64 object.
  *     """
  *     return <NPY_DATETIMEUNIT>(<PyDatetimeScalarObject*>obj).obmeta.base             # <<<<<<<<<<<<<<
+ * 
+ * 
  */
   __pyx_r = ((NPY_DATETIMEUNIT)((PyDatetimeScalarObject *)__pyx_v_obj)->obmeta.base);
   goto __pyx_L0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1013
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":986
  * 
  * 
  * cdef inline NPY_DATETIMEUNIT get_datetime64_unit(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -4301,31 +6253,65 @@ static struct PyModuleDef __pyx_moduledef = {
 
 static __Pyx_StringTabEntry __pyx_string_tab[] = {
   {&__pyx_n_s_ImportError, __pyx_k_ImportError, sizeof(__pyx_k_ImportError), 0, 0, 1, 1},
+  {&__pyx_kp_u_Malformed_imputation_line, __pyx_k_Malformed_imputation_line, sizeof(__pyx_k_Malformed_imputation_line), 0, 1, 0, 0},
+  {&__pyx_n_s_ValueError, __pyx_k_ValueError, sizeof(__pyx_k_ValueError), 0, 0, 1, 1},
+  {&__pyx_kp_b__2, __pyx_k__2, sizeof(__pyx_k__2), 0, 0, 0, 0},
   {&__pyx_n_s_allele_range, __pyx_k_allele_range, sizeof(__pyx_k_allele_range), 0, 0, 1, 1},
+  {&__pyx_n_s_blank, __pyx_k_blank, sizeof(__pyx_k_blank), 0, 0, 1, 1},
+  {&__pyx_n_s_buf, __pyx_k_buf, sizeof(__pyx_k_buf), 0, 0, 1, 1},
   {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
+  {&__pyx_n_s_commas, __pyx_k_commas, sizeof(__pyx_k_commas), 0, 0, 1, 1},
+  {&__pyx_n_s_count, __pyx_k_count, sizeof(__pyx_k_count), 0, 0, 1, 1},
+  {&__pyx_n_s_cparse_imputation_lines, __pyx_k_cparse_imputation_lines, sizeof(__pyx_k_cparse_imputation_lines), 0, 0, 1, 1},
+  {&__pyx_n_s_data, __pyx_k_data, sizeof(__pyx_k_data), 0, 0, 1, 1},
+  {&__pyx_n_s_decode, __pyx_k_decode, sizeof(__pyx_k_decode), 0, 0, 1, 1},
   {&__pyx_n_s_donors_genos, __pyx_k_donors_genos, sizeof(__pyx_k_donors_genos), 0, 0, 1, 1},
   {&__pyx_n_s_dtype, __pyx_k_dtype, sizeof(__pyx_k_dtype), 0, 0, 1, 1},
+  {&__pyx_n_s_empty, __pyx_k_empty, sizeof(__pyx_k_empty), 0, 0, 1, 1},
+  {&__pyx_n_s_errors, __pyx_k_errors, sizeof(__pyx_k_errors), 0, 0, 1, 1},
+  {&__pyx_n_s_float64, __pyx_k_float64, sizeof(__pyx_k_float64), 0, 0, 1, 1},
+  {&__pyx_n_s_genos, __pyx_k_genos, sizeof(__pyx_k_genos), 0, 0, 1, 1},
+  {&__pyx_n_s_grma_utilities_cutils, __pyx_k_grma_utilities_cutils, sizeof(__pyx_k_grma_utilities_cutils), 0, 0, 1, 1},
+  {&__pyx_kp_s_grma_utilities_cutils_pyx, __pyx_k_grma_utilities_cutils_pyx, sizeof(__pyx_k_grma_utilities_cutils_pyx), 0, 0, 1, 0},
+  {&__pyx_n_s_i, __pyx_k_i, sizeof(__pyx_k_i), 0, 0, 1, 1},
   {&__pyx_n_s_ids, __pyx_k_ids, sizeof(__pyx_k_ids), 0, 0, 1, 1},
   {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
+  {&__pyx_n_s_indices, __pyx_k_indices, sizeof(__pyx_k_indices), 0, 0, 1, 1},
   {&__pyx_n_s_init_count_similar, __pyx_k_init_count_similar, sizeof(__pyx_k_init_count_similar), 0, 0, 1, 1},
+  {&__pyx_n_s_int64, __pyx_k_int64, sizeof(__pyx_k_int64), 0, 0, 1, 1},
   {&__pyx_n_s_int8, __pyx_k_int8, sizeof(__pyx_k_int8), 0, 0, 1, 1},
+  {&__pyx_n_s_length, __pyx_k_length, sizeof(__pyx_k_length), 0, 0, 1, 1},
+  {&__pyx_n_s_line_end, __pyx_k_line_end, sizeof(__pyx_k_line_end), 0, 0, 1, 1},
   {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
+  {&__pyx_n_s_n_lines, __pyx_k_n_lines, sizeof(__pyx_k_n_lines), 0, 0, 1, 1},
   {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
   {&__pyx_n_s_np, __pyx_k_np, sizeof(__pyx_k_np), 0, 0, 1, 1},
+  {&__pyx_n_s_num_commas, __pyx_k_num_commas, sizeof(__pyx_k_num_commas), 0, 0, 1, 1},
+  {&__pyx_n_s_number_end, __pyx_k_number_end, sizeof(__pyx_k_number_end), 0, 0, 1, 1},
   {&__pyx_n_s_numpy, __pyx_k_numpy, sizeof(__pyx_k_numpy), 0, 0, 1, 1},
-  {&__pyx_kp_u_numpy_core_multiarray_failed_to, __pyx_k_numpy_core_multiarray_failed_to, sizeof(__pyx_k_numpy_core_multiarray_failed_to), 0, 1, 0, 0},
-  {&__pyx_kp_u_numpy_core_umath_failed_to_impor, __pyx_k_numpy_core_umath_failed_to_impor, sizeof(__pyx_k_numpy_core_umath_failed_to_impor), 0, 1, 0, 0},
+  {&__pyx_kp_u_numpy__core_multiarray_failed_to, __pyx_k_numpy__core_multiarray_failed_to, sizeof(__pyx_k_numpy__core_multiarray_failed_to), 0, 1, 0, 0},
+  {&__pyx_kp_u_numpy__core_umath_failed_to_impo, __pyx_k_numpy__core_umath_failed_to_impo, sizeof(__pyx_k_numpy__core_umath_failed_to_impo), 0, 1, 0, 0},
   {&__pyx_n_s_patients_geno, __pyx_k_patients_geno, sizeof(__pyx_k_patients_geno), 0, 0, 1, 1},
+  {&__pyx_n_s_pos, __pyx_k_pos, sizeof(__pyx_k_pos), 0, 0, 1, 1},
+  {&__pyx_n_s_prob, __pyx_k_prob, sizeof(__pyx_k_prob), 0, 0, 1, 1},
+  {&__pyx_n_s_probs, __pyx_k_probs, sizeof(__pyx_k_probs), 0, 0, 1, 1},
   {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
+  {&__pyx_n_u_replace, __pyx_k_replace, sizeof(__pyx_k_replace), 0, 1, 0, 1},
+  {&__pyx_n_s_row, __pyx_k_row, sizeof(__pyx_k_row), 0, 0, 1, 1},
+  {&__pyx_n_s_shape, __pyx_k_shape, sizeof(__pyx_k_shape), 0, 0, 1, 1},
   {&__pyx_n_s_similarities, __pyx_k_similarities, sizeof(__pyx_k_similarities), 0, 0, 1, 1},
+  {&__pyx_n_s_subarray, __pyx_k_subarray, sizeof(__pyx_k_subarray), 0, 0, 1, 1},
   {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
+  {&__pyx_n_s_uint16, __pyx_k_uint16, sizeof(__pyx_k_uint16), 0, 0, 1, 1},
   {&__pyx_n_s_uint32, __pyx_k_uint32, sizeof(__pyx_k_uint32), 0, 0, 1, 1},
+  {&__pyx_n_s_value, __pyx_k_value, sizeof(__pyx_k_value), 0, 0, 1, 1},
   {&__pyx_n_s_zeros, __pyx_k_zeros, sizeof(__pyx_k_zeros), 0, 0, 1, 1},
   {0, 0, 0, 0, 0, 0, 0}
 };
 static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 24, __pyx_L1_error)
-  __pyx_builtin_ImportError = __Pyx_GetBuiltinName(__pyx_n_s_ImportError); if (!__pyx_builtin_ImportError) __PYX_ERR(1, 944, __pyx_L1_error)
+  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 26, __pyx_L1_error)
+  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 254, __pyx_L1_error)
+  __pyx_builtin_ImportError = __Pyx_GetBuiltinName(__pyx_n_s_ImportError); if (!__pyx_builtin_ImportError) __PYX_ERR(1, 924, __pyx_L1_error)
   return 0;
   __pyx_L1_error:;
   return -1;
@@ -4335,38 +6321,50 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
   __Pyx_RefNannyDeclarations
   __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
 
-  /* "grma/utilities/cutils.pyx":29
+  /* "grma/utilities/cutils.pyx":31
  *             ret[count, 1] = similarities[i]
  *             count += 1
  *     return ret[:count, :]             # <<<<<<<<<<<<<<
  * 
  * 
  */
-  __pyx_slice_ = PySlice_New(Py_None, Py_None, Py_None); if (unlikely(!__pyx_slice_)) __PYX_ERR(0, 29, __pyx_L1_error)
+  __pyx_slice_ = PySlice_New(Py_None, Py_None, Py_None); if (unlikely(!__pyx_slice_)) __PYX_ERR(0, 31, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_slice_);
   __Pyx_GIVEREF(__pyx_slice_);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":944
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":924
  *         __pyx_import_array()
  *     except Exception:
- *         raise ImportError("numpy.core.multiarray failed to import")             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy._core.multiarray failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_umath() except -1:
  */
-  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_u_numpy_core_multiarray_failed_to); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(1, 944, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__2);
-  __Pyx_GIVEREF(__pyx_tuple__2);
+  __pyx_tuple__3 = PyTuple_Pack(1, __pyx_kp_u_numpy__core_multiarray_failed_to); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(1, 924, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__3);
+  __Pyx_GIVEREF(__pyx_tuple__3);
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":950
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":930
  *         _import_umath()
  *     except Exception:
- *         raise ImportError("numpy.core.umath failed to import")             # <<<<<<<<<<<<<<
+ *         raise ImportError("numpy._core.umath failed to import")             # <<<<<<<<<<<<<<
  * 
  * cdef inline int import_ufunc() except -1:
  */
-  __pyx_tuple__3 = PyTuple_Pack(1, __pyx_kp_u_numpy_core_umath_failed_to_impor); if (unlikely(!__pyx_tuple__3)) __PYX_ERR(1, 950, __pyx_L1_error)
-  __Pyx_GOTREF(__pyx_tuple__3);
-  __Pyx_GIVEREF(__pyx_tuple__3);
+  __pyx_tuple__4 = PyTuple_Pack(1, __pyx_kp_u_numpy__core_umath_failed_to_impo); if (unlikely(!__pyx_tuple__4)) __PYX_ERR(1, 930, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__4);
+  __Pyx_GIVEREF(__pyx_tuple__4);
+
+  /* "grma/utilities/cutils.pyx":184
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * def cparse_imputation_lines(bytes data):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.
+ */
+  __pyx_tuple__5 = PyTuple_Pack(18, __pyx_n_s_data, __pyx_n_s_buf, __pyx_n_s_number_end, __pyx_n_s_length, __pyx_n_s_pos, __pyx_n_s_line_end, __pyx_n_s_row, __pyx_n_s_i, __pyx_n_s_num_commas, __pyx_n_s_commas, __pyx_n_s_value, __pyx_n_s_prob, __pyx_n_s_blank, __pyx_n_s_ids, __pyx_n_s_genos, __pyx_n_s_probs, __pyx_n_s_indices, __pyx_n_s_n_lines); if (unlikely(!__pyx_tuple__5)) __PYX_ERR(0, 184, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__5);
+  __Pyx_GIVEREF(__pyx_tuple__5);
+  __pyx_codeobj__6 = (PyObject*)__Pyx_PyCode_New(1, 0, 18, 0, CO_OPTIMIZED|CO_NEWLOCALS, __pyx_empty_bytes, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_tuple__5, __pyx_empty_tuple, __pyx_empty_tuple, __pyx_kp_s_grma_utilities_cutils_pyx, __pyx_n_s_cparse_imputation_lines, 184, __pyx_empty_bytes); if (unlikely(!__pyx_codeobj__6)) __PYX_ERR(0, 184, __pyx_L1_error)
   __Pyx_RefNannyFinishContext();
   return 0;
   __pyx_L1_error:;
@@ -4375,8 +6373,11 @@ static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
 }
 
 static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
+  __pyx_umethod_PyBytes_Type_count.type = (PyObject*)&PyBytes_Type;
   if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error);
+  __pyx_int_1 = PyInt_FromLong(1); if (unlikely(!__pyx_int_1)) __PYX_ERR(0, 1, __pyx_L1_error)
   __pyx_int_2 = PyInt_FromLong(2); if (unlikely(!__pyx_int_2)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_10 = PyInt_FromLong(10); if (unlikely(!__pyx_int_10)) __PYX_ERR(0, 1, __pyx_L1_error)
   return 0;
   __pyx_L1_error:;
   return -1;
@@ -4441,38 +6442,38 @@ static int __Pyx_modinit_type_import_code(void) {
   __Pyx_ImportType_CheckSize_Warn);
    if (!__pyx_ptype_7cpython_4type_type) __PYX_ERR(2, 9, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  __pyx_t_1 = PyImport_ImportModule("numpy"); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 199, __pyx_L1_error)
+  __pyx_t_1 = PyImport_ImportModule("numpy"); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 238, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_ptype_5numpy_dtype = __Pyx_ImportType(__pyx_t_1, "numpy", "dtype", sizeof(PyArray_Descr), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_dtype) __PYX_ERR(1, 199, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_dtype) __PYX_ERR(1, 238, __pyx_L1_error)
   __pyx_ptype_5numpy_flatiter = __Pyx_ImportType(__pyx_t_1, "numpy", "flatiter", sizeof(PyArrayIterObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_flatiter) __PYX_ERR(1, 222, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_flatiter) __PYX_ERR(1, 257, __pyx_L1_error)
   __pyx_ptype_5numpy_broadcast = __Pyx_ImportType(__pyx_t_1, "numpy", "broadcast", sizeof(PyArrayMultiIterObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_broadcast) __PYX_ERR(1, 226, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_broadcast) __PYX_ERR(1, 261, __pyx_L1_error)
   __pyx_ptype_5numpy_ndarray = __Pyx_ImportType(__pyx_t_1, "numpy", "ndarray", sizeof(PyArrayObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_ndarray) __PYX_ERR(1, 238, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_ndarray) __PYX_ERR(1, 273, __pyx_L1_error)
   __pyx_ptype_5numpy_generic = __Pyx_ImportType(__pyx_t_1, "numpy", "generic", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_generic) __PYX_ERR(1, 770, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_generic) __PYX_ERR(1, 740, __pyx_L1_error)
   __pyx_ptype_5numpy_number = __Pyx_ImportType(__pyx_t_1, "numpy", "number", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_number) __PYX_ERR(1, 772, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_number) __PYX_ERR(1, 742, __pyx_L1_error)
   __pyx_ptype_5numpy_integer = __Pyx_ImportType(__pyx_t_1, "numpy", "integer", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_integer) __PYX_ERR(1, 774, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_integer) __PYX_ERR(1, 744, __pyx_L1_error)
   __pyx_ptype_5numpy_signedinteger = __Pyx_ImportType(__pyx_t_1, "numpy", "signedinteger", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_signedinteger) __PYX_ERR(1, 776, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_signedinteger) __PYX_ERR(1, 746, __pyx_L1_error)
   __pyx_ptype_5numpy_unsignedinteger = __Pyx_ImportType(__pyx_t_1, "numpy", "unsignedinteger", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_unsignedinteger) __PYX_ERR(1, 778, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_unsignedinteger) __PYX_ERR(1, 748, __pyx_L1_error)
   __pyx_ptype_5numpy_inexact = __Pyx_ImportType(__pyx_t_1, "numpy", "inexact", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_inexact) __PYX_ERR(1, 780, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_inexact) __PYX_ERR(1, 750, __pyx_L1_error)
   __pyx_ptype_5numpy_floating = __Pyx_ImportType(__pyx_t_1, "numpy", "floating", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_floating) __PYX_ERR(1, 782, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_floating) __PYX_ERR(1, 752, __pyx_L1_error)
   __pyx_ptype_5numpy_complexfloating = __Pyx_ImportType(__pyx_t_1, "numpy", "complexfloating", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_complexfloating) __PYX_ERR(1, 784, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_complexfloating) __PYX_ERR(1, 754, __pyx_L1_error)
   __pyx_ptype_5numpy_flexible = __Pyx_ImportType(__pyx_t_1, "numpy", "flexible", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_flexible) __PYX_ERR(1, 786, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_flexible) __PYX_ERR(1, 756, __pyx_L1_error)
   __pyx_ptype_5numpy_character = __Pyx_ImportType(__pyx_t_1, "numpy", "character", sizeof(PyObject), __Pyx_ImportType_CheckSize_Warn);
-   if (!__pyx_ptype_5numpy_character) __PYX_ERR(1, 788, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_character) __PYX_ERR(1, 758, __pyx_L1_error)
   __pyx_ptype_5numpy_ufunc = __Pyx_ImportType(__pyx_t_1, "numpy", "ufunc", sizeof(PyUFuncObject), __Pyx_ImportType_CheckSize_Ignore);
-   if (!__pyx_ptype_5numpy_ufunc) __PYX_ERR(1, 826, __pyx_L1_error)
+   if (!__pyx_ptype_5numpy_ufunc) __PYX_ERR(1, 822, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   __Pyx_RefNannyFinishContext();
   return 0;
@@ -4703,13 +6704,25 @@ if (!__Pyx_RefNanny) {
  * import cython
  * import numpy as np             # <<<<<<<<<<<<<<
  * cimport numpy as np
- * 
+ * from libc.stdlib cimport strtod
  */
   __pyx_t_1 = __Pyx_Import(__pyx_n_s_numpy, 0, 0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   if (PyDict_SetItem(__pyx_d, __pyx_n_s_np, __pyx_t_1) < 0) __PYX_ERR(0, 4, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
+  /* "grma/utilities/cutils.pyx":184
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * def cparse_imputation_lines(bytes data):             # <<<<<<<<<<<<<<
+ *     """
+ *     Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.
+ */
+  __pyx_t_1 = PyCFunction_NewEx(&__pyx_mdef_4grma_9utilities_6cutils_7cparse_imputation_lines, NULL, __pyx_n_s_grma_utilities_cutils); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 184, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_cparse_imputation_lines, __pyx_t_1) < 0) __PYX_ERR(0, 184, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
   /* "grma/utilities/cutils.pyx":1
  * #cython: language_level=3             # <<<<<<<<<<<<<<
  * 
@@ -4720,7 +6733,7 @@ if (!__Pyx_RefNanny) {
   if (PyDict_SetItem(__pyx_d, __pyx_n_s_test, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
 
-  /* "../anaconda3/envs/grma_test/lib/python3.8/site-packages/numpy/__init__.pxd":1013
+  /* "../.pyenv/versions/3.11.7/lib/python3.11/site-packages/numpy/__init__.pxd":986
  * 
  * 
  * cdef inline NPY_DATETIMEUNIT get_datetime64_unit(object obj) nogil:             # <<<<<<<<<<<<<<
@@ -5803,160 +7816,422 @@ bad:
 #endif
 }
 
-/* GetTopmostException */
-  #if CYTHON_USE_EXC_INFO_STACK
-static _PyErr_StackItem *
-__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
-{
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
-           exc_info->previous_item != NULL)
-    {
-        exc_info = exc_info->previous_item;
+/* PyIntBinop */
+  #if !CYTHON_COMPILING_IN_PYPY
+static PyObject* __Pyx_PyInt_AddObjC(PyObject *op1, PyObject *op2, CYTHON_UNUSED long intval, int inplace, int zerodivision_check) {
+    (void)inplace;
+    (void)zerodivision_check;
+    #if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_CheckExact(op1))) {
+        const long b = intval;
+        long x;
+        long a = PyInt_AS_LONG(op1);
+            x = (long)((unsigned long)a + b);
+            if (likely((x^a) >= 0 || (x^b) >= 0))
+                return PyInt_FromLong(x);
+            return PyLong_Type.tp_as_number->nb_add(op1, op2);
     }
-    return exc_info;
+    #endif
+    #if CYTHON_USE_PYLONG_INTERNALS
+    if (likely(PyLong_CheckExact(op1))) {
+        const long b = intval;
+        long a, x;
+#ifdef HAVE_LONG_LONG
+        const PY_LONG_LONG llb = intval;
+        PY_LONG_LONG lla, llx;
+#endif
+        const digit* digits = ((PyLongObject*)op1)->ob_digit;
+        const Py_ssize_t size = Py_SIZE(op1);
+        if (likely(__Pyx_sst_abs(size) <= 1)) {
+            a = likely(size) ? digits[0] : 0;
+            if (size == -1) a = -a;
+        } else {
+            switch (size) {
+                case -2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 2:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        a = (long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 2 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 3:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        a = (long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 3 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = -(PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                case 4:
+                    if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                        a = (long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0]));
+                        break;
+#ifdef HAVE_LONG_LONG
+                    } else if (8 * sizeof(PY_LONG_LONG) - 1 > 4 * PyLong_SHIFT) {
+                        lla = (PY_LONG_LONG) (((((((((unsigned PY_LONG_LONG)digits[3]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[2]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[1]) << PyLong_SHIFT) | (unsigned PY_LONG_LONG)digits[0]));
+                        goto long_long;
+#endif
+                    }
+                    CYTHON_FALLTHROUGH;
+                default: return PyLong_Type.tp_as_number->nb_add(op1, op2);
+            }
+        }
+                x = a + b;
+            return PyLong_FromLong(x);
+#ifdef HAVE_LONG_LONG
+        long_long:
+                llx = lla + llb;
+            return PyLong_FromLongLong(llx);
+#endif
+        
+        
+    }
+    #endif
+    if (PyFloat_CheckExact(op1)) {
+        const long b = intval;
+        double a = PyFloat_AS_DOUBLE(op1);
+            double result;
+            PyFPE_START_PROTECT("add", return NULL)
+            result = ((double)a) + (double)b;
+            PyFPE_END_PROTECT(result)
+            return PyFloat_FromDouble(result);
+    }
+    return (inplace ? PyNumber_InPlaceAdd : PyNumber_Add)(op1, op2);
 }
 #endif
 
-/* SaveResetException */
-  #if CYTHON_FAST_THREAD_STATE
-static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
-    *type = exc_info->exc_type;
-    *value = exc_info->exc_value;
-    *tb = exc_info->exc_traceback;
-    #else
-    *type = tstate->exc_type;
-    *value = tstate->exc_value;
-    *tb = tstate->exc_traceback;
+/* UnpackUnboundCMethod */
+  static int __Pyx_TryUnpackUnboundCMethod(__Pyx_CachedCFunction* target) {
+    PyObject *method;
+    method = __Pyx_PyObject_GetAttrStr(target->type, *target->method_name);
+    if (unlikely(!method))
+        return -1;
+    target->method = method;
+#if CYTHON_COMPILING_IN_CPYTHON
+    #if PY_MAJOR_VERSION >= 3
+    if (likely(__Pyx_TypeCheck(method, &PyMethodDescr_Type)))
     #endif
-    Py_XINCREF(*type);
-    Py_XINCREF(*value);
-    Py_XINCREF(*tb);
+    {
+        PyMethodDescrObject *descr = (PyMethodDescrObject*) method;
+        target->func = descr->d_method->ml_meth;
+        target->flag = descr->d_method->ml_flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_STACKLESS);
+    }
+#endif
+    return 0;
 }
-static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    #if CYTHON_USE_EXC_INFO_STACK
-    _PyErr_StackItem *exc_info = tstate->exc_info;
-    tmp_type = exc_info->exc_type;
-    tmp_value = exc_info->exc_value;
-    tmp_tb = exc_info->exc_traceback;
-    exc_info->exc_type = type;
-    exc_info->exc_value = value;
-    exc_info->exc_traceback = tb;
-    #else
-    tmp_type = tstate->exc_type;
-    tmp_value = tstate->exc_value;
-    tmp_tb = tstate->exc_traceback;
-    tstate->exc_type = type;
-    tstate->exc_value = value;
-    tstate->exc_traceback = tb;
+
+/* CallUnboundCMethod1 */
+  #if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg) {
+    if (likely(cfunc->func)) {
+        int flag = cfunc->flag;
+        if (flag == METH_O) {
+            return (*(cfunc->func))(self, arg);
+        } else if (PY_VERSION_HEX >= 0x030600B1 && flag == METH_FASTCALL) {
+            if (PY_VERSION_HEX >= 0x030700A0) {
+                return (*(__Pyx_PyCFunctionFast)(void*)(PyCFunction)cfunc->func)(self, &arg, 1);
+            } else {
+                return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
+            }
+        } else if (PY_VERSION_HEX >= 0x030700A0 && flag == (METH_FASTCALL | METH_KEYWORDS)) {
+            return (*(__Pyx_PyCFunctionFastWithKeywords)(void*)(PyCFunction)cfunc->func)(self, &arg, 1, NULL);
+        }
+    }
+    return __Pyx__CallUnboundCMethod1(cfunc, self, arg);
+}
+#endif
+static PyObject* __Pyx__CallUnboundCMethod1(__Pyx_CachedCFunction* cfunc, PyObject* self, PyObject* arg){
+    PyObject *args, *result = NULL;
+    if (unlikely(!cfunc->func && !cfunc->method) && unlikely(__Pyx_TryUnpackUnboundCMethod(cfunc) < 0)) return NULL;
+#if CYTHON_COMPILING_IN_CPYTHON
+    if (cfunc->func && (cfunc->flag & METH_VARARGS)) {
+        args = PyTuple_New(1);
+        if (unlikely(!args)) goto bad;
+        Py_INCREF(arg);
+        PyTuple_SET_ITEM(args, 0, arg);
+        if (cfunc->flag & METH_KEYWORDS)
+            result = (*(PyCFunctionWithKeywords)(void*)(PyCFunction)cfunc->func)(self, args, NULL);
+        else
+            result = (*cfunc->func)(self, args);
+    } else {
+        args = PyTuple_New(2);
+        if (unlikely(!args)) goto bad;
+        Py_INCREF(self);
+        PyTuple_SET_ITEM(args, 0, self);
+        Py_INCREF(arg);
+        PyTuple_SET_ITEM(args, 1, arg);
+        result = __Pyx_PyObject_Call(cfunc->method, args, NULL);
+    }
+#else
+    args = PyTuple_Pack(2, self, arg);
+    if (unlikely(!args)) goto bad;
+    result = __Pyx_PyObject_Call(cfunc->method, args, NULL);
+#endif
+bad:
+    Py_XDECREF(args);
+    return result;
+}
+
+/* PyObjectFormatAndDecref */
+  static CYTHON_INLINE PyObject* __Pyx_PyObject_FormatSimpleAndDecref(PyObject* s, PyObject* f) {
+    if (unlikely(!s)) return NULL;
+    if (likely(PyUnicode_CheckExact(s))) return s;
+    #if PY_MAJOR_VERSION < 3
+    if (likely(PyString_CheckExact(s))) {
+        PyObject *result = PyUnicode_FromEncodedObject(s, NULL, "strict");
+        Py_DECREF(s);
+        return result;
+    }
     #endif
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
+    return __Pyx_PyObject_FormatAndDecref(s, f);
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_FormatAndDecref(PyObject* s, PyObject* f) {
+    PyObject *result = PyObject_Format(s, f);
+    Py_DECREF(s);
+    return result;
+}
+
+/* PyCFunctionFastCall */
+  #if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject * __Pyx_PyCFunction_FastCall(PyObject *func_obj, PyObject **args, Py_ssize_t nargs) {
+    PyCFunctionObject *func = (PyCFunctionObject*)func_obj;
+    PyCFunction meth = PyCFunction_GET_FUNCTION(func);
+    PyObject *self = PyCFunction_GET_SELF(func);
+    int flags = PyCFunction_GET_FLAGS(func);
+    assert(PyCFunction_Check(func));
+    assert(METH_FASTCALL == (flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)));
+    assert(nargs >= 0);
+    assert(nargs == 0 || args != NULL);
+    /* _PyCFunction_FastCallDict() must not be called with an exception set,
+       because it may clear it (directly or indirectly) and so the
+       caller loses its exception */
+    assert(!PyErr_Occurred());
+    if ((PY_VERSION_HEX < 0x030700A0) || unlikely(flags & METH_KEYWORDS)) {
+        return (*((__Pyx_PyCFunctionFastWithKeywords)(void*)meth)) (self, args, nargs, NULL);
+    } else {
+        return (*((__Pyx_PyCFunctionFast)(void*)meth)) (self, args, nargs);
+    }
 }
 #endif
 
-/* PyErrExceptionMatches */
-  #if CYTHON_FAST_THREAD_STATE
-static int __Pyx_PyErr_ExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
-    Py_ssize_t i, n;
-    n = PyTuple_GET_SIZE(tuple);
+/* PyFunctionFastCall */
+  #if CYTHON_FAST_PYCALL
+static PyObject* __Pyx_PyFunction_FastCallNoKw(PyCodeObject *co, PyObject **args, Py_ssize_t na,
+                                               PyObject *globals) {
+    PyFrameObject *f;
+    PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject **fastlocals;
+    Py_ssize_t i;
+    PyObject *result;
+    assert(globals != NULL);
+    /* XXX Perhaps we should create a specialized
+       PyFrame_New() that doesn't take locals, but does
+       take builtins without sanity checking them.
+       */
+    assert(tstate != NULL);
+    f = PyFrame_New(tstate, co, globals, NULL);
+    if (f == NULL) {
+        return NULL;
+    }
+    fastlocals = __Pyx_PyFrame_GetLocalsplus(f);
+    for (i = 0; i < na; i++) {
+        Py_INCREF(*args);
+        fastlocals[i] = *args++;
+    }
+    result = PyEval_EvalFrameEx(f,0);
+    ++tstate->recursion_depth;
+    Py_DECREF(f);
+    --tstate->recursion_depth;
+    return result;
+}
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs) {
+    PyCodeObject *co = (PyCodeObject *)PyFunction_GET_CODE(func);
+    PyObject *globals = PyFunction_GET_GLOBALS(func);
+    PyObject *argdefs = PyFunction_GET_DEFAULTS(func);
+    PyObject *closure;
 #if PY_MAJOR_VERSION >= 3
-    for (i=0; i<n; i++) {
-        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    PyObject *kwdefs;
+#endif
+    PyObject *kwtuple, **k;
+    PyObject **d;
+    Py_ssize_t nd;
+    Py_ssize_t nk;
+    PyObject *result;
+    assert(kwargs == NULL || PyDict_Check(kwargs));
+    nk = kwargs ? PyDict_Size(kwargs) : 0;
+    if (Py_EnterRecursiveCall((char*)" while calling a Python object")) {
+        return NULL;
     }
+    if (
+#if PY_MAJOR_VERSION >= 3
+            co->co_kwonlyargcount == 0 &&
 #endif
-    for (i=0; i<n; i++) {
-        if (__Pyx_PyErr_GivenExceptionMatches(exc_type, PyTuple_GET_ITEM(tuple, i))) return 1;
+            likely(kwargs == NULL || nk == 0) &&
+            co->co_flags == (CO_OPTIMIZED | CO_NEWLOCALS | CO_NOFREE)) {
+        if (argdefs == NULL && co->co_argcount == nargs) {
+            result = __Pyx_PyFunction_FastCallNoKw(co, args, nargs, globals);
+            goto done;
+        }
+        else if (nargs == 0 && argdefs != NULL
+                 && co->co_argcount == Py_SIZE(argdefs)) {
+            /* function called with no arguments, but all parameters have
+               a default value: use default values as arguments .*/
+            args = &PyTuple_GET_ITEM(argdefs, 0);
+            result =__Pyx_PyFunction_FastCallNoKw(co, args, Py_SIZE(argdefs), globals);
+            goto done;
+        }
     }
-    return 0;
-}
-static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err) {
-    PyObject *exc_type = tstate->curexc_type;
-    if (exc_type == err) return 1;
-    if (unlikely(!exc_type)) return 0;
-    if (unlikely(PyTuple_Check(err)))
-        return __Pyx_PyErr_ExceptionMatchesTuple(exc_type, err);
-    return __Pyx_PyErr_GivenExceptionMatches(exc_type, err);
-}
+    if (kwargs != NULL) {
+        Py_ssize_t pos, i;
+        kwtuple = PyTuple_New(2 * nk);
+        if (kwtuple == NULL) {
+            result = NULL;
+            goto done;
+        }
+        k = &PyTuple_GET_ITEM(kwtuple, 0);
+        pos = i = 0;
+        while (PyDict_Next(kwargs, &pos, &k[i], &k[i+1])) {
+            Py_INCREF(k[i]);
+            Py_INCREF(k[i+1]);
+            i += 2;
+        }
+        nk = i / 2;
+    }
+    else {
+        kwtuple = NULL;
+        k = NULL;
+    }
+    closure = PyFunction_GET_CLOSURE(func);
+#if PY_MAJOR_VERSION >= 3
+    kwdefs = PyFunction_GET_KW_DEFAULTS(func);
 #endif
-
-/* GetException */
-  #if CYTHON_FAST_THREAD_STATE
-static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb)
+    if (argdefs != NULL) {
+        d = &PyTuple_GET_ITEM(argdefs, 0);
+        nd = Py_SIZE(argdefs);
+    }
+    else {
+        d = NULL;
+        nd = 0;
+    }
+#if PY_MAJOR_VERSION >= 3
+    result = PyEval_EvalCodeEx((PyObject*)co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, kwdefs, closure);
 #else
-static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb)
+    result = PyEval_EvalCodeEx(co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, closure);
 #endif
-{
-    PyObject *local_type, *local_value, *local_tb;
-#if CYTHON_FAST_THREAD_STATE
-    PyObject *tmp_type, *tmp_value, *tmp_tb;
-    local_type = tstate->curexc_type;
-    local_value = tstate->curexc_value;
-    local_tb = tstate->curexc_traceback;
-    tstate->curexc_type = 0;
-    tstate->curexc_value = 0;
-    tstate->curexc_traceback = 0;
-#else
-    PyErr_Fetch(&local_type, &local_value, &local_tb);
+    Py_XDECREF(kwtuple);
+done:
+    Py_LeaveRecursiveCall();
+    return result;
+}
 #endif
-    PyErr_NormalizeException(&local_type, &local_value, &local_tb);
-#if CYTHON_FAST_THREAD_STATE
-    if (unlikely(tstate->curexc_type))
-#else
-    if (unlikely(PyErr_Occurred()))
 #endif
-        goto bad;
-    #if PY_MAJOR_VERSION >= 3
-    if (local_tb) {
-        if (unlikely(PyException_SetTraceback(local_value, local_tb) < 0))
-            goto bad;
+
+/* PyObjectCallMethO */
+  #if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg) {
+    PyObject *self, *result;
+    PyCFunction cfunc;
+    cfunc = PyCFunction_GET_FUNCTION(func);
+    self = PyCFunction_GET_SELF(func);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = cfunc(self, arg);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
     }
-    #endif
-    Py_XINCREF(local_tb);
-    Py_XINCREF(local_type);
-    Py_XINCREF(local_value);
-    *type = local_type;
-    *value = local_value;
-    *tb = local_tb;
-#if CYTHON_FAST_THREAD_STATE
-    #if CYTHON_USE_EXC_INFO_STACK
-    {
-        _PyErr_StackItem *exc_info = tstate->exc_info;
-        tmp_type = exc_info->exc_type;
-        tmp_value = exc_info->exc_value;
-        tmp_tb = exc_info->exc_traceback;
-        exc_info->exc_type = local_type;
-        exc_info->exc_value = local_value;
-        exc_info->exc_traceback = local_tb;
+    return result;
+}
+#endif
+
+/* PyObjectCallOneArg */
+  #if CYTHON_COMPILING_IN_CPYTHON
+static PyObject* __Pyx__PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_New(1);
+    if (unlikely(!args)) return NULL;
+    Py_INCREF(arg);
+    PyTuple_SET_ITEM(args, 0, arg);
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, &arg, 1);
     }
-    #else
-    tmp_type = tstate->exc_type;
-    tmp_value = tstate->exc_value;
-    tmp_tb = tstate->exc_traceback;
-    tstate->exc_type = local_type;
-    tstate->exc_value = local_value;
-    tstate->exc_traceback = local_tb;
-    #endif
-    Py_XDECREF(tmp_type);
-    Py_XDECREF(tmp_value);
-    Py_XDECREF(tmp_tb);
-#else
-    PyErr_SetExcInfo(local_type, local_value, local_tb);
 #endif
-    return 0;
-bad:
-    *type = 0;
-    *value = 0;
-    *tb = 0;
-    Py_XDECREF(local_type);
-    Py_XDECREF(local_value);
-    Py_XDECREF(local_tb);
-    return -1;
+    if (likely(PyCFunction_Check(func))) {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
+            return __Pyx_PyObject_CallMethO(func, arg);
+#if CYTHON_FAST_PYCCALL
+        } else if (__Pyx_PyFastCFunction_Check(func)) {
+            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
+#endif
+        }
+    }
+    return __Pyx__PyObject_CallOneArg(func, arg);
+}
+#else
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_Pack(1, arg);
+    if (unlikely(!args)) return NULL;
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
 }
+#endif
 
 /* RaiseException */
   #if PY_MAJOR_VERSION < 3
@@ -6073,49 +8348,204 @@ static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject
         PyErr_SetString(PyExc_TypeError,
             "raise: exception class must be a subclass of BaseException");
         goto bad;
-    }
-    if (cause) {
-        PyObject *fixed_cause;
-        if (cause == Py_None) {
-            fixed_cause = NULL;
-        } else if (PyExceptionClass_Check(cause)) {
-            fixed_cause = PyObject_CallObject(cause, NULL);
-            if (fixed_cause == NULL)
-                goto bad;
-        } else if (PyExceptionInstance_Check(cause)) {
-            fixed_cause = cause;
-            Py_INCREF(fixed_cause);
-        } else {
-            PyErr_SetString(PyExc_TypeError,
-                            "exception causes must derive from "
-                            "BaseException");
+    }
+    if (cause) {
+        PyObject *fixed_cause;
+        if (cause == Py_None) {
+            fixed_cause = NULL;
+        } else if (PyExceptionClass_Check(cause)) {
+            fixed_cause = PyObject_CallObject(cause, NULL);
+            if (fixed_cause == NULL)
+                goto bad;
+        } else if (PyExceptionInstance_Check(cause)) {
+            fixed_cause = cause;
+            Py_INCREF(fixed_cause);
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "exception causes must derive from "
+                            "BaseException");
+            goto bad;
+        }
+        PyException_SetCause(value, fixed_cause);
+    }
+    PyErr_SetObject(type, value);
+    if (tb) {
+#if CYTHON_COMPILING_IN_PYPY
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
+#else
+        PyThreadState *tstate = __Pyx_PyThreadState_Current;
+        PyObject* tmp_tb = tstate->curexc_traceback;
+        if (tb != tmp_tb) {
+            Py_INCREF(tb);
+            tstate->curexc_traceback = tb;
+            Py_XDECREF(tmp_tb);
+        }
+#endif
+    }
+bad:
+    Py_XDECREF(owned_instance);
+    return;
+}
+#endif
+
+/* GetTopmostException */
+  #if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem *
+__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
+{
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
+           exc_info->previous_item != NULL)
+    {
+        exc_info = exc_info->previous_item;
+    }
+    return exc_info;
+}
+#endif
+
+/* SaveResetException */
+  #if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
+    *type = exc_info->exc_type;
+    *value = exc_info->exc_value;
+    *tb = exc_info->exc_traceback;
+    #else
+    *type = tstate->exc_type;
+    *value = tstate->exc_value;
+    *tb = tstate->exc_traceback;
+    #endif
+    Py_XINCREF(*type);
+    Py_XINCREF(*value);
+    Py_XINCREF(*tb);
+}
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = type;
+    exc_info->exc_value = value;
+    exc_info->exc_traceback = tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = type;
+    tstate->exc_value = value;
+    tstate->exc_traceback = tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+#endif
+
+/* PyErrExceptionMatches */
+  #if CYTHON_FAST_THREAD_STATE
+static int __Pyx_PyErr_ExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    }
+#endif
+    for (i=0; i<n; i++) {
+        if (__Pyx_PyErr_GivenExceptionMatches(exc_type, PyTuple_GET_ITEM(tuple, i))) return 1;
+    }
+    return 0;
+}
+static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err) {
+    PyObject *exc_type = tstate->curexc_type;
+    if (exc_type == err) return 1;
+    if (unlikely(!exc_type)) return 0;
+    if (unlikely(PyTuple_Check(err)))
+        return __Pyx_PyErr_ExceptionMatchesTuple(exc_type, err);
+    return __Pyx_PyErr_GivenExceptionMatches(exc_type, err);
+}
+#endif
+
+/* GetException */
+  #if CYTHON_FAST_THREAD_STATE
+static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb)
+#else
+static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb)
+#endif
+{
+    PyObject *local_type, *local_value, *local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    local_type = tstate->curexc_type;
+    local_value = tstate->curexc_value;
+    local_tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+#else
+    PyErr_Fetch(&local_type, &local_value, &local_tb);
+#endif
+    PyErr_NormalizeException(&local_type, &local_value, &local_tb);
+#if CYTHON_FAST_THREAD_STATE
+    if (unlikely(tstate->curexc_type))
+#else
+    if (unlikely(PyErr_Occurred()))
+#endif
+        goto bad;
+    #if PY_MAJOR_VERSION >= 3
+    if (local_tb) {
+        if (unlikely(PyException_SetTraceback(local_value, local_tb) < 0))
             goto bad;
-        }
-        PyException_SetCause(value, fixed_cause);
     }
-    PyErr_SetObject(type, value);
-    if (tb) {
-#if CYTHON_COMPILING_IN_PYPY
-        PyObject *tmp_type, *tmp_value, *tmp_tb;
-        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
-        Py_INCREF(tb);
-        PyErr_Restore(tmp_type, tmp_value, tb);
-        Py_XDECREF(tmp_tb);
+    #endif
+    Py_XINCREF(local_tb);
+    Py_XINCREF(local_type);
+    Py_XINCREF(local_value);
+    *type = local_type;
+    *value = local_value;
+    *tb = local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    #if CYTHON_USE_EXC_INFO_STACK
+    {
+        _PyErr_StackItem *exc_info = tstate->exc_info;
+        tmp_type = exc_info->exc_type;
+        tmp_value = exc_info->exc_value;
+        tmp_tb = exc_info->exc_traceback;
+        exc_info->exc_type = local_type;
+        exc_info->exc_value = local_value;
+        exc_info->exc_traceback = local_tb;
+    }
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = local_type;
+    tstate->exc_value = local_value;
+    tstate->exc_traceback = local_tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
 #else
-        PyThreadState *tstate = __Pyx_PyThreadState_Current;
-        PyObject* tmp_tb = tstate->curexc_traceback;
-        if (tb != tmp_tb) {
-            Py_INCREF(tb);
-            tstate->curexc_traceback = tb;
-            Py_XDECREF(tmp_tb);
-        }
+    PyErr_SetExcInfo(local_type, local_value, local_tb);
 #endif
-    }
+    return 0;
 bad:
-    Py_XDECREF(owned_instance);
-    return;
+    *type = 0;
+    *value = 0;
+    *tb = 0;
+    Py_XDECREF(local_type);
+    Py_XDECREF(local_value);
+    Py_XDECREF(local_tb);
+    return -1;
 }
-#endif
 
 /* TypeImport */
   #ifndef __PYX_HAVE_RT_ImportType
@@ -6606,19 +9036,173 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
         return z;
     }
     #if 1
-        static CYTHON_INLINE float __Pyx_c_abs_float(__pyx_t_float_complex z) {
+        static CYTHON_INLINE float __Pyx_c_abs_float(__pyx_t_float_complex z) {
+          #if !defined(HAVE_HYPOT) || defined(_MSC_VER)
+            return sqrtf(z.real*z.real + z.imag*z.imag);
+          #else
+            return hypotf(z.real, z.imag);
+          #endif
+        }
+        static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_pow_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
+            __pyx_t_float_complex z;
+            float r, lnr, theta, z_r, z_theta;
+            if (b.imag == 0 && b.real == (int)b.real) {
+                if (b.real < 0) {
+                    float denom = a.real * a.real + a.imag * a.imag;
+                    a.real = a.real / denom;
+                    a.imag = -a.imag / denom;
+                    b.real = -b.real;
+                }
+                switch ((int)b.real) {
+                    case 0:
+                        z.real = 1;
+                        z.imag = 0;
+                        return z;
+                    case 1:
+                        return a;
+                    case 2:
+                        return __Pyx_c_prod_float(a, a);
+                    case 3:
+                        z = __Pyx_c_prod_float(a, a);
+                        return __Pyx_c_prod_float(z, a);
+                    case 4:
+                        z = __Pyx_c_prod_float(a, a);
+                        return __Pyx_c_prod_float(z, z);
+                }
+            }
+            if (a.imag == 0) {
+                if (a.real == 0) {
+                    return a;
+                } else if (b.imag == 0) {
+                    z.real = powf(a.real, b.real);
+                    z.imag = 0;
+                    return z;
+                } else if (a.real > 0) {
+                    r = a.real;
+                    theta = 0;
+                } else {
+                    r = -a.real;
+                    theta = atan2f(0.0, -1.0);
+                }
+            } else {
+                r = __Pyx_c_abs_float(a);
+                theta = atan2f(a.imag, a.real);
+            }
+            lnr = logf(r);
+            z_r = expf(lnr * b.real - theta * b.imag);
+            z_theta = theta * b.real + lnr * b.imag;
+            z.real = z_r * cosf(z_theta);
+            z.imag = z_r * sinf(z_theta);
+            return z;
+        }
+    #endif
+#endif
+
+/* Declarations */
+  #if CYTHON_CCOMPLEX
+  #ifdef __cplusplus
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      return ::std::complex< double >(x, y);
+    }
+  #else
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      return x + y*(__pyx_t_double_complex)_Complex_I;
+    }
+  #endif
+#else
+    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
+      __pyx_t_double_complex z;
+      z.real = x;
+      z.imag = y;
+      return z;
+    }
+#endif
+
+/* Arithmetic */
+  #if CYTHON_CCOMPLEX
+#else
+    static CYTHON_INLINE int __Pyx_c_eq_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+       return (a.real == b.real) && (a.imag == b.imag);
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_sum_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real + b.real;
+        z.imag = a.imag + b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_diff_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real - b.real;
+        z.imag = a.imag - b.imag;
+        return z;
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_prod_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        __pyx_t_double_complex z;
+        z.real = a.real * b.real - a.imag * b.imag;
+        z.imag = a.real * b.imag + a.imag * b.real;
+        return z;
+    }
+    #if 1
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else if (fabs(b.real) >= fabs(b.imag)) {
+            if (b.real == 0 && b.imag == 0) {
+                return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.imag);
+            } else {
+                double r = b.imag / b.real;
+                double s = (double)(1.0) / (b.real + b.imag * r);
+                return __pyx_t_double_complex_from_parts(
+                    (a.real + a.imag * r) * s, (a.imag - a.real * r) * s);
+            }
+        } else {
+            double r = b.real / b.imag;
+            double s = (double)(1.0) / (b.imag + b.real * r);
+            return __pyx_t_double_complex_from_parts(
+                (a.real * r + a.imag) * s, (a.imag * r - a.real) * s);
+        }
+    }
+    #else
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+        if (b.imag == 0) {
+            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else {
+            double denom = b.real * b.real + b.imag * b.imag;
+            return __pyx_t_double_complex_from_parts(
+                (a.real * b.real + a.imag * b.imag) / denom,
+                (a.imag * b.real - a.real * b.imag) / denom);
+        }
+    }
+    #endif
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_neg_double(__pyx_t_double_complex a) {
+        __pyx_t_double_complex z;
+        z.real = -a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    static CYTHON_INLINE int __Pyx_c_is_zero_double(__pyx_t_double_complex a) {
+       return (a.real == 0) && (a.imag == 0);
+    }
+    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_conj_double(__pyx_t_double_complex a) {
+        __pyx_t_double_complex z;
+        z.real =  a.real;
+        z.imag = -a.imag;
+        return z;
+    }
+    #if 1
+        static CYTHON_INLINE double __Pyx_c_abs_double(__pyx_t_double_complex z) {
           #if !defined(HAVE_HYPOT) || defined(_MSC_VER)
-            return sqrtf(z.real*z.real + z.imag*z.imag);
+            return sqrt(z.real*z.real + z.imag*z.imag);
           #else
-            return hypotf(z.real, z.imag);
+            return hypot(z.real, z.imag);
           #endif
         }
-        static CYTHON_INLINE __pyx_t_float_complex __Pyx_c_pow_float(__pyx_t_float_complex a, __pyx_t_float_complex b) {
-            __pyx_t_float_complex z;
-            float r, lnr, theta, z_r, z_theta;
+        static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_pow_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+            __pyx_t_double_complex z;
+            double r, lnr, theta, z_r, z_theta;
             if (b.imag == 0 && b.real == (int)b.real) {
                 if (b.real < 0) {
-                    float denom = a.real * a.real + a.imag * a.imag;
+                    double denom = a.real * a.real + a.imag * a.imag;
                     a.real = a.real / denom;
                     a.imag = -a.imag / denom;
                     b.real = -b.real;
@@ -6631,20 +9215,20 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
                     case 1:
                         return a;
                     case 2:
-                        return __Pyx_c_prod_float(a, a);
+                        return __Pyx_c_prod_double(a, a);
                     case 3:
-                        z = __Pyx_c_prod_float(a, a);
-                        return __Pyx_c_prod_float(z, a);
+                        z = __Pyx_c_prod_double(a, a);
+                        return __Pyx_c_prod_double(z, a);
                     case 4:
-                        z = __Pyx_c_prod_float(a, a);
-                        return __Pyx_c_prod_float(z, z);
+                        z = __Pyx_c_prod_double(a, a);
+                        return __Pyx_c_prod_double(z, z);
                 }
             }
             if (a.imag == 0) {
                 if (a.real == 0) {
                     return a;
                 } else if (b.imag == 0) {
-                    z.real = powf(a.real, b.real);
+                    z.real = pow(a.real, b.real);
                     z.imag = 0;
                     return z;
                 } else if (a.real > 0) {
@@ -6652,17 +9236,17 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
                     theta = 0;
                 } else {
                     r = -a.real;
-                    theta = atan2f(0.0, -1.0);
+                    theta = atan2(0.0, -1.0);
                 }
             } else {
-                r = __Pyx_c_abs_float(a);
-                theta = atan2f(a.imag, a.real);
+                r = __Pyx_c_abs_double(a);
+                theta = atan2(a.imag, a.real);
             }
-            lnr = logf(r);
-            z_r = expf(lnr * b.real - theta * b.imag);
+            lnr = log(r);
+            z_r = exp(lnr * b.real - theta * b.imag);
             z_theta = theta * b.real + lnr * b.imag;
-            z.real = z_r * cosf(z_theta);
-            z.imag = z_r * sinf(z_theta);
+            z.real = z_r * cos(z_theta);
+            z.imag = z_r * sin(z_theta);
             return z;
         }
     #endif
@@ -6671,17 +9255,17 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
 /* Declarations */
   #if CYTHON_CCOMPLEX
   #ifdef __cplusplus
-    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
-      return ::std::complex< double >(x, y);
+    static CYTHON_INLINE __pyx_t_long_double_complex __pyx_t_long_double_complex_from_parts(long double x, long double y) {
+      return ::std::complex< long double >(x, y);
     }
   #else
-    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
-      return x + y*(__pyx_t_double_complex)_Complex_I;
+    static CYTHON_INLINE __pyx_t_long_double_complex __pyx_t_long_double_complex_from_parts(long double x, long double y) {
+      return x + y*(__pyx_t_long_double_complex)_Complex_I;
     }
   #endif
 #else
-    static CYTHON_INLINE __pyx_t_double_complex __pyx_t_double_complex_from_parts(double x, double y) {
-      __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __pyx_t_long_double_complex_from_parts(long double x, long double y) {
+      __pyx_t_long_double_complex z;
       z.real = x;
       z.imag = y;
       return z;
@@ -6691,88 +9275,88 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
 /* Arithmetic */
   #if CYTHON_CCOMPLEX
 #else
-    static CYTHON_INLINE int __Pyx_c_eq_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+    static CYTHON_INLINE int __Pyx_c_eq_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
        return (a.real == b.real) && (a.imag == b.imag);
     }
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_sum_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
-        __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_sum_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
+        __pyx_t_long_double_complex z;
         z.real = a.real + b.real;
         z.imag = a.imag + b.imag;
         return z;
     }
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_diff_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
-        __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_diff_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
+        __pyx_t_long_double_complex z;
         z.real = a.real - b.real;
         z.imag = a.imag - b.imag;
         return z;
     }
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_prod_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
-        __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_prod_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
+        __pyx_t_long_double_complex z;
         z.real = a.real * b.real - a.imag * b.imag;
         z.imag = a.real * b.imag + a.imag * b.real;
         return z;
     }
     #if 1
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_quot_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
         if (b.imag == 0) {
-            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
-        } else if (fabs(b.real) >= fabs(b.imag)) {
+            return __pyx_t_long_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+        } else if (fabsl(b.real) >= fabsl(b.imag)) {
             if (b.real == 0 && b.imag == 0) {
-                return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.imag);
+                return __pyx_t_long_double_complex_from_parts(a.real / b.real, a.imag / b.imag);
             } else {
-                double r = b.imag / b.real;
-                double s = (double)(1.0) / (b.real + b.imag * r);
-                return __pyx_t_double_complex_from_parts(
+                long double r = b.imag / b.real;
+                long double s = (long double)(1.0) / (b.real + b.imag * r);
+                return __pyx_t_long_double_complex_from_parts(
                     (a.real + a.imag * r) * s, (a.imag - a.real * r) * s);
             }
         } else {
-            double r = b.real / b.imag;
-            double s = (double)(1.0) / (b.imag + b.real * r);
-            return __pyx_t_double_complex_from_parts(
+            long double r = b.real / b.imag;
+            long double s = (long double)(1.0) / (b.imag + b.real * r);
+            return __pyx_t_long_double_complex_from_parts(
                 (a.real * r + a.imag) * s, (a.imag * r - a.real) * s);
         }
     }
     #else
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_quot_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_quot_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
         if (b.imag == 0) {
-            return __pyx_t_double_complex_from_parts(a.real / b.real, a.imag / b.real);
+            return __pyx_t_long_double_complex_from_parts(a.real / b.real, a.imag / b.real);
         } else {
-            double denom = b.real * b.real + b.imag * b.imag;
-            return __pyx_t_double_complex_from_parts(
+            long double denom = b.real * b.real + b.imag * b.imag;
+            return __pyx_t_long_double_complex_from_parts(
                 (a.real * b.real + a.imag * b.imag) / denom,
                 (a.imag * b.real - a.real * b.imag) / denom);
         }
     }
     #endif
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_neg_double(__pyx_t_double_complex a) {
-        __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_neg_long__double(__pyx_t_long_double_complex a) {
+        __pyx_t_long_double_complex z;
         z.real = -a.real;
         z.imag = -a.imag;
         return z;
     }
-    static CYTHON_INLINE int __Pyx_c_is_zero_double(__pyx_t_double_complex a) {
+    static CYTHON_INLINE int __Pyx_c_is_zero_long__double(__pyx_t_long_double_complex a) {
        return (a.real == 0) && (a.imag == 0);
     }
-    static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_conj_double(__pyx_t_double_complex a) {
-        __pyx_t_double_complex z;
+    static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_conj_long__double(__pyx_t_long_double_complex a) {
+        __pyx_t_long_double_complex z;
         z.real =  a.real;
         z.imag = -a.imag;
         return z;
     }
     #if 1
-        static CYTHON_INLINE double __Pyx_c_abs_double(__pyx_t_double_complex z) {
+        static CYTHON_INLINE long double __Pyx_c_abs_long__double(__pyx_t_long_double_complex z) {
           #if !defined(HAVE_HYPOT) || defined(_MSC_VER)
-            return sqrt(z.real*z.real + z.imag*z.imag);
+            return sqrtl(z.real*z.real + z.imag*z.imag);
           #else
-            return hypot(z.real, z.imag);
+            return hypotl(z.real, z.imag);
           #endif
         }
-        static CYTHON_INLINE __pyx_t_double_complex __Pyx_c_pow_double(__pyx_t_double_complex a, __pyx_t_double_complex b) {
-            __pyx_t_double_complex z;
-            double r, lnr, theta, z_r, z_theta;
+        static CYTHON_INLINE __pyx_t_long_double_complex __Pyx_c_pow_long__double(__pyx_t_long_double_complex a, __pyx_t_long_double_complex b) {
+            __pyx_t_long_double_complex z;
+            long double r, lnr, theta, z_r, z_theta;
             if (b.imag == 0 && b.real == (int)b.real) {
                 if (b.real < 0) {
-                    double denom = a.real * a.real + a.imag * a.imag;
+                    long double denom = a.real * a.real + a.imag * a.imag;
                     a.real = a.real / denom;
                     a.imag = -a.imag / denom;
                     b.real = -b.real;
@@ -6785,20 +9369,20 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
                     case 1:
                         return a;
                     case 2:
-                        return __Pyx_c_prod_double(a, a);
+                        return __Pyx_c_prod_long__double(a, a);
                     case 3:
-                        z = __Pyx_c_prod_double(a, a);
-                        return __Pyx_c_prod_double(z, a);
+                        z = __Pyx_c_prod_long__double(a, a);
+                        return __Pyx_c_prod_long__double(z, a);
                     case 4:
-                        z = __Pyx_c_prod_double(a, a);
-                        return __Pyx_c_prod_double(z, z);
+                        z = __Pyx_c_prod_long__double(a, a);
+                        return __Pyx_c_prod_long__double(z, z);
                 }
             }
             if (a.imag == 0) {
                 if (a.real == 0) {
                     return a;
                 } else if (b.imag == 0) {
-                    z.real = pow(a.real, b.real);
+                    z.real = powl(a.real, b.real);
                     z.imag = 0;
                     return z;
                 } else if (a.real > 0) {
@@ -6806,17 +9390,17 @@ static void __Pyx_ReleaseBuffer(Py_buffer *view) {
                     theta = 0;
                 } else {
                     r = -a.real;
-                    theta = atan2(0.0, -1.0);
+                    theta = atan2l(0.0, -1.0);
                 }
             } else {
-                r = __Pyx_c_abs_double(a);
-                theta = atan2(a.imag, a.real);
+                r = __Pyx_c_abs_long__double(a);
+                theta = atan2l(a.imag, a.real);
             }
-            lnr = log(r);
-            z_r = exp(lnr * b.real - theta * b.imag);
+            lnr = logl(r);
+            z_r = expl(lnr * b.real - theta * b.imag);
             z_theta = theta * b.real + lnr * b.imag;
-            z.real = z_r * cos(z_theta);
-            z.imag = z_r * sin(z_theta);
+            z.real = z_r * cosl(z_theta);
+            z.imag = z_r * sinl(z_theta);
             return z;
         }
     #endif
@@ -7269,25 +9853,221 @@ raise_neg_overflow:
         } else if (sizeof(npy_uint8) <= sizeof(unsigned long)) {
             return PyLong_FromUnsignedLong((unsigned long) value);
 #ifdef HAVE_LONG_LONG
-        } else if (sizeof(npy_uint8) <= sizeof(unsigned PY_LONG_LONG)) {
-            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+        } else if (sizeof(npy_uint8) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(npy_uint8) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(npy_uint8) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(npy_uint8),
+                                     little, !is_unsigned);
+    }
+}
+
+/* CIntFromPy */
+  static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
+    const int is_unsigned = neg_one > const_zero;
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(int) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(int, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (int) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(int, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 2 * PyLong_SHIFT) {
+                            return (int) (((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 3 * PyLong_SHIFT) {
+                            return (int) (((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 4 * PyLong_SHIFT) {
+                            return (int) (((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (int) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(int) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(int, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(int,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(int) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) ((((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) ((((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) ((((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(int) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, PY_LONG_LONG, PyLong_AsLongLong(x))
 #endif
+            }
         }
-    } else {
-        if (sizeof(npy_uint8) <= sizeof(long)) {
-            return PyInt_FromLong((long) value);
-#ifdef HAVE_LONG_LONG
-        } else if (sizeof(npy_uint8) <= sizeof(PY_LONG_LONG)) {
-            return PyLong_FromLongLong((PY_LONG_LONG) value);
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            int val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
 #endif
+            return (int) -1;
         }
+    } else {
+        int val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (int) -1;
+        val = __Pyx_PyInt_As_int(tmp);
+        Py_DECREF(tmp);
+        return val;
     }
-    {
-        int one = 1; int little = (int)*(unsigned char *)&one;
-        unsigned char *bytes = (unsigned char *)&value;
-        return _PyLong_FromByteArray(bytes, sizeof(npy_uint8),
-                                     little, !is_unsigned);
-    }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to int");
+    return (int) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to int");
+    return (int) -1;
 }
 
 /* CIntToPy */
@@ -7524,202 +10304,6 @@ raise_neg_overflow:
     return (long) -1;
 }
 
-/* CIntFromPy */
-  static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic push
-#pragma GCC diagnostic ignored "-Wconversion"
-#endif
-    const int neg_one = (int) -1, const_zero = (int) 0;
-#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
-#pragma GCC diagnostic pop
-#endif
-    const int is_unsigned = neg_one > const_zero;
-#if PY_MAJOR_VERSION < 3
-    if (likely(PyInt_Check(x))) {
-        if (sizeof(int) < sizeof(long)) {
-            __PYX_VERIFY_RETURN_INT(int, long, PyInt_AS_LONG(x))
-        } else {
-            long val = PyInt_AS_LONG(x);
-            if (is_unsigned && unlikely(val < 0)) {
-                goto raise_neg_overflow;
-            }
-            return (int) val;
-        }
-    } else
-#endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-#if CYTHON_USE_PYLONG_INTERNALS
-            const digit* digits = ((PyLongObject*)x)->ob_digit;
-            switch (Py_SIZE(x)) {
-                case  0: return (int) 0;
-                case  1: __PYX_VERIFY_RETURN_INT(int, digit, digits[0])
-                case 2:
-                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) >= 2 * PyLong_SHIFT) {
-                            return (int) (((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
-                        }
-                    }
-                    break;
-                case 3:
-                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) >= 3 * PyLong_SHIFT) {
-                            return (int) (((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
-                        }
-                    }
-                    break;
-                case 4:
-                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) >= 4 * PyLong_SHIFT) {
-                            return (int) (((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
-                        }
-                    }
-                    break;
-            }
-#endif
-#if CYTHON_COMPILING_IN_CPYTHON
-            if (unlikely(Py_SIZE(x) < 0)) {
-                goto raise_neg_overflow;
-            }
-#else
-            {
-                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
-                if (unlikely(result < 0))
-                    return (int) -1;
-                if (unlikely(result == 1))
-                    goto raise_neg_overflow;
-            }
-#endif
-            if (sizeof(int) <= sizeof(unsigned long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned long, PyLong_AsUnsignedLong(x))
-#ifdef HAVE_LONG_LONG
-            } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
-#endif
-            }
-        } else {
-#if CYTHON_USE_PYLONG_INTERNALS
-            const digit* digits = ((PyLongObject*)x)->ob_digit;
-            switch (Py_SIZE(x)) {
-                case  0: return (int) 0;
-                case -1: __PYX_VERIFY_RETURN_INT(int, sdigit, (sdigit) (-(sdigit)digits[0]))
-                case  1: __PYX_VERIFY_RETURN_INT(int,  digit, +digits[0])
-                case -2:
-                    if (8 * sizeof(int) - 1 > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
-                            return (int) (((int)-1)*(((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-                case 2:
-                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
-                            return (int) ((((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-                case -3:
-                    if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
-                            return (int) (((int)-1)*(((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-                case 3:
-                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
-                            return (int) ((((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-                case -4:
-                    if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
-                            return (int) (((int)-1)*(((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-                case 4:
-                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
-                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
-                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
-                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
-                            return (int) ((((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
-                        }
-                    }
-                    break;
-            }
-#endif
-            if (sizeof(int) <= sizeof(long)) {
-                __PYX_VERIFY_RETURN_INT_EXC(int, long, PyLong_AsLong(x))
-#ifdef HAVE_LONG_LONG
-            } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
-                __PYX_VERIFY_RETURN_INT_EXC(int, PY_LONG_LONG, PyLong_AsLongLong(x))
-#endif
-            }
-        }
-        {
-#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
-            PyErr_SetString(PyExc_RuntimeError,
-                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
-#else
-            int val;
-            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
- #if PY_MAJOR_VERSION < 3
-            if (likely(v) && !PyLong_Check(v)) {
-                PyObject *tmp = v;
-                v = PyNumber_Long(tmp);
-                Py_DECREF(tmp);
-            }
- #endif
-            if (likely(v)) {
-                int one = 1; int is_little = (int)*(unsigned char *)&one;
-                unsigned char *bytes = (unsigned char *)&val;
-                int ret = _PyLong_AsByteArray((PyLongObject *)v,
-                                              bytes, sizeof(val),
-                                              is_little, !is_unsigned);
-                Py_DECREF(v);
-                if (likely(!ret))
-                    return val;
-            }
-#endif
-            return (int) -1;
-        }
-    } else {
-        int val;
-        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
-        if (!tmp) return (int) -1;
-        val = __Pyx_PyInt_As_int(tmp);
-        Py_DECREF(tmp);
-        return val;
-    }
-raise_overflow:
-    PyErr_SetString(PyExc_OverflowError,
-        "value too large to convert to int");
-    return (int) -1;
-raise_neg_overflow:
-    PyErr_SetString(PyExc_OverflowError,
-        "can't convert negative value to int");
-    return (int) -1;
-}
-
 /* FastTypeChecks */
   #if CYTHON_COMPILING_IN_CPYTHON
 static int __Pyx_InBases(PyTypeObject *a, PyTypeObject *b) {
@@ -3,11 +3,13 @@
 import cython
 import numpy as np
 cimport numpy as np
+from libc.stdlib cimport strtod
 
 ctypedef np.uint8_t UINT8
 ctypedef np.int8_t INT8
 ctypedef np.uint16_t UINT16
 ctypedef np.uint32_t UINT32
+ctypedef np.int64_t INT64
 
 
 
@@ -99,3 +101,154 @@ cpdef UINT32 chash(np.ndarray[UINT16, ndim=1] arr):
     for i in range(len(arr)):
         h = h * 31 + arr[i]
     return h
+
+
+cdef inline bint _is_space(char ch):
+    return ch == c' ' or ch == c'\t' or ch == c'\r'
+
+
+cdef bint _parse_int(const char* buf, Py_ssize_t start, Py_ssize_t end, INT64* value):
+    """parse a base-10 integer field (surrounded by optional spaces). returns False if it is malformed."""
+    cdef INT64 result = 0
+    cdef bint negative = False
+    while start < end and _is_space(buf[start]):
+        start += 1
+    while end > start and _is_space(buf[end - 1]):
+        end -= 1
+    if start < end and (buf[start] == c'-' or buf[start] == c'+'):
+        negative = buf[start] == c'-'
+        start += 1
+    if start == end:
+        return False
+    while start < end:
+        if buf[start] < c'0' or buf[start] > c'9':
+            return False
+        result = result * 10 + (buf[start] - c'0')
+        start += 1
+    value[0] = -result if negative else result
+    return True
+
+
+cdef bint _parse_gl_string(const char* buf, Py_ssize_t start, Py_ssize_t end, UINT16* geno):
+    """
+    Parse a GL string of 10 alleles into geno, the same way as utils.gl_string_to_integers:
+    alleles are separated by '+', '^' or '~', and each allele is the first 4 digits after its '*'
+    (ignoring ':'), or 0 if it has no '*'. The alleles of each locus are sorted.
+    returns False if the string is malformed.
+    """
+    cdef:
+        Py_ssize_t allele_end
+        int num_alleles = 0, digits, i
+        UINT16 allele, tmp
+        bint after_star
+
+    while start <= end:
+        allele_end = start
+        while allele_end < end and buf[allele_end] != c'+' and buf[allele_end] != c'^' and buf[allele_end] != c'~':
+            allele_end += 1
+        if num_alleles == 10:
+            return False
+
+        allele = 0
+        digits = 0
+        after_star = False
+        for i in range(start, allele_end):
+            if buf[i] == c'*':
+                if after_star:
+                    break
+                after_star = True
+            elif after_star and buf[i] != c':' and digits < 4:
+                if buf[i] < c'0' or buf[i] > c'9':
+                    return False
+                allele = allele * 10 + (buf[i] - c'0')
+                digits += 1
+        if after_star and digits == 0:
+            return False
+
+        geno[num_alleles] = allele
+        num_alleles += 1
+        start = allele_end + 1
+
+    if num_alleles != 10:
+        return False
+    for i in range(0, 10, 2):
+        if geno[i] > geno[i + 1]:
+            tmp = geno[i]
+            geno[i] = geno[i + 1]
+            geno[i + 1] = tmp
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def cparse_imputation_lines(bytes data):
+    """
+    Parse a block of imputation lines: 'id,gl-string,probability,index'. Blank lines are skipped.
+
+    :returns: ids (int64), genotypes ((n, 10) uint16, the alleles of each locus are sorted),
+    probabilities (float64) and indices (int64).
+    Raises ValueError with the first malformed line.
+    """
+    cdef:
+        const char* buf = data
+        char* number_end
+        Py_ssize_t length = len(data), pos = 0, line_end, row = 0, i, num_commas
+        Py_ssize_t commas[3]
+        INT64 value
+        double prob
+        bint blank
+        np.ndarray[INT64, ndim=1] ids
+        np.ndarray[UINT16, ndim=2] genos
+        np.ndarray[np.float64_t, ndim=1] probs
+        np.ndarray[INT64, ndim=1] indices
+
+    n_lines = data.count(b"\n") + 1
+    ids = np.empty(n_lines, dtype=np.int64)
+    genos = np.empty((n_lines, 10), dtype=np.uint16)
+    probs = np.empty(n_lines, dtype=np.float64)
+    indices = np.empty(n_lines, dtype=np.int64)
+
+    while pos < length:
+        line_end = pos
+        num_commas = 0
+        blank = True
+        while line_end < length and buf[line_end] != c'\n':
+            if buf[line_end] == c',':
+                if num_commas < 3:
+                    commas[num_commas] = line_end
+                num_commas += 1
+            if not _is_space(buf[line_end]):
+                blank = False
+            line_end += 1
+
+        if not blank:
+            if num_commas != 3:
+                _raise_malformed(data, pos, line_end)
+
+            if not _parse_int(buf, pos, commas[0], &value):
+                _raise_malformed(data, pos, line_end)
+            ids[row] = value
+
+            if not _parse_gl_string(buf, commas[0] + 1, commas[1], <UINT16*> &genos[row, 0]):
+                _raise_malformed(data, pos, line_end)
+
+            prob = strtod(buf + commas[1] + 1, &number_end)
+            i = number_end - buf
+            while i < commas[2] and _is_space(buf[i]):
+                i += 1
+            if number_end == buf + commas[1] + 1 or i != commas[2]:
+                _raise_malformed(data, pos, line_end)
+            probs[row] = prob
+
+            if not _parse_int(buf, commas[2] + 1, line_end, &value):
+                _raise_malformed(data, pos, line_end)
+            indices[row] = value
+            row += 1
+
+        pos = line_end + 1
+
+    return ids[:row], genos[:row], probs[:row], indices[:row]
+
+
+cdef _raise_malformed(bytes data, Py_ssize_t start, Py_ssize_t end):
+    raise ValueError(f"Malformed imputation line: {data[start:end].decode(errors='replace')!r}")
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import lzma
+import os
+import queue
+import tempfile
+import threading
+from collections import namedtuple
+from typing import BinaryIO, Iterable, Iterator, Union
+
+import numpy as np
+
+from grma.utilities.cutils import cparse_imputation_lines
+
+DEFAULT_BLOCK_BYTES: int = 1 << 24  # 16MB
+DEFAULT_READ_AHEAD_BLOCKS: int = 4
+BINARY_SUFFIX = ".npz"
+COMPRESSED_OPENERS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+# The parsed lines of an imputation file:
+# ids (int64), genotypes ((n, 10) uint16, the alleles of each locus are sorted), probabilities (float64)
+# and indices (int64) - the index of the genotype in the imputation of the patient/donor.
+ImputationBlock = namedtuple("ImputationBlock", ["ids", "genotypes", "probabilities", "indices"])
+
+
+def parse_imputation_lines(lines: Union[bytes, str, Iterable[str]]) -> ImputationBlock:
+    """
+    Parse lines of grim's imputation output ('id,gl-string,probability,index') into arrays, in one pass.
+    Blank lines are skipped, and a ValueError is raised for a malformed line.
+
+    :param lines: The lines, as bytes/str of the whole block or as an iterable of lines.
+    """
+    if isinstance(lines, str):
+        lines = lines.encode()
+    elif not isinstance(lines, bytes):
+        lines = "\n".join(line.rstrip("\n") for line in lines).encode()
+    return ImputationBlock(*cparse_imputation_lines(lines))
+
+
+def open_imputation_file(path: Union[str, os.PathLike]) -> BinaryIO:
+    """Open an imputation file for binary reading. .gz, .bz2 and .xz files are decompressed while they are read."""
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(path)[1], open)
+    return opener(path, "rb")
+
+
+def _iter_raw_blocks(f: BinaryIO, block_bytes: int) -> Iterator[bytes]:
+    """read blocks of about block_bytes from f. A block always ends at the end of a line."""
+    rest = b""
+    while True:
+        data = f.read(block_bytes)
+        if not data:
+            break
+        data = rest + data
+        end = data.rfind(b"\n") + 1
+        rest = data[end:]
+        if end:
+            yield data[:end]
+    if rest:
+        yield rest
+
+
+def _read_ahead(path: Union[str, os.PathLike], block_bytes: int, read_ahead: int) -> Iterator[bytes]:
+    """
+    Read (and decompress) the raw blocks of a file in a reader thread, so the reading overlaps the parsing.
+    At most read_ahead blocks wait in memory for the parser.
+    """
+    blocks = queue.Queue(maxsize=read_ahead)
+    stop = threading.Event()
+    end_of_file = object()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader():
+        try:
+            with open_imputation_file(path) as f:
+                for data in _iter_raw_blocks(f, block_bytes):
+                    if not put(data):
+                        return
+        except BaseException as e:
+            put(e)
+        put(end_of_file)
+
+    thread = threading.Thread(target=reader, name=f"grma-reader-{os.path.basename(path)}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = blocks.get()
+            if item is end_of_file:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def read_imputation_blocks(path: Union[str, os.PathLike], block_bytes: int = DEFAULT_BLOCK_BYTES,
+                           read_ahead: int = DEFAULT_READ_AHEAD_BLOCKS) -> Iterator[ImputationBlock]:
+    """
+    Read an imputation file in blocks of about block_bytes, and parse each block with parse_imputation_lines.
+    A block always ends at the end of a line, so the lines of a donor/patient might be split between two blocks.
+    Compressed files (.gz, .bz2, .xz) are streamed, without decompressing them to the disk first.
+
+    :param path: A path to the imputation file.
+    :param block_bytes: The (uncompressed) size of a block.
+    :param read_ahead: Maximum number of blocks that are read in a reader thread ahead of the parsing.
+    0 reads the file in the calling thread.
+    """
+    if read_ahead <= 0:
+        with open_imputation_file(path) as f:
+            yield from map(parse_imputation_lines, _iter_raw_blocks(f, block_bytes))
+        return
+
+    raw_blocks = _read_ahead(path, block_bytes, read_ahead)
+    try:
+        yield from map(parse_imputation_lines, raw_blocks)
+    finally:
+        raw_blocks.close()  # stops the reader thread if the blocks are not read to the end
+
+
+def _source_key(path: Union[str, os.PathLike]) -> np.ndarray:
+    """the key of a text imputation file in the binary cache: its size and modification time"""
+    stat = os.stat(path)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+
+def save_imputation_binary(block: ImputationBlock, path: Union[str, os.PathLike],
+                           source_key: Union[np.ndarray, None] = None):
+    """
+    Save parsed imputation lines in the binary format (.npz with a column for each field of ImputationBlock).
+    The file is written to a temporary file first, so a reader never sees a partial file.
+
+    :param block: The parsed lines.
+    :param path: A path to the binary file.
+    :param source_key: The key of the text file the lines were parsed from (see read_imputation_file).
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(suffix=BINARY_SUFFIX, dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, source_key=source_key if source_key is not None else np.array([], dtype=np.int64),
+                     **block._asdict())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def load_imputation_binary(path: Union[str, os.PathLike],
+                           source_key: Union[np.ndarray, None] = None) -> Union[ImputationBlock, None]:
+    """
+    Load a binary imputation file saved by save_imputation_binary.
+    If source_key is given, returns None when the file was converted from another version of the text file.
+    """
+    with np.load(path) as data:
+        if source_key is not None and not np.array_equal(data["source_key"], source_key):
+            return None
+        return ImputationBlock(*(data[field] for field in ImputationBlock._fields))
+
+
+def convert_imputation_file(path: Union[str, os.PathLike], binary_path: Union[str, os.PathLike]):
+    """Convert a text imputation file to the binary format"""
+    save_imputation_binary(_concatenate(read_imputation_blocks(path)), binary_path, _source_key(path))
+
+
+def read_imputation_file(path: Union[str, os.PathLike],
+                         cache_directory: Union[str, os.PathLike, None] = None) -> Iterator[ImputationBlock]:
+    """
+    Read and parse an imputation file in blocks. A binary imputation file (.npz) is loaded without parsing.
+    If a cache directory is given, a parsed text file is kept there in the binary format, keyed by the size and
+    modification time of the text file. When the text file is unchanged, its lines are loaded from the cache
+    without parsing.
+
+    :param path: A path to the imputation file.
+    :param cache_directory: A directory of binary imputation files. default is None (no cache).
+    """
+    if str(path).endswith(BINARY_SUFFIX):
+        yield load_imputation_binary(path)
+        return
+
+    if cache_directory is None:
+        yield from read_imputation_blocks(path)
+        return
+
+    binary_path = os.path.join(cache_directory, os.path.basename(path) + BINARY_SUFFIX)
+    source_key = _source_key(path)
+    cached = load_imputation_binary(binary_path, source_key) if os.path.isfile(binary_path) else None
+    if cached is not None:
+        yield cached
+        return
+
+    blocks = []
+    for block in read_imputation_blocks(path):
+        blocks.append(block)
+        yield block
+    save_imputation_binary(_concatenate(blocks), binary_path, source_key)
+
+
+def _concatenate(blocks: Iterable[ImputationBlock]) -> ImputationBlock:
+    blocks = list(blocks)
+    if not blocks:
+        return parse_imputation_lines(b"")
+    return ImputationBlock(*(np.concatenate(arrays) for arrays in zip(*blocks)))
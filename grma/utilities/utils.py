@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from datetime import datetime
 from typing import Iterable
 
@@ -139,6 +140,16 @@ def print_time(log: str):
     print(f"[{current_time}] -- {log}")
 
 
+def reset_tqdm_lock():
+    """
+    Give a forked process its own tqdm lock. The process might be forked while another thread of its parent
+    (e.g. tqdm's monitor) holds tqdm's lock, and then every tqdm in it (even a disabled one) would wait forever.
+    """
+    from tqdm import tqdm
+
+    tqdm.set_lock(threading.RLock())
+
+
 def drop_less_than_7_matches(ids, similarities):
     return cdrop_less_than_7_matches(ids, similarities)
 
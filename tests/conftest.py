@@ -0,0 +1,74 @@
+import os
+import random
+
+import pytest
+
+from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
+
+LOCI = ["A", "B", "C", "DQB1", "DRB1"]
+ALLELES_PER_LOCUS = 6
+
+
+def _genotype(rng: random.Random, pools) -> str:
+    return "^".join("+".join(f"{locus}*{rng.choice(pools[locus])}" for _ in range(2)) for locus in LOCI)
+
+
+def write_imputation(path, ids, seed: int):
+    """
+    Write a synthetic imputation file: 1-5 genotypes for each ID, from a small pool of alleles per locus.
+    The pool is the same in all the files, so the patients and the donors share alleles.
+    """
+    pools_rng = random.Random(0)
+    pools = {locus: [f"{pools_rng.randint(1, 40):02d}:{pools_rng.randint(1, 20):02d}"
+                     for _ in range(ALLELES_PER_LOCUS)] for locus in LOCI}
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in ids:
+            k = rng.choice([1, 1, 2, 3, 5])
+            probabilities = [rng.random() for _ in range(k)]
+            for j in range(k):
+                f.write(f"{i},{_genotype(rng, pools)},{probabilities[j]:.6f},{j}\n")
+
+
+@pytest.fixture(scope="session")
+def donors_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("donors")
+    write_imputation(directory / "donors_1.txt", range(0, 600), seed=1)
+    write_imputation(directory / "donors_2.txt", range(600, 1200), seed=2)
+    return directory
+
+
+@pytest.fixture(scope="session")
+def patients_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("patients") / "patients.txt"
+    write_imputation(path, range(1, 31), seed=3)
+    return path
+
+
+@pytest.fixture(scope="session")
+def donors_graph(donors_dir):
+    return BuildMatchingGraph(str(donors_dir)).graph
+
+
+def _sorted_matches(results_df):
+    # matches with the same number of mismatches and score are in no particular order
+    return results_df.sort_values(["Number_Of_Mismatches", "Matching_Probability", "Donor_ID"],
+                                  ascending=[True, False, True]).reset_index(drop=True)
+
+
+def assert_same_results(results, expected):
+    """assert two find_matches results are equal, patient by patient"""
+    import pandas as pd
+
+    assert list(results) == list(expected)
+    for patient, results_df in results.items():
+        pd.testing.assert_frame_equal(_sorted_matches(results_df), _sorted_matches(expected[patient]),
+                                      check_dtype=False)
+
+
+@pytest.fixture(autouse=True)
+def _in_tmp_path(tmp_path, monkeypatch):
+    """run each test in its own directory (find_matches writes some outputs to the working directory)"""
+    monkeypatch.chdir(tmp_path)
+    yield
+    assert os.getcwd() == str(tmp_path)
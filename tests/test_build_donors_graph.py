@@ -0,0 +1,168 @@
+import functools
+import itertools
+import os
+import shutil
+import pickle
+import subprocess
+import sys
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+import grma.donorsgraph.build_donors_graph
+import grma.utilities.imputation_reader
+from grma.donorsgraph.build_donors_graph import CLASS_I_END, BuildMatchingGraph, class_subclasses
+from grma.donorsgraph.external_build import EDGE_MEMORY_BYTES, ExternalGraphBuilder, build_graph_directory
+from grma.match import Graph, find_matches
+from grma.utilities.geno_representation import HashableArray
+from grma.utilities.imputation_reader import COMPRESSED_OPENERS, read_imputation_file
+from tests.conftest import assert_same_results
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+
+
+def _subclasses_genotypes(donors_dir):
+    """{subclass: set of the genotypes (as tuples) of its classes}, from the donors' files"""
+    subclasses = defaultdict(set)
+    for filename in os.listdir(donors_dir):
+        for block in read_imputation_file(os.path.join(donors_dir, filename)):
+            for geno in block.genotypes:
+                geno = HashableArray(geno)
+                for class_ in (tuple(geno[:CLASS_I_END]), tuple(geno[CLASS_I_END:])):
+                    for subclass in class_subclasses(class_):
+                        subclasses[subclass].add(tuple(geno.np().tolist()))
+    return subclasses
+
+
+def test_neighbors_2nd_returns_every_genotype_of_subclass(donors_dir, donors_graph):
+    subclasses = _subclasses_genotypes(donors_dir)
+    assert subclasses
+    for subclass, genotypes in subclasses.items():
+        ids, values = donors_graph.neighbors_2nd(subclass)
+        assert sorted(map(tuple, values.tolist())) == sorted(genotypes)
+        assert len(ids) == donors_graph.degree_2nd(subclass)
+        assert [tuple(np.asarray(donors_graph.node_value_from_id(geno_id)).tolist()) for geno_id in ids] == \
+            list(map(tuple, values.tolist()))
+
+
+def _assert_same_graph(lol_properties: dict, expected: dict):
+    assert lol_properties.keys() == expected.keys()
+    for name, value in expected.items():
+        if isinstance(value, np.ndarray):
+            assert lol_properties[name].dtype == value.dtype
+            np.testing.assert_array_equal(lol_properties[name], value, err_msg=name)
+        else:
+            assert lol_properties[name] == value, name
+    assert list(lol_properties["map_node_to_number"].items()) == list(expected["map_node_to_number"].items())
+
+
+def test_builds_are_reproducible(tmp_path, donors_dir, donors_graph, patients_file):
+    # the other build is in another process, with another seed of python's hash
+    path = tmp_path / "donors_graph.pkl"
+    code = "import sys; from grma.donorsgraph.build_donors_graph import BuildMatchingGraph; " \
+           "BuildMatchingGraph(sys.argv[1]).to_pickle(sys.argv[2])"
+    subprocess.run([sys.executable, "-c", code, str(donors_dir), str(path)], check=True, cwd=REPOSITORY,
+                   env={**os.environ, "PYTHONHASHSEED": "1234", "PYTHONPATH": REPOSITORY})
+
+    built = BuildMatchingGraph(str(donors_dir))._graph
+    with open(path, "rb") as f:
+        rebuilt = pickle.load(f)
+    _assert_same_graph(rebuilt, built)
+
+    results = find_matches(str(patients_file), Graph(rebuilt), threshold=0.01)
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0.01))
+
+
+def _with_donors_lists(lol_properties: dict) -> dict:
+    """
+    the arrays of a graph with the genotypes of each donor in the donor's own list, as the graphs were built before
+    the donors' edges were stored only in the genotypes' lists (donor_index_list and donor_edges)
+    """
+    index_list, donor_index_list = lol_properties["index_list"], lol_properties["donor_index_list"]
+    donor_edges = lol_properties["donor_edges"]
+    num_donors = len(donor_index_list) - 1
+    assert not index_list[num_donors]  # the donors' lists are empty
+
+    properties = {name: value for name, value in lol_properties.items()
+                  if name not in ("donor_index_list", "donor_edges", "content_hash")}
+    properties["index_list"] = np.concatenate([donor_index_list, index_list[num_donors + 1:] + len(donor_edges)])
+    geno_ids = np.searchsorted(index_list, donor_edges, side="right") - 1
+    properties["neighbors_list"] = np.concatenate([geno_ids, lol_properties["neighbors_list"]]).astype(np.uint32)
+    properties["weights_list"] = np.concatenate([lol_properties["weights_list"][donor_edges],
+                                                 lol_properties["weights_list"]])
+    return properties
+
+
+def test_transposed_donors_edges_match_donors_lists(donors_dir, donors_graph, patients_file):
+    graph = Graph(_with_donors_lists(BuildMatchingGraph(str(donors_dir))._graph))
+    for donor, genotypes in donors_graph.iter_donors():
+        assert {HashableArray(np.asarray(geno)): weight for geno, weight in graph.neighbors(donor)} == \
+            pytest.approx(genotypes, rel=1e-6)
+
+    results = find_matches(str(patients_file), graph, threshold=0, cutof=CUTOF)
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0, cutof=CUTOF))
+
+
+def test_profiles_match_node_per_donor(tmp_path, monkeypatch, donors_dir, patients_file):
+    # copies of the first donors, with the same genotypes distributions
+    directory = tmp_path / "donors"
+    directory.mkdir()
+    for path in sorted(donors_dir.iterdir()):
+        (directory / path.name).write_text(path.read_text())
+    copies = [line for line in open(donors_dir / "donors_1.txt") if int(line.split(",", 1)[0]) < 100]
+    (directory / "donors_copies.txt").write_text("".join(f"{int(line.split(',', 1)[0]) + 10000},"
+                                                         f"{line.split(',', 1)[1]}" for line in copies))
+
+    profiles_graph = BuildMatchingGraph(str(directory)).graph
+    assert profiles_graph.donors_of(profiles_graph.get_node_id(5)) == [5, 10005]
+
+    # each donor gets its own profile, and its own node
+    profile_keys = itertools.count()
+    monkeypatch.setattr(grma.donorsgraph.build_donors_graph, "donor_profile_key", lambda *_: next(profile_keys))
+    graph = BuildMatchingGraph(str(directory)).graph
+    assert graph.donors_of(graph.get_node_id(10005)) == [10005]
+
+    results = find_matches(str(patients_file), profiles_graph, threshold=0, cutof=CUTOF)
+    assert any(donor >= 10000 for results_df in results.values() for donor in results_df["Donor_ID"])
+    assert_same_results(results, find_matches(str(patients_file), graph, threshold=0, cutof=CUTOF))
+
+
+@pytest.mark.parametrize("suffix", list(COMPRESSED_OPENERS))
+def test_compressed_donors_files_build_same_graph(tmp_path, donors_dir, suffix):
+    directory = tmp_path / "donors"
+    directory.mkdir()
+    for path in sorted(donors_dir.iterdir()):
+        with open(path, "rb") as f, COMPRESSED_OPENERS[suffix](directory / (path.name + suffix), "wb") as compressed:
+            shutil.copyfileobj(f, compressed)
+
+    _assert_same_graph(BuildMatchingGraph(str(directory))._graph, BuildMatchingGraph(str(donors_dir))._graph)
+
+
+def test_external_build_matches_build(tmp_path, monkeypatch, donors_dir, donors_graph, patients_file):
+    runs = []
+    flush = ExternalGraphBuilder._flush
+
+    def counted_flush(self):
+        flush(self)
+        runs[:] = self._runs
+
+    monkeypatch.setattr(ExternalGraphBuilder, "_flush", counted_flush)
+    # small blocks, so the lines of donors are split between blocks, and a budget of 100 edges,
+    # so the edges are spilled to many runs
+    monkeypatch.setattr(grma.utilities.imputation_reader, "read_imputation_blocks",
+                        functools.partial(grma.utilities.imputation_reader.read_imputation_blocks, block_bytes=4096))
+    build_graph_directory(str(donors_dir), tmp_path / "graph", memory_budget=100 * EDGE_MEMORY_BYTES)
+    assert len(runs) > 10
+
+    graph = Graph.from_directory(tmp_path / "graph")
+    expected = BuildMatchingGraph(str(donors_dir))._graph
+    for name, value in expected.items():
+        if isinstance(value, np.ndarray):
+            np.testing.assert_array_equal(graph._lol_properties[name], value, err_msg=name)
+    assert graph.content_hash == donors_graph.content_hash
+
+    results = find_matches(str(patients_file), graph, threshold=0, cutof=CUTOF)
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0, cutof=CUTOF))
@@ -0,0 +1,29 @@
+import pytest
+
+from grma.match import DonorsDelta, Graph, find_matches, rescore
+from tests.conftest import assert_same_results
+
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+
+
+@pytest.fixture(scope="module")
+def candidates_path(tmp_path_factory, patients_file, donors_graph):
+    path = tmp_path_factory.mktemp("candidates") / "candidates.npz"
+    find_matches(str(patients_file), donors_graph, threshold=0.1, save_candidates=path)
+    return path
+
+
+@pytest.mark.parametrize("threshold, cutof", [(0, CUTOF), (0.01, CUTOF), (0.2, CUTOF), (0.01, 10)])
+def test_rescore_matches_find_matches(candidates_path, patients_file, donors_graph, threshold, cutof):
+    results = rescore(candidates_path, donors_graph, threshold=threshold, cutof=cutof)
+    expected = find_matches(str(patients_file), donors_graph, threshold=threshold, cutof=cutof)
+    assert any(len(results_df) for results_df in expected.values())
+    assert_same_results(results, expected)
+
+
+def test_rescore_in_another_graph_fails(candidates_path, donors_graph):
+    graph = Graph(donors_graph._lol_properties)
+    graph.apply_delta(DonorsDelta(removed=[1]))
+    with pytest.raises(ValueError, match="another graph"):
+        rescore(candidates_path, graph)
@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
+from grma.match import find_matches
+from grma.match.match import merge_graphs_results
+from tests.conftest import assert_same_results
+
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+
+
+@pytest.fixture(scope="module")
+def registries(tmp_path_factory, donors_dir):
+    """a graph of each of the donors' files"""
+    graphs = {}
+    for path in sorted(donors_dir.iterdir()):
+        directory = tmp_path_factory.mktemp(path.stem)
+        (directory / path.name).write_text(path.read_text())
+        graphs[path.stem] = BuildMatchingGraph(str(directory)).graph
+    return graphs
+
+
+def _results(donors, mismatches, probabilities):
+    return pd.DataFrame({"Patient_ID": 1, "Donor_ID": donors, "Number_Of_Mismatches": mismatches,
+                         "Matching_Probability": probabilities})
+
+
+def test_merge_order():
+    merged = merge_graphs_results([("a", _results([1, 2, 3], [0, 1, 1], [0.5, 0.9, 0.4])),
+                                   ("b", _results([4, 5, 6], [0, 0, 2], [0.7, 0.2, 1.]))], cutof=4)
+
+    assert list(merged.columns) == ["Patient_ID", "Donor_ID", "Graph", "Number_Of_Mismatches",
+                                    "Matching_Probability"]
+    # fewer mismatches first, then by the score, and cutof is applied to the merged matches
+    assert list(merged["Donor_ID"]) == [4, 1, 5, 2]
+    assert list(merged["Graph"]) == ["b", "a", "b", "a"]
+
+
+def test_graphs_match_single_graph(registries, patients_file, donors_graph):
+    results = find_matches(str(patients_file), registries, threshold=0.01, cutof=CUTOF)
+    expected = find_matches(str(patients_file), donors_graph, threshold=0.01, cutof=CUTOF)
+
+    for patient, results_df in results.items():
+        donors_files = {int(donor): "donors_1" if donor < 600 else "donors_2" for donor in results_df["Donor_ID"]}
+        assert list(results_df["Graph"]) == [donors_files[int(donor)] for donor in results_df["Donor_ID"]]
+        scores = results_df[["Number_Of_Mismatches", "Matching_Probability"]].to_records(index=False).tolist()
+        assert scores == sorted(scores, key=lambda score: (score[0], -score[1]))
+    assert_same_results({patient: results_df.drop(columns="Graph") for patient, results_df in results.items()},
+                        expected)
+
+
+def test_cutof_is_applied_after_merge(registries, patients_file):
+    results = find_matches(str(patients_file), registries, threshold=0.01, cutof=10)
+    all_results = find_matches(str(patients_file), registries, threshold=0.01, cutof=CUTOF)
+
+    assert any(len(results_df) > 10 for results_df in all_results.values())
+    for patient, results_df in results.items():
+        assert len(results_df) == min(10, len(all_results[patient]))
+        # the best matches of all the graphs (matches with equal scores might be of either graph)
+        columns = ["Number_Of_Mismatches", "Matching_Probability"]
+        pd.testing.assert_frame_equal(results_df[columns], all_results[patient][columns].head(10))
+    assert any(len(set(results_df["Graph"])) > 1 for results_df in results.values())
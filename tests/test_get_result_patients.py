@@ -0,0 +1,56 @@
+import importlib
+import json
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
+from grma.match import find_matches
+from grma.match.parallel import iter_patients_records
+from tests.conftest import assert_same_results
+
+GRMA_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "grma")
+
+
+@pytest.fixture
+def grma_main(monkeypatch):
+    # the script imports the packages of grma as top-level packages, as when it is run from its directory
+    monkeypatch.syspath_prepend(GRMA_DIRECTORY)
+    return importlib.import_module("grma_main")
+
+
+def test_get_result_patients(tmp_path, monkeypatch, grma_main, donors_dir, patients_file, donors_graph):
+    # the patients get new IDs by their order in grim's output: the last patient of the file is the first
+    records = list(iter_patients_records(str(patients_file)))[::-1]
+    imputation = "".join(f"PAT{patient}{line[line.index(','):]}" for patient, lines in records for line in lines)
+
+    def run_grim_stub(config_path, build_grim_graph=True):
+        # writes the imputation of the patients, as grim would
+        os.makedirs("output", exist_ok=True)
+        with open("output/imputation.csv", "w") as f:
+            f.write(imputation)
+
+    monkeypatch.setattr(grma_main, "run_grim", run_grim_stub)
+    conf = {"imuptation_out_path": "output/", "imputation_out_umug_freq_filename": "imputation.csv"}
+    (tmp_path / "conf.json").write_text(json.dumps(conf))
+    BuildMatchingGraph(str(donors_dir)).to_pickle(str(tmp_path / "donors_graph.pkl"))
+
+    grma_main.GetResultPatients(str(tmp_path / "conf.json"), str(tmp_path / "donors_graph.pkl"), "result_dir",
+                                threshold=0.01)
+
+    with open("new_patient_ids_for_D4.pkl", "rb") as f:
+        new_patient_ids = pickle.load(f)
+    assert new_patient_ids == {f"PAT{patient}": i for i, (patient, _) in enumerate(records, start=1)}
+    assert sorted(os.listdir("result_dir")) == sorted(f"{i}.csv" for i in new_patient_ids.values())
+
+    expected = find_matches(str(patients_file), donors_graph, threshold=0.01)
+    for patient, _ in records:
+        new_id = new_patient_ids[f"PAT{patient}"]
+        results_df = pd.read_csv(os.path.join("result_dir", f"{new_id}.csv"))
+        expected_df = expected[patient].reset_index(drop=True).assign(Patient_ID=float(new_id))
+        if expected_df.empty:
+            assert results_df.empty and list(results_df.columns) == list(expected_df.columns)
+        else:
+            assert_same_results({new_id: results_df}, {new_id: expected_df})
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+
+from grma.match import find_matches
+from grma.match.graph_compression import QUANTIZED_WEIGHT_SCALE
+from tests.conftest import assert_same_results
+
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+# a quantized weight is off by up to 1 / (2 * QUANTIZED_WEIGHT_SCALE), and the probability of a match sums
+# the weights of a donor's genotypes (up to 5 in the test donors), times the patient's probabilities (which sum to 1).
+# The probabilities are in percents, and the probabilities of the alleles are rounded (so they might be off by 1).
+QUANTIZED_TOLERANCE = 100 * 5 / (2 * QUANTIZED_WEIGHT_SCALE)
+
+
+def test_compressed_graph_matches_graph(donors_graph, patients_file):
+    compressed = donors_graph.compress()
+    results = find_matches(str(patients_file), compressed, threshold=0, cutof=CUTOF)
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0, cutof=CUTOF))
+
+
+def test_quantized_graph_matches_graph_within_tolerance(donors_graph, patients_file):
+    quantized = donors_graph.compress(quantize=True)
+    results = find_matches(str(patients_file), quantized, threshold=0, cutof=CUTOF)
+    expected = find_matches(str(patients_file), donors_graph, threshold=0, cutof=CUTOF)
+
+    assert list(results) == list(expected)
+    for patient, results_df in results.items():
+        results_df = results_df.sort_values("Donor_ID").reset_index(drop=True)
+        expected_df = expected[patient].sort_values("Donor_ID").reset_index(drop=True)
+        alleles = [column for column in expected_df.columns if column.startswith("Match_Probability_")]
+        probabilities = ["Matching_Probability"] + alleles
+        pd.testing.assert_frame_equal(results_df.drop(columns=probabilities),
+                                      expected_df.drop(columns=probabilities), check_dtype=False)
+        np.testing.assert_allclose(results_df["Matching_Probability"].to_numpy(float),
+                                   expected_df["Matching_Probability"].to_numpy(float), rtol=0,
+                                   atol=QUANTIZED_TOLERANCE)
+        np.testing.assert_allclose(results_df[alleles].to_numpy(float), expected_df[alleles].to_numpy(float),
+                                   rtol=0, atol=1)
@@ -0,0 +1,69 @@
+import pytest
+
+from grma.donorsgraph.build_donors_graph import BuildMatchingGraph
+from grma.match import DonorsDelta, find_matches
+from tests.conftest import assert_same_results, write_imputation
+
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+REMOVED = range(0, 40)
+REIMPUTED = range(600, 640)
+ADDED = range(5000, 5060)
+
+
+@pytest.fixture(scope="module")
+def delta_files(tmp_path_factory, donors_dir):
+    """the files of a delta, and a donors' directory with the donors after the delta"""
+    directory = tmp_path_factory.mktemp("delta")
+    (directory / "removed.txt").write_text("".join(f"{donor}\n" for donor in REMOVED))
+    write_imputation(directory / "added.txt", list(REIMPUTED) + list(ADDED), seed=4)
+
+    changed = {str(donor) for donor in REMOVED} | {str(donor) for donor in REIMPUTED}
+    rebuilt_dir = directory / "donors"
+    rebuilt_dir.mkdir()
+    for path in sorted(donors_dir.iterdir()):
+        (rebuilt_dir / path.name).write_text("".join(line for line in open(path)
+                                                     if line.split(",", 1)[0] not in changed))
+    (rebuilt_dir / "donors_3.txt").write_text((directory / "added.txt").read_text())
+    return directory, rebuilt_dir
+
+
+@pytest.fixture(scope="module")
+def rebuilt_results(delta_files, patients_file):
+    graph = BuildMatchingGraph(str(delta_files[1])).graph
+    return find_matches(str(patients_file), graph, threshold=0.01, cutof=CUTOF)
+
+
+@pytest.fixture
+def graph_with_delta(donors_dir, delta_files):
+    graph = BuildMatchingGraph(str(donors_dir)).graph
+    content_hash = graph.content_hash
+    graph.apply_delta(DonorsDelta.from_files(delta_files[0] / "added.txt", delta_files[0] / "removed.txt"))
+    assert graph.content_hash != content_hash
+    return graph
+
+
+def test_delta_matches_rebuild(graph_with_delta, patients_file, rebuilt_results):
+    results = find_matches(str(patients_file), graph_with_delta, threshold=0.01, cutof=CUTOF)
+    assert_same_results(results, rebuilt_results)
+
+
+def test_compacted_graph_matches_rebuild(graph_with_delta, patients_file, rebuilt_results):
+    compacted = graph_with_delta.compact()
+    assert not compacted.deltas
+    assert_same_results(find_matches(str(patients_file), compacted, threshold=0.01, cutof=CUTOF), rebuilt_results)
+
+    compacted = graph_with_delta.compact_in_background().result(timeout=120)
+    assert_same_results(find_matches(str(patients_file), compacted, threshold=0.01, cutof=CUTOF), rebuilt_results)
+
+
+def test_delta_changes_content_hash(donors_graph):
+    content_hash = donors_graph.content_hash
+    graph = BuildMatchingGraph.from_donors(donors_graph.iter_donors()).graph
+    assert graph.content_hash == content_hash
+
+    graph.apply_delta(DonorsDelta(removed=[1]))
+    with_removed = graph.content_hash
+    assert with_removed != content_hash
+    graph.apply_delta(DonorsDelta(removed=[2]))
+    assert graph.content_hash not in (content_hash, with_removed)
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from grma.match import GraphHandle, find_matches
+from grma.match.result_writer import read_results
+
+
+@pytest.mark.parametrize("save_results", ["results.csv", "results.bin"])
+def test_saved_results_have_graph_version(patients_file, donors_graph, save_results):
+    handle = GraphHandle(donors_graph, version="v1")
+    results = find_matches(str(patients_file), handle, threshold=0.01, save_results=save_results)
+
+    saved = read_results(save_results)
+    assert list(saved.columns) == list(next(iter(results.values())).columns)
+    assert set(saved["Graph_Version"]) == {"v1"}
+    assert len(saved) == sum(len(results_df) for results_df in results.values())
+
+
+def test_saved_results_have_version_of_each_graph(patients_file, donors_graph):
+    graphs = {"a": GraphHandle(donors_graph, version="v1"), "b": donors_graph}
+    results = find_matches(str(patients_file), graphs, threshold=0.01, save_results="results.csv")
+
+    saved = read_results("results.csv")
+    assert set(saved["Graph"]) == {"a", "b"}
+    assert (saved["Graph_Version"] == saved["Graph"].map({"a": "v1", "b": donors_graph.content_hash})).all()
+    assert list(saved["Graph_Version"]) == list(pd.concat(results.values())["Graph_Version"])
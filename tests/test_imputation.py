@@ -0,0 +1,106 @@
+import functools
+import json
+
+import grim
+import grim.grim
+import numpy as np
+import pytest
+
+from grma.match import find_matches
+from grma.match.imputation import GRIM_GRAPH_FILES_FIELDS, build_grim_graph, check_grim_version, \
+    imputation_block, iter_grim_input
+from grma.match.match import matching
+from grma.match.parallel import iter_patients_records
+from grma.match.pipeline import pipelined_matching
+from grma.utilities.imputation_reader import parse_imputation_lines
+from tests.conftest import assert_same_results
+
+
+class StubImputer(object):
+    """An imputer (see GrimImputer) that returns the lines of the patients in a ready imputation file"""
+
+    def __init__(self, imputation_path, input_file):
+        self._records = {str(patient): lines for patient, lines in iter_patients_records(str(imputation_path))}
+        self.input_file = str(input_file)
+
+    def impute(self, patients=None, save_to=None):
+        text = "".join(line for subject_id, _, _, _ in iter_grim_input(patients or self.input_file)
+                       for line in self._records[subject_id])  # the lines of the file end with a newline
+        if save_to is not None:
+            save_to.write(text)
+        return parse_imputation_lines(text)
+
+
+def _grim_input(tmp_path, patients_file):
+    path = tmp_path / "patients_input.txt"
+    path.write_text("".join(f"{patient},A*01:01+A*02:01\n" for patient, _ in iter_patients_records(str(patients_file))))
+    return path
+
+
+def test_matching_with_imputer(tmp_path, patients_file, donors_graph):
+    imputer = StubImputer(patients_file, _grim_input(tmp_path, patients_file))
+    results = matching(donors_graph, imputer=imputer, threshold=0.01)
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0.01))
+
+
+def test_pipelined_matching_with_imputer_factory(tmp_path, patients_file, donors_graph):
+    imputer_factory = functools.partial(StubImputer, patients_file, _grim_input(tmp_path, patients_file))
+    results = pipelined_matching(donors_graph, imputer_factory=imputer_factory, batch_size=7, threshold=0.01,
+                                 save_imputation=tmp_path / "imputation.txt")
+
+    assert_same_results(results, find_matches(str(patients_file), donors_graph, threshold=0.01))
+    assert (tmp_path / "imputation.txt").read_text() == patients_file.read_text()
+
+
+def test_imputation_block_is_parsed_lines(patients_file):
+    subjects = [(str(patient), [(line.split(",")[1], float(line.split(",")[2])) for line in lines])
+                for patient, lines in iter_patients_records(str(patients_file))]
+    block = imputation_block(subjects)
+    expected = parse_imputation_lines(patients_file.read_text())
+    for field in block._fields:
+        np.testing.assert_array_equal(getattr(block, field), getattr(expected, field))
+        assert getattr(block, field).dtype == getattr(expected, field).dtype
+
+
+def test_unsupported_grim_version_fails(monkeypatch):
+    check_grim_version()
+    monkeypatch.setattr(grim, "__version__", "0.0.1")
+    with pytest.raises(RuntimeError, match="0.0.1"):
+        check_grim_version()
+
+
+def test_grim_graph_is_rebuilt_only_when_its_input_changes(tmp_path, monkeypatch, capsys):
+    builds = []
+
+    def graph_freqs(config_file_path):
+        # writes the graph files, as grim would
+        builds.append(config_file_path)
+        for field in GRIM_GRAPH_FILES_FIELDS:
+            (tmp_path / "graph" / conf[field]).write_text("graph")
+
+    monkeypatch.setattr(grim.grim, "graph_freqs", graph_freqs)
+    (tmp_path / "graph").mkdir()
+    (tmp_path / "freqs.csv").write_text("A*01:01~B*08:01,CAU,0.1\n")
+    conf = {"freq_file": str(tmp_path / "freqs.csv"), "graph_files_path": str(tmp_path / "graph"),
+            "populations": ["CAU"], **{field: f"{field}.csv" for field in GRIM_GRAPH_FILES_FIELDS}}
+    (tmp_path / "conf.json").write_text(json.dumps(conf))
+
+    build_grim_graph(tmp_path / "conf.json", conf)
+    assert len(builds) == 1
+    build_grim_graph(tmp_path / "conf.json", conf)
+    assert len(builds) == 1
+    assert "Reusing" not in capsys.readouterr().out  # only printed when verbose
+    build_grim_graph(tmp_path / "conf.json", conf, verbose=True)
+    assert len(builds) == 1 and "Reusing" in capsys.readouterr().out
+
+    (tmp_path / "freqs.csv").write_text("A*01:01~B*08:01,CAU,0.2\n")
+    build_grim_graph(tmp_path / "conf.json", conf)
+    assert len(builds) == 2
+    build_grim_graph(tmp_path / "conf.json", conf)
+    assert len(builds) == 2
+
+    conf["populations"] = ["CAU", "AFA"]
+    build_grim_graph(tmp_path / "conf.json", conf)
+    assert len(builds) == 3
+    build_grim_graph(tmp_path / "conf.json", conf, reuse_graph=False)
+    assert len(builds) == 4
@@ -0,0 +1,90 @@
+import os
+
+import numpy as np
+import pytest
+
+import grma.utilities.imputation_reader
+from grma.utilities.imputation_reader import parse_imputation_lines, read_imputation_file
+from grma.utilities.utils import gl_string_to_integers
+
+GENOTYPE = "A*02:01+A*01:01^B*08:01+B*07:02^C*07:01+C*07:02^DQB1*02:01+DQB1*06:02^DRB1*03:01+DRB1*15:01"
+# lines in the forms grim writes: long and null alleles, an exponent, and windows line ends
+EDGE_LINES = [f"5,{GENOTYPE.replace('A*01:01', 'A*01:01:01')},0.25,3\r\n",
+              f"5,{GENOTYPE.replace('A*02:01', 'A*02:01N')},1e-3,4\n",
+              f"12,{GENOTYPE},0.5,0\n"]
+MALFORMED_LINES = ["5,A*01:01+A*02:01,0.5,0",  # missing loci
+                   "5,not_a_gl,0.5,0",
+                   f"abc,{GENOTYPE},0.5,0",
+                   f"5,{GENOTYPE},x,0",
+                   f"5,{GENOTYPE},0.5",
+                   f"5,{GENOTYPE},0.5,0,7"]
+
+
+def _expected_block(lines):
+    """the fields of the lines, parsed with gl_string_to_integers (the alleles of each locus are sorted)"""
+    rows = [line.strip().split(",") for line in lines if line.strip()]
+    genotypes = np.array([gl_string_to_integers(gl_string) for _, gl_string, _, _ in rows], dtype=np.uint16)
+    genotypes.reshape(-1, 5, 2).sort(axis=2)
+    return (np.array([int(row[0]) for row in rows], dtype=np.int64), genotypes,
+            np.array([float(row[2]) for row in rows]), np.array([int(row[3]) for row in rows], dtype=np.int64))
+
+
+def _assert_block(block, expected):
+    for array, expected_array in zip(block, expected):
+        np.testing.assert_array_equal(array, expected_array)
+        assert array.dtype == expected_array.dtype
+
+
+def test_parser_matches_gl_string_to_integers(donors_dir):
+    lines = open(donors_dir / "donors_1.txt").readlines() + EDGE_LINES
+    _assert_block(parse_imputation_lines("".join(lines)), _expected_block(lines))
+    _assert_block(parse_imputation_lines(lines), _expected_block(lines))
+
+
+@pytest.mark.parametrize("line", MALFORMED_LINES)
+def test_malformed_line_raises(line):
+    with pytest.raises(ValueError, match="Malformed"):
+        parse_imputation_lines(f"12,{GENOTYPE},0.5,0\n{line}\n")
+
+
+def _concatenated(blocks):
+    return [np.concatenate(arrays) for arrays in zip(*blocks)]
+
+
+def test_cache_is_invalidated_when_source_changes(tmp_path, monkeypatch, donors_dir):
+    path = tmp_path / "donors.txt"
+    path.write_text((donors_dir / "donors_1.txt").read_text())
+    parsed_blocks = []
+    read_imputation_blocks = grma.utilities.imputation_reader.read_imputation_blocks
+
+    def counted_read_imputation_blocks(*args, **kwargs):
+        parsed_blocks.append(args[0])
+        return read_imputation_blocks(*args, **kwargs)
+
+    monkeypatch.setattr(grma.utilities.imputation_reader, "read_imputation_blocks", counted_read_imputation_blocks)
+
+    def read():
+        block = _concatenated(read_imputation_file(path, tmp_path / "cache"))
+        _assert_block(block, _expected_block(open(path).readlines()))
+
+    read()
+    assert len(parsed_blocks) == 1 and (tmp_path / "cache" / "donors.txt.npz").is_file()
+    read()
+    assert len(parsed_blocks) == 1  # loaded from the cache
+
+    # the same size, another modification time
+    path.write_text(path.read_text().replace("0.", "1.", 1))
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    read()
+    assert len(parsed_blocks) == 2
+    read()
+    assert len(parsed_blocks) == 2
+
+    # another size, the same modification time
+    stat = os.stat(path)
+    with open(path, "a") as f:
+        f.write(f"12,{GENOTYPE},0.5,0\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    read()
+    assert len(parsed_blocks) == 3
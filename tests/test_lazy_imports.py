@@ -0,0 +1,25 @@
+import json
+import os
+import subprocess
+import sys
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ("pandas", "networkx", "grim")
+
+
+def _imported_packages(code: str) -> list:
+    """the heavy packages in sys.modules after running code in a new interpreter"""
+    code += "; import json, sys; " \
+            f"print(json.dumps(sorted({{m.split('.')[0] for m in sys.modules}} & set({HEAVY_PACKAGES!r}))))"
+    output = subprocess.run([sys.executable, "-c", code], check=True, cwd=REPOSITORY, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": REPOSITORY}).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def test_graph_import_is_light():
+    assert _imported_packages("from grma.match import Graph, GraphHandle") == []
+
+
+def test_matching_functions_are_imported_on_use():
+    imported = _imported_packages("from grma.match import find_matches")
+    assert "pandas" in imported and "grim" not in imported  # grim is imported only for the imputation
@@ -0,0 +1,125 @@
+import os
+import threading
+
+import pandas as pd
+import pytest
+from tqdm import tqdm
+
+import grma.match.match
+from grma.match import MatchingError, find_matches
+from grma.match.parallel import _deduplicate, _fan_out, iter_patients_records
+from tests.conftest import assert_same_results
+
+BAD_LINE = "999999,not_a_gl,0.5,0\n"
+
+
+@pytest.fixture(scope="module")
+def serial_results(patients_file, donors_graph):
+    return find_matches(str(patients_file), donors_graph, threshold=0.01)
+
+
+def test_workers_match_serial(patients_file, donors_graph, serial_results):
+    results = find_matches(str(patients_file), donors_graph, threshold=0.01, workers=2)
+    assert_same_results(results, serial_results)
+
+
+def test_workers_forked_while_tqdm_is_locked(patients_file, donors_graph, serial_results):
+    # as when tqdm's monitor thread holds the lock while the workers are forked
+    locked, release = threading.Event(), threading.Event()
+
+    def hold_lock():
+        with tqdm.get_lock():
+            locked.set()
+            release.wait()
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait()
+    try:
+        results = find_matches(str(patients_file), donors_graph, threshold=0.01, workers=2)
+    finally:
+        release.set()
+        holder.join()
+    assert_same_results(results, serial_results)
+
+
+def test_malformed_patient_fails_alone(tmp_path, patients_file, donors_graph, serial_results):
+    lines = open(patients_file).readlines()
+    path = tmp_path / "patients_with_bad_line.txt"
+    path.write_text("".join(lines[:5] + [BAD_LINE] + lines[5:]))
+
+    # chunk the patients with the bad one, so the batch falls back to one patient at a time
+    with pytest.raises(MatchingError) as error:
+        find_matches(str(path), donors_graph, threshold=0.01, workers=2)
+
+    assert error.value.failed_patients == [999999]
+    assert_same_results(error.value.results, serial_results)
+
+
+def test_killed_worker_fails_only_its_patient(monkeypatch, patients_file, donors_graph, serial_results):
+    killer = list(serial_results)[3]
+    search_in_levels = grma.match.match.search_in_levels
+
+    def search_or_die(patient_id, *args, **kwargs):
+        if patient_id == killer:
+            os._exit(1)  # the worker process dies, and the pool is broken
+        return search_in_levels(patient_id, *args, **kwargs)
+
+    # the workers are forked, so they inherit the patched function
+    monkeypatch.setattr(grma.match.match, "search_in_levels", search_or_die)
+    with pytest.raises(MatchingError) as error:
+        find_matches(str(patients_file), donors_graph, threshold=0.01, workers=2)
+
+    assert error.value.failed_patients == [killer]
+    expected = dict(serial_results)
+    expected.pop(killer)
+    assert_same_results(error.value.results, expected)
+
+
+def _with_duplicates(path, patients_file):
+    """a copy of the patients file with duplicates of some patients (patient + 1000) between the patients"""
+    records = list(iter_patients_records(str(patients_file)))
+    lines = []
+    for i, (patient, patient_lines) in enumerate(records):
+        lines.extend(patient_lines)
+        if i % 3 == 0:
+            duplicate = records[i // 2]
+            lines.extend(f"{duplicate[0] + 1000}{line[line.index(','):]}" for line in duplicate[1])
+    path.write_text("".join(lines))
+    return path
+
+
+def test_duplicates_fan_out():
+    records = [(1, ["a"]), (2, ["b"]), (3, ["a"]), (4, ["c"]), (5, ["b"]), (6, ["a"])]
+    unique = [(1, ["a"]), (2, ["b"]), (4, ["c"])]
+    duplicates = {2: 1, 4: 2, 5: 1}
+    representative_df = pd.DataFrame({"Patient_ID": [1, 1], "Donor_ID": [10, 11]})
+    results = iter([(patient, pd.DataFrame({"Patient_ID": [patient], "Donor_ID": [patient * 10]}), 0.5, None)
+                    if patient != 1 else (1, representative_df, 0.5, None) for patient, _ in unique])
+
+    fanned_out = list(_fan_out(records, duplicates, results))
+    assert [patient for patient, _, _, _ in fanned_out] == [1, 2, 3, 4, 5, 6]
+    for patient, results_df, _, _ in fanned_out:
+        assert list(results_df["Patient_ID"]) == [patient] * len(results_df)
+    results_by_patient = {patient: results_df for patient, results_df, _, _ in fanned_out}
+    assert list(results_by_patient[3]["Donor_ID"]) == list(results_by_patient[6]["Donor_ID"]) == [10, 11]
+    assert list(results_by_patient[5]["Donor_ID"]) == [20]
+
+    # each duplicate gets its own copy
+    results_by_patient[3].loc[:, "Donor_ID"] = 0
+    assert list(results_by_patient[1]["Donor_ID"]) == list(results_by_patient[6]["Donor_ID"]) == [10, 11]
+
+
+def test_workers_with_duplicates_match_serial(tmp_path, patients_file, donors_graph):
+    path = _with_duplicates(tmp_path / "patients_with_duplicates.txt", patients_file)
+    records = list(iter_patients_records(str(path)))
+    unique, duplicates = _deduplicate(records)
+    assert duplicates and len(unique) + len(duplicates) == len(records)
+    assert all(records[i][0] == representative + 1000 for i, representative in duplicates.items())
+
+    results = find_matches(str(path), donors_graph, threshold=0.01, workers=2)
+    expected = find_matches(str(path), donors_graph, threshold=0.01, deduplicate=False)
+    assert_same_results(results, expected)
+    for patient, results_df in results.items():
+        assert list(results_df["Patient_ID"]) == [patient] * len(results_df)
+    assert len({id(results_df) for results_df in results.values()}) == len(results)
@@ -0,0 +1,42 @@
+import os
+
+import pandas as pd
+import pytest
+
+import grma.match.donors_matching
+from grma.match import find_matches
+from grma.match.profiling import COUNTERS, STAGES, MatchingProfiler
+
+
+def test_profiler_report(monkeypatch, patients_file, donors_graph):
+    donors = [donor for donor, _ in donors_graph.iter_donors()]
+    database = pd.DataFrame({"Name": [f"donor {donor}" for donor in donors]}, index=donors)
+    monkeypatch.setattr(grma.match.donors_matching, "DONORS_DB", database)
+
+    profiler = MatchingProfiler(profile_slower_than=0, profile_dir="profiles")
+    results = find_matches(str(patients_file), donors_graph, donors_info=["Name"], threshold=0.01,
+                           save_results="results.csv", profiler=profiler)
+    report = profiler.report()
+
+    # every stage is timed, and every counter is counted
+    assert set(report["stages"]) == set(STAGES)
+    assert set(report["counters"]) == set(COUNTERS)
+    assert report["counters"]["matches"] == sum(len(results_df) for results_df in results.values())
+    assert report["counters"]["candidates_examined"] >= report["counters"]["donors_scored"] > 0
+
+    assert set(report["patients"]) == set(results)
+    for patient, patient_report in report["patients"].items():
+        assert patient_report["counters"].get("matches", 0) == len(results[patient])
+        assert patient_report["seconds"] > 0
+    for stage, seconds in report["stages"].items():
+        assert seconds == pytest.approx(sum(patient_report["stages"].get(stage, 0.)
+                                            for patient_report in report["patients"].values()))
+
+    assert set(report["slow_patients"]) == set(results)
+    assert all(os.path.isfile(path) for path in report["slow_patients"].values())
+    assert list(profiler.to_dataframe().index) == list(report["patients"])
+
+
+def test_profiler_with_workers_fails(patients_file, donors_graph):
+    with pytest.raises(ValueError, match="profiler"):
+        find_matches(str(patients_file), donors_graph, threshold=0.01, workers=2, profiler=MatchingProfiler())
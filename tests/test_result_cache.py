@@ -0,0 +1,101 @@
+import pickle
+
+import pandas as pd
+import pytest
+
+import grma.match.donors_matching
+import grma.match.match
+from grma.match import DonorsDelta, Graph, find_matches
+from grma.match.result_cache import MatchResultCache
+from tests.conftest import assert_same_results
+
+
+@pytest.fixture(scope="module")
+def expected(patients_file, donors_graph):
+    return find_matches(str(patients_file), donors_graph, threshold=0.01)
+
+
+@pytest.fixture
+def no_search(monkeypatch):
+    """make every search of the graph fail, so only the cached patients get results"""
+    def search_in_levels(patient_id, *args, **kwargs):
+        raise AssertionError(f"patient {patient_id} was searched")
+
+    monkeypatch.setattr(grma.match.match, "search_in_levels", search_in_levels)
+
+
+def _other_graph(donors_graph):
+    graph = Graph(donors_graph._lol_properties)
+    graph.apply_delta(DonorsDelta(removed=[donor for donor, _ in donors_graph.iter_donors()][:300]))
+    assert graph.content_hash != donors_graph.content_hash
+    return graph
+
+
+def test_cache_hit(request, patients_file, donors_graph, expected):
+    assert_same_results(find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db"), expected)
+
+    request.getfixturevalue("no_search")
+    assert_same_results(find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db"), expected)
+
+
+def test_graphs_share_cache(request, patients_file, donors_graph, expected):
+    other_graph = _other_graph(donors_graph)
+    other_expected = find_matches(str(patients_file), other_graph, threshold=0.01)
+    find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db")
+    find_matches(str(patients_file), other_graph, threshold=0.01, cache="cache.db")
+
+    request.getfixturevalue("no_search")
+    assert_same_results(find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db"), expected)
+    assert_same_results(find_matches(str(patients_file), other_graph, threshold=0.01, cache="cache.db"),
+                        other_expected)
+
+
+def test_changed_graph_is_searched(patients_file, donors_graph, expected):
+    find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db")
+    other_graph = _other_graph(donors_graph)
+    results = find_matches(str(patients_file), other_graph, threshold=0.01, cache="cache.db")
+
+    assert_same_results(results, find_matches(str(patients_file), other_graph, threshold=0.01))
+    assert any(len(results[patient]) != len(expected[patient]) for patient in expected)
+
+
+def test_drop_other_graphs(patients_file, donors_graph):
+    find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db")
+    with MatchResultCache("cache.db", donors_graph.content_hash) as cache:
+        stored = len(cache)
+    assert stored
+
+    with MatchResultCache("cache.db", "another graph") as cache:
+        assert len(cache) == stored
+    with MatchResultCache("cache.db", "another graph", drop_other_graphs=True) as cache:
+        assert len(cache) == 0
+
+
+def test_least_recently_used_are_evicted(expected):
+    results = [results_df for results_df in expected.values() if len(results_df)][:3]
+    sizes = [len(pickle.dumps(results_df, protocol=pickle.HIGHEST_PROTOCOL)) for results_df in results]
+    with MatchResultCache("cache.db", "graph", max_bytes=sum(sizes) - sizes[1]) as cache:
+        cache.put("patient0", 0.01, 100, results[0])
+        cache.put("patient1", 0.01, 100, results[1])
+        cache.get("patient0", 0.01, 100)  # patient1 is the least recently used
+        cache.put("patient2", 0.01, 100, results[2])
+
+        assert len(cache) == 2
+        assert cache.get("patient1", 0.01, 100) is None
+        pd.testing.assert_frame_equal(cache.get("patient0", 0.01, 100), results[0])
+        pd.testing.assert_frame_equal(cache.get("patient2", 0.01, 100), results[2])
+
+
+def test_donors_info_is_joined_on_hit(request, monkeypatch, patients_file, donors_graph):
+    donors = [donor for donor, _ in donors_graph.iter_donors()]
+    database = pd.DataFrame({"Name": [f"donor {donor}" for donor in donors]}, index=donors)
+    monkeypatch.setattr(grma.match.donors_matching, "DONORS_DB", database)
+    expected = find_matches(str(patients_file), donors_graph, donors_info=["Name"], threshold=0.01)
+    assert any(len(results_df) for results_df in expected.values())
+
+    find_matches(str(patients_file), donors_graph, threshold=0.01, cache="cache.db")  # cached without the info
+    request.getfixturevalue("no_search")
+    results = find_matches(str(patients_file), donors_graph, donors_info=["Name"], threshold=0.01, cache="cache.db")
+    assert_same_results(results, expected)
+    for results_df in results.values():
+        assert list(results_df["Name"]) == [f"donor {int(donor)}" for donor in results_df["Donor_ID"]]
@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from grma.match import find_matches
+from grma.match.result_writer import open_result_writer, read_results
+
+SUFFIXES = [".csv", ".grma"]
+
+
+@pytest.fixture(scope="module")
+def expected(patients_file, donors_graph):
+    return find_matches(str(patients_file), donors_graph, threshold=0.01)
+
+
+def _assert_read_results(path, results_df):
+    read_df = read_results(path)
+    if str(path).endswith(".csv"):
+        # the probabilities are rounded in CSV files
+        results_df = results_df.round(2)
+    pd.testing.assert_frame_equal(read_df, results_df, check_dtype=False, check_index_type=False)
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_results_round_trip(patients_file, donors_graph, expected, suffix):
+    find_matches(str(patients_file), donors_graph, threshold=0.01, save_results=f"results{suffix}")
+    matches = [results_df for results_df in expected.values() if len(results_df)]
+    _assert_read_results(f"results{suffix}", pd.concat(matches))
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_results_without_matches_round_trip(patients_file, donors_graph, suffix):
+    results = find_matches(str(patients_file), donors_graph, threshold=2.0, save_results=f"results{suffix}")
+    assert not any(len(results_df) for results_df in results.values())
+
+    read_df = read_results(f"results{suffix}")
+    assert read_df.empty
+    assert list(read_df.columns) == list(next(iter(results.values())).columns)
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_batch_without_matches_round_trip(expected, suffix):
+    patients = [patient for patient, results_df in expected.items() if len(results_df)][:2]
+    empty_df = expected[patients[0]].iloc[:0]
+    # each batch is written as soon as it has a row, so the last batch has only the patients without matches
+    with open_result_writer(f"results{suffix}", flush_rows=1) as writer:
+        writer.write(1001, empty_df)
+        for patient in patients:
+            writer.write(patient, expected[patient])
+        writer.write(1002, empty_df)
+        writer.write(1003, empty_df)
+
+    _assert_read_results(f"results{suffix}", pd.concat([expected[patient] for patient in patients]))
@@ -0,0 +1,31 @@
+import random
+
+from grma.match.parallel import iter_patients_records
+from grma.match.scheduling import TASK_COST_FRACTION, estimate_patient_cost, longest_job_first_tasks
+
+
+def test_longest_jobs_first():
+    rng = random.Random(0)
+    costs = [rng.choice([1., 10., 100.]) * rng.random() for _ in range(200)] + [1000., 800.]
+    rng.shuffle(costs)
+    tasks = longest_job_first_tasks(costs, workers=4, max_task_size=8)
+
+    assert sorted(i for task in tasks for i in task) == list(range(len(costs)))
+    order = [i for task in tasks for i in task]
+    assert [costs[i] for i in order] == sorted(costs, reverse=True)
+    assert all(len(task) <= 8 for task in tasks)
+    # the expensive patients run alone, and the cheap ones are batched
+    assert tasks[0] == [costs.index(1000.)] and tasks[1] == [costs.index(800.)]
+    assert len(tasks[-1]) > 1
+
+    task_cost_limit = TASK_COST_FRACTION * sum(costs) / 4
+    for task in tasks[:-1]:
+        # a task is closed as soon as it reaches the limit
+        assert len(task) == 8 or sum(costs[i] for i in task) >= task_cost_limit > sum(costs[i] for i in task[:-1])
+
+
+def test_patient_cost_grows_with_genotypes(patients_file, donors_graph):
+    records = dict(iter_patients_records(str(patients_file)))
+    lines = max(records.values(), key=len)
+    assert len(lines) > 1
+    assert estimate_patient_cost(donors_graph, lines[:1]) < estimate_patient_cost(donors_graph, lines)
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import pytest
+
+import grma.match.match
+from grma.match import find_matches
+from grma.match.parallel import iter_patients_records
+from grma.match.server import MatchingClient, MatchingServer
+from tests.conftest import assert_same_results
+
+BAD_LINES = ["999999,not_a_gl,0.5,0"]
+
+
+@pytest.fixture(scope="module")
+def patients_records(patients_file):
+    return list(iter_patients_records(str(patients_file)))[:6]
+
+
+def _serve_clients(server, requests):
+    """send each request from its own client at once, and return the results (or the error) of each request"""
+    async def send(lines, port):
+        client = await MatchingClient.connect(port=port)
+        try:
+            return await client.match(lines, threshold=0.01)
+        except RuntimeError as e:
+            return e
+        finally:
+            await client.close()
+
+    async def main():
+        await server.start(port=0)
+        try:
+            port = server.address[1]
+            return await asyncio.gather(*[send(lines, port) for lines in requests])
+        finally:
+            await server.close()
+
+    return asyncio.run(main())
+
+
+def _check_good_results(responses, patients_records, donors_graph):
+    expected = find_matches([line for _, lines in patients_records for line in lines], donors_graph, threshold=0.01)
+    for (patient, _), response in zip(patients_records, responses):
+        assert_same_results({patient: response[str(patient)]}, {patient: expected[patient]})
+
+
+def test_bad_request_fails_alone(patients_records, donors_graph):
+    server = MatchingServer(donors_graph, max_batch_delay=0.5)
+    requests = [lines for _, lines in patients_records]
+    responses = _serve_clients(server, requests[:3] + [BAD_LINES] + requests[3:])
+
+    error = responses.pop(3)
+    assert isinstance(error, RuntimeError) and "Malformed imputation line" in str(error)
+    _check_good_results(responses, patients_records, donors_graph)
+    stats = server.stats()
+    assert stats["requests"] == len(requests) + 1 and stats["batches"] == 1
+    assert len(server._latencies) == len(requests) + 1  # the failed request is in the latency percentiles
+
+
+def test_failed_batch_is_searched_request_by_request(monkeypatch, patients_records, donors_graph):
+    failing_line = patients_records[2][1][0].split(",", 1)[1]  # the patients are renamed in the batch
+    original_find_matches = grma.match.match.find_matches
+
+    def find_matches_or_fail(lines, *args, **kwargs):
+        lines = list(lines)
+        if any(line.split(",", 1)[1] == failing_line for line in lines):
+            raise RuntimeError("search failed")
+        return original_find_matches(lines, *args, **kwargs)
+
+    monkeypatch.setattr(grma.match.match, "find_matches", find_matches_or_fail)
+    server = MatchingServer(donors_graph, max_batch_delay=0.5)
+    responses = _serve_clients(server, [lines for _, lines in patients_records])
+
+    assert "search failed" in str(responses.pop(2))
+    _check_good_results(responses, patients_records[:2] + patients_records[3:], donors_graph)
+    assert server.stats()["batches"] == 1
+
+
+def test_malformed_messages_get_errors(patients_records, donors_graph):
+    async def main():
+        server = MatchingServer(donors_graph)
+        await server.start(port=0)
+        try:
+            reader, writer = await asyncio.open_connection(*server.address[:2])
+            responses = []
+            for message in [b"[1]\n", b"not json\n", b'{"id": 7, "method": "stats"}\n']:
+                writer.write(message)
+                await writer.drain()
+                responses.append(json.loads(await asyncio.wait_for(reader.readline(), timeout=10)))
+            writer.close()
+            await writer.wait_closed()
+            return responses
+        finally:
+            await server.close()
+
+    not_object, not_json, stats = asyncio.run(main())
+    assert not_object == {"id": None, "error": "ValueError: A request must be a JSON object."}
+    assert not_json["id"] is None and not_json["error"].startswith("JSONDecodeError: ")
+    assert stats["id"] == 7 and "results" in stats
+
+
+def test_results_without_matches_keep_columns(patients_records, donors_graph):
+    async def main():
+        server = MatchingServer(donors_graph)
+        await server.start(port=0)
+        try:
+            client = await MatchingClient.connect(port=server.address[1])
+            try:
+                return await client.match(patients_records[0][1], threshold=2.0)
+            finally:
+                await client.close()
+        finally:
+            await server.close()
+
+    results_df = asyncio.run(main())[str(patients_records[0][0])]
+    expected = find_matches(patients_records[0][1], donors_graph, threshold=2.0)[patients_records[0][0]]
+    assert results_df.empty and list(results_df.columns) == list(expected.columns)
@@ -0,0 +1,26 @@
+import pytest
+
+from grma.donorsgraph.sharded_build import build_sharded_graph
+from grma.match import find_matches
+from grma.match.sharded_search import ShardCoordinator
+from tests.conftest import assert_same_results
+
+# every match is returned, so matches with equal scores at the cutof don't make the results differ
+CUTOF = 100000
+
+
+@pytest.fixture(scope="module")
+def sharded_directory(tmp_path_factory, donors_dir):
+    directory = tmp_path_factory.mktemp("shards")
+    build_sharded_graph(str(donors_dir), str(directory), num_shards=3)
+    return directory
+
+
+@pytest.mark.parametrize("processes", [False, True])
+def test_shards_match_single_graph(sharded_directory, patients_file, donors_graph, processes):
+    expected = find_matches(str(patients_file), donors_graph, threshold=0.01, cutof=CUTOF)
+    with ShardCoordinator(str(sharded_directory), processes=processes) as coordinator:
+        assert coordinator.num_shards == 3
+        results = coordinator.find_matches(str(patients_file), threshold=0.01, cutof=CUTOF)
+
+    assert_same_results(results, expected)